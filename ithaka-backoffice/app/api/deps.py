@@ -9,12 +9,98 @@ En lugar de duplicar código, IMPORTAMOS get_db desde db.session
 # ============================================================================
 # IMPORTAR DEPENDENCIES DESDE OTROS MÓDULOS
 # ============================================================================
+import re
+from typing import Mapping, Optional
 
+from fastapi import HTTPException, Query, status
+
+from app.core.config import settings
 # get_db() está definido en db/session.py
 # Lo importamos aquí para tenerlo disponible junto a otras dependencies
 from app.db.session import get_db
+from app.services.proyeccion import CampoProyectado, parsear_fields
+
+# ============================================================================
+# PROYECCIÓN DE CAMPOS (?fields=)
+# ============================================================================
+
+
+def campos_proyectados(campos: Mapping[str, CampoProyectado]):
+    """
+    Dependency factory para el query param `fields` de los listados.
+
+    Retorna la lista de campos pedidos (o None si no se pidió proyección)
+    y responde 400 si se pide un campo que el listado no expone.
+
+    Uso:
+        seleccion: Optional[list[str]] = Depends(campos_proyectados(CAMPOS))
+    """
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Campos a devolver separados por coma. Disponibles: {', '.join(campos)}"
+        )
+    ) -> Optional[list[str]]:
+        try:
+            return parsear_fields(fields, campos)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return dependency
+
+
+# ============================================================================
+# CONSULTA EN LOTE (?ids=)
+# ============================================================================
+# IDs son columnas INTEGER (int4): valores mayores fallarían en la base
+MAX_ID = 2_147_483_647
+_ID = re.compile(r"[0-9]+")
+
+
+def parsear_id(valor: str) -> Optional[int]:
+    """Entero positivo dentro de int4 (solo dígitos ASCII), o None si no es válido."""
+    if not _ID.fullmatch(valor):
+        return None
+    numero = int(valor)
+    return numero if 0 < numero <= MAX_ID else None
+
+
+def ids_en_lote(
+    ids: str = Query(
+        ...,
+        description=f"IDs separados por coma (máximo {settings.LOTE_MAX_IDS}), ej: 1,2,3"
+    )
+) -> list[int]:
+    """
+    Dependency para los endpoints `/batch`: parsea `ids=1,2,3`.
+
+    Retorna los IDs sin duplicados (en el orden pedido) y responde 400 si hay
+    valores no numéricos o se supera `LOTE_MAX_IDS`.
+    """
+    resultado: dict[int, None] = {}
+    for valor in ids.split(","):
+        valor = valor.strip()
+        if not valor:
+            continue
+        numero = parsear_id(valor)
+        if numero is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"ID inválido: '{valor}'"
+            )
+        resultado[numero] = None
+
+    if not resultado:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Debe indicar al menos un ID")
+    if len(resultado) > settings.LOTE_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Se permiten hasta {settings.LOTE_MAX_IDS} IDs por consulta"
+        )
+    return list(resultado)
+
 
 # Exportamos get_db para que otros archivos puedan importarlo desde aquí
 # Uso: from app.api.deps import get_db
-__all__ = ["get_db"]
+__all__ = ["get_db", "campos_proyectados", "ids_en_lote"]
 
@@ -1,148 +1,63 @@
 """
 API Router Principal
 ====================
-Este archivo AGRUPA todos los routers de los endpoints.
+Este archivo REGISTRA todos los routers de los endpoints.
 
 Cuando creen un nuevo archivo de endpoints (ej: casos.py), deben:
-1. Importarlo aquí
-2. Incluirlo con api_router.include_router()
+1. Agregarlo a ROUTERS con su módulo, prefijo y tags
 
 Así todos los endpoints quedan bajo /api/v1/
-"""
-
-from fastapi import APIRouter
 
-# Importar los routers de cada endpoint
-from app.api.v1.endpoints import (
-    apoyo,
-    apoyo_solicitado,
-    asignacion,
-    auditoria,
-    caso,
-    catalogo_estados,
-    convocatoria,
-    emprendedores,
-    nota,
-    programa,
-    rol,
-    usuario,
-    auth,
-    catalogo_apoyos
-)
+Los módulos NO se importan acá: main.py monta el registro con
+`incluir_routers` y cada módulo se importa recién con el primer pedido a su
+prefijo (arranque más rápido; ver app/core/routers_diferidos.py). Con
+ROUTERS_DIFERIDOS=False se importan todos al arrancar.
+"""
 
-# Importar el router de métricas correctamente
-from app.api.v1.endpoints.metricas.dashboard import router as metricas_router
+from app.core.routers_diferidos import RouterRegistrado
 
-# Router principal que agrupa todo
-api_router = APIRouter()
+_ENDPOINTS = "app.api.v1.endpoints"
 
 # ============================================================================
-# INCLUIR TODOS LOS ROUTERS
+# REGISTRO DE ROUTERS (en orden de matching)
 # ============================================================================
-
-# Emprendedores
-api_router.include_router(
-    emprendedores.router,
-    prefix="/emprendedores",
-    tags=["emprendedores"]
-)
-
- # Catálogo de Apoyos
-api_router.include_router(
-    catalogo_apoyos.router,
-    prefix="/catalogo_apoyos",
-    tags=["catalogo_apoyos"]
-)
- # Catálogo de Estados
-api_router.include_router(
-    catalogo_estados.router,
-    prefix="/estados",
-    tags=["estados"]
-)
-
-# Casos
-api_router.include_router(
-    caso.router,
-    prefix="/casos",
-    tags=["casos"]
-)
-
-#Metricas
-api_router.include_router(
-    metricas_router,
-    prefix="/metricas",
-    tags=["metricas"],
-)
-
-# Notas
-api_router.include_router(
-    nota.router,
-    prefix="/notas",
-    tags=["notas"]
-)
-
-# Auditoría
-api_router.include_router(
-    auditoria.router,
-    prefix="/auditoria",
-    tags=["auditoria"]
-)
-
-# Convocatorias
-api_router.include_router(
-    convocatoria.router,
-    prefix="/convocatorias",
-    tags=["convocatorias"]
-)
-
-# Programas
-api_router.include_router(
-    programa.router,
-    prefix="/programas",
-    tags=["programas"]
-)
-
-# Autenticación
-api_router.include_router(
-    auth.router,
-    prefix="/auth",
-    tags=["autenticación"]
-)
-
-# Usuarios
-api_router.include_router(
-    usuario.router,
-    prefix="/usuarios",
-    tags=["usuarios"]
-)
-
-# Roles
-api_router.include_router(
-    rol.router,
-    prefix="/roles",
-    tags=["roles"]
-)
-
-# Asignaciones
-api_router.include_router(
-    asignacion.router,
-    prefix="/asignaciones",
-    tags=["asignaciones"]
-)
-
-# Apoyos
-api_router.include_router(
-    apoyo.router,
-    prefix="/apoyos",
-    tags=["apoyos"]
-)
-
-# Apoyos Solicitados
-api_router.include_router(
-    apoyo_solicitado.router,
-    prefix="/apoyos-solicitados",
-    tags=["apoyos-solicitados"]
-)
+ROUTERS = [
+    # Emprendedores
+    RouterRegistrado(f"{_ENDPOINTS}.emprendedores", "/emprendedores", ("emprendedores",)),
+    # Catálogo de Apoyos
+    RouterRegistrado(f"{_ENDPOINTS}.catalogo_apoyos", "/catalogo_apoyos", ("catalogo_apoyos",)),
+    # Catálogo de Estados
+    RouterRegistrado(f"{_ENDPOINTS}.catalogo_estados", "/estados", ("estados",)),
+    # Casos
+    RouterRegistrado(f"{_ENDPOINTS}.caso", "/casos", ("casos",)),
+    # Métricas (antes que /metricas/proyectos, igual que al incluirlos)
+    RouterRegistrado(f"{_ENDPOINTS}.metricas.dashboard", "/metricas", ("metricas",)),
+    RouterRegistrado(f"{_ENDPOINTS}.metricas.proyecto", "/metricas/proyectos", ("metricas",)),
+    # Notas
+    RouterRegistrado(f"{_ENDPOINTS}.nota", "/notas", ("notas",)),
+    # Auditoría
+    RouterRegistrado(f"{_ENDPOINTS}.auditoria", "/auditoria", ("auditoria",)),
+    # Convocatorias
+    RouterRegistrado(f"{_ENDPOINTS}.convocatoria", "/convocatorias", ("convocatorias",)),
+    # Programas
+    RouterRegistrado(f"{_ENDPOINTS}.programa", "/programas", ("programas",)),
+    # Autenticación
+    RouterRegistrado(f"{_ENDPOINTS}.auth", "/auth", ("autenticación",)),
+    # Usuarios
+    RouterRegistrado(f"{_ENDPOINTS}.usuario", "/usuarios", ("usuarios",)),
+    # Roles
+    RouterRegistrado(f"{_ENDPOINTS}.rol", "/roles", ("roles",)),
+    # Asignaciones
+    RouterRegistrado(f"{_ENDPOINTS}.asignacion", "/asignaciones", ("asignaciones",)),
+    # Apoyos
+    RouterRegistrado(f"{_ENDPOINTS}.apoyo", "/apoyos", ("apoyos",)),
+    # Apoyos Solicitados
+    RouterRegistrado(f"{_ENDPOINTS}.apoyo_solicitado", "/apoyos-solicitados", ("apoyos-solicitados",)),
+    # Búsqueda full-text
+    RouterRegistrado(f"{_ENDPOINTS}.busqueda", "/search", ("busqueda",)),
+    # Exportaciones en segundo plano
+    RouterRegistrado(f"{_ENDPOINTS}.exportacion", "/exportaciones", ("exportaciones",)),
+]
 
 # ============================================================================
 # RESULTADO FINAL
@@ -155,4 +70,4 @@ api_router.include_router(
 #   - GET  /api/v1/emprendedores/
 #   - POST /api/v1/casos/
 #
-# El main.py incluye este api_router con prefix="/api/v1"
+# El main.py monta este registro con prefijo="/api/v1"
@@ -20,12 +20,13 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_db
 from app.models.apoyo import Apoyo
 from app.models.caso import Caso
-from app.models.asignacion import Asignacion
 from app.models.programa import Programa
 from app.models.usuario import Usuario
 from app.schemas.apoyo import ApoyoCreate, ApoyoUpdate, ApoyoResponse
 from app.services.auditoria_service import registrar_auditoria_caso
 from app.core.security import require_role
+from app.core.versionado import incrementar_version_casos
+from app.services.autorizacion_service import aplicar_alcance_tutor, puede_ver_caso
 
 router = APIRouter()
 
@@ -48,12 +49,7 @@ def listar_apoyos(
     query = db.query(Apoyo)
     
     # Si es Tutor, filtrar por casos asignados
-    if current_user.rol.nombre_rol == "Tutor":
-        query = query.join(
-            Asignacion, Apoyo.id_caso == Asignacion.id_caso
-        ).filter(
-            Asignacion.id_usuario == current_user.id_usuario
-        )
+    query = aplicar_alcance_tutor(query, current_user, Apoyo.id_caso)
     
     if id_caso:
         query = query.filter(Apoyo.id_caso == id_caso)
@@ -83,17 +79,11 @@ def obtener_apoyo(
         )
     
     # Si es Tutor, verificar que el caso esté asignado
-    if current_user.rol.nombre_rol == "Tutor":
-        asignacion = db.query(Asignacion).filter(
-            Asignacion.id_caso == apoyo.id_caso,
-            Asignacion.id_usuario == current_user.id_usuario
-        ).first()
-        
-        if not asignacion:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="No tienes acceso a este apoyo"
-            )
+    if not puede_ver_caso(db, current_user, apoyo.id_caso):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes acceso a este apoyo"
+        )
     
     return apoyo
 
@@ -114,17 +104,11 @@ def listar_apoyos_por_caso(
         )
     
     # Si es Tutor, verificar que el caso esté asignado
-    if current_user.rol.nombre_rol == "Tutor":
-        asignacion = db.query(Asignacion).filter(
-            Asignacion.id_caso == id_caso,
-            Asignacion.id_usuario == current_user.id_usuario
-        ).first()
-        
-        if not asignacion:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="No tienes acceso a este caso"
-            )
+    if not puede_ver_caso(db, current_user, id_caso):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes acceso a este caso"
+        )
     
     apoyos = db.query(Apoyo).filter(
         Apoyo.id_caso == id_caso
@@ -194,6 +178,8 @@ def crear_apoyo(
             valor_anterior=None,
             valor_nuevo=f"{nombre_catalogo_apoyo or apoyo_data.id_catalogo_apoyo} - {programa.nombre}"
         )
+    # El programa de apoyo se muestra en el caso: cambia su ETag
+    incrementar_version_casos(db, Caso.id_caso == apoyo_data.id_caso)
 
     db.commit()
     db.refresh(nuevo_apoyo)
@@ -219,8 +205,12 @@ def actualizar_apoyo(
             detail=f"Apoyo con ID {apoyo_id} no encontrado"
         )
     
+    id_caso_anterior = apoyo.id_caso
     for key, value in apoyo_data.model_dump(exclude_unset=True).items():
         setattr(apoyo, key, value)
+    # Puede cambiar el programa o el caso del apoyo (se muestra en el caso)
+    db.flush()
+    incrementar_version_casos(db, Caso.id_caso.in_({id_caso_anterior, apoyo.id_caso}))
     
     db.commit()
     db.refresh(apoyo)
@@ -244,5 +234,6 @@ def eliminar_apoyo(
         )
     
     db.delete(apoyo)
+    incrementar_version_casos(db, Caso.id_caso == apoyo.id_caso)
     db.commit()
     return
\ No newline at end of file
@@ -13,7 +13,6 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_db
 from app.models.apoyo_solicitado import ApoyoSolicitado
 from app.models.caso import Caso
-from app.models.asignacion import Asignacion
 from app.models.usuario import Usuario
 from app.schemas.apoyo_solicitado import (
     ApoyoSolicitadoCreate,
@@ -21,6 +20,7 @@ from app.schemas.apoyo_solicitado import (
     ApoyoSolicitadoResponse
 )
 from app.core.security import require_role
+from app.services.autorizacion_service import aplicar_alcance_tutor, puede_ver_caso
 
 router = APIRouter()
 
@@ -45,12 +45,7 @@ def listar_apoyos_solicitados(
     query = db.query(ApoyoSolicitado)
     
     # Si es Tutor, filtrar por casos asignados
-    if current_user.rol.nombre_rol == "Tutor":
-        query = query.join(
-            Asignacion, ApoyoSolicitado.id_caso == Asignacion.id_caso
-        ).filter(
-            Asignacion.id_usuario == current_user.id_usuario
-        )
+    query = aplicar_alcance_tutor(query, current_user, ApoyoSolicitado.id_caso)
     
     apoyos = query.offset(skip).limit(limit).all()
     return apoyos
@@ -83,17 +78,11 @@ def listar_apoyos_por_caso(
         )
     
     # Si es Tutor, verificar que el caso esté asignado
-    if current_user.rol.nombre_rol == "Tutor":
-        asignacion = db.query(Asignacion).filter(
-            Asignacion.id_caso == id_caso,
-            Asignacion.id_usuario == current_user.id_usuario
-        ).first()
-        
-        if not asignacion:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="No tienes acceso a este caso"
-            )
+    if not puede_ver_caso(db, current_user, id_caso):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes acceso a este caso"
+        )
     
     apoyos = db.query(ApoyoSolicitado).filter(
         ApoyoSolicitado.id_caso == id_caso
@@ -128,17 +117,11 @@ def obtener_apoyo_solicitado(
         )
     
     # Si es Tutor, verificar que el caso esté asignado
-    if current_user.rol.nombre_rol == "Tutor":
-        asignacion = db.query(Asignacion).filter(
-            Asignacion.id_caso == apoyo.id_caso,
-            Asignacion.id_usuario == current_user.id_usuario
-        ).first()
-        
-        if not asignacion:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="No tienes acceso a este apoyo"
-            )
+    if not puede_ver_caso(db, current_user, apoyo.id_caso):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes acceso a este apoyo"
+        )
     
     return apoyo
 
@@ -229,16 +212,11 @@ def actualizar_apoyo_solicitado(
         )
 
     # Si es Tutor, verificar que el caso esté asignado
-    if current_user.rol.nombre_rol == "Tutor":
-        asignacion = db.query(Asignacion).filter(
-            Asignacion.id_caso == apoyo.id_caso,
-            Asignacion.id_usuario == current_user.id_usuario
-        ).first()
-        if not asignacion:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="No tienes acceso a este apoyo"
-            )
+    if not puede_ver_caso(db, current_user, apoyo.id_caso):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes acceso a este apoyo"
+        )
 
     # Actualizar solo los campos enviados
     update_data = apoyo_data.model_dump(exclude_unset=True)
@@ -9,6 +9,7 @@ Endpoints:
 - GET /api/v1/asignaciones/caso/{id_caso} - Listar por caso
 - GET /api/v1/asignaciones/usuario/{id_usuario} - Listar por usuario
 - POST /api/v1/asignaciones - Crear (solo tutores, con auditoría)
+- POST /api/v1/asignaciones/automatica - Repartir casos sin tutor según carga
 - DELETE /api/v1/asignaciones/{id} - Eliminar (con auditoría)
 """
 
@@ -18,12 +19,22 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
+from app.core.config import settings
 from app.models.asignacion import Asignacion
+from app.models.catalogo_estados import normalizar_estado
 from app.models.usuario import Usuario
 from app.models.caso import Caso
-from app.schemas.asignacion import AsignacionCreate, AsignacionUpdate, AsignacionResponse
+from app.schemas.asignacion import (
+    AsignacionAutomaticaCreate,
+    AsignacionAutomaticaResponse,
+    AsignacionCreate,
+    AsignacionResponse,
+    AsignacionUpdate,
+)
+from app.services import asignacion_automatica_service
 from app.services.auditoria_service import registrar_auditoria_caso
 from app.core.security import require_role
+from app.core.versionado import incrementar_version_casos
 
 router = APIRouter()
 
@@ -188,6 +199,8 @@ def crear_asignacion(
         valor_anterior=None,
         valor_nuevo=usuario.nombre
     )
+    # El tutor se muestra en el caso: cambia su ETag
+    incrementar_version_casos(db, Caso.id_caso == asignacion_data.id_caso)
     
     db.commit()
     db.refresh(nueva_asignacion)
@@ -195,6 +208,78 @@ def crear_asignacion(
     return nueva_asignacion
 
 
+@router.post("/automatica", response_model=AsignacionAutomaticaResponse)
+def asignar_automaticamente(
+    datos: AsignacionAutomaticaCreate,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(require_role(["Admin", "Coordinador"]))
+):
+    """
+    Reparte casos sin tutor entre los tutores activos según su carga.
+
+    - Los casos que ya tienen tutor se ignoran.
+    - Cada tutor recibe casos hasta su capacidad (carga ponderada por apoyos
+      solicitados); los que no entran quedan en `sin_asignar`.
+    - Con `simular=true` solo devuelve el reparto calculado.
+
+    Las asignaciones y la auditoría se guardan en una sola transacción.
+    """
+    filtros = None
+    if datos.filtros is not None:
+        filtros = datos.filtros.model_dump(exclude_none=True)
+        for clave in ("nombre_estado", "tipo_caso"):
+            if clave in filtros:
+                filtros[clave] = normalizar_estado(filtros[clave])
+
+    limite = settings.ASIGNACION_AUTOMATICA_MAX_CASOS
+    # Bloqueados hasta el commit: un reparto simultáneo no toma los mismos casos
+    id_casos = asignacion_automatica_service.casos_sin_asignar(
+        db, datos.ids, filtros, limite, bloquear=not datos.simular
+    )
+    if len(id_casos) > limite:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Se permiten hasta {limite} casos por operación"
+        )
+
+    tutores = asignacion_automatica_service.cargas_tutores(
+        db, datos.capacidad or settings.ASIGNACION_CAPACIDAD_TUTOR, datos.id_tutores
+    )
+    if not tutores:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No hay tutores activos disponibles"
+        )
+
+    resultado = asignacion_automatica_service.repartir(db, id_casos, tutores)
+    if not datos.simular:
+        asignacion_automatica_service.guardar(db, resultado, current_user.id_usuario)
+
+    asignados_por_tutor: dict[int, int] = {}
+    for _, tutor in resultado.asignaciones:
+        asignados_por_tutor[tutor.id_usuario] = asignados_por_tutor.get(tutor.id_usuario, 0) + 1
+
+    return {
+        "simulado": datos.simular,
+        "asignaciones": [
+            {"id_caso": id_caso, "id_usuario": tutor.id_usuario, "tutor_nombre": tutor.nombre}
+            for id_caso, tutor in resultado.asignaciones
+        ],
+        "sin_asignar": resultado.sin_asignar,
+        "tutores": [
+            {
+                "id_usuario": tutor.id_usuario,
+                "tutor_nombre": tutor.nombre,
+                "capacidad": tutor.capacidad,
+                "carga_anterior": tutor.carga_inicial,
+                "carga_final": tutor.carga,
+                "casos_asignados": asignados_por_tutor.get(tutor.id_usuario, 0),
+            }
+            for tutor in resultado.tutores
+        ],
+    }
+
+
 @router.put("/{asignacion_id}", status_code=status.HTTP_200_OK)
 def actualizar_asignacion(
     asignacion_id: int,
@@ -246,6 +331,9 @@ def actualizar_asignacion(
         valor_anterior=valor_anterior,
         valor_nuevo=valor_nuevo
     )
+    incrementar_version_casos(
+        db, Caso.id_caso.in_({valor_anterior.get("id_caso", asignacion.id_caso), asignacion.id_caso})
+    )
 
     db.commit()
     db.refresh(asignacion)
@@ -286,6 +374,7 @@ def eliminar_asignacion(
         valor_anterior=usuario.nombre if usuario else None,
         valor_nuevo=None
     )
+    incrementar_version_casos(db, Caso.id_caso == asignacion.id_caso)
     
     db.delete(asignacion)
     db.commit()
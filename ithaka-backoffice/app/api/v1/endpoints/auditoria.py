@@ -23,17 +23,23 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.deps import campos_proyectados, get_db
 from app.models.auditoria import Auditoria
 from app.models.usuario import Usuario
 from app.schemas.auditoria import AuditoriaResponse
+from app.core.respuestas import respuesta_lista, serializador
 from app.core.security import require_role
+from app.services.proyeccion import columnas_de_modelo, proyectar, respuesta_proyectada
 
 router = APIRouter()
 
+_CAMPOS_AUDITORIA = columnas_de_modelo(Auditoria)
+_serializar_auditoria = serializador(AuditoriaResponse)
+
 
 @router.get("/", response_model=list[AuditoriaResponse], status_code=status.HTTP_200_OK)
 def listar_auditoria(
+    seleccion: Optional[list[str]] = Depends(campos_proyectados(_CAMPOS_AUDITORIA)),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(require_role(["Admin", "Coordinador"]))
 ):
@@ -48,8 +54,13 @@ def listar_auditoria(
     """
     # Consulta simple de solo lectura, ordenada por ID ascendente
     # para reconstruir la secuencia historica de eventos.
-    auditorias = db.query(Auditoria).order_by(Auditoria.id_auditoria.asc()).all()
-    return auditorias
+    query = db.query(Auditoria).order_by(Auditoria.id_auditoria.asc())
+
+    # Proyeccion opcional (?fields=): evita traer valor_anterior/valor_nuevo.
+    if seleccion:
+        return respuesta_proyectada(proyectar(query, _CAMPOS_AUDITORIA, seleccion))
+
+    return respuesta_lista(map(_serializar_auditoria, query.all()))
 
 
 @router.get("/staff/{id_usuario}", response_model=list[AuditoriaResponse], status_code=status.HTTP_200_OK)
@@ -59,6 +70,7 @@ def listar_acciones_por_staff(
     limit: int = 100,
     id_caso: Optional[int] = None,
     accion: Optional[str] = None,
+    seleccion: Optional[list[str]] = Depends(campos_proyectados(_CAMPOS_AUDITORIA)),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
 ):
@@ -88,8 +100,15 @@ def listar_acciones_por_staff(
         query = query.filter(Auditoria.accion.ilike(f"%{accion}%"))
 
     # 4) Orden por eventos mas recientes + paginacion.
-    acciones = query.order_by(Auditoria.timestamp.desc()).offset(skip).limit(limit).all()
-    return acciones
+    query = query.order_by(Auditoria.timestamp.desc())
+
+    if seleccion:
+        return respuesta_proyectada(
+            proyectar(query, _CAMPOS_AUDITORIA, seleccion, skip=skip, limit=limit)
+        )
+
+    acciones = query.offset(skip).limit(limit).all()
+    return respuesta_lista(map(_serializar_auditoria, acciones))
 
 
 @router.get("/{auditoria_id}", response_model=AuditoriaResponse, status_code=status.HTTP_200_OK)
@@ -0,0 +1,56 @@
+"""Endpoint de busqueda full-text.
+
+Referencia de permisos: PERMISOS_POR_ROL.md.
+- GET /search: Admin, Coordinador y Tutor (Tutor solo ve resultados
+  ligados a sus casos asignados).
+
+Busca por nombre/descripcion de caso, nombre/email/documento de
+emprendedor y contenido de notas en una unica consulta indexada
+(ver `app/services/busqueda_service.py`).
+"""
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.core.security import require_role
+from app.models.usuario import Usuario
+from app.schemas.busqueda import ResultadoBusquedaResponse
+from app.services.busqueda_service import TIPOS_BUSQUEDA, buscar
+
+router = APIRouter()
+
+
+@router.get("/", response_model=list[ResultadoBusquedaResponse], status_code=status.HTTP_200_OK)
+def buscar_global(
+    q: str = Query(..., min_length=2, max_length=200, description="Texto a buscar"),
+    tipos: Optional[List[str]] = Query(
+        None,
+        description="Restringir a entidades: caso, emprendedor, nota"
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
+):
+    """Busca casos, emprendedores y notas ordenados por relevancia.
+
+    Permisos:
+    - Admin y Coordinador: acceso completo.
+    - Tutor: solo resultados de casos asignados.
+    """
+    if tipos:
+        invalidos = set(tipos) - set(TIPOS_BUSQUEDA)
+        if invalidos:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Tipos inválidos: {', '.join(sorted(invalidos))}"
+            )
+
+    if not q.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El parámetro 'q' no puede estar vacío"
+        )
+
+    return buscar(db, q.strip(), current_user=current_user, tipos=tipos, limit=limit)
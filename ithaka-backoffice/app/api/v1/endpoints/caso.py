@@ -1,22 +1,125 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload
+import os
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.background import BackgroundTask
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload, undefer_group
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.api.deps import get_db
+from app.api.deps import campos_proyectados, get_db, ids_en_lote, parsear_id
 from app.models import Caso, CatalogoEstados, Convocatoria, Apoyo, Programa
+from app.models.catalogo_estados import normalizar_estado
 from app.models.usuario import Usuario
 from app.models.asignacion import Asignacion
+from app.models.apoyo_solicitado import ApoyoSolicitado
+from app.models.auditoria import Auditoria
+from app.models.catalogo_apoyo import CatalogoApoyo
 from app.models.emprendedor import Emprendedor
-from app.schemas.caso import CasoCreate, CasoUpdate, CasoResponse
+from app.models.nota import Nota
+from app.schemas.auditoria import AuditoriaResponse
+from app.schemas.caso import (
+    CambiarEstadoLote,
+    CambiosCasosResponse,
+    CambiarEstadoLoteResponse,
+    CasoCompletoResponse,
+    CasoCreate,
+    CasoResponse,
+    CasoUpdate,
+)
+from app.schemas.emprendedor import EmprendedorResponse
+from app.schemas.nota import NotaResponse
+from app.core.respuestas import ORJSONRespuesta, respuesta_lista, serializador
+from app.core.config import settings
 from app.core.security import require_role
+from app.core.versionado import (
+    error_conflicto,
+    no_modificado,
+    poner_etag,
+    respuesta_no_modificada,
+    verificar_if_match,
+)
+from app.services import cambios_service, eventos_service
 from app.services.auditoria_service import registrar_auditoria_caso
-from app.services.export_service import ExportService
+from app.services.autorizacion_service import (
+    aplicar_alcance_tutor,
+    es_tutor,
+    invalidar_tutor,
+    puede_ver_caso,
+    tutor_tiene_caso,
+)
+from app.services.export_service import (
+    FORMATOS_COLUMNARES,
+    HOJAS_XLSX,
+    MEDIA_TYPE_XLSX,
+    ExportService,
+)
+from app.services.chatbot_filtros import condicion_datos_chatbot, parsear_filtros_chatbot
+from app.services.proyeccion import CampoProyectado, proyectar, respuesta_proyectada
 
 router = APIRouter()
 
 
+# =============================================================================
+# PROYECCIÓN (?fields=) PARA EL LISTADO
+# =============================================================================
+# Alias propios para que los joins de la proyección no choquen con los joins
+# de filtrado (tutor, estado) del query base.
+_EstadoProy = aliased(CatalogoEstados)
+_EmprendedorProy = aliased(Emprendedor)
+_ConvocatoriaProy = aliased(Convocatoria)
+_AsignacionProy = aliased(Asignacion)
+_TutorProy = aliased(Usuario)
+_AsignacionPrimera = aliased(Asignacion)
+
+_CAMPOS_CASO = {
+    "id_caso": CampoProyectado(Caso.id_caso),
+    "nombre_caso": CampoProyectado(Caso.nombre_caso),
+    "descripcion": CampoProyectado(Caso.descripcion),
+    "fecha_creacion": CampoProyectado(Caso.fecha_creacion),
+    "datos_chatbot": CampoProyectado(Caso.datos_chatbot),
+    "id_estado": CampoProyectado(Caso.id_estado),
+    "id_emprendedor": CampoProyectado(Caso.id_emprendedor),
+    "id_convocatoria": CampoProyectado(Caso.id_convocatoria),
+    "nombre_estado": CampoProyectado(_EstadoProy.nombre_estado, "estado"),
+    "tipo_caso": CampoProyectado(_EstadoProy.tipo_caso, "estado"),
+    "emprendedor": CampoProyectado(
+        _EmprendedorProy.nombre + " " + _EmprendedorProy.apellido, "emprendedor"
+    ),
+    "convocatoria": CampoProyectado(_ConvocatoriaProy.nombre, "convocatoria"),
+    "tutor_nombre": CampoProyectado(
+        _TutorProy.nombre + " " + func.coalesce(_TutorProy.apellido, ""), "tutor", "Sin asignar"
+    ),
+    "id_tutor": CampoProyectado(_TutorProy.id_usuario, "tutor", "Sin Asignar"),
+    "asignacion": CampoProyectado(_AsignacionProy.id_asignacion, "tutor", "Sin Asignar"),
+}
+
+# Igual que _serializar_caso_para_response: se toma la primera asignación del caso
+_primera_asignacion = (
+    select(func.min(_AsignacionPrimera.id_asignacion))
+    .where(_AsignacionPrimera.id_caso == Caso.id_caso)
+    .correlate(Caso)
+    .scalar_subquery()
+)
+
+_JOINS_CASO = {
+    "estado": lambda q: q.outerjoin(_EstadoProy, _EstadoProy.id_estado == Caso.id_estado),
+    "emprendedor": lambda q: q.outerjoin(
+        _EmprendedorProy, _EmprendedorProy.id_emprendedor == Caso.id_emprendedor
+    ),
+    "convocatoria": lambda q: q.outerjoin(
+        _ConvocatoriaProy, _ConvocatoriaProy.id_convocatoria == Caso.id_convocatoria
+    ),
+    "tutor": lambda q: q.outerjoin(
+        _AsignacionProy,
+        (_AsignacionProy.id_caso == Caso.id_caso)
+        & (_AsignacionProy.id_asignacion == _primera_asignacion),
+    ).outerjoin(_TutorProy, _TutorProy.id_usuario == _AsignacionProy.id_usuario),
+}
+
+
 def _serializar_caso_para_response(caso: Caso) -> dict:
     """Normaliza un caso al formato esperado por CasoResponse."""
     estado = caso.estado
@@ -40,10 +143,19 @@ def _serializar_caso_para_response(caso: Caso) -> dict:
         "datos_chatbot": caso.datos_chatbot,
         "tutor_nombre": f"{tutor.nombre} {tutor.apellido}" if tutor else "Sin asignar",
         "id_tutor": tutor.id_usuario if tutor else "Sin Asignar",
-        "asignacion": asignacion.id_asignacion if asignacion else "Sin Asignar"
+        "asignacion": asignacion.id_asignacion if asignacion else "Sin Asignar",
+        "version": caso.version
     }
 
 
+def _filtro_chatbot_o_400(chatbot_contiene: Optional[str], chatbot: Optional[List[str]]) -> Optional[dict]:
+    """Parsea los filtros sobre datos_chatbot o responde 400 si son inválidos."""
+    try:
+        return parsear_filtros_chatbot(chatbot_contiene, chatbot)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # =============================================================================
 # LISTAR TODOS
 # =============================================================================
@@ -57,20 +169,23 @@ def listar_casos(
     id_emprendedor: Optional[int] = None,
     id_convocatoria: Optional[int] = None,
     id_tutor: Optional[int] = None,
+    chatbot_contiene: Optional[str] = Query(
+        None,
+        description='Objeto JSON contenido en datos_chatbot, ej: {"sector": "Tecnología"}'
+    ),
+    chatbot: Optional[List[str]] = Query(
+        None,
+        description="Filtros clave=valor sobre datos_chatbot (claves anidadas con '.')"
+    ),
+    seleccion: Optional[List[str]] = Depends(campos_proyectados(_CAMPOS_CASO)),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
 ):
-    query = db.query(Caso).options(
-        joinedload(Caso.estado),
-        joinedload(Caso.emprendedor),
-        joinedload(Caso.convocatoria),
-        joinedload(Caso.asignaciones).joinedload(Asignacion.usuario)
-    )
+    filtro_chatbot = _filtro_chatbot_o_400(chatbot_contiene, chatbot)
 
-    if current_user.rol.nombre_rol == "Tutor":
-        query = query.join(Caso.asignaciones).filter(
-            Asignacion.id_usuario == current_user.id_usuario
-        )
+    query = aplicar_alcance_tutor(
+        db.query(Caso), current_user, Caso.id_caso, id_tutor=id_tutor or None
+    )
 
     if id_estado:
         query = query.filter(Caso.id_estado == id_estado)
@@ -81,29 +196,34 @@ def listar_casos(
     if id_convocatoria:
         query = query.filter(Caso.id_convocatoria == id_convocatoria)
 
-    if id_tutor:
-        query = query.join(Caso.asignaciones).filter(
-            Asignacion.id_usuario == id_tutor
-        )
+    if tipo_caso or nombre_estado:
+        query = query.join(Caso.estado)
+        if tipo_caso:
+            query = query.filter(CatalogoEstados.tipo_caso == normalizar_estado(tipo_caso))
+        if nombre_estado:
+            query = query.filter(CatalogoEstados.nombre_estado == normalizar_estado(nombre_estado))
 
-    if tipo_caso:
-        query = query.join(Caso.estado).filter(
-            func.lower(CatalogoEstados.tipo_caso) == tipo_caso.lower()
+    if filtro_chatbot:
+        query = query.filter(
+            condicion_datos_chatbot(filtro_chatbot, db.get_bind().dialect.name)
         )
 
-    if nombre_estado:
-        query = query.join(Caso.estado).filter(
-            func.lower(CatalogoEstados.nombre_estado) == nombre_estado.lower()
+    if seleccion:
+        # Solo las columnas pedidas: sin hidratar entidades ni traer columnas pesadas
+        return respuesta_proyectada(
+            proyectar(query, _CAMPOS_CASO, seleccion, joins=_JOINS_CASO, skip=skip, limit=limit)
         )
 
-    casos = query.offset(skip).limit(limit).all()
-
-    casos_transformados = []
-
-    for caso in casos:
-        casos_transformados.append(_serializar_caso_para_response(caso))
+    casos = query.options(
+        undefer_group("detalle"),
+        joinedload(Caso.estado),
+        joinedload(Caso.emprendedor),
+        joinedload(Caso.convocatoria),
+        joinedload(Caso.asignaciones).joinedload(Asignacion.usuario)
+    ).offset(skip).limit(limit).all()
 
-    return casos_transformados
+    # Dicts ya armados con el formato de CasoResponse: se codifican sin re-validar
+    return respuesta_lista(map(_serializar_caso_para_response, casos))
 
 
 ## MOVE EXPORTAR CASOS ABOVE OBTENER UNO
@@ -119,9 +239,66 @@ def exportar_casos(
     id_convocatoria: Optional[int] = None,
     id_tutor: Optional[int] = None,
     con_tutores: bool = False,
+    chatbot_contiene: Optional[str] = None,
+    chatbot: Optional[List[str]] = Query(None),
+    formato: str = Query("csv", alias="format", pattern="^(csv|xlsx|parquet|arrow)$"),
+    hojas: Optional[List[str]] = Query(
+        None,
+        description="Hojas adicionales del XLSX: notas, apoyos, asignaciones"
+    ),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
 ):
+    filtro_chatbot = _filtro_chatbot_o_400(chatbot_contiene, chatbot)
+
+    if formato == "xlsx":
+        hojas_invalidas = set(hojas or []) - set(HOJAS_XLSX)
+        if hojas_invalidas:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Hojas no soportadas: {', '.join(sorted(hojas_invalidas))}"
+            )
+        ruta = ExportService.exportar_casos_xlsx(
+            db=db,
+            current_user=current_user,
+            id_estado=id_estado,
+            tipo_caso=tipo_caso,
+            nombre_estado=nombre_estado,
+            id_emprendedor=id_emprendedor,
+            id_convocatoria=id_convocatoria,
+            id_tutor=id_tutor,
+            filtro_chatbot=filtro_chatbot,
+            hojas=hojas or []
+        )
+        # Se envía desde disco por bloques y se borra al terminar
+        return FileResponse(
+            ruta,
+            media_type=MEDIA_TYPE_XLSX,
+            filename=ExportService.generar_nombre_archivo("casos", "xlsx"),
+            background=BackgroundTask(os.remove, ruta)
+        )
+
+    if formato in FORMATOS_COLUMNARES:
+        ruta = ExportService.exportar_casos_columnar(
+            db=db,
+            current_user=current_user,
+            id_estado=id_estado,
+            tipo_caso=tipo_caso,
+            nombre_estado=nombre_estado,
+            id_emprendedor=id_emprendedor,
+            id_convocatoria=id_convocatoria,
+            id_tutor=id_tutor,
+            filtro_chatbot=filtro_chatbot,
+            formato=formato
+        )
+        media_type, extension = FORMATOS_COLUMNARES[formato]
+        return FileResponse(
+            ruta,
+            media_type=media_type,
+            filename=ExportService.generar_nombre_archivo("casos", extension),
+            background=BackgroundTask(os.remove, ruta)
+        )
+
     if con_tutores:
         csv_file = ExportService.exportar_casos_con_tutores_csv(
             db=db,
@@ -131,7 +308,8 @@ def exportar_casos(
             nombre_estado=nombre_estado,
             id_emprendedor=id_emprendedor,
             id_convocatoria=id_convocatoria,
-            id_tutor=id_tutor
+            id_tutor=id_tutor,
+            filtro_chatbot=filtro_chatbot
         )
         nombre_archivo = ExportService.generar_nombre_archivo("casos_con_tutores")
     else:
@@ -143,7 +321,8 @@ def exportar_casos(
             nombre_estado=nombre_estado,
             id_emprendedor=id_emprendedor,
             id_convocatoria=id_convocatoria,
-            id_tutor=id_tutor
+            id_tutor=id_tutor,
+            filtro_chatbot=filtro_chatbot
         )
         nombre_archivo = ExportService.generar_nombre_archivo("casos")
 
@@ -153,16 +332,169 @@ def exportar_casos(
         headers={"Content-Disposition": f'attachment; filename="{nombre_archivo}"'}
     )
 
+# =============================================================================
+# OBTENER EN LOTE
+# =============================================================================
+@router.get("/batch", response_model=Dict[int, CasoResponse])
+def obtener_casos_en_lote(
+    ids: List[int] = Depends(ids_en_lote),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
+):
+    """
+    Varios casos por ID en una sola consulta (`?ids=1,2,3`), indexados por ID.
+
+    Los IDs inexistentes o fuera del alcance del usuario (Tutor: solo casos
+    asignados) no aparecen en la respuesta.
+    """
+    casos = aplicar_alcance_tutor(
+        db.query(Caso), current_user, Caso.id_caso
+    ).options(
+        undefer_group("detalle"),
+        joinedload(Caso.estado),
+        joinedload(Caso.emprendedor),
+        joinedload(Caso.convocatoria),
+        selectinload(Caso.asignaciones).joinedload(Asignacion.usuario)
+    ).filter(Caso.id_caso.in_(ids)).all()
+
+    return ORJSONRespuesta(content={
+        caso.id_caso: _serializar_caso_para_response(caso) for caso in casos
+    })
+
+
+# =============================================================================
+# EVENTOS (SSE)
+# =============================================================================
+@router.get("/events", response_class=StreamingResponse)
+async def eventos_casos(
+    last_event_id: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
+):
+    """
+    Stream de eventos (Server-Sent Events) de cambios en casos, en lugar de
+    consultar periódicamente los listados.
+
+    Tipos (`event:`): caso_creado, caso_actualizado, estado_cambiado,
+    asignacion, nota y resync. `data:` es JSON con `id_caso`, `accion` y
+    `timestamp`; el cliente vuelve a pedir el recurso si le interesa.
+
+    - Al reconectar con `Last-Event-ID` se reenvían los eventos perdidos; si
+      ya no están disponibles llega `resync` (recargar los listados).
+    - Tutor: solo eventos de sus casos asignados.
+    - Un cliente sin eventos no consulta la base: solo recibe un comentario
+      de heartbeat cada `EVENTOS_HEARTBEAT_SEGUNDOS`.
+    """
+    ultimo_id = parsear_id(last_event_id.strip()) if last_event_id else None
+
+    visible = None
+    if es_tutor(current_user):
+        id_tutor = current_user.id_usuario
+
+        def tiene_caso(evento: dict) -> bool:
+            try:
+                if evento["tipo"] == eventos_service.ASIGNACION:
+                    invalidar_tutor(id_tutor)
+                return tutor_tiene_caso(db, id_tutor, evento["id_caso"])
+            finally:
+                # Sin transacción abierta: no se retiene la conexión entre eventos
+                db.rollback()
+
+        async def visible(evento: dict) -> bool:
+            return await run_in_threadpool(tiene_caso, evento)
+
+    db.rollback()
+    return StreamingResponse(
+        eventos_service.flujo_sse(ultimo_id, visible),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# =============================================================================
+# FEED DE CAMBIOS
+# =============================================================================
+@router.get("/changes", response_model=CambiosCasosResponse)
+def cambios_casos(
+    since: Optional[int] = Query(None, ge=0, description="Cursor devuelto por el pedido anterior"),
+    limit: int = Query(500, ge=1, le=settings.CAMBIOS_MAX_CASOS),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
+):
+    """
+    Casos modificados después de `since`, para sincronizar una cache local
+    sin volver a descargar los listados.
+
+    - Sin `since`: solo el cursor actual (tomarlo antes de la carga inicial
+      con `GET /casos/`).
+    - Con `since`: estado actual de los casos con cambios posteriores y el
+      nuevo cursor. Si `hay_mas`, repetir con el cursor devuelto.
+    - Un caso puede repetirse en pedidos consecutivos (cambios muy
+      recientes): reemplazarlo en la cache local.
+    - Tutor: solo sus casos asignados; los que dejan de estarlo llegan en
+      `removidos` (nunca IDs de casos que no tuvo asignados).
+
+    Cambios en entidades relacionadas que no pasan por la auditoría del caso
+    (p. ej. el nombre del emprendedor) no se reflejan en el feed.
+    """
+    if since is None:
+        return ORJSONRespuesta(content={
+            "cursor": cambios_service.cursor_actual(db), "hay_mas": False, "casos": [], "removidos": []
+        })
+
+    cambios = cambios_service.cambios_desde(db, since, limit)
+    casos = []
+    if cambios.id_casos:
+        casos = aplicar_alcance_tutor(
+            db.query(Caso), current_user, Caso.id_caso
+        ).options(
+            undefer_group("detalle"),
+            joinedload(Caso.estado),
+            joinedload(Caso.emprendedor),
+            joinedload(Caso.convocatoria),
+            selectinload(Caso.asignaciones).joinedload(Asignacion.usuario)
+        ).filter(Caso.id_caso.in_(cambios.id_casos)).all()
+
+    # En el orden de su último cambio
+    por_id = {caso.id_caso: caso for caso in casos}
+    removidos = [i for i in cambios.id_casos if i not in por_id]
+    if es_tutor(current_user) and removidos:
+        propios = cambios_service.desasignados(db, current_user.id_usuario, removidos)
+        removidos = [i for i in removidos if i in propios]
+    return ORJSONRespuesta(content={
+        "cursor": cambios.cursor,
+        "hay_mas": cambios.hay_mas,
+        "casos": [_serializar_caso_para_response(por_id[i]) for i in cambios.id_casos if i in por_id],
+        "removidos": removidos,
+    })
+
+
 # =============================================================================
 # OBTENER UNO
 # =============================================================================
 @router.get("/{caso_id}", response_model=CasoResponse)
 def obtener_caso(
     caso_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
 ):
+    """
+    Caso por ID, con `ETag`. Con `If-None-Match` vigente responde 304 tras
+    leer solo la versión (sin joins).
+    """
+    if if_none_match:
+        version = db.query(Caso.version).filter(Caso.id_caso == caso_id).scalar()
+        if (
+            version is not None
+            and puede_ver_caso(db, current_user, caso_id)
+            and no_modificado(if_none_match, version)
+        ):
+            return respuesta_no_modificada(version)
+
     caso = db.query(Caso).options(
+        undefer_group("detalle"),
         joinedload(Caso.estado),
         joinedload(Caso.emprendedor),
         joinedload(Caso.convocatoria),
@@ -172,9 +504,8 @@ def obtener_caso(
     if not caso:
         raise HTTPException(status_code=404, detail="Caso no encontrado")
 
-    if current_user.rol.nombre_rol == "Tutor":
-        if not any(a.id_usuario == current_user.id_usuario for a in caso.asignaciones):
-            raise HTTPException(status_code=403, detail="No tienes acceso a este caso")
+    if not puede_ver_caso(db, current_user, caso_id):
+        raise HTTPException(status_code=403, detail="No tienes acceso a este caso")
 
     estado = caso.estado
     emprendedor = caso.emprendedor
@@ -208,13 +539,153 @@ def obtener_caso(
         "programa_apoyo": programa_nombre,
         "tutor": f"{tutor.nombre} {tutor.apellido}" if tutor else "Sin asignar",
         "id_tutor": tutor.id_usuario if tutor else "Sin Asignar",
-        "asignacion": asignacion.id_asignacion if asignacion else "Sin Asignar"
+        "asignacion": asignacion.id_asignacion if asignacion else "Sin Asignar",
+        "version": caso.version
     }
 
+    poner_etag(response, caso.version)
     return custom_case
 
 
+# =============================================================================
+# DETALLE COMPLETO (una sola llamada para la pantalla de detalle)
+# =============================================================================
+# Secciones sin paginar (asignaciones, apoyos, apoyos solicitados): acotadas
+_LIMITE_SECCION = 100
+
+_serializar_nota = serializador(NotaResponse)
+_serializar_auditoria = serializador(AuditoriaResponse)
+_serializar_emprendedor = serializador(EmprendedorResponse)
+
+
+@router.get("/{caso_id}/full", response_model=CasoCompletoResponse)
+def obtener_caso_completo(
+    caso_id: int,
+    notas_skip: int = Query(0, ge=0),
+    notas_limit: int = Query(20, ge=1, le=100),
+    auditoria_skip: int = Query(0, ge=0),
+    auditoria_limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
+):
+    """
+    Caso con emprendedor, asignaciones, apoyos, apoyos solicitados, notas y
+    auditoría en una sola respuesta (un chequeo de acceso, una consulta por
+    sección; relaciones anidadas con selectinload).
+
+    Notas y auditoría se paginan (más recientes primero); el resto de las
+    secciones se acota a 100 filas. La auditoría solo se incluye para Admin y
+    Coordinador, igual que en `GET /auditoria`.
+    """
+    if not puede_ver_caso(db, current_user, caso_id):
+        existe = db.query(Caso.id_caso).filter(Caso.id_caso == caso_id).first()
+        if not existe:
+            raise HTTPException(status_code=404, detail="Caso no encontrado")
+        raise HTTPException(status_code=403, detail="No tienes acceso a este caso")
+
+    caso = db.query(Caso).options(
+        undefer_group("detalle"),
+        joinedload(Caso.estado),
+        joinedload(Caso.emprendedor),
+        joinedload(Caso.convocatoria),
+        selectinload(Caso.asignaciones).joinedload(Asignacion.usuario)
+    ).filter(Caso.id_caso == caso_id).first()
+
+    if not caso:
+        raise HTTPException(status_code=404, detail="Caso no encontrado")
 
+    apoyos = (
+        db.query(Apoyo, CatalogoApoyo.nombre)
+        .outerjoin(CatalogoApoyo, CatalogoApoyo.id_catalogo_apoyo == Apoyo.id_catalogo_apoyo)
+        .options(selectinload(Apoyo.programa))
+        .filter(Apoyo.id_caso == caso_id)
+        .order_by(Apoyo.id_apoyo)
+        .limit(_LIMITE_SECCION)
+        .all()
+    )
+
+    apoyos_solicitados = (
+        db.query(ApoyoSolicitado, CatalogoApoyo.nombre)
+        .outerjoin(CatalogoApoyo, CatalogoApoyo.id_catalogo_apoyo == ApoyoSolicitado.id_catalogo_apoyo)
+        .filter(ApoyoSolicitado.id_caso == caso_id)
+        .order_by(ApoyoSolicitado.id_apoyo_solicitado)
+        .limit(_LIMITE_SECCION)
+        .all()
+    )
+
+    notas_query = db.query(Nota).filter(Nota.id_caso == caso_id)
+    notas = {
+        "total": notas_query.count(),
+        "skip": notas_skip,
+        "limit": notas_limit,
+        "items": [
+            _serializar_nota(nota)
+            for nota in notas_query.order_by(Nota.fecha.desc(), Nota.id_nota.desc())
+            .offset(notas_skip).limit(notas_limit)
+        ],
+    }
+
+    auditoria = None
+    if current_user.rol.nombre_rol in ("Admin", "Coordinador"):
+        auditoria_query = db.query(Auditoria).filter(Auditoria.id_caso == caso_id)
+        auditoria = {
+            "total": auditoria_query.count(),
+            "skip": auditoria_skip,
+            "limit": auditoria_limit,
+            "items": [
+                _serializar_auditoria(registro)
+                for registro in auditoria_query.order_by(Auditoria.timestamp.desc(), Auditoria.id_auditoria.desc())
+                .offset(auditoria_skip).limit(auditoria_limit)
+            ],
+        }
+
+    primer_apoyo = apoyos[0][0] if apoyos else None
+    if primer_apoyo is None:
+        programa_apoyo = "Sin apoyo asignado"
+    else:
+        programa_apoyo = primer_apoyo.programa.nombre if primer_apoyo.programa else None
+
+    asignaciones = sorted(caso.asignaciones, key=lambda a: a.id_asignacion)[:_LIMITE_SECCION]
+
+    return ORJSONRespuesta(content={
+        "caso": {**_serializar_caso_para_response(caso), "programa_apoyo": programa_apoyo},
+        "emprendedor": _serializar_emprendedor(caso.emprendedor) if caso.emprendedor else None,
+        "asignaciones": [
+            {
+                "id_asignacion": asignacion.id_asignacion,
+                "id_usuario": asignacion.id_usuario,
+                "id_caso": asignacion.id_caso,
+                "fecha_asignacion": asignacion.fecha_asignacion,
+                "tutor_nombre": f"{asignacion.usuario.nombre} {asignacion.usuario.apellido}" if asignacion.usuario else None,
+                "tutor_email": asignacion.usuario.email if asignacion.usuario else None,
+            }
+            for asignacion in asignaciones
+        ],
+        "apoyos": [
+            {
+                "id_apoyo": apoyo.id_apoyo,
+                "id_catalogo_apoyo": apoyo.id_catalogo_apoyo,
+                "fecha_inicio": apoyo.fecha_inicio,
+                "fecha_fin": apoyo.fecha_fin,
+                "id_caso": apoyo.id_caso,
+                "id_programa": apoyo.id_programa,
+                "apoyo": nombre_apoyo,
+                "programa": apoyo.programa.nombre if apoyo.programa else None,
+            }
+            for apoyo, nombre_apoyo in apoyos
+        ],
+        "apoyos_solicitados": [
+            {
+                "id_apoyo_solicitado": solicitado.id_apoyo_solicitado,
+                "id_catalogo_apoyo": solicitado.id_catalogo_apoyo,
+                "id_caso": solicitado.id_caso,
+                "apoyo": nombre_apoyo,
+            }
+            for solicitado, nombre_apoyo in apoyos_solicitados
+        ],
+        "notas": notas,
+        "auditoria": auditoria,
+    })
 
 
 # =============================================================================
@@ -227,8 +698,8 @@ def crear_caso(
     current_user: Usuario = Depends(require_role(["Admin"]))
 ):
     estado_postulado = db.query(CatalogoEstados).filter(
-        func.lower(CatalogoEstados.nombre_estado) == "postulado",
-        func.lower(CatalogoEstados.tipo_caso) == "postulacion"
+        CatalogoEstados.nombre_estado == "postulado",
+        CatalogoEstados.tipo_caso == "postulacion"
     ).first()
 
     if not estado_postulado:
@@ -262,6 +733,7 @@ def crear_caso(
 
     db.commit()
     caso_creado = db.query(Caso).options(
+        undefer_group("detalle"),
         joinedload(Caso.estado),
         joinedload(Caso.emprendedor),
         joinedload(Caso.convocatoria),
@@ -278,19 +750,24 @@ def crear_caso(
 def actualizar_caso(
     caso_id: int,
     caso_data: CasoUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
 ):
-    caso = db.query(Caso).options(
-        joinedload(Caso.asignaciones)
-    ).filter(Caso.id_caso == caso_id).first()
+    """
+    Actualiza un caso. Con `If-Match` (ETag de `GET /casos/{id}`) responde 412
+    si el caso cambió desde esa lectura.
+    """
+    caso = db.query(Caso).filter(Caso.id_caso == caso_id).first()
 
     if not caso:
         raise HTTPException(status_code=404, detail="Caso no encontrado")
 
-    if current_user.rol.nombre_rol == "Tutor":
-        if not any(a.id_usuario == current_user.id_usuario for a in caso.asignaciones):
-            raise HTTPException(status_code=403, detail="No tienes acceso a este caso")
+    if not puede_ver_caso(db, current_user, caso_id):
+        raise HTTPException(status_code=403, detail="No tienes acceso a este caso")
+
+    verificar_if_match(if_match, caso.version)
 
     update_data = caso_data.model_dump(exclude_unset=True)
     valores_anteriores = {k: getattr(caso, k) for k in update_data}
@@ -301,10 +778,10 @@ def actualizar_caso(
             CatalogoEstados.id_estado == update_data['id_estado']
         ).first()
         
-        if nuevo_estado and nuevo_estado.nombre_estado.lower() == "en proyecto":
+        if nuevo_estado and nuevo_estado.nombre_estado == "en proyecto":
             estado_en_pausa = db.query(CatalogoEstados).filter(
-                func.lower(CatalogoEstados.nombre_estado) == "en pausa",
-                func.lower(CatalogoEstados.tipo_caso) == "proyecto"
+                CatalogoEstados.nombre_estado == "en pausa",
+                CatalogoEstados.tipo_caso == "proyecto"
             ).first()
             
             if estado_en_pausa:
@@ -333,6 +810,9 @@ def actualizar_caso(
 
     try:
         db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise error_conflicto(if_match)
     except IntegrityError as e:
         db.rollback()
         if "foreign key" in str(e.orig).lower():
@@ -343,15 +823,137 @@ def actualizar_caso(
         raise HTTPException(status_code=400, detail=str(e.orig))
 
     caso_actualizado = db.query(Caso).options(
+        undefer_group("detalle"),
         joinedload(Caso.estado),
         joinedload(Caso.emprendedor),
         joinedload(Caso.convocatoria),
         joinedload(Caso.asignaciones).joinedload(Asignacion.usuario)
     ).filter(Caso.id_caso == caso_id).first()
 
+    poner_etag(response, caso_actualizado.version)
     return _serializar_caso_para_response(caso_actualizado)
 
 
+# =============================================================================
+# CAMBIAR ESTADO EN LOTE
+# =============================================================================
+@router.patch("/estado", response_model=CambiarEstadoLoteResponse)
+def cambiar_estado_casos_lote(
+    datos: CambiarEstadoLote,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(require_role(["Admin", "Coordinador"]))
+):
+    """
+    Cambia el estado de varios casos (por `ids` o por `filtros`) en una sola
+    transacción: un UPDATE por conjunto y la auditoría en un INSERT multi-fila.
+
+    Aplica la misma regla que el cambio individual: "en proyecto" convierte
+    los casos a proyecto con estado "en pausa".
+    """
+    nuevo_estado = db.query(CatalogoEstados).filter(
+        CatalogoEstados.nombre_estado == normalizar_estado(datos.nombre_estado)
+    ).first()
+
+    if not nuevo_estado:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Estado '{datos.nombre_estado}' no encontrado"
+        )
+
+    convertir = False
+    if nuevo_estado.nombre_estado == "en proyecto":
+        estado_en_pausa = db.query(CatalogoEstados).filter(
+            CatalogoEstados.nombre_estado == "en pausa",
+            CatalogoEstados.tipo_caso == "proyecto"
+        ).first()
+        if estado_en_pausa:
+            nuevo_estado = estado_en_pausa
+            convertir = True
+
+    # Casos seleccionados con su estado actual (para la auditoría)
+    query = db.query(Caso.id_caso, Caso.id_estado, CatalogoEstados.nombre_estado).outerjoin(
+        CatalogoEstados, CatalogoEstados.id_estado == Caso.id_estado
+    )
+    if datos.ids is not None:
+        ids_pedidos = list(dict.fromkeys(datos.ids))
+        if len(ids_pedidos) > settings.CAMBIO_ESTADO_LOTE_MAX:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Se permiten hasta {settings.CAMBIO_ESTADO_LOTE_MAX} casos por operación"
+            )
+        query = query.filter(Caso.id_caso.in_(ids_pedidos))
+    else:
+        filtros = datos.filtros
+        if filtros.id_estado:
+            query = query.filter(Caso.id_estado == filtros.id_estado)
+        if filtros.id_emprendedor:
+            query = query.filter(Caso.id_emprendedor == filtros.id_emprendedor)
+        if filtros.id_convocatoria:
+            query = query.filter(Caso.id_convocatoria == filtros.id_convocatoria)
+        if filtros.tipo_caso:
+            query = query.filter(CatalogoEstados.tipo_caso == normalizar_estado(filtros.tipo_caso))
+        if filtros.nombre_estado:
+            query = query.filter(CatalogoEstados.nombre_estado == normalizar_estado(filtros.nombre_estado))
+
+    casos = query.limit(settings.CAMBIO_ESTADO_LOTE_MAX + 1).all()
+    if len(casos) > settings.CAMBIO_ESTADO_LOTE_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"El filtro abarca más de {settings.CAMBIO_ESTADO_LOTE_MAX} casos"
+        )
+
+    no_encontrados = []
+    if datos.ids is not None:
+        encontrados = {caso.id_caso for caso in casos}
+        no_encontrados = [id_caso for id_caso in ids_pedidos if id_caso not in encontrados]
+
+    a_cambiar = [caso for caso in casos if caso.id_estado != nuevo_estado.id_estado]
+
+    if a_cambiar:
+        db.query(Caso).filter(
+            Caso.id_caso.in_([caso.id_caso for caso in a_cambiar])
+        ).update(
+            {Caso.id_estado: nuevo_estado.id_estado, Caso.version: Caso.version + 1},
+            synchronize_session=False
+        )
+
+        registros = []
+        for caso in a_cambiar:
+            anterior = caso.nombre_estado or "N/A"
+            if convertir:
+                registros.append({
+                    "accion": "Conversión automática a proyecto",
+                    "valor_anterior": f"Postulación: {anterior}",
+                    "valor_nuevo": f"Proyecto: {nuevo_estado.nombre_estado}",
+                    "id_usuario": current_user.id_usuario,
+                    "id_caso": caso.id_caso,
+                })
+            registros.append({
+                "accion": "Estado actualizado",
+                "valor_anterior": anterior,
+                "valor_nuevo": nuevo_estado.nombre_estado,
+                "id_usuario": current_user.id_usuario,
+                "id_caso": caso.id_caso,
+            })
+        db.execute(insert(Auditoria), registros)
+        eventos_service.encolar_varios(db, "Estado actualizado", [caso.id_caso for caso in a_cambiar])
+
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e.orig))
+
+    return {
+        "id_estado": nuevo_estado.id_estado,
+        "nombre_estado": nuevo_estado.nombre_estado,
+        "actualizados": len(a_cambiar),
+        "sin_cambios": len(casos) - len(a_cambiar),
+        "no_encontrados": no_encontrados,
+        "convertidos_a_proyecto": convertir and bool(a_cambiar),
+    }
+
+
 # =============================================================================
 # CAMBIAR ESTADO
 # =============================================================================
@@ -359,6 +961,8 @@ def actualizar_caso(
 def cambiar_estado_caso(
     caso_id: int,
     nombre_estado: str,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
 ):
@@ -367,23 +971,23 @@ def cambiar_estado_caso(
     
     - **caso_id**: ID del caso a actualizar
     - **nombre_estado**: Nombre del estado (ej: "Aprobado", "Rechazado", "En revisión")
+    - **If-Match** (opcional): ETag del caso; 412 si cambió desde esa lectura
     """
     # Buscar el caso
-    caso = db.query(Caso).options(
-        joinedload(Caso.asignaciones)
-    ).filter(Caso.id_caso == caso_id).first()
+    caso = db.query(Caso).filter(Caso.id_caso == caso_id).first()
 
     if not caso:
         raise HTTPException(status_code=404, detail="Caso no encontrado")
 
     # Verificar permisos de Tutor
-    if current_user.rol.nombre_rol == "Tutor":
-        if not any(a.id_usuario == current_user.id_usuario for a in caso.asignaciones):
-            raise HTTPException(status_code=403, detail="No tienes acceso a este caso")
+    if not puede_ver_caso(db, current_user, caso_id):
+        raise HTTPException(status_code=403, detail="No tienes acceso a este caso")
 
-    # Buscar el estado por nombre (case-insensitive)
+    verificar_if_match(if_match, caso.version)
+
+    # Buscar el estado por nombre (case-insensitive: los nombres se guardan normalizados)
     nuevo_estado = db.query(CatalogoEstados).filter(
-        func.lower(CatalogoEstados.nombre_estado) == nombre_estado.lower()
+        CatalogoEstados.nombre_estado == normalizar_estado(nombre_estado)
     ).first()
 
     if not nuevo_estado:
@@ -398,10 +1002,10 @@ def cambiar_estado_caso(
     ).first()
 
     # Lógica especial: Si se cambia a "en proyecto", convertir a proyecto con estado "en pausa"
-    if nuevo_estado.nombre_estado.lower() == "en proyecto":
+    if nuevo_estado.nombre_estado == "en proyecto":
         estado_en_pausa = db.query(CatalogoEstados).filter(
-            func.lower(CatalogoEstados.nombre_estado) == "en pausa",
-            func.lower(CatalogoEstados.tipo_caso) == "proyecto"
+            CatalogoEstados.nombre_estado == "en pausa",
+            CatalogoEstados.tipo_caso == "proyecto"
         ).first()
         
         if estado_en_pausa:
@@ -430,16 +1034,21 @@ def cambiar_estado_caso(
 
     try:
         db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise error_conflicto(if_match)
     except IntegrityError as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e.orig))
 
     # Obtener el caso actualizado con todas las relaciones
     caso_actualizado = db.query(Caso).options(
+        undefer_group("detalle"),
         joinedload(Caso.estado),
         joinedload(Caso.emprendedor),
         joinedload(Caso.convocatoria),
         joinedload(Caso.asignaciones).joinedload(Asignacion.usuario)
     ).filter(Caso.id_caso == caso_id).first()
 
+    poner_etag(response, caso_actualizado.version)
     return _serializar_caso_para_response(caso_actualizado)
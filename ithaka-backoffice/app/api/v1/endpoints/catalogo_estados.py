@@ -1,10 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 
 from app.api.deps import get_db
-from app.models.catalogo_estados import CatalogoEstados
+from app.models.catalogo_estados import CatalogoEstados, normalizar_estado
 from app.models.usuario import Usuario
 from app.schemas.catalogo_estados import CatalogoEstadosCreate, CatalogoEstadosUpdate, CatalogoEstadosResponse
 from app.core.security import require_role
@@ -24,7 +23,7 @@ def listar_estados(
     query = db.query(CatalogoEstados)
     
     if tipo_caso:
-        query = query.filter(func.lower(CatalogoEstados.tipo_caso) == tipo_caso.lower())
+        query = query.filter(CatalogoEstados.tipo_caso == normalizar_estado(tipo_caso))
     
     estados = query.offset(skip).limit(limit).all()
 
@@ -75,7 +74,14 @@ def crear_estado(
     """Crear estado (Solo Admin)"""
     nuevo_estado = CatalogoEstados(**estado_data.model_dump())
     db.add(nuevo_estado)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Ya existe el estado '{normalizar_estado(estado_data.nombre_estado)}' para {estado_data.tipo_caso}"
+        )
     db.refresh(nuevo_estado)
     
     return nuevo_estado
@@ -102,7 +108,14 @@ def actualizar_estado(
     for campo, valor in estado_data.model_dump(exclude_unset=True).items():
         setattr(estado, campo, valor)
     
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Ya existe un estado con ese nombre para ese tipo de caso"
+        )
     db.refresh(estado)
     
     return estado
@@ -1,51 +1,92 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy.orm import Session, undefer_group
+from sqlalchemy.orm.exc import StaleDataError
 
 # Imports de tu aplicación
-from app.api.deps import get_db
+from app.api.deps import campos_proyectados, get_db, ids_en_lote
 from app.models import Emprendedor
 from app.models.caso import Caso
-from app.models.asignacion import Asignacion
 from app.models.usuario import Usuario
 from app.schemas.emprendedor import EmprendedorCreate, EmprendedorUpdate, EmprendedorResponse
+from app.core.respuestas import ORJSONRespuesta, respuesta_lista, serializador
 from app.core.security import require_role
+from app.core.versionado import (
+    error_conflicto,
+    incrementar_version_casos,
+    no_modificado,
+    poner_etag,
+    respuesta_no_modificada,
+    verificar_if_match,
+)
+from app.services.autorizacion_service import (
+    aplicar_alcance_tutor_emprendedor,
+    es_tutor,
+    tutor_tiene_emprendedor,
+)
+from app.services.proyeccion import columnas_de_modelo, proyectar, respuesta_proyectada
 
 
 router = APIRouter()
 
+_CAMPOS_EMPRENDEDOR = columnas_de_modelo(Emprendedor)
+_serializar_emprendedor = serializador(EmprendedorResponse)
 
-@router.get("/", status_code=status.HTTP_200_OK)
+
+@router.get("/", status_code=status.HTTP_200_OK, response_model=List[EmprendedorResponse])
 def listar_emprendedores(
     skip: int = 0,             
     limit: int = 100,           
+    seleccion: Optional[List[str]] = Depends(campos_proyectados(_CAMPOS_EMPRENDEDOR)),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
 ):
     """Listar emprendedores (Tutor solo ve emprendedores de casos asignados)"""
     
     # Si es Tutor, filtrar solo emprendedores de casos asignados
-    if current_user.rol.nombre_rol == "Tutor":
-        emprendedores = db.query(Emprendedor).join(
-            Caso, Emprendedor.id_emprendedor == Caso.id_emprendedor
-        ).join(
-            Asignacion, Caso.id_caso == Asignacion.id_caso
-        ).filter(
-            Asignacion.id_usuario == current_user.id_usuario
-        ).offset(skip).limit(limit).all()
-    else:
-        emprendedores = db.query(Emprendedor).offset(skip).limit(limit).all()
-    
-    return emprendedores
+    query = aplicar_alcance_tutor_emprendedor(
+        db.query(Emprendedor), current_user, Emprendedor.id_emprendedor
+    )
+
+    if seleccion:
+        return respuesta_proyectada(
+            proyectar(query, _CAMPOS_EMPRENDEDOR, seleccion, skip=skip, limit=limit)
+        )
+
+    return respuesta_lista(map(_serializar_emprendedor, query.offset(skip).limit(limit).all()))
  
 
+@router.get("/batch", status_code=status.HTTP_200_OK, response_model=Dict[int, EmprendedorResponse])
+def obtener_emprendedores_en_lote(
+    ids: List[int] = Depends(ids_en_lote),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
+):
+    """
+    Varios emprendedores por ID (`?ids=1,2,3`), indexados por ID.
+
+    Los IDs inexistentes o fuera del alcance (Tutor: emprendedores de casos
+    asignados) no aparecen en la respuesta.
+    """
+    emprendedores = aplicar_alcance_tutor_emprendedor(
+        db.query(Emprendedor), current_user, Emprendedor.id_emprendedor
+    ).filter(Emprendedor.id_emprendedor.in_(ids)).all()
+
+    return ORJSONRespuesta(content={
+        emprendedor.id_emprendedor: _serializar_emprendedor(emprendedor)
+        for emprendedor in emprendedores
+    })
+
+
 @router.get("/{emprendedor_id}", status_code=status.HTTP_200_OK)
 def obtener_emprendedor(
     emprendedor_id: int,  
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
 ):
-    """Obtener emprendedor (Tutor solo si tiene caso asignado)"""
+    """Obtener emprendedor (Tutor solo si tiene caso asignado). Con ETag / 304."""
     
     emprendedor = db.query(Emprendedor).filter(
         Emprendedor.id_emprendedor == emprendedor_id
@@ -58,20 +99,17 @@ def obtener_emprendedor(
         )
     
     # Si es Tutor, verificar que tenga un caso asignado con este emprendedor
-    if current_user.rol.nombre_rol == "Tutor":
-        tiene_acceso = db.query(Asignacion).join(
-            Caso, Asignacion.id_caso == Caso.id_caso
-        ).filter(
-            Caso.id_emprendedor == emprendedor_id,
-            Asignacion.id_usuario == current_user.id_usuario
-        ).first()
-        
-        if not tiene_acceso:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="No tienes acceso a este emprendedor"
-            )
+    if es_tutor(current_user) and not tutor_tiene_emprendedor(
+        db, current_user.id_usuario, emprendedor_id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="No tienes acceso a este emprendedor"
+        )
     
+    if no_modificado(if_none_match, emprendedor.version):
+        return respuesta_no_modificada(emprendedor.version)
+    poner_etag(response, emprendedor.version)
     return emprendedor
 
 
@@ -94,10 +132,12 @@ def crear_emprendedor(
 def actualizar_emprendedor(
     emprendedor_id: int,
     emprendedor_data: EmprendedorUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(require_role(["Admin"]))
 ):
-    """Actualizar emprendedor (Solo Admin)"""
+    """Actualizar emprendedor (Solo Admin). Con `If-Match`: 412 si cambió."""
     
     emprendedor = db.query(Emprendedor).filter(
         Emprendedor.id_emprendedor == emprendedor_id
@@ -109,12 +149,23 @@ def actualizar_emprendedor(
             detail=f"Emprendedor con ID {emprendedor_id} no encontrado"
         )
     
+    verificar_if_match(if_match, emprendedor.version)
+
     update_data = emprendedor_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(emprendedor, field, value)
-    
-    db.commit()
+
+    # El nombre se muestra en los casos: cambia su ETag
+    if {"nombre", "apellido"} & update_data.keys():
+        incrementar_version_casos(db, Caso.id_emprendedor == emprendedor_id)
+
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise error_conflicto(if_match)
     db.refresh(emprendedor)
+    poner_etag(response, emprendedor.version)
     return emprendedor
 
 # ============================================================================
@@ -168,6 +219,8 @@ def obtener_casos_emprendedor(
     if not emprendedor:
         raise HTTPException(status_code=404, detail="Emprendedor no encontrado")
     
-    return emprendedor.casos
+    return db.query(Caso).options(undefer_group("detalle")).filter(
+        Caso.id_emprendedor == emprendedor_id
+    ).all()
 
 
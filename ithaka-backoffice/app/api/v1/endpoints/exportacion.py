@@ -0,0 +1,194 @@
+"""
+Endpoints EXPORTACION
+---------------------
+Exportaciones de casos en segundo plano (para exports grandes que no
+entran en el timeout del ingress). Ver app/services/exportacion_service.py.
+
+Endpoints:
+- POST /api/v1/exportaciones - Crear (o reutilizar) un trabajo
+- GET /api/v1/exportaciones/{id} - Estado y progreso
+- GET /api/v1/exportaciones/{id}/descarga - Descargar (Range / ETag)
+
+Permisos: Admin, Coordinador y Tutor (Tutor solo exporta sus casos asignados
+y solo ve los trabajos creados con ese alcance).
+"""
+
+import os
+import re
+from typing import Iterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.core.security import require_role
+from app.models.usuario import Usuario
+from app.schemas.exportacion import ExportacionCreate, ExportacionResponse
+from app.services import exportacion_service
+from app.services.chatbot_filtros import parsear_filtros_chatbot
+from app.services.export_service import ExportService
+
+router = APIRouter()
+
+_RANGO = re.compile(r"^bytes=(\d*)-(\d*)$")
+_TAMANO_BLOQUE = 64 * 1024
+
+
+def _respuesta(trabajo, request: Request) -> ExportacionResponse:
+    url_descarga = None
+    if trabajo.estado == exportacion_service.COMPLETADO:
+        url_descarga = request.url_for("descargar_exportacion", id_trabajo=trabajo.id_trabajo).path
+    return ExportacionResponse(
+        id_trabajo=trabajo.id_trabajo,
+        estado=trabajo.estado,
+        formato=trabajo.formato,
+        procesados=trabajo.procesados,
+        total=trabajo.total,
+        progreso=trabajo.progreso,
+        creado=trabajo.creado,
+        finalizado=trabajo.finalizado,
+        tamano=trabajo.tamano,
+        error=trabajo.error,
+        url_descarga=url_descarga,
+    )
+
+
+def _obtener_o_404(id_trabajo: str, current_user: Usuario):
+    trabajo = exportacion_service.obtener_trabajo(id_trabajo, current_user)
+    if trabajo is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Exportación no encontrada o vencida"
+        )
+    return trabajo
+
+
+def _parsear_rango(cabecera: str, tamano: int) -> Optional[tuple[int, int]]:
+    """
+    Interpreta un `Range: bytes=...` de un solo rango -> (inicio, fin) inclusivo.
+
+    Devuelve None si la cabecera no es un rango simple (se responde el archivo
+    completo). Lanza 416 si el rango no se puede satisfacer.
+    """
+    coincidencia = _RANGO.match(cabecera.strip())
+    if not coincidencia or coincidencia.groups() == ("", ""):
+        return None
+
+    desde, hasta = coincidencia.groups()
+    if desde == "":
+        # Sufijo: últimos N bytes
+        inicio, fin = max(tamano - int(hasta), 0), tamano - 1
+    else:
+        inicio = int(desde)
+        fin = min(int(hasta), tamano - 1) if hasta else tamano - 1
+
+    if inicio >= tamano or inicio > fin:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Rango no satisfacible",
+            headers={"Content-Range": f"bytes */{tamano}"}
+        )
+    return inicio, fin
+
+
+def _leer_archivo(ruta: str, inicio: int, fin: int) -> Iterator[bytes]:
+    with open(ruta, "rb") as archivo:
+        archivo.seek(inicio)
+        restante = fin - inicio + 1
+        while restante > 0:
+            bloque = archivo.read(min(_TAMANO_BLOQUE, restante))
+            if not bloque:
+                break
+            restante -= len(bloque)
+            yield bloque
+
+
+@router.post("/", response_model=ExportacionResponse, status_code=status.HTTP_202_ACCEPTED)
+def crear_exportacion(
+    datos: ExportacionCreate,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
+):
+    """Encola la exportación (o devuelve la equivalente ya existente)."""
+    try:
+        filtro_chatbot = parsear_filtros_chatbot(datos.chatbot_contiene, datos.chatbot)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    filtros = datos.model_dump(include={
+        "id_estado", "tipo_caso", "nombre_estado", "id_emprendedor", "id_convocatoria", "id_tutor"
+    })
+    filtros["filtro_chatbot"] = filtro_chatbot
+
+    trabajo = exportacion_service.crear_trabajo(
+        db, current_user, datos.formato, filtros, hojas=datos.hojas
+    )
+    return _respuesta(trabajo, request)
+
+
+@router.get("/{id_trabajo}", response_model=ExportacionResponse)
+def obtener_exportacion(
+    id_trabajo: str,
+    request: Request,
+    current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
+):
+    """Estado y progreso del trabajo."""
+    return _respuesta(_obtener_o_404(id_trabajo, current_user), request)
+
+
+@router.get("/{id_trabajo}/descarga", name="descargar_exportacion")
+def descargar_exportacion(
+    id_trabajo: str,
+    request: Request,
+    current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
+):
+    """
+    Descarga el archivo generado. Soporta `If-None-Match` (304), `Range` de un
+    solo rango (206) e `If-Range`, para reanudar descargas interrumpidas.
+    """
+    trabajo = _obtener_o_404(id_trabajo, current_user)
+    if trabajo.estado != exportacion_service.COMPLETADO or not os.path.exists(trabajo.ruta or ""):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"La exportación no está lista (estado: {trabajo.estado})"
+        )
+
+    media_type, extension = exportacion_service.FORMATOS[trabajo.formato]
+    nombre_archivo = ExportService.generar_nombre_archivo("casos", extension)
+    cabeceras = {
+        "ETag": trabajo.etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{nombre_archivo}"',
+    }
+
+    si_no_coincide = request.headers.get("if-none-match")
+    if si_no_coincide and trabajo.etag in {valor.strip() for valor in si_no_coincide.split(",")}:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": trabajo.etag})
+
+    tamano = trabajo.tamano
+    rango = None
+    cabecera_rango = request.headers.get("range")
+    si_rango = request.headers.get("if-range")
+    if cabecera_rango and (si_rango is None or si_rango.strip() == trabajo.etag):
+        rango = _parsear_rango(cabecera_rango, tamano)
+
+    if rango is None:
+        return StreamingResponse(
+            _leer_archivo(trabajo.ruta, 0, tamano - 1),
+            media_type=media_type,
+            headers={**cabeceras, "Content-Length": str(tamano)},
+        )
+
+    inicio, fin = rango
+    return StreamingResponse(
+        _leer_archivo(trabajo.ruta, inicio, fin),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers={
+            **cabeceras,
+            "Content-Range": f"bytes {inicio}-{fin}/{tamano}",
+            "Content-Length": str(fin - inicio + 1),
+        },
+    )
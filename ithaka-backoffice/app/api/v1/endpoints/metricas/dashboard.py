@@ -1,24 +1,33 @@
+from datetime import date, datetime, timedelta
 from typing import Optional, List
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+from sqlalchemy import distinct, func, case
 
 from app.api.deps import get_db
 from app.models.caso import Caso
-from app.models.catalogo_estados import CatalogoEstados
+from app.models.catalogo_estados import ESTADOS_CERRADOS, CatalogoEstados, normalizar_estado
 from app.models.apoyo import Apoyo
 from app.models.catalogo_apoyo import CatalogoApoyo
 from app.models.emprendedor import Emprendedor
 from app.models.asignacion import Asignacion
 from app.models.usuario import Usuario
 from app.models.rol import Rol 
+from app.models.nota import Nota
+from app.core.compresion import metricas_compresion
+from app.core.security import require_role
+from app.services import funnel_service, metricas_cache, metricas_series
 
 
 from app.schemas.metricas import (
+    CompresionMetricasResponse,
     DashboardMetricasResponse,
+    FunnelMetricasResponse,
     EstadoDistribucion,
     ApoyoDistribucion,
+    SeriesMetricasResponse,
     TotalesDashboard,
+    TutoresMetricasResponse,
 )
 
 router = APIRouter()
@@ -28,16 +37,17 @@ PROYECTO_ORDER = ["recibida", "en evaluación", "incubado", "proyecto activo", "
 
 
 def _order_expr_por_tipo(tipo_caso: Optional[str]):
-    if tipo_caso and tipo_caso.lower() == "postulacion":
+    tipo_caso = normalizar_estado(tipo_caso)
+    if tipo_caso == "postulacion":
         return case(
             {name: idx for idx, name in enumerate(POSTULACION_ORDER)},
-            value=func.lower(CatalogoEstados.nombre_estado),
+            value=CatalogoEstados.nombre_estado,
             else_=999,
         )
-    if tipo_caso and tipo_caso.lower() == "proyecto":
+    if tipo_caso == "proyecto":
         return case(
             {name: idx for idx, name in enumerate(PROYECTO_ORDER)},
-            value=func.lower(CatalogoEstados.nombre_estado),
+            value=CatalogoEstados.nombre_estado,
             else_=999,
         )
     return CatalogoEstados.id_estado.asc()
@@ -54,7 +64,7 @@ def _distribucion_por_estado(db: Session, tipo_caso: str, id_convocatoria: Optio
         )
         .select_from(Caso)
         .join(CatalogoEstados, Caso.id_estado == CatalogoEstados.id_estado)
-        .filter(func.lower(CatalogoEstados.tipo_caso) == tipo_caso.lower())
+        .filter(CatalogoEstados.tipo_caso == normalizar_estado(tipo_caso))
     )
 
     if id_convocatoria is not None:
@@ -91,7 +101,7 @@ def _distribucion_apoyos(db: Session, id_convocatoria: Optional[int]) -> List[Ap
         .join(CatalogoApoyo, Apoyo.id_catalogo_apoyo == CatalogoApoyo.id_catalogo_apoyo)
         .join(Caso, Apoyo.id_caso == Caso.id_caso)
         .join(CatalogoEstados, Caso.id_estado == CatalogoEstados.id_estado)
-        .filter(func.lower(CatalogoEstados.tipo_caso) == "proyecto")
+        .filter(CatalogoEstados.tipo_caso == "proyecto")
     )
 
     if id_convocatoria is not None:
@@ -124,7 +134,7 @@ def dashboard_metricas(
         db.query(func.count(Caso.id_caso))
         .select_from(Caso)
         .join(CatalogoEstados, Caso.id_estado == CatalogoEstados.id_estado)
-        .filter(func.lower(CatalogoEstados.tipo_caso) == "postulacion")
+        .filter(CatalogoEstados.tipo_caso == "postulacion")
     )
     if id_convocatoria is not None:
         q_post = q_post.filter(Caso.id_convocatoria == id_convocatoria)
@@ -134,7 +144,7 @@ def dashboard_metricas(
         db.query(func.count(Caso.id_caso))
         .select_from(Caso)
         .join(CatalogoEstados, Caso.id_estado == CatalogoEstados.id_estado)
-        .filter(func.lower(CatalogoEstados.tipo_caso) == "proyecto")
+        .filter(CatalogoEstados.tipo_caso == "proyecto")
     )
     if id_convocatoria is not None:
         q_proy = q_proy.filter(Caso.id_convocatoria == id_convocatoria)
@@ -144,8 +154,8 @@ def dashboard_metricas(
         db.query(func.count(Caso.id_caso))
         .select_from(Caso)
         .join(CatalogoEstados, Caso.id_estado == CatalogoEstados.id_estado)
-        .filter(func.lower(CatalogoEstados.tipo_caso) == "proyecto")
-        .filter(func.lower(CatalogoEstados.nombre_estado) == "incubado")
+        .filter(CatalogoEstados.tipo_caso == "proyecto")
+        .filter(CatalogoEstados.nombre_estado == "incubado")
     )
     if id_convocatoria is not None:
         q_inc = q_inc.filter(Caso.id_convocatoria == id_convocatoria)
@@ -182,4 +192,262 @@ def dashboard_metricas(
         "proyectos_por_estado": proyectos_por_estado,
         "postulaciones_por_estado": postulaciones_por_estado,
         "distribucion_apoyos": distribucion_apoyos,
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/compresion", response_model=CompresionMetricasResponse)
+def metricas_de_compresion(
+    current_user: Usuario = Depends(require_role(["Admin"]))
+):
+    """Bytes, ratio y tiempo de compresión acumulados desde el arranque (por codificación)."""
+    return {"codificaciones": metricas_compresion.resumen()}
+
+
+# ============================================================
+# CARTERA DE TUTORES
+# ============================================================
+_DEPENDENCIAS_TUTORES = (Usuario, Asignacion, Caso, CatalogoEstados, Nota)
+
+
+def _cartera_tutores(db: Session, dias: int, id_convocatoria: Optional[int]) -> list[dict]:
+    """Cuatro agregados (tutores, casos por estado, notas recientes, cartera activa)."""
+    tutores = {
+        r.id_usuario: {
+            "id_usuario": r.id_usuario,
+            "nombre": f"{r.nombre} {r.apellido or ''}".strip(),
+            "email": r.email,
+            "total_casos": 0,
+            "casos_activos": 0,
+            "notas_recientes": 0,
+            "por_estado": [],
+            "casos": [],
+        }
+        for r in (
+            db.query(Usuario.id_usuario, Usuario.nombre, Usuario.apellido, Usuario.email)
+            .join(Rol, Usuario.id_rol == Rol.id_rol)
+            .filter(Rol.nombre_rol == "Tutor", Usuario.activo.is_(True))
+            .order_by(Usuario.id_usuario)
+        )
+    }
+    if not tutores:
+        return []
+
+    q_estados = (
+        db.query(
+            Asignacion.id_usuario,
+            CatalogoEstados.tipo_caso,
+            CatalogoEstados.nombre_estado,
+            func.count(distinct(Asignacion.id_caso)).label("cantidad"),
+        )
+        .join(Caso, Asignacion.id_caso == Caso.id_caso)
+        .join(CatalogoEstados, Caso.id_estado == CatalogoEstados.id_estado)
+    )
+    if id_convocatoria is not None:
+        q_estados = q_estados.filter(Caso.id_convocatoria == id_convocatoria)
+    for r in q_estados.group_by(
+        Asignacion.id_usuario, CatalogoEstados.tipo_caso, CatalogoEstados.nombre_estado
+    ).order_by(Asignacion.id_usuario, CatalogoEstados.tipo_caso, CatalogoEstados.nombre_estado):
+        tutor = tutores.get(r.id_usuario)
+        if tutor is None:
+            continue
+        tutor["por_estado"].append(
+            {"tipo_caso": r.tipo_caso, "nombre_estado": r.nombre_estado, "cantidad": r.cantidad}
+        )
+        tutor["total_casos"] += r.cantidad
+        if r.nombre_estado not in ESTADOS_CERRADOS:
+            tutor["casos_activos"] += r.cantidad
+
+    q_notas = (
+        db.query(Nota.id_usuario, func.count(Nota.id_nota).label("cantidad"))
+        .filter(Nota.fecha >= datetime.utcnow() - timedelta(days=dias))
+    )
+    if id_convocatoria is not None:
+        q_notas = q_notas.join(Caso, Nota.id_caso == Caso.id_caso).filter(
+            Caso.id_convocatoria == id_convocatoria
+        )
+    for r in q_notas.group_by(Nota.id_usuario):
+        if r.id_usuario in tutores:
+            tutores[r.id_usuario]["notas_recientes"] = r.cantidad
+
+    ultima_nota = (
+        db.query(Nota.id_caso, func.max(Nota.fecha).label("ultima"))
+        .group_by(Nota.id_caso)
+        .subquery()
+    )
+    q_cartera = (
+        db.query(
+            Asignacion.id_usuario,
+            Caso.id_caso,
+            Caso.nombre_caso,
+            CatalogoEstados.nombre_estado,
+            ultima_nota.c.ultima,
+        )
+        .join(Caso, Asignacion.id_caso == Caso.id_caso)
+        .join(CatalogoEstados, Caso.id_estado == CatalogoEstados.id_estado)
+        .outerjoin(ultima_nota, ultima_nota.c.id_caso == Caso.id_caso)
+        .filter(CatalogoEstados.nombre_estado.notin_(ESTADOS_CERRADOS))
+    )
+    if id_convocatoria is not None:
+        q_cartera = q_cartera.filter(Caso.id_convocatoria == id_convocatoria)
+    for r in q_cartera.distinct().order_by(Asignacion.id_usuario, Caso.id_caso):
+        if r.id_usuario in tutores:
+            tutores[r.id_usuario]["casos"].append({
+                "id_caso": r.id_caso,
+                "nombre_caso": r.nombre_caso,
+                "nombre_estado": r.nombre_estado,
+                "ultima_nota": r.ultima,
+            })
+
+    return list(tutores.values())
+
+
+@router.get("/tutores", response_model=TutoresMetricasResponse)
+def metricas_tutores(
+    dias: int = Query(30, ge=1, le=365, description="Ventana (en días) para contar notas recientes"),
+    id_convocatoria: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(require_role(["Admin", "Coordinador"]))
+):
+    """
+    Carga de cada tutor: casos por tipo/estado, notas escritas en los últimos
+    `dias` y, por caso activo, días desde la última nota (más desatendidos
+    primero). Cacheado hasta la próxima escritura en las tablas involucradas.
+    """
+    cartera = metricas_cache.obtener(
+        ("tutores", dias, id_convocatoria),
+        _DEPENDENCIAS_TUTORES,
+        lambda: _cartera_tutores(db, dias, id_convocatoria),
+    )
+
+    ahora = datetime.utcnow()
+    tutores = []
+    for tutor in cartera:
+        casos = [
+            {**c, "dias_sin_nota": (ahora - c["ultima_nota"]).days if c["ultima_nota"] else None}
+            for c in tutor["casos"]
+        ]
+        # Sin notas primero, luego los de nota más antigua
+        casos.sort(key=lambda c: (c["ultima_nota"] is not None, c["ultima_nota"] or ahora, c["id_caso"]))
+        tutores.append({**tutor, "casos": casos})
+
+    return {
+        "filtros": {"dias": dias, "id_convocatoria": id_convocatoria},
+        "tutores": tutores,
+    }
+
+
+# ============================================================
+# SERIES TEMPORALES
+# ============================================================
+# Máximo de períodos por pedido (un año de días)
+_MAX_PERIODOS_SERIE = 366
+
+
+@router.get("/series", response_model=SeriesMetricasResponse)
+def metricas_series_temporales(
+    granularidad: str = Query("semana", pattern="^(dia|semana|mes)$"),
+    desde: Optional[date] = Query(None, description="Fecha inicial (por defecto, últimos 30 días / 12 semanas / 12 meses)"),
+    id_convocatoria: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(require_role(["Admin", "Coordinador"]))
+):
+    """
+    Casos nuevos, cambios de estado y notas por día, semana (ISO, desde el
+    lunes) o mes, hasta el período en curso. Los períodos cerrados se
+    cachean; solo se recalcula el actual.
+    """
+    hoy = datetime.utcnow().date()
+    actual = metricas_series.inicio_periodo(hoy, granularidad)
+    if desde is None:
+        inicio = metricas_series.retroceder(
+            actual, granularidad, metricas_series.PERIODOS_POR_DEFECTO[granularidad] - 1
+        )
+    else:
+        inicio = metricas_series.inicio_periodo(min(desde, hoy), granularidad)
+
+    periodos = []
+    periodo = inicio
+    while periodo <= actual:
+        periodos.append(periodo)
+        if len(periodos) > _MAX_PERIODOS_SERIE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"El rango abarca más de {_MAX_PERIODOS_SERIE} períodos; use una granularidad mayor"
+            )
+        periodo = metricas_series.siguiente_periodo(periodo, granularidad)
+
+    conteos = {
+        nombre: metricas_series.serie(db, nombre, granularidad, id_convocatoria, inicio, hoy=hoy)
+        for nombre in metricas_series.SERIES
+    }
+
+    return {
+        "granularidad": granularidad,
+        "filtros": {"desde": inicio, "id_convocatoria": id_convocatoria},
+        "puntos": [
+            {"periodo": p, **{nombre: conteos[nombre].get(p, 0) for nombre in metricas_series.SERIES}}
+            for p in periodos
+        ],
+    }
+
+
+# ============================================================
+# EMBUDO DE ESTADOS (desde la auditoría)
+# ============================================================
+@router.get("/funnel", response_model=FunnelMetricasResponse)
+def metricas_funnel(
+    id_convocatoria: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(require_role(["Admin", "Coordinador"]))
+):
+    """
+    Por estado: casos que entraron y salieron, a qué estados pasaron (tasa de
+    conversión) y tiempo promedio de permanencia. Se calcula de forma
+    incremental desde la auditoría (ver app/services/funnel_service.py).
+    """
+    checkpoint = funnel_service.actualizar(db)
+    datos = funnel_service.resumen(id_convocatoria)
+    catalogo = {
+        fila.id_estado: fila
+        for fila in db.query(CatalogoEstados.id_estado, CatalogoEstados.nombre_estado, CatalogoEstados.tipo_caso)
+    }
+
+    def _describir(id_estado: int) -> dict:
+        fila = catalogo.get(id_estado)
+        return {
+            "id_estado": id_estado,
+            "nombre_estado": fila.nombre_estado if fila else f"estado {id_estado} (eliminado)",
+            "tipo_caso": fila.tipo_caso if fila else None,
+        }
+
+    estados = []
+    for id_estado, agregado in datos["estados"].items():
+        estados.append({
+            **_describir(id_estado),
+            "entradas": agregado.entradas,
+            "salidas": agregado.salidas,
+            "casos_actuales": datos["actuales"].get(id_estado, 0),
+            "dias_promedio": (
+                round(agregado.segundos / agregado.estadias / 86400, 2) if agregado.estadias else None
+            ),
+            "transiciones": [
+                {
+                    "id_estado": destino["id_estado"],
+                    "destino": destino["nombre_estado"],
+                    "tipo_caso": destino["tipo_caso"],
+                    "cantidad": cantidad,
+                    "porcentaje": round(cantidad / agregado.salidas * 100.0, 2),
+                }
+                for destino, cantidad in (
+                    (_describir(id_destino), cantidad)
+                    for id_destino, cantidad in agregado.transiciones.most_common()
+                )
+            ],
+        })
+    estados.sort(key=lambda e: (-e["entradas"], e["tipo_caso"] or "", e["nombre_estado"]))
+
+    return {
+        "filtros": {"id_convocatoria": id_convocatoria},
+        "ultimo_id_auditoria": checkpoint,
+        "estados": estados,
+    }
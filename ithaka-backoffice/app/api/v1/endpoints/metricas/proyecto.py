@@ -1,35 +1,159 @@
+from datetime import date
+from typing import Optional
+
 from fastapi import APIRouter, Depends
+from sqlalchemy import and_, case, distinct, func
 from sqlalchemy.orm import Session
+
 from app.api.deps import get_db
+from app.core.security import require_role
+from app.models.apoyo import Apoyo
 from app.models.caso import Caso
+from app.models.catalogo_apoyo import CatalogoApoyo
+from app.models.catalogo_estados import CatalogoEstados
+from app.models.convocatoria import Convocatoria
+from app.models.programa import Programa
 from app.models.usuario import Usuario
-from app.core.security import require_role 
+from app.schemas.metricas import ProyectosMetricasResponse
+from app.services import metricas_cache
 
 router = APIRouter()
 
-@router.get("/", summary="Listar métricas de proyectos")
+_DEPENDENCIAS = (Caso, CatalogoEstados, Apoyo, CatalogoApoyo, Programa, Convocatoria)
+
+
+def _es_proyecto():
+    return CatalogoEstados.tipo_caso == "proyecto"
+
+
+def _apoyo_activo(hoy: date):
+    return and_(
+        Apoyo.fecha_inicio.isnot(None),
+        Apoyo.fecha_inicio <= hoy,
+        (Apoyo.fecha_fin.is_(None)) | (Apoyo.fecha_fin >= hoy),
+    )
+
+
+def _apoyos_de_proyectos(query, id_convocatoria: Optional[int]):
+    """Restringe una consulta sobre Apoyo a apoyos de casos tipo proyecto."""
+    query = (
+        query.join(Caso, Apoyo.id_caso == Caso.id_caso)
+        .join(CatalogoEstados, Caso.id_estado == CatalogoEstados.id_estado)
+        .filter(_es_proyecto())
+    )
+    if id_convocatoria is not None:
+        query = query.filter(Caso.id_convocatoria == id_convocatoria)
+    return query
+
+
+def _calcular(db: Session, id_convocatoria: Optional[int], hoy: date) -> dict:
+    activo = case((_apoyo_activo(hoy), 1), else_=0)
+
+    # Proyectos por convocatoria y estado
+    q_estados = (
+        db.query(
+            Caso.id_convocatoria,
+            Convocatoria.nombre.label("convocatoria"),
+            CatalogoEstados.nombre_estado,
+            func.count(Caso.id_caso).label("cantidad"),
+        )
+        .join(CatalogoEstados, Caso.id_estado == CatalogoEstados.id_estado)
+        .outerjoin(Convocatoria, Caso.id_convocatoria == Convocatoria.id_convocatoria)
+        .filter(_es_proyecto())
+    )
+    if id_convocatoria is not None:
+        q_estados = q_estados.filter(Caso.id_convocatoria == id_convocatoria)
+    por_estado = [
+        {
+            "id_convocatoria": r.id_convocatoria,
+            "convocatoria": r.convocatoria,
+            "nombre_estado": r.nombre_estado,
+            "cantidad": r.cantidad,
+        }
+        for r in q_estados.group_by(
+            Caso.id_convocatoria, Convocatoria.nombre, CatalogoEstados.nombre_estado
+        ).order_by(Caso.id_convocatoria, CatalogoEstados.nombre_estado)
+    ]
+
+    # Apoyos por tipo (catálogo)
+    q_apoyos = _apoyos_de_proyectos(
+        db.query(
+            CatalogoApoyo.nombre.label("apoyo"),
+            func.count(Apoyo.id_apoyo).label("cantidad"),
+            func.count(distinct(Apoyo.id_caso)).label("proyectos"),
+            func.sum(activo).label("activos"),
+        ).select_from(Apoyo).join(CatalogoApoyo, Apoyo.id_catalogo_apoyo == CatalogoApoyo.id_catalogo_apoyo),
+        id_convocatoria,
+    )
+    apoyos = [
+        {"apoyo": r.apoyo, "cantidad": r.cantidad, "proyectos": r.proyectos, "activos": int(r.activos or 0)}
+        for r in q_apoyos.group_by(CatalogoApoyo.nombre).order_by(func.count(Apoyo.id_apoyo).desc())
+    ]
+
+    # Programas, con el rango de fechas de sus apoyos vigentes
+    q_programas = _apoyos_de_proyectos(
+        db.query(
+            Programa.id_programa,
+            Programa.nombre,
+            func.count(distinct(Apoyo.id_caso)).label("proyectos"),
+            func.count(Apoyo.id_apoyo).label("apoyos"),
+            func.sum(activo).label("activos"),
+            func.min(case((_apoyo_activo(hoy), Apoyo.fecha_inicio))).label("inicio_activos"),
+            func.max(case((_apoyo_activo(hoy), Apoyo.fecha_fin))).label("fin_activos"),
+        ).select_from(Apoyo).join(Programa, Apoyo.id_programa == Programa.id_programa),
+        id_convocatoria,
+    )
+    programas = [
+        {
+            "id_programa": r.id_programa,
+            "nombre": r.nombre,
+            "proyectos": r.proyectos,
+            "apoyos": r.apoyos,
+            "apoyos_activos": int(r.activos or 0),
+            "inicio_activos": r.inicio_activos,
+            "fin_activos": r.fin_activos,
+        }
+        for r in q_programas.group_by(Programa.id_programa, Programa.nombre).order_by(Programa.nombre)
+    ]
+
+    # Proyectos con al menos un apoyo (para el promedio de apoyos por proyecto)
+    con_apoyo = _apoyos_de_proyectos(
+        db.query(func.count(distinct(Apoyo.id_caso))).select_from(Apoyo), id_convocatoria
+    ).scalar() or 0
+
+    total_proyectos = sum(e["cantidad"] for e in por_estado)
+    total_apoyos = sum(a["cantidad"] for a in apoyos)
+    return {
+        "totales": {
+            "proyectos": total_proyectos,
+            "proyectos_con_apoyo": con_apoyo,
+            "apoyos": total_apoyos,
+            "apoyos_activos": sum(a["activos"] for a in apoyos),
+            "apoyos_por_proyecto": round(total_apoyos / total_proyectos, 2) if total_proyectos else 0.0,
+        },
+        "por_estado": por_estado,
+        "apoyos": apoyos,
+        "programas": programas,
+    }
+
+
+@router.get("/", response_model=ProyectosMetricasResponse, summary="Métricas de proyectos")
 def listar_metricas_proyecto(
+    id_convocatoria: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
 ):
     """
-    Endpoint para listar métricas básicas de proyectos.
-    Devuelve el total de casos y su distribución por estado.
+    Métricas de proyectos (casos tipo proyecto): por convocatoria y estado,
+    apoyos por tipo, programas y apoyos vigentes (con su rango de fechas).
+
+    Cada sección es una consulta agrupada; el resultado se cachea por
+    convocatoria hasta la próxima escritura en las tablas involucradas.
     """
-    # Total de casos
-    total_casos = db.query(Caso).count()
-
-    # Distribución por estado
-    distribucion_estados = (
-        db.query(Caso.id_estado, func.count(Caso.id_caso).label("cantidad"))
-        .group_by(Caso.id_estado)
-        .all()
+    hoy = date.today()
+    datos = metricas_cache.obtener(
+        ("proyectos", id_convocatoria, hoy),
+        _DEPENDENCIAS,
+        lambda: _calcular(db, id_convocatoria, hoy),
     )
-
-    return {
-        "total_casos": total_casos,
-        "distribucion_estados": [
-            {"id_estado": estado.id_estado, "cantidad": estado.cantidad}
-            for estado in distribucion_estados
-        ],
-    }
\ No newline at end of file
+    return {"filtros": {"id_convocatoria": id_convocatoria}, **datos}
@@ -13,27 +13,33 @@ Contexto funcional:
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.api.deps import get_db
+from app.api.deps import campos_proyectados, get_db
+from app.core.respuestas import respuesta_lista, serializador
 from app.core.security import require_role
-from app.models.asignacion import Asignacion
+from app.core.versionado import (
+    error_conflicto,
+    no_modificado,
+    poner_etag,
+    respuesta_no_modificada,
+    verificar_if_match,
+)
 from app.models.nota import Nota
 from app.models.usuario import Usuario
 from app.schemas.nota import NotaCreate, NotaResponse, NotaUpdate
 from app.services.auditoria_service import registrar_auditoria_caso
+from app.services.autorizacion_service import aplicar_alcance_tutor, es_tutor, tutor_tiene_caso
+from app.services.proyeccion import columnas_de_modelo, proyectar, respuesta_proyectada
 
 router = APIRouter()
 
-_TUTOR_ROLE = "Tutor"
 _ALLOWED_ROLES = ["Admin", "Coordinador", "Tutor"]
-
-
-def _es_tutor(current_user: Usuario) -> bool:
-    """Determina si el usuario autenticado tiene rol Tutor."""
-    return current_user.rol and current_user.rol.nombre_rol == _TUTOR_ROLE
+_CAMPOS_NOTA = columnas_de_modelo(Nota)
+_serializar_nota = serializador(NotaResponse)
 
 
 def _obtener_nota_or_404(db: Session, nota_id: int) -> Nota:
@@ -47,15 +53,6 @@ def _obtener_nota_or_404(db: Session, nota_id: int) -> Nota:
     return nota
 
 
-def _tutor_tiene_caso_asignado(db: Session, tutor_id: int, caso_id: int) -> bool:
-    """Verifica si el Tutor esta asignado al caso indicado."""
-    asignacion = db.query(Asignacion.id_asignacion).filter(
-        Asignacion.id_caso == caso_id,
-        Asignacion.id_usuario == tutor_id,
-    ).first()
-    return asignacion is not None
-
-
 def _validar_tipo_nota(tipo_nota: Optional[str]) -> None:
     """Valida que tipo_nota tenga contenido util (no vacio)."""
     if tipo_nota is not None and not tipo_nota.strip():
@@ -71,6 +68,7 @@ def listar_notas(
     limit: int = 100,
     id_caso: Optional[int] = None,
     id_usuario: Optional[int] = None,
+    seleccion: Optional[list[str]] = Depends(campos_proyectados(_CAMPOS_NOTA)),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(require_role(_ALLOWED_ROLES)),
 ):
@@ -84,10 +82,7 @@ def listar_notas(
     query = db.query(Nota)
 
     # 2) Si es Tutor, se restringe a sus casos asignados.
-    if _es_tutor(current_user):
-        query = query.join(Asignacion, Nota.id_caso == Asignacion.id_caso).filter(
-            Asignacion.id_usuario == current_user.id_usuario
-        )
+    query = aplicar_alcance_tutor(query, current_user, Nota.id_caso)
 
     # 3) Se aplican filtros opcionales enviados por query params.
     if id_caso is not None:
@@ -97,12 +92,22 @@ def listar_notas(
         query = query.filter(Nota.id_usuario == id_usuario)
 
     # Orden cronológico descendente + paginación.
-    return query.order_by(Nota.fecha.desc()).offset(skip).limit(limit).all()
+    query = query.order_by(Nota.fecha.desc())
+
+    # 4) Proyeccion opcional (?fields=): solo las columnas pedidas.
+    if seleccion:
+        return respuesta_proyectada(
+            proyectar(query, _CAMPOS_NOTA, seleccion, skip=skip, limit=limit)
+        )
+
+    return respuesta_lista(map(_serializar_nota, query.offset(skip).limit(limit).all()))
 
 
 @router.get("/{nota_id}", status_code=status.HTTP_200_OK, response_model=NotaResponse)
 def obtener_nota(
     nota_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(require_role(_ALLOWED_ROLES)),
 ):
@@ -111,12 +116,14 @@ def obtener_nota(
     Permisos:
     - Admin y Coordinador: acceso completo.
     - Tutor: solo si el caso de la nota esta asignado.
+
+    Responde con `ETag`; con `If-None-Match` vigente, 304.
     """
     # 1) Busca la nota o corta con 404.
     nota = _obtener_nota_or_404(db, nota_id)
 
     # 2) Control adicional para Tutor sobre el caso asociado.
-    if _es_tutor(current_user) and not _tutor_tiene_caso_asignado(
+    if es_tutor(current_user) and not tutor_tiene_caso(
         db, current_user.id_usuario, nota.id_caso
     ):
         raise HTTPException(
@@ -124,6 +131,9 @@ def obtener_nota(
             detail="No tienes acceso a esta nota",
         )
 
+    if no_modificado(if_none_match, nota.version):
+        return respuesta_no_modificada(nota.version)
+    poner_etag(response, nota.version)
     return nota
 
 
@@ -141,7 +151,7 @@ def crear_nota(
     - No se exige asignacion previa del caso para crear.
     """
     # 1) Regla de seguridad: Tutor no puede crear notas en nombre de otro usuario.
-    if _es_tutor(current_user) and nota_data.id_usuario != current_user.id_usuario:
+    if es_tutor(current_user) and nota_data.id_usuario != current_user.id_usuario:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Solo puedes crear notas con tu propio usuario",
@@ -193,6 +203,8 @@ def crear_nota(
 def actualizar_nota(
     nota_id: int,
     nota_data: NotaUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(require_role(_ALLOWED_ROLES)),
 ):
@@ -201,17 +213,21 @@ def actualizar_nota(
     Permisos:
     - Admin y Coordinador: acceso completo.
     - Tutor: solo notas propias.
+
+    Con `If-Match` (ETag de la nota) responde 412 si cambió desde esa lectura.
     """
     # 1) Busca la nota objetivo.
     nota = _obtener_nota_or_404(db, nota_id)
 
     # 2) Regla de seguridad para Tutor.
-    if _es_tutor(current_user) and nota.id_usuario != current_user.id_usuario:
+    if es_tutor(current_user) and nota.id_usuario != current_user.id_usuario:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Solo puedes actualizar tus propias notas",
         )
 
+    verificar_if_match(if_match, nota.version)
+
     # 3) Update parcial: solo campos enviados en el body.
     update_data = nota_data.model_dump(exclude_unset=True)
     if not update_data:
@@ -219,7 +235,7 @@ def actualizar_nota(
 
     _validar_tipo_nota(update_data.get("tipo_nota"))
 
-    if _es_tutor(current_user):
+    if es_tutor(current_user):
         # Tutor no puede reasignar la autoría a otro usuario.
         if "id_usuario" in update_data and update_data["id_usuario"] != current_user.id_usuario:
             raise HTTPException(
@@ -228,7 +244,7 @@ def actualizar_nota(
             )
 
         # Si cambia de caso, el nuevo caso debe estar asignado al Tutor.
-        if "id_caso" in update_data and not _tutor_tiene_caso_asignado(
+        if "id_caso" in update_data and not tutor_tiene_caso(
             db, current_user.id_usuario, update_data["id_caso"]
         ):
             raise HTTPException(
@@ -256,6 +272,9 @@ def actualizar_nota(
     try:
         db.commit()
         db.refresh(nota)
+    except StaleDataError:
+        db.rollback()
+        raise error_conflicto(if_match)
     except IntegrityError:
         db.rollback()
         raise HTTPException(
@@ -269,6 +288,7 @@ def actualizar_nota(
             detail="No fue posible actualizar la nota.",
         )
 
+    poner_etag(response, nota.version)
     return nota
 
 
@@ -288,7 +308,7 @@ def eliminar_nota(
     nota = _obtener_nota_or_404(db, nota_id)
 
     # 2) Regla de seguridad para Tutor.
-    if _es_tutor(current_user) and nota.id_usuario != current_user.id_usuario:
+    if es_tutor(current_user) and nota.id_usuario != current_user.id_usuario:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Solo puedes eliminar tus propias notas",
@@ -22,10 +22,14 @@ Columnas según SQL:
 #     # ... agregar columnas
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List
 
-from app.api.deps import get_db
+from app.api.deps import get_db, ids_en_lote
+from app.core.versionado import incrementar_version_casos
+from app.models.asignacion import Asignacion
+from app.models.caso import Caso
 from app.models.usuario import Usuario
 from app.models.rol import Rol
 from app.schemas.usuario import UsuarioResponse, UsuarioCreate, UsuarioUpdate
@@ -55,6 +59,27 @@ def listar_usuarios(
 
     return usuarios
 
+# ============================================================================
+# OBTENER USUARIOS EN LOTE (GET /batch?ids=)
+# ============================================================================
+@router.get("/batch", response_model=Dict[int, UsuarioResponse], status_code=status.HTTP_200_OK)
+def obtener_usuarios_en_lote(
+    ids: List[int] = Depends(ids_en_lote),
+    db: Session = Depends(get_db),
+    current_user: Usuario = Depends(require_role(["Admin", "Coordinador", "Tutor"]))
+):
+    """
+    Varios usuarios por ID (`?ids=1,2,3`), indexados por ID.
+
+    Los IDs inexistentes no aparecen en la respuesta. Un Tutor solo obtiene su
+    propio perfil (mismo criterio que GET /{id}).
+    """
+    query = db.query(Usuario).filter(Usuario.id_usuario.in_(ids))
+    if current_user.rol.nombre_rol == "Tutor":
+        query = query.filter(Usuario.id_usuario == current_user.id_usuario)
+
+    return {usuario.id_usuario: usuario for usuario in query.all()}
+
 # ============================================================================
 # OBTENER USUARIO (GET /{id})
 # ============================================================================
@@ -173,6 +198,10 @@ def actualizar_usuario(
             detail="Usuario no encontrado"
         )
     
+    renombrado = (usuario_data.nombre and usuario_data.nombre != usuario.nombre) or (
+        usuario_data.apellido and usuario_data.apellido != usuario.apellido
+    )
+
     # Actualizar campos
     if usuario_data.nombre:
         usuario.nombre = usuario_data.nombre
@@ -213,6 +242,13 @@ def actualizar_usuario(
                 detail="Rol inválido"
             )
         usuario.id_rol = usuario_data.id_rol
+
+    # El nombre del tutor se muestra en sus casos: cambia su ETag
+    if renombrado:
+        incrementar_version_casos(
+            db,
+            Caso.id_caso.in_(select(Asignacion.id_caso).where(Asignacion.id_usuario == usuario_id)),
+        )
     
     db.commit()
     db.refresh(usuario)
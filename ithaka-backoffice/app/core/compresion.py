@@ -0,0 +1,256 @@
+"""
+Compresión de respuestas (gzip / brotli)
+----------------------------------------
+Middleware ASGI que negocia `Accept-Encoding` y comprime respuestas de tipos
+textuales (JSON, CSV, texto, Arrow IPC) a partir de `COMPRESION_TAMANO_MINIMO`.
+
+- Respuestas completas: se comprimen de una vez (con `Content-Length`).
+- `StreamingResponse`: cada bloque se comprime y se vacía al cliente
+  (sync flush), así los exports siguen llegando de forma incremental.
+- No se tocan respuestas que ya traen `Content-Encoding`, parciales (206) o
+  que anuncian `Accept-Ranges` (los offsets deben referirse al archivo
+  original), ni formatos ya comprimidos (xlsx, parquet), ni streams SSE
+  (`text/event-stream`).
+- ETags: al comprimir, los derivados del contenido pasan a débiles
+  (`W/`). Los que identifican la versión del recurso (`ETAG_DE_VERSION`,
+  ver app/core/versionado.py) se mantienen fuertes para que sigan sirviendo
+  en `If-Match`.
+- Brotli es opcional: si el paquete `brotli` no está instalado solo se
+  negocia gzip.
+
+Las métricas acumuladas (bytes, ratio, tiempo de compresión) se consultan en
+`GET /api/v1/metricas/compresion`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+
+TIPOS_COMPRIMIBLES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/vnd.apache.arrow.stream",
+}
+
+
+# Streams de larga duración: cada evento debe llegar sin buffering
+TIPOS_EXCLUIDOS = {"text/event-stream"}
+
+# Marca interna de la respuesta: su ETag es la versión del recurso, no un
+# hash de los bytes. El middleware la quita antes de enviar la respuesta.
+ETAG_DE_VERSION = "x-etag-version"
+
+
+def es_comprimible(content_type: str) -> bool:
+    tipo = content_type.split(";", 1)[0].strip().lower()
+    if tipo in TIPOS_EXCLUIDOS:
+        return False
+    return (
+        tipo.startswith("text/")
+        or tipo in TIPOS_COMPRIMIBLES
+        or tipo.endswith("+json")
+        or tipo.endswith("+xml")
+    )
+
+
+def negociar_codificacion(accept_encoding: str) -> Optional[str]:
+    """Elige "br" o "gzip" según los q-values de `Accept-Encoding` (empate: br)."""
+    disponibles = ["br", "gzip"] if brotli is not None else ["gzip"]
+    preferencias: dict[str, float] = {}
+    for parte in accept_encoding.split(","):
+        nombre, _, parametros = parte.strip().partition(";")
+        nombre = nombre.strip().lower()
+        if not nombre:
+            continue
+        q = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith("q="):
+            try:
+                q = float(parametros[2:])
+            except ValueError:
+                q = 0.0
+        preferencias[nombre] = q
+
+    comodin = preferencias.get("*")
+    mejor, mejor_q = None, 0.0
+    for codificacion in disponibles:
+        q = preferencias.get(codificacion, comodin if comodin is not None else 0.0)
+        if q > mejor_q:
+            mejor, mejor_q = codificacion, q
+    return mejor
+
+
+class MetricasCompresion:
+    """Contadores acumulados por codificación (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._datos: dict[str, dict] = {}
+
+    def registrar(self, codificacion: str, originales: int, comprimidos: int, segundos: float) -> None:
+        with self._lock:
+            datos = self._datos.setdefault(
+                codificacion,
+                {"respuestas": 0, "bytes_originales": 0, "bytes_comprimidos": 0, "segundos": 0.0},
+            )
+            datos["respuestas"] += 1
+            datos["bytes_originales"] += originales
+            datos["bytes_comprimidos"] += comprimidos
+            datos["segundos"] += segundos
+
+    def resumen(self) -> dict:
+        with self._lock:
+            resultado = {}
+            for codificacion, datos in self._datos.items():
+                originales = datos["bytes_originales"]
+                resultado[codificacion] = {
+                    **datos,
+                    "ratio": round(datos["bytes_comprimidos"] / originales, 4) if originales else None,
+                    "ms_por_respuesta": round(datos["segundos"] * 1000 / datos["respuestas"], 3),
+                }
+            return resultado
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self._datos.clear()
+
+
+metricas_compresion = MetricasCompresion()
+
+
+def _quitar_marca(inicio: Message) -> bool:
+    """Quita `ETAG_DE_VERSION` de los headers; retorna si estaba."""
+    headers = MutableHeaders(raw=inicio["headers"])
+    if ETAG_DE_VERSION not in headers:
+        return False
+    del headers[ETAG_DE_VERSION]
+    return True
+
+
+class _Compresor:
+    def __init__(self, codificacion: str, nivel_gzip: int, calidad_brotli: int) -> None:
+        self.codificacion = codificacion
+        if codificacion == "br":
+            self._brotli = brotli.Compressor(quality=calidad_brotli)
+        else:
+            # wbits 16+: cabecera y trailer gzip
+            self._zlib = zlib.compressobj(nivel_gzip, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def comprimir(self, datos: bytes, final: bool) -> bytes:
+        if self.codificacion == "br":
+            salida = self._brotli.process(datos)
+            return salida + (self._brotli.finish() if final else self._brotli.flush())
+        salida = self._zlib.compress(datos)
+        return salida + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompresionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        tamano_minimo: int = 500,
+        nivel_gzip: int = 6,
+        calidad_brotli: int = 4,
+    ) -> None:
+        self.app = app
+        self.tamano_minimo = tamano_minimo
+        self.nivel_gzip = nivel_gzip
+        self.calidad_brotli = calidad_brotli
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        codificacion = None
+        if scope.get("method") != "HEAD":
+            codificacion = negociar_codificacion(Headers(scope=scope).get("accept-encoding", ""))
+        if codificacion is None:
+            async def enviar_sin_comprimir(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    _quitar_marca(message)
+                await send(message)
+
+            await self.app(scope, receive, enviar_sin_comprimir)
+            return
+
+        inicio: Optional[Message] = None
+        compresor: Optional[_Compresor] = None
+        directo = False
+        etag_de_version = False
+        originales = comprimidos = 0
+        segundos = 0.0
+
+        async def enviar(message: Message) -> None:
+            nonlocal inicio, compresor, directo, etag_de_version, originales, comprimidos, segundos
+
+            if message["type"] == "http.response.start":
+                inicio = message
+                etag_de_version = _quitar_marca(inicio)
+                return
+            if message["type"] != "http.response.body" or directo:
+                await send(message)
+                return
+
+            cuerpo = message.get("body", b"")
+            hay_mas = message.get("more_body", False)
+
+            if compresor is None:
+                headers = MutableHeaders(raw=inicio["headers"])
+                if (
+                    inicio["status"] in (204, 206, 304)
+                    or "content-encoding" in headers
+                    or "content-range" in headers
+                    or headers.get("accept-ranges", "none") != "none"
+                    or not es_comprimible(headers.get("content-type", ""))
+                    or (not hay_mas and len(cuerpo) < self.tamano_minimo)
+                ):
+                    directo = True
+                    await send(inicio)
+                    await send(message)
+                    return
+
+                compresor = _Compresor(codificacion, self.nivel_gzip, self.calidad_brotli)
+                headers["Content-Encoding"] = codificacion
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/") and not etag_de_version:
+                    # La representación comprimida no es idéntica byte a byte
+                    headers["ETag"] = f"W/{etag}"
+                del headers["content-length"]
+
+                if not hay_mas:
+                    t0 = time.perf_counter()
+                    salida = compresor.comprimir(cuerpo, final=True)
+                    segundos += time.perf_counter() - t0
+                    headers["Content-Length"] = str(len(salida))
+                    metricas_compresion.registrar(codificacion, len(cuerpo), len(salida), segundos)
+                    await send(inicio)
+                    await send({"type": "http.response.body", "body": salida})
+                    return
+
+                await send(inicio)
+
+            t0 = time.perf_counter()
+            salida = compresor.comprimir(cuerpo, final=not hay_mas)
+            segundos += time.perf_counter() - t0
+            originales += len(cuerpo)
+            comprimidos += len(salida)
+            if not hay_mas:
+                metricas_compresion.registrar(codificacion, originales, comprimidos, segundos)
+            await send({"type": "http.response.body", "body": salida, "more_body": hay_mas})
+
+        await self.app(scope, receive, enviar)
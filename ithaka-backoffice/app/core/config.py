@@ -18,6 +18,62 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
     ENVIRONMENT: str = "development"
 
+    # Réplicas de solo lectura (opcional): URLs separadas por coma. Los GET usan
+    # una réplica; escrituras y lecturas del mismo cliente durante
+    # REPLICA_STICKY_SEGUNDOS tras una escritura van a la primaria
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_STICKY_SEGUNDOS: int = 15
+
+    # Routers de /api/v1: importar cada módulo de endpoints con el primer pedido
+    # a su prefijo en lugar de al arrancar (ver app/core/routers_diferidos.py)
+    ROUTERS_DIFERIDOS: bool = True
+
+    # Cache de casos asignados por Tutor (chequeos de autorización)
+    CACHE_ASIGNACIONES_TTL_SEGUNDOS: int = 60
+
+    # Exportaciones: casos leídos por página (memoria constante en XLSX)
+    EXPORT_TAMANO_PAGINA: int = 1000
+
+    # Trabajos de exportación en segundo plano (/exportaciones)
+    EXPORT_TRABAJOS_WORKERS: int = 2
+    EXPORT_TRABAJOS_TTL_SEGUNDOS: int = 3600
+    # Archivos y manifiestos de los trabajos; compartido entre workers (con
+    # varios pods, un volumen compartido)
+    EXPORT_TRABAJOS_DIR: str = ""  # vacío = <tmp>/ithaka_exportaciones
+
+    # Consultas en lote (GET /casos/batch?ids=...): máximo de IDs por pedido
+    LOTE_MAX_IDS: int = 100
+    # PATCH /casos/estado: máximo de casos por operación
+    CAMBIO_ESTADO_LOTE_MAX: int = 5000
+
+    # Asignación automática de tutores: carga máxima (ponderada) por tutor
+    ASIGNACION_CAPACIDAD_TUTOR: int = 15
+    ASIGNACION_AUTOMATICA_MAX_CASOS: int = 1000
+
+    # Cache de métricas agregadas (/metricas/tutores, /metricas/series)
+    METRICAS_CACHE_TTL_SEGUNDOS: int = 300
+    # Embudo de estados (/metricas/funnel): antigüedad mínima de la auditoría procesada
+    FUNNEL_MARGEN_SEGUNDOS: int = 5
+    FUNNEL_TAMANO_PAGINA: int = 1000  # registros de auditoría (y casos) por consulta
+    FUNNEL_SNAPSHOT_CADA: int = 1000  # registros procesados entre guardados del estado
+
+    # Eventos de casos (SSE en /casos/events)
+    # PostgreSQL LISTEN/NOTIFY entre procesos: necesario con varios workers
+    # (el Dockerfile levanta 2); False solo para un proceso sin PostgreSQL
+    EVENTOS_LISTEN_NOTIFY: bool = True
+    EVENTOS_HISTORIAL: int = 1000  # eventos recientes reenviables con Last-Event-ID
+    EVENTOS_HEARTBEAT_SEGUNDOS: int = 15
+    EVENTOS_REINTENTO_MS: int = 5000
+
+    # Feed de cambios (/casos/changes): antigüedad mínima para avanzar el cursor
+    CAMBIOS_MARGEN_SEGUNDOS: int = 5
+    CAMBIOS_MAX_CASOS: int = 1000
+
+    # Compresión de respuestas (gzip / brotli)
+    COMPRESION_TAMANO_MINIMO: int = 500
+    COMPRESION_NIVEL_GZIP: int = 6
+    COMPRESION_CALIDAD_BROTLI: int = 4
+
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=True,
@@ -29,5 +85,9 @@ class Settings(BaseSettings):
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
+    @property
+    def REPLICA_URLS(self) -> list[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
     
 settings = Settings()
@@ -0,0 +1,59 @@
+"""
+Respuestas JSON rápidas (orjson)
+--------------------------------
+- `ORJSONRespuesta`: clase de respuesta por defecto de la app (ver main.py);
+  codifica con orjson en lugar del json de la stdlib.
+- `serializador(Schema)` + `respuesta_lista(...)`: camino rápido para los
+  listados más usados. Las filas salen de columnas ya tipadas por el modelo
+  de BD, así que se codifican directo sin volver a validar cada dict contra
+  el `response_model` (que queda solo para la documentación OpenAPI).
+
+Benchmark: `python -m scripts.benchmark_serializacion`.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any, Callable, Iterable
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _por_defecto(valor: Any) -> Any:
+    """Tipos que orjson no codifica de forma nativa."""
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, (set, frozenset)):
+        return list(valor)
+    if isinstance(valor, BaseModel):
+        return valor.model_dump(mode="json")
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+class ORJSONRespuesta(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_por_defecto, option=orjson.OPT_NON_STR_KEYS)
+
+
+def serializador(schema: type[BaseModel]) -> Callable[[Any], dict]:
+    """
+    Serializador ORM -> dict con los campos de `schema` (mismo orden).
+
+    Los campos se resuelven una vez, al definir el serializador; por fila solo
+    se leen atributos.
+    """
+    campos = tuple(schema.model_fields)
+
+    def serializar(objeto: Any) -> dict:
+        return {campo: getattr(objeto, campo) for campo in campos}
+
+    return serializar
+
+
+def respuesta_lista(filas: Iterable[dict]) -> ORJSONRespuesta:
+    """Listado ya serializado: se codifica con orjson, sin re-validar."""
+    return ORJSONRespuesta(content=list(filas))
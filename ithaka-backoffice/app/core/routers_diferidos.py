@@ -0,0 +1,131 @@
+"""
+Registro de routers con importación diferida
+--------------------------------------------
+Importar todos los módulos de endpoints al arrancar cuesta (arrastran
+servicios de exportación, métricas, JWT/bcrypt, etc.) aunque el proceso
+atienda pocas rutas. Con `diferido=True` cada router del registro se monta
+como una `RutaDiferida`: una ruta que solo compara el prefijo del path y,
+en el primer pedido que le corresponde, importa el módulo, lo incluye en
+la app con `app.include_router` y se reemplaza por las rutas reales en su
+misma posición (el orden de matching no cambia).
+
+Los servicios que escuchan eventos de sesión (caches de métricas y de
+autorización) se registran al importarse; como sus caches arrancan vacíos,
+importarlos tarde no deja datos desactualizados.
+
+El esquema OpenAPI (/docs, /openapi.json) necesita todas las rutas:
+`cargar_todos(app)` fuerza la carga antes de generarlo.
+"""
+
+from __future__ import annotations
+
+import importlib
+import threading
+from dataclasses import dataclass
+from typing import Iterable
+
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound, get_route_path
+from starlette.types import Receive, Scope, Send
+
+
+@dataclass(frozen=True)
+class RouterRegistrado:
+    """Router de `modulo` (atributo `atributo`) montado en `prefijo`."""
+
+    modulo: str
+    prefijo: str
+    tags: tuple[str, ...] = ()
+    atributo: str = "router"
+
+    def cargar(self):
+        return getattr(importlib.import_module(self.modulo), self.atributo)
+
+
+_lock = threading.RLock()
+
+
+class RutaDiferida(BaseRoute):
+    def __init__(self, app: FastAPI, prefijo: str, registro: RouterRegistrado) -> None:
+        self.app = app
+        self.registro = registro
+        self.path = prefijo + registro.prefijo
+        self._rutas: list[BaseRoute] | None = None
+
+    @property
+    def cargada(self) -> bool:
+        return self._rutas is not None
+
+    def _corresponde(self, scope: Scope) -> bool:
+        if scope["type"] not in ("http", "websocket"):
+            return False
+        ruta = get_route_path(scope)
+        return ruta == self.path or ruta.startswith(self.path.rstrip("/") + "/")
+
+    def cargar(self) -> list[BaseRoute]:
+        """Importa el router y reemplaza esta ruta por las reales."""
+        with _lock:
+            if self._rutas is None:
+                rutas = self.app.router.routes
+                antes = len(rutas)
+                self.app.include_router(
+                    self.registro.cargar(), prefix=self.path, tags=list(self.registro.tags)
+                )
+                nuevas = rutas[antes:]
+                del rutas[antes:]
+                for i, ruta in enumerate(rutas):
+                    if ruta is self:
+                        rutas[i:i + 1] = nuevas
+                        break
+                self._rutas = nuevas
+            return self._rutas
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        if not self._corresponde(scope):
+            return Match.NONE, {}
+        # El Router sigue iterando desde la posición siguiente, que tras el
+        # reemplazo es la segunda ruta real: la primera se evalúa acá
+        parcial = None
+        for ruta in self.cargar():
+            match, child_scope = ruta.matches(scope)
+            if match == Match.FULL:
+                return Match.FULL, {**child_scope, "ruta_diferida": ruta}
+            if match == Match.PARTIAL and parcial is None:
+                parcial = {**child_scope, "ruta_diferida": ruta}
+        if parcial is not None:
+            return Match.PARTIAL, parcial
+        return Match.NONE, {}
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        ruta = scope.pop("ruta_diferida")
+        scope["route"] = ruta
+        await ruta.handle(scope, receive, send)
+
+    def url_path_for(self, name: str, /, **path_params):
+        for ruta in self.cargar():
+            try:
+                return ruta.url_path_for(name, **path_params)
+            except NoMatchFound:
+                pass
+        raise NoMatchFound(name, path_params)
+
+    def __repr__(self) -> str:
+        return f"RutaDiferida(path={self.path!r}, modulo={self.registro.modulo!r})"
+
+
+def incluir_routers(
+    app: FastAPI, registro: Iterable[RouterRegistrado], prefijo: str = "", diferido: bool = True
+) -> None:
+    """Monta los routers del registro en `app`, en orden."""
+    for entrada in registro:
+        if diferido:
+            app.router.routes.append(RutaDiferida(app, prefijo, entrada))
+        else:
+            app.include_router(entrada.cargar(), prefix=prefijo + entrada.prefijo, tags=list(entrada.tags))
+
+
+def cargar_todos(app: FastAPI) -> None:
+    """Carga los routers diferidos que queden pendientes."""
+    for ruta in list(app.router.routes):
+        if isinstance(ruta, RutaDiferida):
+            ruta.cargar()
@@ -3,8 +3,6 @@ Módulo de seguridad: JWT, passwords y autenticación
 """
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -21,6 +19,9 @@ from app.models.usuario import Usuario
 # Esquema de seguridad HTTP Bearer (para Swagger UI)
 security = HTTPBearer()
 
+# bcrypt y jose (con sus backends criptográficos) se importan dentro de las
+# funciones que los usan: no cuestan nada al arrancar si no se usan
+
 
 # ============================================================================
 # FUNCIONES PARA PASSWORDS
@@ -40,6 +41,8 @@ def hash_password(password: str) -> str:
         >>> hash_password("admin123")
         "$2b$12$KIXv5McSxK9Y7J3..."
     """
+    import bcrypt
+
     # Convertir password a bytes y hashear con bcrypt
     password_bytes = password.encode('utf-8')
     salt = bcrypt.gensalt()
@@ -64,6 +67,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         >>> verify_password("wrongpass", "$2b$12$KIXv5McSxK9Y7J3...")
         False
     """
+    import bcrypt
+
     try:
         password_bytes = plain_password.encode('utf-8')
         hashed_bytes = hashed_password.encode('utf-8')
@@ -92,6 +97,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         >>> print(token)
         "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJzdWIiOiI1Ii..."
     """
+    from jose import jwt
+
     to_encode = data.copy()
     
     # Calcular fecha de expiración
@@ -112,6 +119,8 @@ def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None)
     """
     Crear un refresh token JWT con expiración más larga.
     """
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -126,6 +135,8 @@ def decode_refresh_token(token: str) -> dict:
     """
     Decodificar un refresh token JWT. Lanza HTTPException 401 si inválido.
     """
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
@@ -155,6 +166,8 @@ def decode_access_token(token: str) -> dict:
         >>> print(payload)
         {"sub": "5", "email": "admin@ithaka.com", "exp": 1708228800}
     """
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
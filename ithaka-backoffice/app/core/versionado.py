@@ -0,0 +1,95 @@
+"""
+ETags y concurrencia optimista
+------------------------------
+`caso`, `nota` y `emprendedor` tienen una columna `version` configurada como
+`version_id_col` del mapper: cada UPDATE vía ORM la incrementa y agrega
+`WHERE version = :v`. Si otra transacción modificó la fila en el medio, el
+UPDATE no afecta filas y SQLAlchemy lanza `StaleDataError` (sin locks).
+
+En la API la versión se expone como ETag (`"<version>"`, con `poner_etag`):
+
+- GET: responde con `ETag`; con `If-None-Match` vigente responde 304. El
+  ETag sigue siendo fuerte aunque la respuesta vaya comprimida.
+- PUT/PATCH: con `If-Match` que no coincide con la versión actual responde
+  412 (se acepta también la forma débil `W/"<version>"`, que pueden
+  introducir proxies o caches intermedios); sin `If-Match` se actualiza igual, pero un conflicto durante el
+  read-modify-write responde 409.
+
+El ETag de un caso también cambia con sus asignaciones y el nombre del
+tutor (se muestran en `CasoResponse`), con sus apoyos (programa de apoyo)
+y con el nombre del emprendedor; no con renombres de catálogos (estado,
+convocatoria, programa).
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.compresion import ETAG_DE_VERSION
+from app.models.caso import Caso
+
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def poner_etag(response: Response, version: int) -> None:
+    """ETag de la versión, marcado para que la compresión no lo debilite."""
+    response.headers["ETag"] = etag(version)
+    response.headers[ETAG_DE_VERSION] = "1"
+
+
+def _etiquetas(header: str) -> set[str]:
+    # Se ignora el prefijo W/: la versión identifica el recurso en cualquier codificación
+    return {parte.strip().removeprefix("W/") for parte in header.split(",") if parte.strip()}
+
+
+def no_modificado(if_none_match: Optional[str], version: int) -> bool:
+    """True si el cliente ya tiene la versión actual (responder 304)."""
+    if not if_none_match:
+        return False
+    etiquetas = _etiquetas(if_none_match)
+    return "*" in etiquetas or etag(version) in etiquetas
+
+
+def respuesta_no_modificada(version: int) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag(version)})
+
+
+def verificar_if_match(if_match: Optional[str], version: int) -> None:
+    """Responde 412 si `If-Match` no corresponde a la versión actual."""
+    if not if_match:
+        return
+    etiquetas = _etiquetas(if_match)
+    if "*" not in etiquetas and etag(version) not in etiquetas:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=f"El recurso fue modificado (versión actual {etag(version)})",
+        )
+
+
+def error_conflicto(if_match: Optional[str]) -> HTTPException:
+    """Error para un `StaleDataError` (otra transacción modificó la fila)."""
+    if if_match:
+        return HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="El recurso fue modificado por otro usuario",
+        )
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="El recurso fue modificado por otro usuario; vuelva a cargarlo",
+    )
+
+
+def incrementar_version_casos(db: Session, *condiciones) -> None:
+    """
+    Invalida el ETag de los casos que cumplen `condiciones` por cambios en
+    datos relacionados que se muestran con el caso (asignaciones, emprendedor).
+    No hace commit.
+    """
+    db.query(Caso).filter(*condiciones).update(
+        {Caso.version: Caso.version + 1}, synchronize_session="fetch"
+    )
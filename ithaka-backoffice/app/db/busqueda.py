@@ -0,0 +1,132 @@
+"""
+Índices de búsqueda full-text
+-----------------------------
+DDL específico de cada motor para la búsqueda de casos, emprendedores y notas.
+
+- PostgreSQL: columnas `search_vector` (tsvector generado) con índice GIN
+  más índices trigram (pg_trgm) para coincidencias parciales de nombres,
+  emails y documentos.
+- SQLite: tablas virtuales FTS5 de contenido externo sincronizadas con
+  triggers (se usan en los tests).
+
+Los listeners se registran sobre las tablas, así `Base.metadata.create_all()`
+y `drop_all()` crean/eliminan estas estructuras automáticamente.
+La consulta que las usa vive en `app/services/busqueda_service.py`.
+"""
+
+from sqlalchemy import DDL, event
+
+from app.models.caso import Caso
+from app.models.emprendedor import Emprendedor
+from app.models.nota import Nota
+
+
+# ============================================================================
+# POSTGRESQL: tsvector generado + GIN + trigram
+# ============================================================================
+
+POSTGRES_DDL = {
+    "caso": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "ALTER TABLE caso ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('spanish', coalesce(nombre_caso, '')), 'A') || "
+        "setweight(to_tsvector('spanish', coalesce(descripcion, '')), 'B')"
+        ") STORED",
+        "CREATE INDEX IF NOT EXISTS ix_caso_search_vector ON caso USING GIN (search_vector)",
+        "CREATE INDEX IF NOT EXISTS ix_caso_nombre_caso_trgm ON caso USING GIN (nombre_caso gin_trgm_ops)",
+    ],
+    "emprendedor": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "ALTER TABLE emprendedor ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "to_tsvector('simple', coalesce(nombre, '') || ' ' || coalesce(apellido, '') || ' ' || "
+        "coalesce(email, '') || ' ' || coalesce(documento_identidad, ''))"
+        ") STORED",
+        "CREATE INDEX IF NOT EXISTS ix_emprendedor_search_vector ON emprendedor USING GIN (search_vector)",
+        "CREATE INDEX IF NOT EXISTS ix_emprendedor_nombre_completo_trgm ON emprendedor "
+        "USING GIN ((nombre || ' ' || apellido) gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_emprendedor_email_trgm ON emprendedor USING GIN (email gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_emprendedor_documento_trgm ON emprendedor "
+        "USING GIN (documento_identidad gin_trgm_ops)",
+    ],
+    "nota": [
+        "ALTER TABLE nota ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('spanish', coalesce(contenido, ''))) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_nota_search_vector ON nota USING GIN (search_vector)",
+    ],
+}
+
+
+# ============================================================================
+# SQLITE: FTS5 de contenido externo + triggers de sincronización
+# ============================================================================
+
+def _sqlite_fts_ddl(tabla: str, pk: str, columnas: list[str]) -> list[str]:
+    """Genera la tabla FTS5 y los triggers que la mantienen sincronizada."""
+    fts = f"{tabla}_fts"
+    cols = ", ".join(columnas)
+    nuevos = ", ".join(f"new.{c}" for c in columnas)
+    viejos = ", ".join(f"old.{c}" for c in columnas)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{tabla}', content_rowid='{pk}', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {tabla} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk}, {nuevos}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {tabla} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {viejos}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {tabla} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {viejos}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk}, {nuevos}); END",
+    ]
+
+
+SQLITE_DDL = {
+    "caso": _sqlite_fts_ddl("caso", "id_caso", ["nombre_caso", "descripcion"]),
+    "emprendedor": _sqlite_fts_ddl(
+        "emprendedor",
+        "id_emprendedor",
+        ["nombre", "apellido", "email", "documento_identidad"],
+    ),
+    "nota": _sqlite_fts_ddl("nota", "id_nota", ["contenido"]),
+}
+
+
+# Objetos que este DDL agrega por fuera de los modelos. El autogenerate de
+# Alembic los ignora (ver migrations/env.py).
+COLUMNAS_NO_MAPEADAS = {"search_vector"}
+INDICES_NO_MAPEADOS = {
+    "ix_caso_search_vector",
+    "ix_caso_nombre_caso_trgm",
+    "ix_emprendedor_search_vector",
+    "ix_emprendedor_nombre_completo_trgm",
+    "ix_emprendedor_email_trgm",
+    "ix_emprendedor_documento_trgm",
+    "ix_nota_search_vector",
+}
+
+
+def es_tabla_fts(nombre: str) -> bool:
+    """Tablas virtuales FTS5 (y sus tablas sombra) de SQLite."""
+    return any(nombre.startswith(f"{tabla}_fts") for tabla in SQLITE_DDL)
+
+
+def _registrar(tabla) -> None:
+    """Asocia el DDL de búsqueda al ciclo create/drop de la tabla."""
+    for sentencia in POSTGRES_DDL[tabla.name]:
+        event.listen(tabla, "after_create", DDL(sentencia).execute_if(dialect="postgresql"))
+
+    for sentencia in SQLITE_DDL[tabla.name]:
+        event.listen(tabla, "after_create", DDL(sentencia).execute_if(dialect="sqlite"))
+
+    # La tabla virtual no se elimina junto con la tabla base en SQLite
+    event.listen(
+        tabla,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {tabla.name}_fts").execute_if(dialect="sqlite"),
+    )
+
+
+for _tabla in (Caso.__table__, Emprendedor.__table__, Nota.__table__):
+    _registrar(_tabla)
@@ -10,5 +10,13 @@ engine = create_engine(settings.DATABASE_URL)
 # Crear SessionLocal para las transacciones
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Réplicas de solo lectura (vacío si no se configuran). El enrutamiento está
+# en app/db/session.py
+engines_replica = [create_engine(url) for url in settings.REPLICA_URLS]
+ReplicaSessionLocal = [
+    sessionmaker(autocommit=False, autoflush=False, bind=engine_replica)
+    for engine_replica in engines_replica
+]
+
 # Base para los modelos
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
@@ -0,0 +1,57 @@
+"""
+Soporte de migraciones (Alembic)
+--------------------------------
+Reglas de comparación modelos ↔ base de datos compartidas por
+`migrations/env.py` (autogenerate) y los tests que verifican que las
+migraciones producen el mismo esquema que `Base.metadata`.
+"""
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy.engine import Connection
+
+from app.db import busqueda
+from app.db.database import Base
+import app.models  # noqa: F401  (registra todos los modelos en Base.metadata)
+
+
+def include_name(name, type_, parent_names) -> bool:
+    """Excluye lo que crea app/db/busqueda.py por fuera de los modelos."""
+    if type_ == "table":
+        return not busqueda.es_tabla_fts(name)
+    if type_ == "column":
+        return name not in busqueda.COLUMNAS_NO_MAPEADAS
+    if type_ == "index":
+        return name not in busqueda.INDICES_NO_MAPEADOS
+    return True
+
+
+def _include_object(dialecto: str):
+    """Ignora índices del modelo restringidos a otro motor (`Index.ddl_if`)."""
+    def include_object(obj, name, type_, reflected, compare_to) -> bool:
+        if type_ == "index" and not reflected:
+            condicion = getattr(obj, "_ddl_if", None)
+            if condicion is not None and condicion.dialect not in (None, dialecto):
+                return False
+        return True
+    return include_object
+
+
+def opciones_autogenerate(dialecto: str) -> dict:
+    """Opciones de `context.configure` para comparar contra los modelos."""
+    return {
+        "target_metadata": Base.metadata,
+        "include_name": include_name,
+        "include_object": _include_object(dialecto),
+        "compare_type": True,
+    }
+
+
+def diferencias_con_modelos(connection: Connection) -> list:
+    """Diferencias entre el esquema de `connection` y `Base.metadata` (vacía si coinciden)."""
+    opciones = opciones_autogenerate(connection.dialect.name)
+    contexto = MigrationContext.configure(
+        connection,
+        opts={clave: valor for clave, valor in opciones.items() if clave != "target_metadata"},
+    )
+    return compare_metadata(contexto, opciones["target_metadata"])
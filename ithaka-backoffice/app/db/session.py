@@ -1,13 +1,223 @@
-from typing import Generator
-from app.db.database import SessionLocal
+"""
+Sesiones de base de datos y enrutamiento primaria / réplicas.
 
-def get_db() -> Generator:
+Sin réplicas configuradas (`DATABASE_REPLICA_URLS` vacío) todo va a la
+primaria, como siempre. Con réplicas:
+
+- GET/HEAD usan una sesión de réplica (round-robin).
+- El resto de los métodos usa la primaria.
+- Read-your-writes: cuando una sesión de la primaria confirma escrituras,
+  las lecturas del mismo cliente van a la primaria durante
+  `REPLICA_STICKY_SEGUNDOS`, para no leer una réplica atrasada.
+
+La marca de escritura viaja con el cliente: `MarcaEscrituraMiddleware`
+devuelve la hora (epoch) de la escritura en la cookie `COOKIE_ESCRITURA` y
+el header `HEADER_ESCRITURA`, y cualquier worker respeta la ventana si el
+pedido trae alguno de los dos (clientes sin cookies reenvían el header).
+Además cada proceso recuerda las escrituras por header Authorization, para
+clientes que no devuelven la marca. Conviene que la ventana supere el lag
+típico de replicación. Las caches en memoria (autorización, métricas) pueden cargarse
+desde una réplica atrasada tras invalidarse: su TTL acota ese desfase, igual
+que entre workers.
+"""
+
+import hashlib
+import itertools
+import threading
+import time
+from typing import Callable, Generator, Optional, Sequence
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.database import ReplicaSessionLocal, SessionLocal
+
+METODOS_LECTURA = frozenset({"GET", "HEAD"})
+
+# Hora (epoch) de la última escritura del cliente
+COOKIE_ESCRITURA = "ultima_escritura"
+HEADER_ESCRITURA = "X-Ultima-Escritura"
+
+# Cantidad de marcas a partir de la cual se purgan las vencidas
+_MAX_MARCAS = 10000
+
+
+class EnrutadorSesiones:
+    def __init__(
+        self,
+        primaria: Callable[[], Session],
+        replicas: Sequence[Callable[[], Session]] = (),
+        sticky_segundos: float = 15,
+    ) -> None:
+        self._primaria = primaria
+        self._replicas = list(replicas)
+        self._ciclo = itertools.cycle(self._replicas)
+        self._sticky_segundos = sticky_segundos
+        self._escrituras: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def con_replicas(self) -> bool:
+        return bool(self._replicas)
+
+    @property
+    def sticky_segundos(self) -> float:
+        return self._sticky_segundos
+
+    def sesion(
+        self, metodo: str, cliente: Optional[str] = None, escritura: Optional[float] = None
+    ) -> Session:
+        """
+        Sesión de réplica para lecturas; primaria para escrituras o tras
+        escribir (`escritura`: marca devuelta por el cliente).
+        """
+        if (
+            metodo.upper() in METODOS_LECTURA
+            and self._replicas
+            and not self.leer_de_primaria(cliente, escritura)
+        ):
+            with self._lock:
+                fabrica = next(self._ciclo)
+            db = fabrica()
+            db.info["replica"] = True
+            return db
+
+        db = self._primaria()
+        db.info["enrutador"] = self
+        db.info["cliente"] = cliente
+        db.info["escritura"] = escritura
+        return db
+
+    def bind_lectura(self, db: Session):
+        """
+        Bind para lecturas largas fuera del request (p. ej. trabajos de
+        exportación) con el mismo criterio que `sesion`.
+        """
+        if db.info.get("replica") or not self._replicas or self.leer_de_primaria(
+            db.info.get("cliente"), db.info.get("escritura")
+        ):
+            return db.get_bind()
+        with self._lock:
+            fabrica = next(self._ciclo)
+        return fabrica.kw["bind"]
+
+    def registrar_escritura(self, cliente: Optional[str]) -> None:
+        if cliente is None:
+            return
+        ahora = time.monotonic()
+        with self._lock:
+            if len(self._escrituras) >= _MAX_MARCAS:
+                self._escrituras = {c: hasta for c, hasta in self._escrituras.items() if hasta > ahora}
+            self._escrituras[cliente] = ahora + self._sticky_segundos
+
+    def leer_de_primaria(self, cliente: Optional[str], escritura: Optional[float] = None) -> bool:
+        if escritura is not None:
+            # Una marca "futura" (reloj corrido o adulterada) no extiende la ventana
+            ahora = time.time()
+            if ahora - self._sticky_segundos < escritura <= ahora + self._sticky_segundos:
+                return True
+        if cliente is None:
+            return False
+        with self._lock:
+            hasta = self._escrituras.get(cliente)
+        return hasta is not None and hasta > time.monotonic()
+
+
+enrutador = EnrutadorSesiones(SessionLocal, ReplicaSessionLocal, settings.REPLICA_STICKY_SEGUNDOS)
+
+
+def clave_cliente(request: Request) -> Optional[str]:
+    """Identifica al cliente por su token (sin decodificarlo)."""
+    autorizacion = request.headers.get("authorization")
+    if not autorizacion:
+        return None
+    return hashlib.sha256(autorizacion.encode()).hexdigest()
+
+
+def marca_escritura(request: Request) -> Optional[float]:
+    """Hora de la última escritura que devolvió el cliente (cookie o header)."""
+    valor = request.headers.get(HEADER_ESCRITURA) or request.cookies.get(COOKIE_ESCRITURA)
+    try:
+        return float(valor) if valor else None
+    except ValueError:
+        return None
+
+
+def get_db(request: Request) -> Generator:
     """
     Dependency para obtener sesión de base de datos.
     Se usa en los endpoints como: db: Session = Depends(get_db)
+
+    Los GET pueden recibir una sesión de réplica (ver docstring del módulo).
     """
-    db = SessionLocal()
+    db = enrutador.sesion(request.method, clave_cliente(request), marca_escritura(request))
+    # Al confirmar escrituras se anota la hora en el request (ver middleware)
+    db.info["estado"] = request.state
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# ============================================================================
+# MARCA DE ESCRITURA (read-your-writes)
+# ============================================================================
+
+@event.listens_for(Session, "after_flush")
+def _marcar_escritura(session, flush_context):
+    session.info["escribio"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _marcar_escritura_masiva(orm_execute_state):
+    # INSERT/UPDATE/DELETE masivos o SQL textual (se asume escritura)
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["escribio"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _registrar_escritura(session):
+    if session.info.pop("escribio", False) and "enrutador" in session.info:
+        session.info["enrutador"].registrar_escritura(session.info.get("cliente"))
+        if "estado" in session.info:
+            session.info["estado"].ultima_escritura = time.time()
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_escritura(session):
+    session.info.pop("escribio", None)
+
+
+class MarcaEscrituraMiddleware:
+    """
+    Devuelve al cliente la hora de su última escritura (cookie y header)
+    para que cualquier worker dirija sus lecturas siguientes a la primaria.
+    Sin réplicas no agrega nada.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not enrutador.con_replicas:
+            await self.app(scope, receive, send)
+            return
+
+        async def enviar(mensaje: Message) -> None:
+            if mensaje["type"] == "http.response.start":
+                escritura = scope.get("state", {}).get("ultima_escritura")
+                if escritura is not None:
+                    valor = f"{escritura:.3f}"
+                    headers = MutableHeaders(scope=mensaje)
+                    headers.append(HEADER_ESCRITURA, valor)
+                    headers.append("set-cookie", (
+                        f"{COOKIE_ESCRITURA}={valor}; Max-Age={int(enrutador.sticky_segundos)}; "
+                        "Path=/; HttpOnly; SameSite=Lax"
+                    ))
+            await send(mensaje)
+
+        await self.app(scope, receive, enviar)
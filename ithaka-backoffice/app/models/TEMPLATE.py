@@ -66,8 +66,7 @@ class RECURSO(Base):
     
     id_recurso = Column(
         Integer, 
-        primary_key=True,  # Marca esta columna como clave primaria
-        index=True,        # Crea un índice para búsquedas rápidas
+        primary_key=True,  # Marca esta columna como clave primaria (ya indexada)
         autoincrement=True # PostgreSQL genera el ID automáticamente
     )
     
@@ -273,6 +272,11 @@ Si vas a buscar frecuentemente por un campo, agrégale index=True:
 Esto hace que las búsquedas sean más rápidas:
     db.query(Usuario).filter(Usuario.email == "..").first()
 
+Las foreign keys también llevan index=True (joins y filtros por FK).
+
+Todo cambio de columnas o índices necesita su migración:
+    alembic revision --autogenerate -m "descripcion"
+
 PASOS FINALES:
 --------------
 1. Una vez creado tu modelo (ej: rol.py):
@@ -281,7 +285,11 @@ PASOS FINALES:
    
    from app.models.rol import Rol
 
-3. ¡SQLAlchemy ya puede usar tu tabla!
+3. Generar la migración (ver alembic.ini):
+
+   alembic revision --autogenerate -m "crear tabla rol"
+
+4. ¡SQLAlchemy ya puede usar tu tabla!
    
    roles = db.query(Rol).all()
    nuevo_rol = Rol(nombre="Admin", descripcion="Administrador")
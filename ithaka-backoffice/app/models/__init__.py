@@ -29,6 +29,11 @@ from app.models.nota import Nota
 from app.models.auditoria import Auditoria
 from app.models.asignacion import Asignacion
 from app.models.apoyo_solicitado import ApoyoSolicitado
+from app.models.catalogo_apoyo import CatalogoApoyo
+from app.models.funnel_snapshot import FunnelSnapshot
+
+# DDL de búsqueda full-text (tsvector/trigram en PostgreSQL, FTS5 en SQLite)
+import app.db.busqueda  # noqa: E402,F401
 
 
 # Esto permite hacer: from app.models import Usuario, Caso, etc.
@@ -45,4 +50,6 @@ __all__ = [
     "Apoyo",
     "Asignacion",
     "ApoyoSolicitado",
+    "CatalogoApoyo",
+    "FunnelSnapshot",
 ]
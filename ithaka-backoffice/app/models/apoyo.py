@@ -20,9 +20,9 @@ from app.db.database import Base
 class Apoyo(Base):
     __tablename__ = "apoyo"
 
-    id_apoyo = Column(Integer, primary_key=True, index=True)
-    id_catalogo_apoyo = Column(Integer, ForeignKey("catalogo_apoyo.id_catalogo_apoyo"), nullable=False)
+    id_apoyo = Column(Integer, primary_key=True)
+    id_catalogo_apoyo = Column(Integer, ForeignKey("catalogo_apoyo.id_catalogo_apoyo", ondelete="RESTRICT"), nullable=False, index=True)
     fecha_inicio = Column(Date, nullable=True)
     fecha_fin = Column(Date, nullable=True)
-    id_caso = Column(Integer, ForeignKey("caso.id_caso"), nullable=False)
-    id_programa = Column(Integer, ForeignKey("programa.id_programa"), nullable=False)
+    id_caso = Column(Integer, ForeignKey("caso.id_caso", ondelete="CASCADE"), nullable=False, index=True)
+    id_programa = Column(Integer, ForeignKey("programa.id_programa", ondelete="RESTRICT"), nullable=False, index=True)
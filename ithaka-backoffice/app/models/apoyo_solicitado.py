@@ -18,7 +18,7 @@ class ApoyoSolicitado(Base):
     __tablename__ = "apoyo_solicitado"
     
     # Columnas
-    id_apoyo_solicitado = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    id_catalogo_apoyo = Column(Integer, ForeignKey("catalogo_apoyo.id_catalogo_apoyo"), nullable=False)
+    id_apoyo_solicitado = Column(Integer, primary_key=True, autoincrement=True)
+    id_catalogo_apoyo = Column(Integer, ForeignKey("catalogo_apoyo.id_catalogo_apoyo", ondelete="RESTRICT"), nullable=False, index=True)
     # Foreign Keys
-    id_caso = Column(Integer, ForeignKey("caso.id_caso"), nullable=False)
+    id_caso = Column(Integer, ForeignKey("caso.id_caso", ondelete="CASCADE"), nullable=False, index=True)
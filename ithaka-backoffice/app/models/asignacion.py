@@ -11,7 +11,7 @@ Columnas según SQL:
 - id_caso INTEGER NOT NULL (FK a caso)
 """
 
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.db.database import Base
 from sqlalchemy.orm import relationship
@@ -22,12 +22,12 @@ class Asignacion(Base):
     __tablename__ = "asignacion"
     
     # Columnas
-    id_asignacion = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    fecha_asignacion = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    id_asignacion = Column(Integer, primary_key=True, autoincrement=True)
+    fecha_asignacion = Column(DateTime, server_default=func.now())
     
     # Foreign Keys
-    id_usuario = Column(Integer, ForeignKey("usuario.id_usuario"), nullable=False)
-    id_caso = Column(Integer, ForeignKey("caso.id_caso"), nullable=False)
+    id_usuario = Column(Integer, ForeignKey("usuario.id_usuario", ondelete="RESTRICT"), nullable=False)
+    id_caso = Column(Integer, ForeignKey("caso.id_caso", ondelete="CASCADE"), nullable=False, index=True)
 
 
     # Relación con Usuario
@@ -35,3 +35,8 @@ class Asignacion(Base):
 
     # Relación con Caso
     caso = relationship("Caso", back_populates="asignaciones")
+
+    __table_args__ = (
+        # Alcance de Tutor: casos de un usuario (también cubre filtros por id_usuario)
+        Index("ix_asignacion_id_usuario_id_caso", "id_usuario", "id_caso"),
+    )
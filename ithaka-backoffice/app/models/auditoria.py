@@ -15,7 +15,7 @@ Columnas según SQL:
 """
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 
 from app.db.database import Base
 
@@ -23,10 +23,15 @@ from app.db.database import Base
 class Auditoria(Base):
     __tablename__ = "auditoria"
 
-    id_auditoria = Column(Integer, primary_key=True, index=True)
+    id_auditoria = Column(Integer, primary_key=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
     accion = Column(String(150), nullable=False)
     valor_anterior = Column(Text)
     valor_nuevo = Column(Text)
-    id_usuario = Column(Integer, ForeignKey("usuario.id_usuario"), nullable=False)
-    id_caso = Column(Integer, ForeignKey("caso.id_caso"), nullable=True)
+    id_usuario = Column(Integer, ForeignKey("usuario.id_usuario", ondelete="RESTRICT"), nullable=False)
+    id_caso = Column(Integer, ForeignKey("caso.id_caso", ondelete="CASCADE"), nullable=True, index=True)
+
+    __table_args__ = (
+        # Acciones por staff en orden cronológico (también cubre filtros por id_usuario)
+        Index("ix_auditoria_id_usuario_timestamp", "id_usuario", "timestamp"),
+    )
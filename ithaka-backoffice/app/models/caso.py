@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 from app.db.database import Base
 
@@ -11,7 +12,7 @@ class Caso(Base):
     
     # ========== COLUMNAS BÁSICAS ==========
     
-    id_caso = Column(Integer, primary_key=True, index=True)
+    id_caso = Column(Integer, primary_key=True)
     
    
     fecha_creacion = Column(DateTime, default=datetime.utcnow)
@@ -19,32 +20,41 @@ class Caso(Base):
     nombre_caso = Column(String(200), nullable=False)
     
     
-    descripcion = Column(Text)
+    # Columnas pesadas (grupo "detalle"): se difieren por defecto y solo se
+    # cargan donde se usan, con .options(undefer_group("detalle"))
+    descripcion = deferred(Column(Text), group="detalle")
+
+    # Versión de la fila (concurrencia optimista y ETag, ver app/core/versionado.py)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     
     # ========== DATOS DEL CHATBOT ==========
-    # JSON = tipo genérico compatible con PostgreSQL (se convierte a JSONB) y SQLite
+    # JSONB en PostgreSQL (indexado con GIN, ver __table_args__), JSON en SQLite
     # Puede guardar cualquier estructura JSON:
     # {"edad": 25, "sector": "Tecnología", "respuestas": ["a", "b", "c"]}
-    # Ejemplo: SELECT * FROM caso WHERE datos_chatbot->>'sector' = 'Tecnología'
-    datos_chatbot = Column(JSON)
+    # Ejemplo: SELECT * FROM caso WHERE datos_chatbot @> '{"sector": "Tecnología"}'
+    # Filtros desde la API: app/services/chatbot_filtros.py
+    datos_chatbot = deferred(Column(JSON().with_variant(JSONB(), "postgresql")), group="detalle")
     
     # ========== FOREIGN KEYS ==========
     
     id_emprendedor = Column(
         Integer, 
-        ForeignKey("emprendedor.id_emprendedor"),
-        nullable=False
+        ForeignKey("emprendedor.id_emprendedor", ondelete="RESTRICT"),
+        nullable=False,
+        index=True
     )
     
     id_convocatoria = Column(
         Integer, 
-        ForeignKey("convocatoria.id_convocatoria")
+        ForeignKey("convocatoria.id_convocatoria", ondelete="SET NULL"),
+        index=True
     )
     
     id_estado = Column(
         Integer, 
-        ForeignKey("catalogo_estados.id_estado"),
-        nullable=False
+        ForeignKey("catalogo_estados.id_estado", ondelete="RESTRICT"),
+        nullable=False,
+        index=True
     )
     
     # ========== RELATIONSHIPS ==========
@@ -76,3 +86,18 @@ class Caso(Base):
     #   caso.apoyos ← Lista de apoyos/programas asignados a este caso
     #   caso.asignaciones ← Usuarios (tutores) asignados a este caso
     #   caso.notas ← Notas/comentarios sobre este caso
+
+    # ========== ÍNDICES ==========
+    # GIN con jsonb_path_ops: acelera los filtros de contención (@>) sobre
+    # datos_chatbot. Solo aplica a PostgreSQL.
+    __table_args__ = (
+        Index(
+            "ix_caso_datos_chatbot_gin",
+            "datos_chatbot",
+            postgresql_using="gin",
+            postgresql_ops={"datos_chatbot": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+    # Cada UPDATE vía ORM incrementa `version` y lleva `WHERE version = :v`
+    __mapper_args__ = {"version_id_col": version}
@@ -1,13 +1,28 @@
-from sqlalchemy import Column, Integer, String, CheckConstraint
+from typing import Optional
+
+from sqlalchemy import Column, Index, Integer, String, CheckConstraint
 from sqlalchemy.orm import validates
 from app.db.database import Base
 
 
+def normalizar_estado(valor: Optional[str]) -> Optional[str]:
+    """Forma canónica de nombre_estado / tipo_caso (minúsculas, sin espacios extremos).
+
+    Usar también sobre los valores de entrada al filtrar, así la comparación
+    es directa contra la columna y puede usar el índice.
+    """
+    return valor.strip().lower() if isinstance(valor, str) else valor
+
+
+# Estados en los que un caso ya no demanda seguimiento (cartera activa de tutores)
+ESTADOS_CERRADOS = ("rechazado", "realizado", "egresado", "cancelado")
+
+
 class CatalogoEstados(Base):
  
     __tablename__ = "catalogo_estados"
     
-    id_estado = Column(Integer, primary_key=True, index=True)
+    id_estado = Column(Integer, primary_key=True)
     
     nombre_estado = Column(String(100), nullable=False)
 
@@ -16,18 +31,23 @@ class CatalogoEstados(Base):
 
     @validates("nombre_estado")
     def _normalize_nombre_estado(self, key, value):
-        return value.lower() if isinstance(value, str) else value
+        return normalizar_estado(value)
 
     @validates("tipo_caso")
     def _normalize_tipo_caso(self, key, value):
-        return value.lower() if isinstance(value, str) else value
+        return normalizar_estado(value)
     
-    # CheckConstraint: Validación a nivel de base de datos
-    # Solo permite los valores 'Postulacion' o 'Proyecto'
-    # Esto es equivalente al CHECK
+    # Validación a nivel de base de datos: los valores se guardan ya
+    # normalizados (ver normalizar_estado), así los filtros comparan la
+    # columna directamente, sin lower(), y usan el índice único.
     __table_args__ = (
         CheckConstraint(
-            "lower(tipo_caso) IN ('postulacion', 'proyecto')",
+            "tipo_caso IN ('postulacion', 'proyecto')",
             name="check_tipo_caso"
         ),
-    )
\ No newline at end of file
+        CheckConstraint(
+            "nombre_estado = lower(trim(nombre_estado))",
+            name="check_nombre_estado_normalizado"
+        ),
+        Index("ux_catalogo_estados_tipo_nombre", "tipo_caso", "nombre_estado", unique=True),
+    )
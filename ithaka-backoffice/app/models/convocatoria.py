@@ -7,8 +7,9 @@ from app.db.database import Base
 class Convocatoria(Base):
     __tablename__ = "convocatoria"
 
-    id_convocatoria = Column(Integer, primary_key=True, index=True)
+    id_convocatoria = Column(Integer, primary_key=True)
     nombre = Column(String(150), nullable=False)
     fecha_cierre = Column(DateTime, nullable=True)
 
-    casos = relationship("Caso", back_populates="convocatoria", lazy="selectin")
+    # Carga perezosa: cargar la convocatoria de un caso no debe traer todos sus casos
+    casos = relationship("Caso", back_populates="convocatoria")
@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Text
 from datetime import datetime
 from app.db.database import Base
 
@@ -8,7 +8,7 @@ class Emprendedor(Base):
 
     __tablename__ = "emprendedor"
     
-    id_emprendedor = Column(Integer, primary_key=True, index=True)
+    id_emprendedor = Column(Integer, primary_key=True)
     
     nombre = Column(String(150), nullable=False)
     apellido = Column(String(150), nullable=False)
@@ -21,6 +21,9 @@ class Emprendedor(Base):
     relacion_ucu = Column(String(100), nullable=True)
     facultad_ucu = Column(String(100), nullable=True)
     canal_llegada = Column(String(100), nullable=True)
-    motivacion = Column(String, nullable=True)  # TEXT
+    motivacion = Column(Text, nullable=True)
     fecha_registro = Column(DateTime, default=datetime.utcnow)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
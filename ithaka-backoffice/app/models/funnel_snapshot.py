@@ -0,0 +1,27 @@
+"""
+Modelo FUNNEL_SNAPSHOT
+----------------------
+Estado del embudo de estados (app/services/funnel_service.py) calculado
+desde la auditoría hasta `checkpoint`. Lo comparten los workers y sobrevive
+a los reinicios: solo se procesa la auditoría posterior.
+
+Tabla: funnel_snapshot (una sola fila, id = 1)
+- id INTEGER PRIMARY KEY
+- checkpoint INTEGER NOT NULL (último id_auditoria procesado)
+- datos TEXT NOT NULL (estado serializado en JSON)
+- actualizado TIMESTAMP
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, Text
+
+from app.db.database import Base
+
+
+class FunnelSnapshot(Base):
+    __tablename__ = "funnel_snapshot"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    checkpoint = Column(Integer, nullable=False)
+    datos = Column(Text, nullable=False)
+    actualizado = Column(DateTime, default=datetime.utcnow)
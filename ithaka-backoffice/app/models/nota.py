@@ -13,7 +13,7 @@ Columnas según SQL:
 """
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
 
 from app.db.database import Base
 
@@ -21,9 +21,17 @@ from app.db.database import Base
 class Nota(Base):
     __tablename__ = "nota"
 
-    id_nota = Column(Integer, primary_key=True, index=True)
+    id_nota = Column(Integer, primary_key=True)
     contenido = Column(Text, nullable=False)
-    tipo_nota = Column(Text, nullable=False)
+    tipo_nota = Column(String(50), nullable=False)
     fecha = Column(DateTime, default=datetime.utcnow)
-    id_usuario = Column(Integer, ForeignKey("usuario.id_usuario"), nullable=False)
-    id_caso = Column(Integer, ForeignKey("caso.id_caso"), nullable=False)
+    id_usuario = Column(Integer, ForeignKey("usuario.id_usuario", ondelete="RESTRICT"), nullable=False, index=True)
+    id_caso = Column(Integer, ForeignKey("caso.id_caso", ondelete="CASCADE"), nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    __table_args__ = (
+        # Notas de un caso ordenadas por fecha (también cubre filtros por id_caso)
+        Index("ix_nota_id_caso_fecha", "id_caso", "fecha"),
+    )
+
+    __mapper_args__ = {"version_id_col": version}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, Integer, String, Boolean, true
 from sqlalchemy.orm import relationship
 
 from app.db.database import Base
@@ -7,8 +7,8 @@ from app.db.database import Base
 class Programa(Base):
     __tablename__ = "programa"
 
-    id_programa = Column(Integer, primary_key=True, index=True)
+    id_programa = Column(Integer, primary_key=True)
     nombre = Column(String(150), nullable=False)
-    activo = Column(Boolean, nullable=False, default=True)
+    activo = Column(Boolean, default=True, server_default=true())
 
     apoyos = relationship("Apoyo", backref="programa", lazy="selectin")
\ No newline at end of file
@@ -19,7 +19,7 @@ class Rol(Base):
     __tablename__ = "rol"
     
     # Columnas
-    id_rol = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id_rol = Column(Integer, primary_key=True, autoincrement=True)
     nombre_rol = Column(String(50), nullable=False, unique=True)
     
     # Relaciones
@@ -14,7 +14,7 @@ Columnas según SQL:
 - id_rol INTEGER NOT NULL (FK a rol)
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, true
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -23,15 +23,15 @@ class Usuario(Base):
     __tablename__ = "usuario"
     
     # Columnas
-    id_usuario = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id_usuario = Column(Integer, primary_key=True, autoincrement=True)
     nombre = Column(String(150), nullable=False)
     apellido = Column(String(150), nullable=True)
-    email = Column(String(150), nullable=False, unique=True, index=True)
+    email = Column(String(150), nullable=False, unique=True)
     password_hash = Column(Text, nullable=False)
-    activo = Column(Boolean, default=True, nullable=False)
+    activo = Column(Boolean, default=True, server_default=true())
     
     # Foreign Keys
-    id_rol = Column(Integer, ForeignKey("rol.id_rol"), nullable=False)
+    id_rol = Column(Integer, ForeignKey("rol.id_rol", ondelete="RESTRICT"), nullable=False, index=True)
     
     # Relaciones
     rol = relationship("Rol", back_populates="usuarios")
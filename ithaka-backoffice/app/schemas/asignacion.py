@@ -10,8 +10,11 @@ Campos según SQL:
 - id_caso (FK a caso)
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
+from typing import List, Optional
+
+from app.core.config import settings
 
 
 class AsignacionBase(BaseModel):
@@ -58,3 +61,72 @@ class AsignacionResponse(AsignacionBase):
     model_config = {
         "from_attributes": True
     }
+
+
+# =============================================================================
+# ASIGNACIÓN AUTOMÁTICA (POST /asignaciones/automatica)
+# =============================================================================
+
+class FiltroAsignacionAutomatica(BaseModel):
+    """Selección de casos por filtro (solo se toman los que no tienen tutor)"""
+    id_convocatoria: Optional[int] = Field(None, gt=0)
+    id_estado: Optional[int] = Field(None, gt=0)
+    nombre_estado: Optional[str] = None
+    tipo_caso: Optional[str] = None
+
+
+class AsignacionAutomaticaCreate(BaseModel):
+    """Lote de casos a repartir entre tutores"""
+    ids: Optional[List[int]] = Field(
+        None,
+        min_length=1,
+        max_length=settings.ASIGNACION_AUTOMATICA_MAX_CASOS,
+        description="IDs de casos a asignar (se ignoran los que ya tienen tutor)"
+    )
+    filtros: Optional[FiltroAsignacionAutomatica] = Field(
+        None,
+        description="Alternativa a `ids`: todos los casos sin tutor que cumplan el filtro"
+    )
+    id_tutores: Optional[List[int]] = Field(
+        None,
+        min_length=1,
+        description="Restringir el reparto a estos tutores (por defecto, todos los activos)"
+    )
+    capacidad: Optional[int] = Field(
+        None,
+        gt=0,
+        description="Carga máxima por tutor (por defecto ASIGNACION_CAPACIDAD_TUTOR)"
+    )
+    simular: bool = Field(
+        False,
+        description="Calcular el reparto sin guardarlo"
+    )
+
+    @model_validator(mode="after")
+    def _ids_o_filtros(self):
+        if (self.ids is None) == (self.filtros is None):
+            raise ValueError("Debe indicar `ids` o `filtros` (no ambos)")
+        return self
+
+
+class AsignacionAutomaticaItem(BaseModel):
+    id_caso: int
+    id_usuario: int
+    tutor_nombre: str
+
+
+class CargaTutorResponse(BaseModel):
+    id_usuario: int
+    tutor_nombre: str
+    capacidad: int
+    carga_anterior: float
+    carga_final: float
+    casos_asignados: int
+
+
+class AsignacionAutomaticaResponse(BaseModel):
+    """Resultado del reparto"""
+    simulado: bool
+    asignaciones: List[AsignacionAutomaticaItem]
+    sin_asignar: List[int] = Field(..., description="Casos sin tutor con capacidad disponible")
+    tutores: List[CargaTutorResponse]
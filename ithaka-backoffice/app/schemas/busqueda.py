@@ -0,0 +1,26 @@
+"""
+Schemas BUSQUEDA
+----------------
+Resultados de la búsqueda full-text sobre casos, emprendedores y notas.
+"""
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ResultadoBusquedaResponse(BaseModel):
+    tipo: Literal["caso", "emprendedor", "nota"] = Field(
+        ...,
+        description="Entidad encontrada"
+    )
+    id: int = Field(..., description="ID de la entidad encontrada")
+    id_caso: Optional[int] = Field(
+        None,
+        description="ID del caso asociado (casos y notas)"
+    )
+    titulo: str = Field(..., description="Nombre del caso, del emprendedor o tipo de nota")
+    fragmento: Optional[str] = Field(
+        None,
+        description="Extracto de la descripción, contenido o email"
+    )
+    puntaje: float = Field(..., description="Relevancia (mayor es mejor)")
@@ -4,9 +4,16 @@ Schemas CASO
 Define casos de emprendedores (postulaciones/proyectos).
 """
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from datetime import datetime
-from typing import Optional, Any
+from typing import List, Optional, Any
+
+from app.schemas.apoyo import ApoyoResponse
+from app.schemas.apoyo_solicitado import ApoyoSolicitadoResponse
+from app.schemas.asignacion import AsignacionResponse
+from app.schemas.auditoria import AuditoriaResponse
+from app.schemas.emprendedor import EmprendedorResponse
+from app.schemas.nota import NotaResponse
 
 
 class CasoBase(BaseModel):
@@ -112,6 +119,52 @@ class CambiarEstadoCaso(BaseModel):
     )
 
 
+class FiltroCambioEstadoLote(BaseModel):
+    """Selección de casos por filtro (mismos criterios que el listado)"""
+    id_estado: Optional[int] = Field(None, gt=0)
+    tipo_caso: Optional[str] = None
+    nombre_estado: Optional[str] = Field(None, description="Estado actual de los casos")
+    id_emprendedor: Optional[int] = Field(None, gt=0)
+    id_convocatoria: Optional[int] = Field(None, gt=0)
+
+
+class CambiarEstadoLote(BaseModel):
+    """Schema para cambiar el estado de varios casos (PATCH /casos/estado)"""
+    nombre_estado: str = Field(
+        ...,
+        max_length=100,
+        description="Nombre del estado destino",
+        examples=["Rechazado", "En proyecto"]
+    )
+    ids: Optional[List[int]] = Field(
+        None,
+        min_length=1,
+        description="IDs de los casos a actualizar"
+    )
+    filtros: Optional[FiltroCambioEstadoLote] = Field(
+        None,
+        description="Alternativa a `ids`: actualizar todos los casos que cumplan el filtro"
+    )
+
+    @model_validator(mode="after")
+    def _ids_o_filtros(self):
+        if (self.ids is None) == (self.filtros is None):
+            raise ValueError("Debe indicar `ids` o `filtros` (no ambos)")
+        if self.filtros is not None and not self.filtros.model_dump(exclude_none=True):
+            raise ValueError("`filtros` debe incluir al menos un criterio")
+        return self
+
+
+class CambiarEstadoLoteResponse(BaseModel):
+    """Resumen del cambio de estado en lote"""
+    id_estado: int
+    nombre_estado: str = Field(..., description="Estado final (puede diferir del pedido, ver conversión a proyecto)")
+    actualizados: int
+    sin_cambios: int = Field(..., description="Casos que ya estaban en el estado destino")
+    no_encontrados: List[int] = Field(default_factory=list, description="IDs pedidos inexistentes")
+    convertidos_a_proyecto: bool = False
+
+
 class CasoResponse(CasoBase):
     """Schema para respuesta (GET)"""
     id_caso: int = Field(..., description="ID único del caso")
@@ -123,6 +176,72 @@ class CasoResponse(CasoBase):
     tutor_nombre: Optional[str] = Field(None, description="Nombre completo del tutor")
     id_tutor: Optional[Any] = Field(None, description="ID del tutor o 'Sin Asignar'")
     asignacion: Optional[Any] = Field(None, description="ID de la asignación o 'Sin Asignar'")
+    version: Optional[int] = Field(None, description="Versión de la fila (ETag para If-Match)")
     
     class Config:
         from_attributes = True
+
+
+# =============================================================================
+# FEED DE CAMBIOS (GET /casos/changes)
+# =============================================================================
+
+class CambiosCasosResponse(BaseModel):
+    cursor: int = Field(..., description="Valor de `since` para el próximo pedido")
+    hay_mas: bool = Field(..., description="Hay más cambios: volver a pedir con el nuevo cursor")
+    casos: List[CasoResponse] = Field(..., description="Casos modificados (estado actual)")
+    removidos: List[int] = Field(
+        default_factory=list,
+        description="IDs modificados que ya no existen o quedaron fuera del alcance del usuario"
+    )
+
+
+# =============================================================================
+# DETALLE COMPLETO (GET /casos/{id}/full)
+# =============================================================================
+# Secciones de la pantalla de detalle en una sola respuesta.
+
+class CasoDetalleResponse(CasoResponse):
+    programa_apoyo: Optional[str] = Field(None, description="Programa del primer apoyo otorgado")
+
+
+class AsignacionDetalleResponse(AsignacionResponse):
+    tutor_nombre: Optional[str] = Field(None, description="Nombre completo del tutor")
+    tutor_email: Optional[str] = Field(None, description="Email del tutor")
+
+
+class ApoyoDetalleResponse(ApoyoResponse):
+    apoyo: Optional[str] = Field(None, description="Nombre del apoyo (catálogo)")
+    programa: Optional[str] = Field(None, description="Nombre del programa")
+
+
+class ApoyoSolicitadoDetalleResponse(ApoyoSolicitadoResponse):
+    apoyo: Optional[str] = Field(None, description="Nombre del apoyo solicitado (catálogo)")
+
+
+class NotasPaginadas(BaseModel):
+    total: int
+    skip: int
+    limit: int
+    items: List[NotaResponse]
+
+
+class AuditoriaPaginada(BaseModel):
+    total: int
+    skip: int
+    limit: int
+    items: List[AuditoriaResponse]
+
+
+class CasoCompletoResponse(BaseModel):
+    """Caso con todas las secciones de su pantalla de detalle."""
+    caso: CasoDetalleResponse
+    emprendedor: Optional[EmprendedorResponse] = None
+    asignaciones: List[AsignacionDetalleResponse]
+    apoyos: List[ApoyoDetalleResponse]
+    apoyos_solicitados: List[ApoyoSolicitadoDetalleResponse]
+    notas: NotasPaginadas
+    auditoria: Optional[AuditoriaPaginada] = Field(
+        None,
+        description="Historial del caso (solo Admin y Coordinador)"
+    )
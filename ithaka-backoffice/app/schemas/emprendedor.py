@@ -121,6 +121,8 @@ class EmprendedorResponse(EmprendedorBase):
         ...,
         description="Fecha y hora de registro en el sistema"
     )
+
+    version: Optional[int] = Field(None, description="Versión de la fila (ETag para If-Match)")
     
     class Config:
         from_attributes = True
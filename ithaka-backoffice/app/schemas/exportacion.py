@@ -0,0 +1,49 @@
+"""
+Schemas EXPORTACION
+-------------------
+Trabajos de exportación de casos en segundo plano (ver
+app/services/exportacion_service.py).
+"""
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ExportacionCreate(BaseModel):
+    formato: Literal["csv", "xlsx", "parquet", "arrow"] = Field(
+        "csv",
+        description="Formato del archivo"
+    )
+    hojas: List[Literal["notas", "apoyos", "asignaciones"]] = Field(
+        default_factory=list,
+        description="Hojas adicionales (solo XLSX)"
+    )
+    id_estado: Optional[int] = None
+    tipo_caso: Optional[str] = None
+    nombre_estado: Optional[str] = None
+    id_emprendedor: Optional[int] = None
+    id_convocatoria: Optional[int] = None
+    id_tutor: Optional[int] = None
+    chatbot_contiene: Optional[str] = Field(
+        None,
+        description='Objeto JSON contenido en datos_chatbot, ej: {"sector": "Tecnología"}'
+    )
+    chatbot: Optional[List[str]] = Field(
+        None,
+        description="Filtros clave=valor sobre datos_chatbot (claves anidadas con '.')"
+    )
+
+
+class ExportacionResponse(BaseModel):
+    id_trabajo: str
+    estado: Literal["pendiente", "en_proceso", "completado", "error"]
+    formato: str
+    procesados: int = Field(..., description="Casos escritos hasta el momento")
+    total: Optional[int] = Field(None, description="Casos a exportar (se conoce al iniciar)")
+    progreso: float = Field(..., ge=0, le=1)
+    creado: datetime
+    finalizado: Optional[datetime] = None
+    tamano: Optional[int] = Field(None, description="Tamaño del archivo en bytes")
+    error: Optional[str] = None
+    url_descarga: Optional[str] = None
@@ -1,3 +1,5 @@
+from datetime import date, datetime
+
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 
@@ -28,4 +30,125 @@ class DashboardMetricasResponse(BaseModel):
     totales: TotalesDashboard
     proyectos_por_estado: List[EstadoDistribucion]
     postulaciones_por_estado: List[EstadoDistribucion]
-    distribucion_apoyos: List[ApoyoDistribucion]
\ No newline at end of file
+    distribucion_apoyos: List[ApoyoDistribucion]
+
+
+class CompresionCodificacion(BaseModel):
+    respuestas: int
+    bytes_originales: int
+    bytes_comprimidos: int
+    ratio: Optional[float]
+    segundos: float
+    ms_por_respuesta: float
+
+
+class CompresionMetricasResponse(BaseModel):
+    codificaciones: Dict[str, CompresionCodificacion]
+
+
+class TutorEstadoCantidad(BaseModel):
+    tipo_caso: str
+    nombre_estado: str
+    cantidad: int
+
+
+class TutorCasoActivo(BaseModel):
+    id_caso: int
+    nombre_caso: str
+    nombre_estado: str
+    ultima_nota: Optional[datetime]
+    dias_sin_nota: Optional[int]
+
+
+class TutorCartera(BaseModel):
+    id_usuario: int
+    nombre: str
+    email: str
+    total_casos: int
+    casos_activos: int
+    notas_recientes: int
+    por_estado: List[TutorEstadoCantidad]
+    casos: List[TutorCasoActivo]
+
+
+class TutoresMetricasResponse(BaseModel):
+    filtros: Dict[str, Any]
+    tutores: List[TutorCartera]
+
+
+class SeriePunto(BaseModel):
+    periodo: date
+    casos_nuevos: int
+    cambios_estado: int
+    notas: int
+
+
+class SeriesMetricasResponse(BaseModel):
+    granularidad: str
+    filtros: Dict[str, Any]
+    puntos: List[SeriePunto]
+
+
+class FunnelTransicion(BaseModel):
+    id_estado: int
+    destino: str
+    tipo_caso: Optional[str]
+    cantidad: int
+    porcentaje: float
+
+
+class FunnelEstado(BaseModel):
+    id_estado: int
+    nombre_estado: str
+    tipo_caso: Optional[str]
+    entradas: int
+    salidas: int
+    casos_actuales: int
+    dias_promedio: Optional[float]
+    transiciones: List[FunnelTransicion]
+
+
+class FunnelMetricasResponse(BaseModel):
+    filtros: Dict[str, Any]
+    ultimo_id_auditoria: int
+    estados: List[FunnelEstado]
+
+
+class ProyectosTotales(BaseModel):
+    proyectos: int
+    proyectos_con_apoyo: int
+    apoyos: int
+    apoyos_activos: int
+    apoyos_por_proyecto: float
+
+
+class ProyectosPorEstado(BaseModel):
+    id_convocatoria: Optional[int]
+    convocatoria: Optional[str]
+    nombre_estado: str
+    cantidad: int
+
+
+class ProyectosApoyo(BaseModel):
+    apoyo: str
+    cantidad: int
+    proyectos: int
+    activos: int
+
+
+class ProyectosPrograma(BaseModel):
+    id_programa: int
+    nombre: str
+    proyectos: int
+    apoyos: int
+    apoyos_activos: int
+    inicio_activos: Optional[date]
+    fin_activos: Optional[date]
+
+
+class ProyectosMetricasResponse(BaseModel):
+    filtros: Dict[str, Any]
+    totales: ProyectosTotales
+    por_estado: List[ProyectosPorEstado]
+    apoyos: List[ProyectosApoyo]
+    programas: List[ProyectosPrograma]
@@ -60,6 +60,7 @@ class NotaUpdate(BaseModel):
 class NotaResponse(NotaBase):
     id_nota: int = Field(..., description="ID único de la nota")
     fecha: datetime = Field(..., description="Fecha de creación de la nota")
+    version: Optional[int] = Field(None, description="Versión de la fila (ETag para If-Match)")
 
     class Config:
         from_attributes = True
@@ -0,0 +1,246 @@
+"""Asignación automática de tutores a casos sin asignar.
+
+`POST /asignaciones/automatica` reparte un lote de casos entre los tutores
+activos según su carga actual:
+
+- Carga de un tutor: suma del peso de sus casos en estados activos (no
+  cerrados, ver `ESTADOS_CERRADOS`), calculada con un solo agregado.
+- Peso de un caso: 1 + `PESO_APOYO_SOLICITADO` por cada apoyo distinto
+  solicitado (un caso que pide más apoyos demanda más seguimiento). La
+  misma definición rige la carga de los tutores y el reparto.
+- Reparto: los casos más pesados primero; cada uno va al tutor con menor
+  ocupación (carga / capacidad) que todavía tenga lugar. A igual ocupación
+  se prefiere al tutor que ya acompaña casos con los mismos apoyos.
+
+Concurrencia: al guardar, los casos elegidos se leen con `FOR UPDATE SKIP
+LOCKED` (PostgreSQL; en SQLite no aplica): dos repartos simultáneos no
+toman el mismo caso, y el segundo no ve los que el primero está
+asignando.
+
+Las asignaciones y su auditoría se escriben con dos INSERT multi-fila en una
+sola transacción. Como no pasan por el unit of work del ORM, la cache de
+acceso de los tutores afectados se invalida explícitamente al confirmar.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from sqlalchemy import exists, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.versionado import incrementar_version_casos
+from app.models.apoyo_solicitado import ApoyoSolicitado
+from app.models.asignacion import Asignacion
+from app.models.auditoria import Auditoria
+from app.models.caso import Caso
+from app.models.catalogo_estados import ESTADOS_CERRADOS, CatalogoEstados
+from app.models.rol import Rol
+from app.models.usuario import Usuario
+from app.services import eventos_service
+from app.services.autorizacion_service import invalidar_tutor
+
+PESO_APOYO_SOLICITADO = 0.5
+
+
+@dataclass
+class CargaTutor:
+    id_usuario: int
+    nombre: str
+    capacidad: int
+    carga_inicial: float
+    carga: float
+    apoyos: set[int] = field(default_factory=set)
+
+    @property
+    def ocupacion(self) -> float:
+        return self.carga / self.capacidad
+
+
+@dataclass
+class ResultadoAsignacion:
+    asignaciones: list[tuple[int, CargaTutor]]
+    sin_asignar: list[int]
+    tutores: list[CargaTutor]
+
+
+def peso_caso(apoyos_solicitados: int) -> float:
+    """Peso de un caso según la cantidad de apoyos que solicita."""
+    return 1 + PESO_APOYO_SOLICITADO * apoyos_solicitados
+
+
+def _apoyos_por_caso():
+    """Cantidad de apoyos distintos solicitados por caso."""
+    return (
+        select(
+            ApoyoSolicitado.id_caso,
+            func.count(func.distinct(ApoyoSolicitado.id_catalogo_apoyo)).label("cantidad"),
+        )
+        .group_by(ApoyoSolicitado.id_caso)
+        .subquery()
+    )
+
+
+def cargas_tutores(
+    db: Session,
+    capacidad: int,
+    id_tutores: Optional[Iterable[int]] = None,
+) -> list[CargaTutor]:
+    """Tutores activos con su carga ponderada sobre casos en estados activos."""
+    apoyos = _apoyos_por_caso()
+    peso = 1 + PESO_APOYO_SOLICITADO * func.coalesce(apoyos.c.cantidad, 0)
+
+    # Asignaciones sobre casos activos (outer join: tutores sin casos = carga 0)
+    activos = (
+        db.query(Asignacion.id_usuario, Asignacion.id_caso, peso.label("peso"))
+        .join(Caso, Caso.id_caso == Asignacion.id_caso)
+        .join(CatalogoEstados, CatalogoEstados.id_estado == Caso.id_estado)
+        .outerjoin(apoyos, apoyos.c.id_caso == Asignacion.id_caso)
+        .filter(CatalogoEstados.nombre_estado.notin_(ESTADOS_CERRADOS))
+        .subquery()
+    )
+
+    query = (
+        db.query(
+            Usuario.id_usuario,
+            Usuario.nombre,
+            Usuario.apellido,
+            func.coalesce(func.sum(activos.c.peso), 0).label("carga"),
+        )
+        .join(Rol, Rol.id_rol == Usuario.id_rol)
+        .outerjoin(activos, activos.c.id_usuario == Usuario.id_usuario)
+        .filter(Rol.nombre_rol == "Tutor", Usuario.activo.is_(True))
+        .group_by(Usuario.id_usuario, Usuario.nombre, Usuario.apellido)
+    )
+    if id_tutores is not None:
+        query = query.filter(Usuario.id_usuario.in_(list(id_tutores)))
+
+    tutores = {
+        fila.id_usuario: CargaTutor(
+            id_usuario=fila.id_usuario,
+            nombre=f"{fila.nombre} {fila.apellido or ''}".strip(),
+            capacidad=capacidad,
+            carga_inicial=float(fila.carga),
+            carga=float(fila.carga),
+        )
+        for fila in query.all()
+    }
+
+    # Afinidad: apoyos solicitados de los casos activos de cada tutor
+    if tutores:
+        filas = (
+            db.query(activos.c.id_usuario, ApoyoSolicitado.id_catalogo_apoyo)
+            .join(ApoyoSolicitado, ApoyoSolicitado.id_caso == activos.c.id_caso)
+            .filter(activos.c.id_usuario.in_(list(tutores)))
+            .distinct()
+            .all()
+        )
+        for id_usuario, id_catalogo_apoyo in filas:
+            tutores[id_usuario].apoyos.add(id_catalogo_apoyo)
+
+    return sorted(tutores.values(), key=lambda t: t.id_usuario)
+
+
+def casos_sin_asignar(
+    db: Session,
+    ids: Optional[list[int]],
+    filtros: Optional[dict],
+    limite: int,
+    bloquear: bool = False,
+) -> list[int]:
+    """
+    IDs (hasta `limite` + 1) de los casos seleccionados que no tienen tutor.
+    Con `bloquear`, los bloquea hasta el fin de la transacción y omite los
+    que otra transacción tiene bloqueados.
+    """
+    query = db.query(Caso.id_caso).filter(
+        ~exists().where(Asignacion.id_caso == Caso.id_caso)
+    )
+    if ids is not None:
+        query = query.filter(Caso.id_caso.in_(ids))
+    else:
+        filtros = filtros or {}
+        if filtros.get("id_convocatoria"):
+            query = query.filter(Caso.id_convocatoria == filtros["id_convocatoria"])
+        if filtros.get("id_estado"):
+            query = query.filter(Caso.id_estado == filtros["id_estado"])
+        if filtros.get("nombre_estado") or filtros.get("tipo_caso"):
+            query = query.join(CatalogoEstados, CatalogoEstados.id_estado == Caso.id_estado)
+            if filtros.get("nombre_estado"):
+                query = query.filter(CatalogoEstados.nombre_estado == filtros["nombre_estado"])
+            if filtros.get("tipo_caso"):
+                query = query.filter(CatalogoEstados.tipo_caso == filtros["tipo_caso"])
+    query = query.order_by(Caso.id_caso).limit(limite + 1)
+    if bloquear:
+        query = query.with_for_update(of=Caso, skip_locked=True)
+    return [fila.id_caso for fila in query]
+
+
+def repartir(
+    db: Session,
+    id_casos: list[int],
+    tutores: list[CargaTutor],
+) -> ResultadoAsignacion:
+    """Calcula el reparto (no escribe en la base)."""
+    # Apoyos distintos por caso: mismo peso que en `cargas_tutores`
+    apoyos_caso: dict[int, set[int]] = {id_caso: set() for id_caso in id_casos}
+    if id_casos:
+        for id_caso, id_catalogo_apoyo in db.query(
+            ApoyoSolicitado.id_caso, ApoyoSolicitado.id_catalogo_apoyo
+        ).filter(ApoyoSolicitado.id_caso.in_(id_casos)):
+            apoyos_caso[id_caso].add(id_catalogo_apoyo)
+
+    # Más pesados primero: reparte mejor que el orden de llegada
+    orden = sorted(id_casos, key=lambda id_caso: (-len(apoyos_caso[id_caso]), id_caso))
+
+    asignaciones: list[tuple[int, CargaTutor]] = []
+    sin_asignar: list[int] = []
+    for id_caso in orden:
+        peso = peso_caso(len(apoyos_caso[id_caso]))
+        candidatos = [t for t in tutores if t.carga + peso <= t.capacidad]
+        if not candidatos:
+            sin_asignar.append(id_caso)
+            continue
+        elegido = min(
+            candidatos,
+            key=lambda t: (
+                round(t.ocupacion, 6),
+                -len(t.apoyos & apoyos_caso[id_caso]),
+                t.id_usuario,
+            ),
+        )
+        elegido.carga += peso
+        elegido.apoyos |= apoyos_caso[id_caso]
+        asignaciones.append((id_caso, elegido))
+
+    asignaciones.sort(key=lambda par: par[0])
+    return ResultadoAsignacion(asignaciones=asignaciones, sin_asignar=sorted(sin_asignar), tutores=tutores)
+
+
+def guardar(db: Session, resultado: ResultadoAsignacion, id_usuario_actor: int) -> None:
+    """Inserta asignaciones y auditoría en bloque y confirma la transacción."""
+    if not resultado.asignaciones:
+        return
+
+    db.execute(insert(Asignacion), [
+        {"id_caso": id_caso, "id_usuario": tutor.id_usuario}
+        for id_caso, tutor in resultado.asignaciones
+    ])
+    db.execute(insert(Auditoria), [
+        {
+            "accion": "Asignación automática de tutor",
+            "valor_anterior": None,
+            "valor_nuevo": tutor.nombre,
+            "id_usuario": id_usuario_actor,
+            "id_caso": id_caso,
+        }
+        for id_caso, tutor in resultado.asignaciones
+    ])
+    id_casos = [id_caso for id_caso, _ in resultado.asignaciones]
+    incrementar_version_casos(db, Caso.id_caso.in_(id_casos))
+    eventos_service.encolar_varios(db, "Asignación automática de tutor", id_casos)
+    db.commit()
+
+    for id_usuario in {tutor.id_usuario for _, tutor in resultado.asignaciones}:
+        invalidar_tutor(id_usuario)
@@ -3,11 +3,19 @@
 from __future__ import annotations
 
 import json
+import re
 from typing import Any, Optional
 
 from sqlalchemy.orm import Session
 
 from app.models.auditoria import Auditoria
+from app.services import eventos_service
+
+# PUT /casos/{id} registra "Caso actualizado" con `str(dict)` de los campos
+_ID_ESTADO = re.compile(r"'id_estado':\s*(\d+)")
+
+# Registros de /asignaciones con los que un tutor deja de tener un caso
+ACCIONES_DESASIGNACION = ("Eliminación de asignación", "Actualización de asignación")
 
 
 def _serializar_valor(valor: Any) -> Optional[str]:
@@ -39,6 +47,7 @@ def registrar_auditoria_caso(
     Importante:
     - No hace commit.
     - Debe llamarse dentro de la misma transaccion de negocio.
+    - Publica el evento correspondiente en `/casos/events` al confirmar.
     """
     registro = Auditoria(
         accion=accion,
@@ -48,6 +57,7 @@ def registrar_auditoria_caso(
         id_caso=id_caso,
     )
     db.add(registro)
+    eventos_service.encolar(db, accion, id_caso)
     return registro
 
 
@@ -77,5 +87,41 @@ def registrar_auditoria_general(
         id_caso=id_caso,
     )
     db.add(registro)
+    eventos_service.encolar(db, accion, id_caso)
     return registro
-    return registro
+
+
+def estados_en_actualizacion(
+    valor_anterior: Optional[str], valor_nuevo: Optional[str]
+) -> Optional[tuple[Optional[int], int]]:
+    """
+    (id_estado anterior, id_estado nuevo) de un registro "Caso actualizado",
+    o None si la actualización no incluyó `id_estado`. El anterior puede
+    ser igual al nuevo (se envió el mismo estado).
+    """
+    nuevo = _ID_ESTADO.search(valor_nuevo or "")
+    if not nuevo:
+        return None
+    anterior = _ID_ESTADO.search(valor_anterior or "")
+    return int(anterior.group(1)) if anterior else None, int(nuevo.group(1))
+
+
+def tutor_desasignado(registro: Auditoria) -> Optional[int]:
+    """
+    Tutor que perdió la asignación del caso en un registro de
+    `ACCIONES_DESASIGNACION`, o None si no cambió el tutor.
+
+    La eliminación guarda al tutor en `id_usuario`; la actualización guarda
+    al tutor nuevo en `id_usuario` y los campos anteriores como JSON.
+    """
+    if registro.accion == "Eliminación de asignación":
+        return registro.id_usuario
+    if registro.accion != "Actualización de asignación":
+        return None
+    try:
+        anterior = json.loads(registro.valor_anterior or "")
+    except ValueError:
+        return None
+    if not isinstance(anterior, dict) or anterior.get("id_usuario") in (None, registro.id_usuario):
+        return None
+    return int(anterior["id_usuario"])
@@ -0,0 +1,271 @@
+"""Autorizacion de Tutores sobre casos asignados.
+
+Alcance en listados: `aplicar_alcance_tutor` / `aplicar_alcance_tutor_emprendedor`
+agregan la restricción como `EXISTS` correlacionado sobre `asignacion`, sin
+joins que dupliquen filas (la paginación sigue siendo correcta y no hace
+falta DISTINCT).
+
+Chequeos puntuales: mantiene en memoria, por Tutor, el conjunto de `id_caso` asignados (y los
+`id_emprendedor` de esos casos), de modo que los chequeos de acceso de los
+endpoints no consulten `asignacion` en cada request.
+
+Invalidacion:
+- Automatica ante cualquier alta/baja/cambio de `Asignacion` hecho por el ORM
+  (crear_asignacion, eliminar_asignacion, actualizar_asignacion, scripts,
+  fixtures), y ante cambios de `Caso.id_emprendedor`.
+- Entre workers: con `EVENTOS_LISTEN_NOTIFY` (PostgreSQL) la transacción
+  envía los tutores afectados por `pg_notify` en `CANAL_NOTIFY` y cada
+  worker los invalida desde el hilo LISTEN de `eventos_service`.
+- Por TTL (`settings.CACHE_ASIGNACIONES_TTL_SEGUNDOS`), que acota la
+  desactualizacion frente a SQL manual o sin LISTEN/NOTIFY.
+
+Cada invalidación incrementa una generación: una carga que empezó antes
+no guarda su resultado (podría haber leído las asignaciones anteriores).
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event, exists, inspect, text
+from sqlalchemy.orm import Query, Session, aliased
+
+from app.core.config import settings
+from app.models.asignacion import Asignacion
+from app.models.caso import Caso
+from app.models.usuario import Usuario
+from app.services import eventos_service
+
+_TUTOR_ROLE = "Tutor"
+
+CANAL_NOTIFY = "ithaka_autorizacion"
+
+# Por encima de este tamaño se notifica invalidar todo (límite de NOTIFY: 8000 bytes)
+_MAX_PAYLOAD_NOTIFY = 7000
+
+
+class AccesoTutor(NamedTuple):
+    """Casos y emprendedores visibles para un Tutor."""
+    casos: frozenset[int]
+    emprendedores: frozenset[int]
+
+
+_cache: dict[int, tuple[float, AccesoTutor]] = {}
+_lock = threading.Lock()
+_generacion = 0
+
+
+def es_tutor(current_user: Optional[Usuario]) -> bool:
+    """Determina si el usuario autenticado tiene rol Tutor."""
+    return bool(current_user and current_user.rol and current_user.rol.nombre_rol == _TUTOR_ROLE)
+
+
+def _cargar_acceso(db: Session, id_tutor: int) -> AccesoTutor:
+    """Consulta (una sola vez) los casos asignados al Tutor."""
+    filas = db.query(Asignacion.id_caso, Caso.id_emprendedor).join(
+        Caso, Caso.id_caso == Asignacion.id_caso
+    ).filter(
+        Asignacion.id_usuario == id_tutor
+    ).all()
+    return AccesoTutor(
+        casos=frozenset(fila.id_caso for fila in filas),
+        emprendedores=frozenset(fila.id_emprendedor for fila in filas),
+    )
+
+
+def acceso_tutor(db: Session, id_tutor: int) -> AccesoTutor:
+    """Retorna los casos/emprendedores del Tutor, desde cache si está vigente."""
+    ahora = time.monotonic()
+    with _lock:
+        entrada = _cache.get(id_tutor)
+        generacion = _generacion
+    if entrada is not None and entrada[0] > ahora:
+        return entrada[1]
+
+    acceso = _cargar_acceso(db, id_tutor)
+    with _lock:
+        if _generacion == generacion:
+            _cache[id_tutor] = (ahora + settings.CACHE_ASIGNACIONES_TTL_SEGUNDOS, acceso)
+    return acceso
+
+
+def casos_asignados(db: Session, id_tutor: int) -> frozenset[int]:
+    """IDs de casos asignados al Tutor."""
+    return acceso_tutor(db, id_tutor).casos
+
+
+def tutor_tiene_caso(db: Session, id_tutor: int, id_caso: int) -> bool:
+    """Verifica si el Tutor está asignado al caso indicado."""
+    return id_caso in casos_asignados(db, id_tutor)
+
+
+def tutor_tiene_emprendedor(db: Session, id_tutor: int, id_emprendedor: int) -> bool:
+    """Verifica si el Tutor tiene algún caso asignado de ese emprendedor."""
+    return id_emprendedor in acceso_tutor(db, id_tutor).emprendedores
+
+
+def puede_ver_caso(db: Session, current_user: Usuario, id_caso: int) -> bool:
+    """Admin/Coordinador ven todo; Tutor solo sus casos asignados."""
+    return not es_tutor(current_user) or tutor_tiene_caso(db, current_user.id_usuario, id_caso)
+
+
+def invalidar_tutor(id_tutor: Optional[int]) -> None:
+    """Descarta la entrada de cache de un Tutor."""
+    global _generacion
+    if id_tutor is None:
+        return
+    with _lock:
+        _generacion += 1
+        _cache.pop(id_tutor, None)
+
+
+def invalidar_todo() -> None:
+    """Vacía la cache completa."""
+    global _generacion
+    with _lock:
+        _generacion += 1
+        _cache.clear()
+
+
+# ============================================================================
+# ALCANCE EN LISTADOS (EXISTS correlacionado)
+# ============================================================================
+
+_AsignacionAlcance = aliased(Asignacion)
+_CasoAlcance = aliased(Caso)
+
+
+def caso_asignado_a(columna_id_caso, id_usuario: int):
+    """`EXISTS` que exige una asignación de `id_usuario` al caso de `columna_id_caso`."""
+    return exists().where(
+        _AsignacionAlcance.id_caso == columna_id_caso,
+        _AsignacionAlcance.id_usuario == id_usuario,
+    )
+
+
+def emprendedor_asignado_a(columna_id_emprendedor, id_usuario: int):
+    """`EXISTS` que exige algún caso del emprendedor asignado a `id_usuario`."""
+    return exists().where(
+        _CasoAlcance.id_emprendedor == columna_id_emprendedor,
+        _AsignacionAlcance.id_caso == _CasoAlcance.id_caso,
+        _AsignacionAlcance.id_usuario == id_usuario,
+    )
+
+
+def aplicar_alcance_tutor(
+    query: Query,
+    current_user: Optional[Usuario],
+    columna_id_caso,
+    id_tutor: Optional[int] = None,
+) -> Query:
+    """
+    Restringe `query` a filas cuyo caso (`columna_id_caso`) esté asignado al
+    Tutor autenticado y, si se indica, también al tutor filtrado `id_tutor`.
+    """
+    if es_tutor(current_user):
+        query = query.filter(caso_asignado_a(columna_id_caso, current_user.id_usuario))
+    if id_tutor is not None:
+        query = query.filter(caso_asignado_a(columna_id_caso, id_tutor))
+    return query
+
+
+def aplicar_alcance_tutor_emprendedor(
+    query: Query,
+    current_user: Optional[Usuario],
+    columna_id_emprendedor,
+) -> Query:
+    """Restringe `query` a emprendedores con algún caso asignado al Tutor autenticado."""
+    if es_tutor(current_user):
+        query = query.filter(emprendedor_asignado_a(columna_id_emprendedor, current_user.id_usuario))
+    return query
+
+
+# ============================================================================
+# INVALIDACIÓN AUTOMÁTICA (eventos del ORM)
+# ============================================================================
+
+def _tutores_afectados(asignacion: Asignacion) -> set[int]:
+    """Tutor actual y, si cambió, el anterior."""
+    tutores = {asignacion.id_usuario}
+    historial = inspect(asignacion).attrs.id_usuario.history
+    tutores.update(historial.deleted or ())
+    return {t for t in tutores if t is not None}
+
+
+def _marcar_pendientes(session: Session, tutores: set[int], todos: bool = False) -> None:
+    """Invalida ya y agenda una segunda invalidación al confirmar la transacción."""
+    for id_tutor in tutores:
+        invalidar_tutor(id_tutor)
+    if todos:
+        invalidar_todo()
+
+    pendientes = session.info.setdefault("autorizacion_pendiente", {"tutores": set(), "todos": False})
+    pendientes["tutores"].update(tutores)
+    pendientes["todos"] = pendientes["todos"] or todos
+
+
+@event.listens_for(Session, "before_flush")
+def _detectar_cambios(session, flush_context, instances):
+    tutores: set[int] = set()
+    todos = False
+
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, Asignacion):
+            tutores.update(_tutores_afectados(obj))
+        elif isinstance(obj, Caso) and obj in session.deleted:
+            todos = True
+
+    for obj in session.dirty:
+        if isinstance(obj, Asignacion) and session.is_modified(obj):
+            tutores.update(_tutores_afectados(obj))
+            if inspect(obj).attrs.id_caso.history.has_changes():
+                tutores.add(obj.id_usuario)
+        elif isinstance(obj, Caso) and inspect(obj).attrs.id_emprendedor.history.has_changes():
+            todos = True
+
+    if tutores or todos:
+        _marcar_pendientes(session, tutores, todos)
+
+
+@event.listens_for(Session, "before_commit")
+def _notificar(session):
+    pendientes = session.info.get("autorizacion_pendiente")
+    if not pendientes or not eventos_service.usa_notify(session):
+        return
+    payload = json.dumps({"tutores": sorted(pendientes["tutores"]), "todos": pendientes["todos"]})
+    if len(payload) > _MAX_PAYLOAD_NOTIFY:
+        payload = json.dumps({"tutores": [], "todos": True})
+    session.execute(text("SELECT pg_notify(:canal, :payload)"), {"canal": CANAL_NOTIFY, "payload": payload})
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_al_confirmar(session):
+    # Un request concurrente pudo recargar la cache entre el flush y el commit
+    pendientes = session.info.pop("autorizacion_pendiente", None)
+    if not pendientes:
+        return
+    if pendientes["todos"]:
+        invalidar_todo()
+    for id_tutor in pendientes["tutores"]:
+        invalidar_tutor(id_tutor)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_pendientes(session):
+    session.info.pop("autorizacion_pendiente", None)
+
+
+def _invalidar_notificados(payload: str) -> None:
+    """Invalidación recibida de otro worker (o de este mismo, sin efecto extra)."""
+    datos = json.loads(payload)
+    if datos["todos"]:
+        invalidar_todo()
+    for id_tutor in datos["tutores"]:
+        invalidar_tutor(id_tutor)
+
+
+# Tras una reconexión del listener pudo perderse alguna invalidación
+eventos_service.registrar_canal(CANAL_NOTIFY, _invalidar_notificados, al_conectar=invalidar_todo)
@@ -0,0 +1,167 @@
+"""Busqueda full-text sobre casos, emprendedores y notas.
+
+Arma una unica consulta (UNION ALL de las tres entidades) ordenada por
+relevancia, con el alcance de Tutor aplicado dentro de la misma consulta.
+Usa los indices definidos en `app/db/busqueda.py` segun el motor.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.usuario import Usuario
+
+TIPOS_BUSQUEDA = ("caso", "emprendedor", "nota")
+LARGO_FRAGMENTO = 200
+
+
+# ============================================================================
+# POSTGRESQL
+# ============================================================================
+
+_PG_SELECTS = {
+    "caso": """
+        SELECT 'caso' AS tipo, c.id_caso AS id, c.id_caso AS id_caso,
+               c.nombre_caso AS titulo, left(c.descripcion, :largo) AS fragmento,
+               greatest(ts_rank(c.search_vector, websearch_to_tsquery('spanish', :texto)),
+                        similarity(c.nombre_caso, :texto)) AS puntaje
+        FROM caso c
+        WHERE (c.search_vector @@ websearch_to_tsquery('spanish', :texto)
+               OR c.nombre_caso % :texto)
+        {alcance}
+    """,
+    "emprendedor": """
+        SELECT 'emprendedor' AS tipo, e.id_emprendedor AS id, NULL AS id_caso,
+               e.nombre || ' ' || e.apellido AS titulo, e.email AS fragmento,
+               greatest(ts_rank(e.search_vector, websearch_to_tsquery('simple', :texto)),
+                        similarity(e.nombre || ' ' || e.apellido, :texto),
+                        similarity(e.email, :texto)) AS puntaje
+        FROM emprendedor e
+        WHERE (e.search_vector @@ websearch_to_tsquery('simple', :texto)
+               OR (e.nombre || ' ' || e.apellido) % :texto
+               OR e.email % :texto
+               OR e.documento_identidad % :texto)
+        {alcance}
+    """,
+    "nota": """
+        SELECT 'nota' AS tipo, n.id_nota AS id, n.id_caso AS id_caso,
+               n.tipo_nota AS titulo, left(n.contenido, :largo) AS fragmento,
+               ts_rank(n.search_vector, websearch_to_tsquery('spanish', :texto)) AS puntaje
+        FROM nota n
+        WHERE n.search_vector @@ websearch_to_tsquery('spanish', :texto)
+        {alcance}
+    """,
+}
+
+
+# ============================================================================
+# SQLITE (FTS5)
+# ============================================================================
+
+_SQLITE_SELECTS = {
+    "caso": """
+        SELECT 'caso' AS tipo, c.id_caso AS id, c.id_caso AS id_caso,
+               c.nombre_caso AS titulo, substr(c.descripcion, 1, :largo) AS fragmento,
+               -bm25(caso_fts) AS puntaje
+        FROM caso_fts JOIN caso c ON c.id_caso = caso_fts.rowid
+        WHERE caso_fts MATCH :consulta
+        {alcance}
+    """,
+    "emprendedor": """
+        SELECT 'emprendedor' AS tipo, e.id_emprendedor AS id, NULL AS id_caso,
+               e.nombre || ' ' || e.apellido AS titulo, e.email AS fragmento,
+               -bm25(emprendedor_fts) AS puntaje
+        FROM emprendedor_fts JOIN emprendedor e ON e.id_emprendedor = emprendedor_fts.rowid
+        WHERE emprendedor_fts MATCH :consulta
+        {alcance}
+    """,
+    "nota": """
+        SELECT 'nota' AS tipo, n.id_nota AS id, n.id_caso AS id_caso,
+               n.tipo_nota AS titulo, substr(n.contenido, 1, :largo) AS fragmento,
+               -bm25(nota_fts) AS puntaje
+        FROM nota_fts JOIN nota n ON n.id_nota = nota_fts.rowid
+        WHERE nota_fts MATCH :consulta
+        {alcance}
+    """,
+}
+
+
+# Restricciones de Tutor: solo entidades ligadas a casos asignados.
+_ALCANCE_TUTOR = {
+    "caso": """
+        AND EXISTS (SELECT 1 FROM asignacion a
+                    WHERE a.id_caso = c.id_caso AND a.id_usuario = :id_tutor)
+    """,
+    "emprendedor": """
+        AND EXISTS (SELECT 1 FROM caso ce JOIN asignacion a ON a.id_caso = ce.id_caso
+                    WHERE ce.id_emprendedor = e.id_emprendedor AND a.id_usuario = :id_tutor)
+    """,
+    "nota": """
+        AND EXISTS (SELECT 1 FROM asignacion a
+                    WHERE a.id_caso = n.id_caso AND a.id_usuario = :id_tutor)
+    """,
+}
+
+
+def _consulta_fts5(texto: str) -> Optional[str]:
+    """Convierte el texto libre en una consulta FTS5 segura (AND de prefijos)."""
+    terminos = re.findall(r"\w+", texto)
+    if not terminos:
+        return None
+    return " ".join(f'"{termino}"*' for termino in terminos)
+
+
+def buscar(
+    db: Session,
+    texto: str,
+    current_user: Optional[Usuario] = None,
+    tipos: Optional[Iterable[str]] = None,
+    limit: int = 20,
+) -> list[dict]:
+    """
+    Busca `texto` en casos, emprendedores y notas en una sola consulta.
+
+    Retorna una lista de dicts (tipo, id, id_caso, titulo, fragmento, puntaje)
+    ordenada por relevancia descendente.
+    """
+    tipos_validos = [t for t in TIPOS_BUSQUEDA if tipos is None or t in set(tipos)]
+    if not tipos_validos:
+        return []
+
+    es_tutor = bool(
+        current_user
+        and current_user.rol
+        and current_user.rol.nombre_rol == "Tutor"
+    )
+
+    dialecto = db.get_bind().dialect.name
+    params = {"largo": LARGO_FRAGMENTO, "limite": limit}
+
+    if dialecto == "postgresql":
+        selects = _PG_SELECTS
+        params["texto"] = texto
+    else:
+        selects = _SQLITE_SELECTS
+        consulta = _consulta_fts5(texto)
+        if consulta is None:
+            return []
+        params["consulta"] = consulta
+
+    if es_tutor:
+        params["id_tutor"] = current_user.id_usuario
+
+    partes = [
+        selects[tipo].format(alcance=_ALCANCE_TUTOR[tipo] if es_tutor else "")
+        for tipo in tipos_validos
+    ]
+    sql = (
+        "SELECT * FROM (" + " UNION ALL ".join(partes) + ") AS resultados "
+        "ORDER BY puntaje DESC, tipo, id LIMIT :limite"
+    )
+
+    filas = db.execute(text(sql), params).mappings().all()
+    return [dict(fila) for fila in filas]
@@ -0,0 +1,96 @@
+"""Feed incremental de casos modificados (`GET /casos/changes`).
+
+Toda escritura sobre un caso (alta, edición, estado, asignaciones, notas,
+apoyos) deja un registro en `auditoria` en la misma transacción, así que
+`auditoria.id_auditoria` (creciente) sirve de cursor: los casos cambiados
+después del cursor son los `id_caso` de los registros con id mayor.
+
+El cursor devuelto nunca avanza sobre registros más recientes que
+`CAMBIOS_MARGEN_SEGUNDOS`: un INSERT con id menor puede confirmarse después
+de uno con id mayor (mismo criterio que `funnel_service`). Esos casos
+pueden volver a aparecer en el pedido siguiente; el cliente los reemplaza.
+Si el margen impide avanzar el cursor, `hay_mas` es False aunque queden
+casos: el cliente vuelve a consultar en su intervalo normal.
+
+Para un Tutor, los casos fuera de su alcance solo se informan como
+removidos si alguna vez los tuvo asignados (`desasignados`): el resto de los
+IDs modificados no le corresponde conocerlos.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.auditoria import Auditoria
+from app.services.auditoria_service import ACCIONES_DESASIGNACION, tutor_desasignado
+
+
+@dataclass
+class Cambios:
+    id_casos: list[int]
+    cursor: int
+    hay_mas: bool
+
+
+def _ultimo_estable(db: Session, desde: int, hasta: Optional[int] = None) -> int:
+    """Mayor id de auditoría en (desde, hasta] con antigüedad mayor al margen."""
+    limite = datetime.utcnow() - timedelta(seconds=settings.CAMBIOS_MARGEN_SEGUNDOS)
+    query = db.query(func.max(Auditoria.id_auditoria)).filter(
+        Auditoria.id_auditoria > desde,
+        Auditoria.timestamp <= limite,
+    )
+    if hasta is not None:
+        query = query.filter(Auditoria.id_auditoria <= hasta)
+    return query.scalar() or desde
+
+
+def cursor_actual(db: Session) -> int:
+    """Cursor inicial: posición actual de la auditoría (sin casos)."""
+    return _ultimo_estable(db, 0)
+
+
+def cambios_desde(db: Session, cursor: int, limite: int) -> Cambios:
+    """
+    Hasta `limite` casos con auditoría posterior a `cursor`, en el orden de su
+    último cambio, y el cursor para el pedido siguiente.
+    """
+    ultimo = func.max(Auditoria.id_auditoria).label("ultimo")
+    filas = (
+        db.query(Auditoria.id_caso, ultimo)
+        .filter(Auditoria.id_auditoria > cursor, Auditoria.id_caso.isnot(None))
+        .group_by(Auditoria.id_caso)
+        .order_by(ultimo)
+        .limit(limite + 1)
+        .all()
+    )
+    hay_mas = len(filas) > limite
+    filas = filas[:limite]
+
+    # Con más páginas, el cursor no pasa del último cambio incluido: los casos
+    # restantes tienen su último cambio después
+    hasta = filas[-1].ultimo if hay_mas else None
+    nuevo = _ultimo_estable(db, cursor, hasta)
+    return Cambios(
+        id_casos=[fila.id_caso for fila in filas],
+        cursor=nuevo,
+        # Sin avance, repetir enseguida devolvería la misma página
+        hay_mas=hay_mas and nuevo > cursor,
+    )
+
+
+def desasignados(db: Session, id_tutor: int, id_casos: Iterable[int]) -> set[int]:
+    """De `id_casos`, los que tuvieron una asignación de `id_tutor` que se quitó."""
+    id_casos = list(id_casos)
+    if not id_casos:
+        return set()
+    registros = db.query(Auditoria).filter(
+        Auditoria.id_caso.in_(id_casos),
+        Auditoria.accion.in_(ACCIONES_DESASIGNACION),
+    ).all()
+    return {r.id_caso for r in registros if tutor_desasignado(r) == id_tutor}
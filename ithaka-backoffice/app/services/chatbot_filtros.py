@@ -0,0 +1,121 @@
+"""Filtros sobre `Caso.datos_chatbot`.
+
+Los filtros se normalizan a un unico documento JSON de "contencion":
+- `chatbot_contiene='{"sector": "Tecnología"}'` (JSON literal)
+- `chatbot=sector=Tecnología`, `chatbot=equipo.integrantes=3` (clave=valor,
+  las claves con puntos se anidan)
+
+En PostgreSQL se compila a `datos_chatbot @> :filtro`, que usa el indice
+GIN (jsonb_path_ops) de la columna. En SQLite (tests) se compila a
+comparaciones con `json_extract` / `json_each` equivalentes.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import and_, exists, func, literal, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.models.caso import Caso
+
+
+def _parsear_valor(valor: str) -> Any:
+    """Interpreta el valor como JSON (numeros, booleanos) o lo deja como texto."""
+    try:
+        return json.loads(valor)
+    except ValueError:
+        return valor
+
+
+def _fusionar(destino: dict, origen: dict) -> dict:
+    """Fusiona recursivamente `origen` dentro de `destino`."""
+    for clave, valor in origen.items():
+        if isinstance(valor, dict) and isinstance(destino.get(clave), dict):
+            _fusionar(destino[clave], valor)
+        else:
+            destino[clave] = valor
+    return destino
+
+
+def parsear_filtros_chatbot(
+    contiene: Optional[str] = None,
+    pares: Optional[Iterable[str]] = None,
+) -> Optional[dict]:
+    """
+    Construye el documento de contencion a partir de los query params.
+
+    Raises:
+        ValueError: si el JSON es invalido o un par no tiene formato clave=valor.
+    """
+    filtro: dict = {}
+
+    if contiene:
+        try:
+            documento = json.loads(contiene)
+        except ValueError:
+            raise ValueError("chatbot_contiene debe ser un objeto JSON válido")
+        if not isinstance(documento, dict):
+            raise ValueError("chatbot_contiene debe ser un objeto JSON")
+        _fusionar(filtro, documento)
+
+    for par in pares or []:
+        clave, separador, valor = par.partition("=")
+        clave = clave.strip()
+        if not separador or not clave:
+            raise ValueError(f"Filtro de chatbot inválido: '{par}'. Formato esperado clave=valor")
+
+        anidado: Any = _parsear_valor(valor.strip())
+        for parte in reversed(clave.split(".")):
+            anidado = {parte: anidado}
+        _fusionar(filtro, anidado)
+
+    return filtro or None
+
+
+def _condiciones_sqlite(documento: dict, ruta: str = "$") -> list:
+    """Traduce la contencion JSON a condiciones `json_extract` / `json_each`."""
+    condiciones = []
+    for clave, valor in documento.items():
+        ruta_clave = f'{ruta}."{clave}"'
+        if isinstance(valor, dict):
+            condiciones.extend(_condiciones_sqlite(valor, ruta_clave))
+        elif isinstance(valor, list):
+            for elemento in valor:
+                elementos = func.json_each(Caso.datos_chatbot, ruta_clave).table_valued("value")
+                condiciones.append(
+                    exists(select(literal(1)).select_from(elementos).where(
+                        elementos.c.value == elemento
+                    ))
+                )
+        elif isinstance(valor, bool):
+            # json_extract devuelve 1/0 para true/false
+            condiciones.append(func.json_extract(Caso.datos_chatbot, ruta_clave) == int(valor))
+        elif valor is None:
+            condiciones.append(func.json_type(Caso.datos_chatbot, ruta_clave) == "null")
+        else:
+            condiciones.append(func.json_extract(Caso.datos_chatbot, ruta_clave) == valor)
+    return condiciones
+
+
+def condicion_datos_chatbot(filtro: dict, dialecto: str):
+    """Expresion SQL que exige que `datos_chatbot` contenga `filtro`."""
+    if dialecto == "postgresql":
+        return type_coerce(Caso.datos_chatbot, JSONB).contains(filtro)
+    return and_(*_condiciones_sqlite(filtro))
+
+
+def aplanar_datos_chatbot(documento: Optional[dict], prefijo: str = "") -> dict:
+    """
+    Aplana `datos_chatbot` a claves con puntos (la misma sintaxis que los
+    filtros `chatbot=clave.anidada=valor`). Las listas quedan como valor.
+    """
+    plano: dict = {}
+    for clave, valor in (documento or {}).items():
+        ruta = f"{prefijo}{clave}"
+        if isinstance(valor, dict) and valor:
+            plano.update(aplanar_datos_chatbot(valor, f"{ruta}."))
+        else:
+            plano[ruta] = valor
+    return plano
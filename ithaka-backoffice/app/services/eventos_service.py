@@ -0,0 +1,339 @@
+"""Eventos de cambios en casos (Server-Sent Events en `GET /casos/events`).
+
+Publicación: `registrar_auditoria_caso` (y las escrituras masivas que
+insertan auditoría en bloque) encolan un evento en la sesión con
+`encolar(db, accion, id_caso)`. Los eventos se emiten solo si la
+transacción se confirma:
+
+- Con `EVENTOS_LISTEN_NOTIFY` (por defecto) y PostgreSQL, necesario con
+  varios workers: en `before_commit` se envían con `pg_notify` dentro de la
+  misma transacción; cada worker los recibe con un hilo en `LISTEN`
+  (`iniciar_listener`) y los entrega a su broker local. El mismo hilo
+  atiende los canales que registren otros servicios con `registrar_canal`
+  (p. ej. la invalidación de la cache de autorización).
+- Sin LISTEN/NOTIFY (`EVENTOS_LISTEN_NOTIFY=False` u otro motor, como en
+  los tests): en `after_commit` se entregan al broker en memoria de este
+  proceso; solo sirve con un único worker.
+
+Broker: cada cliente SSE tiene una cola asyncio; publicar no bloquea (si la
+cola de un cliente lento se llena, se le pide que resincronice). Guarda los
+últimos `EVENTOS_HISTORIAL` eventos para reenviar los perdidos al
+reconectar con `Last-Event-ID` (los IDs son por proceso).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import select
+import threading
+from collections import deque
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CANAL_NOTIFY = "ithaka_casos"
+
+# Tamaño máximo del payload de NOTIFY en PostgreSQL: 8000 bytes
+_MAX_PAYLOAD_NOTIFY = 7000
+
+CASO_CREADO = "caso_creado"
+CASO_ACTUALIZADO = "caso_actualizado"
+ESTADO_CAMBIADO = "estado_cambiado"
+ASIGNACION = "asignacion"
+NOTA = "nota"
+
+_TIPO_POR_ACCION = {
+    "Caso creado": CASO_CREADO,
+    "Caso actualizado": CASO_ACTUALIZADO,
+    "Estado actualizado": ESTADO_CAMBIADO,
+    "Conversión automática a proyecto": ESTADO_CAMBIADO,
+    "Asignación de tutor": ASIGNACION,
+    "Asignación automática de tutor": ASIGNACION,
+    "Actualización de asignación": ASIGNACION,
+    "Eliminación de asignación": ASIGNACION,
+    "nota_creada": NOTA,
+    "nota_actualizada": NOTA,
+    "nota_eliminada": NOTA,
+}
+
+
+def tipo_de_accion(accion: str) -> str:
+    """Tipo de evento para una acción de auditoría (por defecto, caso_actualizado)."""
+    return _TIPO_POR_ACCION.get(accion, CASO_ACTUALIZADO)
+
+
+# ============================================================================
+# BROKER EN MEMORIA
+# ============================================================================
+
+class Suscripcion:
+    """Cola de eventos de un cliente SSE (vive en el event loop del cliente)."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, tamano: int) -> None:
+        self.loop = loop
+        self.cola: asyncio.Queue = asyncio.Queue(maxsize=tamano)
+        self.desbordada = False
+
+    def _poner(self, evento: dict) -> None:
+        try:
+            self.cola.put_nowait(evento)
+        except asyncio.QueueFull:
+            self.desbordada = True
+
+    def entregar(self, evento: dict) -> None:
+        """Thread-safe: se puede llamar desde cualquier hilo."""
+        self.loop.call_soon_threadsafe(self._poner, evento)
+
+
+class BrokerEventos:
+    def __init__(self, historial: int = 1000, tamano_cola: int = 1000) -> None:
+        self._lock = threading.Lock()
+        self._suscripciones: set[Suscripcion] = set()
+        self._historial: deque[dict] = deque(maxlen=historial)
+        self._secuencia = 0
+        self._tamano_cola = tamano_cola
+
+    def publicar(self, datos: dict) -> dict:
+        with self._lock:
+            self._secuencia += 1
+            evento = {**datos, "id": self._secuencia}
+            self._historial.append(evento)
+            suscripciones = list(self._suscripciones)
+        for suscripcion in suscripciones:
+            suscripcion.entregar(evento)
+        return evento
+
+    def suscribir(self, ultimo_id: Optional[int] = None) -> tuple[Suscripcion, list[dict], bool]:
+        """
+        Registra un cliente. Retorna la suscripción, los eventos del historial
+        posteriores a `ultimo_id` y si hubo un hueco (eventos ya descartados).
+        """
+        suscripcion = Suscripcion(asyncio.get_running_loop(), self._tamano_cola)
+        with self._lock:
+            self._suscripciones.add(suscripcion)
+            if ultimo_id is None:
+                return suscripcion, [], False
+            pendientes, hueco = self._posteriores(ultimo_id)
+        return suscripcion, pendientes, hueco
+
+    def _posteriores(self, ultimo_id: int) -> tuple[list[dict], bool]:
+        pendientes = [e for e in self._historial if e["id"] > ultimo_id]
+        primero = self._historial[0]["id"] if self._historial else self._secuencia + 1
+        return pendientes, ultimo_id < primero - 1 or ultimo_id > self._secuencia
+
+    def posteriores(self, ultimo_id: int) -> tuple[list[dict], bool]:
+        """Eventos del historial posteriores a `ultimo_id` y si hubo un hueco."""
+        with self._lock:
+            return self._posteriores(ultimo_id)
+
+    @property
+    def ultimo_id(self) -> int:
+        with self._lock:
+            return self._secuencia
+
+    def desuscribir(self, suscripcion: Suscripcion) -> None:
+        with self._lock:
+            self._suscripciones.discard(suscripcion)
+
+    @property
+    def clientes(self) -> int:
+        with self._lock:
+            return len(self._suscripciones)
+
+
+broker = BrokerEventos(historial=settings.EVENTOS_HISTORIAL)
+
+
+# ============================================================================
+# FLUJO SSE
+# ============================================================================
+
+def formato_sse(evento: dict) -> str:
+    return f"id: {evento['id']}\nevent: {evento['tipo']}\ndata: {json.dumps(evento, ensure_ascii=False)}\n\n"
+
+
+# Sin `id`: el cliente conserva su Last-Event-ID
+_RESYNC = "event: resync\ndata: {}\n\n"
+
+
+async def flujo_sse(
+    ultimo_id: Optional[int],
+    visible: Optional[Callable[[dict], Awaitable[bool]]] = None,
+    heartbeat: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """
+    Genera el stream SSE de un cliente: primero los eventos perdidos desde
+    `ultimo_id` (o `resync` si ya no están en el historial) y luego los
+    nuevos, filtrados por `visible`. Sin eventos solo envía un comentario
+    cada `heartbeat` segundos (mantiene viva la conexión en proxies).
+    """
+    heartbeat = heartbeat or settings.EVENTOS_HEARTBEAT_SEGUNDOS
+    suscripcion, pendientes, hueco = broker.suscribir(ultimo_id)
+    try:
+        yield f"retry: {settings.EVENTOS_REINTENTO_MS}\n\n"
+        if hueco:
+            yield _RESYNC
+        for evento in pendientes:
+            if visible is None or await visible(evento):
+                yield formato_sse(evento)
+
+        while True:
+            try:
+                evento = await asyncio.wait_for(suscripcion.cola.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if suscripcion.desbordada:
+                # Cliente demasiado lento: se descarta lo acumulado y se pide recargar
+                while not suscripcion.cola.empty():
+                    suscripcion.cola.get_nowait()
+                suscripcion.desbordada = False
+                yield _RESYNC
+                continue
+            if visible is None or await visible(evento):
+                yield formato_sse(evento)
+    finally:
+        broker.desuscribir(suscripcion)
+
+
+# ============================================================================
+# PUBLICACIÓN DESDE LA SESIÓN (al confirmar la transacción)
+# ============================================================================
+
+def encolar(db: Session, accion: str, id_caso: Optional[int]) -> None:
+    """Agenda el evento de `accion` sobre `id_caso` para cuando se confirme la transacción."""
+    if id_caso is None:
+        return
+    db.info.setdefault("eventos_pendientes", []).append({
+        "tipo": tipo_de_accion(accion),
+        "id_caso": id_caso,
+        "accion": accion,
+        "timestamp": datetime.utcnow().isoformat(),
+    })
+
+
+def encolar_varios(db: Session, accion: str, id_casos: Iterable[int]) -> None:
+    for id_caso in id_casos:
+        encolar(db, accion, id_caso)
+
+
+def usa_notify(session: Session) -> bool:
+    """Si las notificaciones entre workers van por `pg_notify` en esta sesión."""
+    return settings.EVENTOS_LISTEN_NOTIFY and session.get_bind().dialect.name == "postgresql"
+
+
+def _lotes_payload(eventos: list[dict]) -> Iterable[str]:
+    """Agrupa eventos en payloads JSON que entran en un NOTIFY."""
+    lote: list[str] = []
+    tamano = 2
+    for evento in eventos:
+        serializado = json.dumps(evento, ensure_ascii=False)
+        if lote and tamano + len(serializado.encode("utf-8")) + 1 > _MAX_PAYLOAD_NOTIFY:
+            yield "[" + ",".join(lote) + "]"
+            lote, tamano = [], 2
+        lote.append(serializado)
+        tamano += len(serializado.encode("utf-8")) + 1
+    if lote:
+        yield "[" + ",".join(lote) + "]"
+
+
+@event.listens_for(Session, "before_commit")
+def _notificar(session):
+    eventos = session.info.get("eventos_pendientes")
+    if not eventos or not usa_notify(session):
+        return
+    for payload in _lotes_payload(eventos):
+        session.execute(text("SELECT pg_notify(:canal, :payload)"), {"canal": CANAL_NOTIFY, "payload": payload})
+    session.info["eventos_notificados"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _publicar(session):
+    eventos = session.info.pop("eventos_pendientes", None)
+    notificados = session.info.pop("eventos_notificados", False)
+    if eventos and not notificados:
+        for evento in eventos:
+            broker.publicar(evento)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar(session):
+    session.info.pop("eventos_pendientes", None)
+    session.info.pop("eventos_notificados", None)
+
+
+# ============================================================================
+# PUENTE LISTEN/NOTIFY (varios workers)
+# ============================================================================
+
+# canal -> (manejador del payload, callback al (re)conectar)
+_canales: dict[str, tuple[Callable[[str], None], Optional[Callable[[], None]]]] = {}
+
+
+def registrar_canal(
+    canal: str,
+    manejador: Callable[[str], None],
+    al_conectar: Optional[Callable[[], None]] = None,
+) -> None:
+    """
+    Suma `canal` al hilo LISTEN: cada payload se pasa a `manejador`.
+    `al_conectar` se llama tras cada (re)conexión, porque las notificaciones
+    enviadas mientras el listener estuvo caído se pierden. Debe registrarse
+    antes de `iniciar_listener`.
+    """
+    _canales[canal] = (manejador, al_conectar)
+
+
+def _publicar_notificados(payload: str) -> None:
+    for evento in json.loads(payload):
+        broker.publicar(evento)
+
+
+registrar_canal(CANAL_NOTIFY, _publicar_notificados)
+
+
+def _escuchar(dsn: str, detener: threading.Event) -> None:
+    import psycopg2
+
+    canales = dict(_canales)
+
+    while not detener.is_set():
+        conexion = None
+        try:
+            conexion = psycopg2.connect(dsn)
+            conexion.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conexion.cursor() as cursor:
+                for canal in canales:
+                    cursor.execute(f"LISTEN {canal}")
+            for _, al_conectar in canales.values():
+                if al_conectar is not None:
+                    al_conectar()
+            while not detener.is_set():
+                if select.select([conexion], [], [], 5) == ([], [], []):
+                    continue
+                conexion.poll()
+                while conexion.notifies:
+                    notificacion = conexion.notifies.pop(0)
+                    manejador, _ = canales[notificacion.channel]
+                    manejador(notificacion.payload)
+        except Exception:
+            logger.exception("Listener de eventos: error, reintentando en 5 s")
+            detener.wait(5)
+        finally:
+            if conexion is not None:
+                conexion.close()
+
+
+def iniciar_listener(dsn: str) -> threading.Event:
+    """Inicia el hilo LISTEN. Retorna el Event que lo detiene."""
+    detener = threading.Event()
+    threading.Thread(target=_escuchar, args=(dsn, detener), name="eventos-listen", daemon=True).start()
+    return detener
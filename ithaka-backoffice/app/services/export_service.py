@@ -1,17 +1,157 @@
 import csv
 import json
+import os
+import tempfile
 from datetime import datetime
 from io import StringIO
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional
 
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy.orm import Query, Session, joinedload, selectinload, undefer_group
 
+from app.core.config import settings
+from app.models.apoyo import Apoyo
 from app.models.asignacion import Asignacion
 from app.models.caso import Caso
-from app.models.catalogo_estados import CatalogoEstados
+from app.models.catalogo_apoyo import CatalogoApoyo
+from app.models.catalogo_estados import CatalogoEstados, normalizar_estado
 from app.models.emprendedor import Emprendedor
+from app.models.nota import Nota
+from app.models.programa import Programa
 from app.models.usuario import Usuario
+from app.services.autorizacion_service import aplicar_alcance_tutor
+from app.services.chatbot_filtros import aplanar_datos_chatbot, condicion_datos_chatbot
+
+
+ENCABEZADOS_CASOS = [
+    "ID Caso",
+    "Nombre del Caso",
+    "Descripción",
+    "Fecha de Creación",
+    "Nombre Emprendedor",
+    "Apellido Emprendedor",
+    "Email Emprendedor",
+    "Teléfono",
+    "Documento de Identidad",
+    "País de Residencia",
+    "Ciudad de Residencia",
+    "Campus UCU",
+    "Relación con UCU",
+    "Facultad",
+    "Canal de Llegada",
+    "Motivación",
+    "Convocatoria",
+    "Estado del Caso",
+    "Datos del Chatbot (JSON)",
+]
+
+# Hojas adicionales opcionales del XLSX
+HOJAS_XLSX = {
+    "notas": ["ID Nota", "ID Caso", "Fecha", "Tipo", "Email del Autor", "Contenido"],
+    "apoyos": ["ID Apoyo", "ID Caso", "Apoyo", "Programa", "Fecha de Inicio", "Fecha de Fin"],
+    "asignaciones": ["ID Asignación", "ID Caso", "Tutor", "Email del Tutor", "Fecha de Asignación"],
+}
+
+MEDIA_TYPE_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Formatos columnares para análisis: (media type, extensión)
+FORMATOS_COLUMNARES = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+
+def _fila_caso(caso: Caso) -> list:
+    """Valores de la fila de un caso (tipos nativos; el CSV los formatea)."""
+    emprendedor = caso.emprendedor or Emprendedor()
+    return [
+        caso.id_caso,
+        caso.nombre_caso,
+        caso.descripcion,
+        caso.fecha_creacion,
+        emprendedor.nombre,
+        emprendedor.apellido,
+        emprendedor.email,
+        emprendedor.telefono,
+        emprendedor.documento_identidad,
+        emprendedor.pais_residencia,
+        emprendedor.ciudad_residencia,
+        emprendedor.campus_ucu,
+        emprendedor.relacion_ucu,
+        emprendedor.facultad_ucu,
+        emprendedor.canal_llegada,
+        emprendedor.motivacion,
+        caso.convocatoria.nombre if caso.convocatoria else None,
+        caso.estado.nombre_estado if caso.estado else None,
+        json.dumps(caso.datos_chatbot) if caso.datos_chatbot else None,
+    ]
+
+
+def _asignacion_principal(caso: Caso) -> Optional[Asignacion]:
+    """Primera asignación del caso (el "tutor" de los listados)."""
+    return min(caso.asignaciones, key=lambda a: a.id_asignacion, default=None)
+
+
+def _columnas_columnares(pa) -> list:
+    """(nombre, tipo Arrow, extractor) de las columnas fijas del export columnar."""
+    def tutor(caso):
+        asignacion = _asignacion_principal(caso)
+        return asignacion.usuario if asignacion else None
+
+    return [
+        ("id_caso", pa.int64(), lambda c: c.id_caso),
+        ("nombre_caso", pa.string(), lambda c: c.nombre_caso),
+        ("descripcion", pa.string(), lambda c: c.descripcion),
+        ("fecha_creacion", pa.timestamp("us"), lambda c: c.fecha_creacion),
+        ("id_emprendedor", pa.int64(), lambda c: c.id_emprendedor),
+        ("emprendedor_nombre", pa.string(), lambda c: c.emprendedor and c.emprendedor.nombre),
+        ("emprendedor_apellido", pa.string(), lambda c: c.emprendedor and c.emprendedor.apellido),
+        ("emprendedor_email", pa.string(), lambda c: c.emprendedor and c.emprendedor.email),
+        ("emprendedor_documento", pa.string(), lambda c: c.emprendedor and c.emprendedor.documento_identidad),
+        ("emprendedor_pais", pa.string(), lambda c: c.emprendedor and c.emprendedor.pais_residencia),
+        ("emprendedor_ciudad", pa.string(), lambda c: c.emprendedor and c.emprendedor.ciudad_residencia),
+        ("campus_ucu", pa.string(), lambda c: c.emprendedor and c.emprendedor.campus_ucu),
+        ("relacion_ucu", pa.string(), lambda c: c.emprendedor and c.emprendedor.relacion_ucu),
+        ("facultad_ucu", pa.string(), lambda c: c.emprendedor and c.emprendedor.facultad_ucu),
+        ("canal_llegada", pa.string(), lambda c: c.emprendedor and c.emprendedor.canal_llegada),
+        ("id_convocatoria", pa.int64(), lambda c: c.id_convocatoria),
+        ("convocatoria", pa.string(), lambda c: c.convocatoria and c.convocatoria.nombre),
+        ("id_estado", pa.int64(), lambda c: c.id_estado),
+        ("estado", pa.string(), lambda c: c.estado and c.estado.nombre_estado),
+        ("tipo_caso", pa.string(), lambda c: c.estado and c.estado.tipo_caso),
+        ("id_tutor", pa.int64(), lambda c: tutor(c) and tutor(c).id_usuario),
+        ("tutor_email", pa.string(), lambda c: tutor(c) and tutor(c).email),
+        ("cantidad_tutores", pa.int32(), lambda c: len(c.asignaciones)),
+    ]
+
+
+def _tipo_arrow_chatbot(pa, tipos: set):
+    """Tipo Arrow de una clave de datos_chatbot según los tipos Python observados."""
+    tipos = tipos - {type(None)}
+    if tipos == {bool}:
+        return pa.bool_()
+    if tipos and tipos <= {int}:
+        return pa.int64()
+    if tipos and tipos <= {int, float}:
+        return pa.float64()
+    return pa.string()
+
+
+def _valor_chatbot(valor, tipo, pa):
+    if valor is None:
+        return None
+    if tipo == pa.float64():
+        return float(valor)
+    if tipo == pa.string() and not isinstance(valor, str):
+        return json.dumps(valor, ensure_ascii=False)
+    return valor
+
+
+def _celda_csv(valor):
+    if valor is None:
+        return ""
+    if isinstance(valor, datetime):
+        return valor.strftime("%Y-%m-%d %H:%M:%S")
+    return valor
 
 
 class ExportService:
@@ -25,10 +165,14 @@ class ExportService:
         id_emprendedor: Optional[int] = None,
         id_convocatoria: Optional[int] = None,
         id_tutor: Optional[int] = None,
+        filtro_chatbot: Optional[dict] = None,
         incluir_relaciones: bool = True
     ):
         """
         Construye el query base de casos reutilizable para listados y exportaciones.
+
+        `filtro_chatbot` es un documento de contención sobre `datos_chatbot`
+        (ver app/services/chatbot_filtros.py).
         """
         query = db.query(Caso)
 
@@ -40,23 +184,12 @@ class ExportService:
                 joinedload(Caso.asignaciones).joinedload(Asignacion.usuario)
             )
 
-        es_tutor = bool(
-            current_user
-            and current_user.rol
-            and current_user.rol.nombre_rol == "Tutor"
-        )
-        necesita_join_asignacion = es_tutor or id_tutor is not None
-        necesita_join_estado = tipo_caso is not None or nombre_estado is not None
+        # Alcance de Tutor e `id_tutor` como EXISTS: sin filas duplicadas ni DISTINCT
+        query = aplicar_alcance_tutor(query, current_user, Caso.id_caso, id_tutor=id_tutor)
 
-        if necesita_join_asignacion:
-            query = query.join(Asignacion)
-        if necesita_join_estado:
+        if tipo_caso is not None or nombre_estado is not None:
             query = query.join(Caso.estado)
 
-        if es_tutor:
-            query = query.filter(Asignacion.id_usuario == current_user.id_usuario)
-        if id_tutor is not None:
-            query = query.filter(Asignacion.id_usuario == id_tutor)
         if id_estado is not None:
             query = query.filter(Caso.id_estado == id_estado)
         if id_emprendedor is not None:
@@ -64,12 +197,13 @@ class ExportService:
         if id_convocatoria is not None:
             query = query.filter(Caso.id_convocatoria == id_convocatoria)
         if tipo_caso is not None:
-            query = query.filter(func.lower(CatalogoEstados.tipo_caso) == tipo_caso.lower())
+            query = query.filter(CatalogoEstados.tipo_caso == normalizar_estado(tipo_caso))
         if nombre_estado is not None:
-            query = query.filter(func.lower(CatalogoEstados.nombre_estado) == nombre_estado.lower())
-
-        if necesita_join_asignacion:
-            query = query.distinct()
+            query = query.filter(CatalogoEstados.nombre_estado == normalizar_estado(nombre_estado))
+        if filtro_chatbot:
+            query = query.filter(
+                condicion_datos_chatbot(filtro_chatbot, db.get_bind().dialect.name)
+            )
 
         return query
 
@@ -82,7 +216,8 @@ class ExportService:
         nombre_estado: Optional[str] = None,
         id_emprendedor: Optional[int] = None,
         id_convocatoria: Optional[int] = None,
-        id_tutor: Optional[int] = None
+        id_tutor: Optional[int] = None,
+        filtro_chatbot: Optional[dict] = None
     ) -> StringIO:
         """
         Exportar casos a CSV con filtros opcionales.
@@ -95,61 +230,17 @@ class ExportService:
             nombre_estado=nombre_estado,
             id_emprendedor=id_emprendedor,
             id_convocatoria=id_convocatoria,
-            id_tutor=id_tutor
-        ).order_by(Caso.id_caso.asc()).all()
+            id_tutor=id_tutor,
+            filtro_chatbot=filtro_chatbot
+        ).options(undefer_group("detalle")).order_by(Caso.id_caso.asc()).all()
 
         # Crea archivo CSV en memoria
         output = StringIO()
         writer = csv.writer(output, quoting=csv.QUOTE_ALL)
 
-        # Encabezados
-        writer.writerow([
-            "ID Caso",
-            "Nombre del Caso",
-            "Descripción",
-            "Fecha de Creación",
-            "Nombre Emprendedor",
-            "Apellido Emprendedor",
-            "Email Emprendedor",
-            "Teléfono",
-            "Documento de Identidad",
-            "País de Residencia",
-            "Ciudad de Residencia",
-            "Campus UCU",
-            "Relación con UCU",
-            "Facultad",
-            "Canal de Llegada",
-            "Motivación",
-            "Convocatoria",
-            "Estado del Caso",
-            "Datos del Chatbot (JSON)"
-        ])
-
-        # Filas de datos
+        writer.writerow(ENCABEZADOS_CASOS)
         for caso in casos:
-            emprendedor = caso.emprendedor or Emprendedor()
-
-            writer.writerow([
-                caso.id_caso or "",
-                caso.nombre_caso or "",
-                caso.descripcion or "",
-                caso.fecha_creacion.strftime("%Y-%m-%d %H:%M:%S") if caso.fecha_creacion else "",
-                emprendedor.nombre or "",
-                emprendedor.apellido or "",
-                emprendedor.email or "",
-                emprendedor.telefono or "",
-                emprendedor.documento_identidad or "",
-                emprendedor.pais_residencia or "",
-                emprendedor.ciudad_residencia or "",
-                emprendedor.campus_ucu or "",
-                emprendedor.relacion_ucu or "",
-                emprendedor.facultad_ucu or "",
-                emprendedor.canal_llegada or "",
-                emprendedor.motivacion or "",
-                caso.convocatoria.nombre if caso.convocatoria else "",
-                caso.estado.nombre_estado if caso.estado else "",
-                json.dumps(caso.datos_chatbot) if caso.datos_chatbot else "",
-            ])
+            writer.writerow([_celda_csv(valor) for valor in _fila_caso(caso)])
 
         output.seek(0)
         return output
@@ -163,7 +254,8 @@ class ExportService:
         nombre_estado: Optional[str] = None,
         id_emprendedor: Optional[int] = None,
         id_convocatoria: Optional[int] = None,
-        id_tutor: Optional[int] = None
+        id_tutor: Optional[int] = None,
+        filtro_chatbot: Optional[dict] = None
     ) -> StringIO:
         """
         Exporta casos con información de tutores asignados
@@ -176,7 +268,8 @@ class ExportService:
             nombre_estado=nombre_estado,
             id_emprendedor=id_emprendedor,
             id_convocatoria=id_convocatoria,
-            id_tutor=id_tutor
+            id_tutor=id_tutor,
+            filtro_chatbot=filtro_chatbot
         ).order_by(Caso.id_caso.asc()).all()
 
         # Crea archivo CSV
@@ -233,13 +326,305 @@ class ExportService:
         return output
 
     @staticmethod
-    def generar_nombre_archivo(tipo_reporte: str = "postulaciones") -> str:
+    def iterar_paginas_casos(
+        query: Query,
+        tamano_pagina: Optional[int] = None,
+        al_avanzar: Optional[Callable[[int], None]] = None,
+    ) -> Iterator[list[Caso]]:
+        """
+        Recorre el query de casos por páginas (keyset sobre id_caso).
+
+        Cada página se descarta al pedir la siguiente, así la memoria no crece
+        con el total de filas exportadas. `al_avanzar` recibe la cantidad de
+        casos procesados hasta el momento (progreso de trabajos en segundo plano).
+        """
+        tamano_pagina = tamano_pagina or settings.EXPORT_TAMANO_PAGINA
+        ultimo_id = 0
+        procesados = 0
+        while True:
+            pagina = (
+                query.filter(Caso.id_caso > ultimo_id)
+                .order_by(Caso.id_caso.asc())
+                .limit(tamano_pagina)
+                .all()
+            )
+            if not pagina:
+                return
+            yield pagina
+            procesados += len(pagina)
+            if al_avanzar:
+                al_avanzar(procesados)
+            ultimo_id = pagina[-1].id_caso
+
+    @staticmethod
+    def exportar_casos_csv_archivo(
+        db: Session,
+        current_user: Optional[Usuario] = None,
+        id_estado: Optional[int] = None,
+        tipo_caso: Optional[str] = None,
+        nombre_estado: Optional[str] = None,
+        id_emprendedor: Optional[int] = None,
+        id_convocatoria: Optional[int] = None,
+        id_tutor: Optional[int] = None,
+        filtro_chatbot: Optional[dict] = None,
+        al_avanzar: Optional[Callable[[int], None]] = None,
+    ) -> str:
+        """
+        Igual que `exportar_casos_csv` pero escribe por páginas a un archivo en
+        disco y devuelve su ruta (para trabajos en segundo plano).
+        """
+        query = ExportService.construir_query_casos(
+            db=db,
+            current_user=current_user,
+            id_estado=id_estado,
+            tipo_caso=tipo_caso,
+            nombre_estado=nombre_estado,
+            id_emprendedor=id_emprendedor,
+            id_convocatoria=id_convocatoria,
+            id_tutor=id_tutor,
+            filtro_chatbot=filtro_chatbot,
+            incluir_relaciones=False
+        ).options(
+            undefer_group("detalle"),
+            joinedload(Caso.estado),
+            joinedload(Caso.emprendedor),
+            joinedload(Caso.convocatoria),
+        )
+
+        descriptor, ruta = tempfile.mkstemp(suffix=".csv")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8", newline="") as archivo:
+                writer = csv.writer(archivo, quoting=csv.QUOTE_ALL)
+                writer.writerow(ENCABEZADOS_CASOS)
+                for pagina in ExportService.iterar_paginas_casos(query, al_avanzar=al_avanzar):
+                    for caso in pagina:
+                        writer.writerow([_celda_csv(valor) for valor in _fila_caso(caso)])
+        except Exception:
+            os.remove(ruta)
+            raise
+
+        return ruta
+
+    @staticmethod
+    def exportar_casos_xlsx(
+        db: Session,
+        current_user: Optional[Usuario] = None,
+        id_estado: Optional[int] = None,
+        tipo_caso: Optional[str] = None,
+        nombre_estado: Optional[str] = None,
+        id_emprendedor: Optional[int] = None,
+        id_convocatoria: Optional[int] = None,
+        id_tutor: Optional[int] = None,
+        filtro_chatbot: Optional[dict] = None,
+        hojas: Iterable[str] = (),
+        al_avanzar: Optional[Callable[[int], None]] = None,
+    ) -> str:
+        """
+        Exporta casos a un XLSX en disco y devuelve su ruta (el llamador la borra).
+
+        El workbook se escribe en modo `constant_memory`: cada fila se vuelca a
+        disco al escribirse. Los casos se leen por páginas y, por cada página,
+        se agregan sus filas en las hojas adicionales pedidas (`HOJAS_XLSX`),
+        en una sola pasada sobre los datos.
+        """
+        hojas = [hoja for hoja in HOJAS_XLSX if hoja in set(hojas)]
+
+        query = ExportService.construir_query_casos(
+            db=db,
+            current_user=current_user,
+            id_estado=id_estado,
+            tipo_caso=tipo_caso,
+            nombre_estado=nombre_estado,
+            id_emprendedor=id_emprendedor,
+            id_convocatoria=id_convocatoria,
+            id_tutor=id_tutor,
+            filtro_chatbot=filtro_chatbot,
+            incluir_relaciones=False
+        ).options(
+            undefer_group("detalle"),
+            joinedload(Caso.estado),
+            joinedload(Caso.emprendedor),
+            joinedload(Caso.convocatoria),
+        )
+        if "asignaciones" in hojas:
+            query = query.options(selectinload(Caso.asignaciones).joinedload(Asignacion.usuario))
+
+        import xlsxwriter  # solo para XLSX: no se carga al arrancar
+
+        descriptor, ruta = tempfile.mkstemp(suffix=".xlsx")
+        os.close(descriptor)
+
+        try:
+            workbook = xlsxwriter.Workbook(ruta, {
+                "constant_memory": True,
+                "default_date_format": "yyyy-mm-dd hh:mm:ss",
+                # Texto libre: nunca interpretarlo como fórmula, número o URL
+                "strings_to_formulas": False,
+                "strings_to_numbers": False,
+                "strings_to_urls": False,
+            })
+            negrita = workbook.add_format({"bold": True})
+
+            hoja_casos = workbook.add_worksheet("Casos")
+            hoja_casos.write_row(0, 0, ENCABEZADOS_CASOS, negrita)
+            hojas_extra = {}
+            for hoja in hojas:
+                worksheet = workbook.add_worksheet(hoja.capitalize())
+                worksheet.write_row(0, 0, HOJAS_XLSX[hoja], negrita)
+                hojas_extra[hoja] = worksheet
+            # Próxima fila libre de cada hoja (constant_memory exige orden creciente)
+            filas = {"casos": 1, **{hoja: 1 for hoja in hojas}}
+
+            def escribir(hoja, worksheet, valores):
+                worksheet.write_row(filas[hoja], 0, valores)
+                filas[hoja] += 1
+
+            for pagina in ExportService.iterar_paginas_casos(query, al_avanzar=al_avanzar):
+                ids = [caso.id_caso for caso in pagina]
+
+                for caso in pagina:
+                    escribir("casos", hoja_casos, _fila_caso(caso))
+
+                if "notas" in hojas_extra:
+                    notas = (
+                        db.query(Nota, Usuario.email)
+                        .outerjoin(Usuario, Usuario.id_usuario == Nota.id_usuario)
+                        .filter(Nota.id_caso.in_(ids))
+                        .order_by(Nota.id_caso, Nota.fecha, Nota.id_nota)
+                    )
+                    for nota, email in notas:
+                        escribir("notas", hojas_extra["notas"], [
+                            nota.id_nota, nota.id_caso, nota.fecha, nota.tipo_nota, email, nota.contenido
+                        ])
+
+                if "apoyos" in hojas_extra:
+                    apoyos = (
+                        db.query(Apoyo, CatalogoApoyo.nombre, Programa.nombre)
+                        .outerjoin(CatalogoApoyo, CatalogoApoyo.id_catalogo_apoyo == Apoyo.id_catalogo_apoyo)
+                        .outerjoin(Programa, Programa.id_programa == Apoyo.id_programa)
+                        .filter(Apoyo.id_caso.in_(ids))
+                        .order_by(Apoyo.id_caso, Apoyo.id_apoyo)
+                    )
+                    for apoyo, nombre_apoyo, nombre_programa in apoyos:
+                        escribir("apoyos", hojas_extra["apoyos"], [
+                            apoyo.id_apoyo, apoyo.id_caso, nombre_apoyo, nombre_programa,
+                            apoyo.fecha_inicio, apoyo.fecha_fin
+                        ])
+
+                if "asignaciones" in hojas_extra:
+                    for caso in pagina:
+                        for asignacion in caso.asignaciones:
+                            tutor = asignacion.usuario
+                            escribir("asignaciones", hojas_extra["asignaciones"], [
+                                asignacion.id_asignacion,
+                                caso.id_caso,
+                                f"{tutor.nombre} {tutor.apellido}" if tutor else None,
+                                tutor.email if tutor else None,
+                                asignacion.fecha_asignacion,
+                            ])
+
+            workbook.close()
+        except Exception:
+            os.remove(ruta)
+            raise
+
+        return ruta
+
+    @staticmethod
+    def exportar_casos_columnar(
+        db: Session,
+        current_user: Optional[Usuario] = None,
+        id_estado: Optional[int] = None,
+        tipo_caso: Optional[str] = None,
+        nombre_estado: Optional[str] = None,
+        id_emprendedor: Optional[int] = None,
+        id_convocatoria: Optional[int] = None,
+        id_tutor: Optional[int] = None,
+        filtro_chatbot: Optional[dict] = None,
+        formato: str = "parquet",
+        al_avanzar: Optional[Callable[[int], None]] = None,
+    ) -> str:
+        """
+        Exporta casos a Parquet o Arrow IPC (stream) en disco y devuelve la ruta.
+
+        Columnas tipadas (enteros, timestamps) de caso, emprendedor, estado,
+        convocatoria y tutor principal, más una columna `chatbot.<clave>` por
+        cada clave aplanada de `datos_chatbot`. Se escribe un record batch por
+        página de casos, así la memoria queda acotada al tamaño de página.
+        """
+        # Import pesado: solo se carga cuando se pide un export columnar
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        base = ExportService.construir_query_casos(
+            db=db,
+            current_user=current_user,
+            id_estado=id_estado,
+            tipo_caso=tipo_caso,
+            nombre_estado=nombre_estado,
+            id_emprendedor=id_emprendedor,
+            id_convocatoria=id_convocatoria,
+            id_tutor=id_tutor,
+            filtro_chatbot=filtro_chatbot,
+            incluir_relaciones=False
+        )
+
+        # Primera pasada (solo datos_chatbot) para fijar el esquema de las claves
+        tipos_chatbot: dict[str, set] = {}
+        for (datos,) in base.with_entities(Caso.datos_chatbot).yield_per(settings.EXPORT_TAMANO_PAGINA):
+            for clave, valor in aplanar_datos_chatbot(datos).items():
+                tipos_chatbot.setdefault(clave, set()).add(type(valor))
+
+        columnas = _columnas_columnares(pa)
+        claves_chatbot = sorted(tipos_chatbot)
+        tipos_claves = {clave: _tipo_arrow_chatbot(pa, tipos_chatbot[clave]) for clave in claves_chatbot}
+        schema = pa.schema(
+            [pa.field(nombre, tipo) for nombre, tipo, _ in columnas]
+            + [pa.field(f"chatbot.{clave}", tipos_claves[clave]) for clave in claves_chatbot]
+        )
+
+        query = base.options(
+            undefer_group("detalle"),
+            joinedload(Caso.estado),
+            joinedload(Caso.emprendedor),
+            joinedload(Caso.convocatoria),
+            selectinload(Caso.asignaciones).joinedload(Asignacion.usuario),
+        )
+
+        descriptor, ruta = tempfile.mkstemp(suffix=f".{FORMATOS_COLUMNARES[formato][1]}")
+        os.close(descriptor)
+
+        try:
+            with pa.OSFile(ruta, "wb") as sink:
+                if formato == "parquet":
+                    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+                else:
+                    writer = pa.ipc.new_stream(sink, schema)
+
+                with writer:
+                    for pagina in ExportService.iterar_paginas_casos(query, al_avanzar=al_avanzar):
+                        datos = {nombre: [extraer(caso) for caso in pagina] for nombre, _, extraer in columnas}
+                        planos = [aplanar_datos_chatbot(caso.datos_chatbot) for caso in pagina]
+                        for clave in claves_chatbot:
+                            datos[f"chatbot.{clave}"] = [
+                                _valor_chatbot(plano.get(clave), tipos_claves[clave], pa) for plano in planos
+                            ]
+                        writer.write_batch(pa.RecordBatch.from_pydict(datos, schema=schema))
+        except Exception:
+            os.remove(ruta)
+            raise
+
+        return ruta
+
+    @staticmethod
+    def generar_nombre_archivo(tipo_reporte: str = "postulaciones", extension: str = "csv") -> str:
         """
         Generar nombre de archivo con timestamp
         
             tipo_reporte: Tipo de reporte para el nombre
+            extension: Extensión del archivo (csv, xlsx)
         
             Nombre de archivo con timestamp
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return f"{tipo_reporte}_{timestamp}.csv"
\ No newline at end of file
+        return f"{tipo_reporte}_{timestamp}.{extension}"
\ No newline at end of file
@@ -0,0 +1,331 @@
+"""Trabajos de exportación de casos en segundo plano.
+
+`POST /exportaciones` registra un trabajo y lo encola en un pool de hilos;
+el archivo se escribe en disco (`EXPORT_TRABAJOS_DIR`) con los mismos
+generadores paginados de `ExportService`, sin bloquear a los workers HTTP.
+
+- Deduplicación: pedidos con el mismo formato, filtros y alcance (Tutor vs.
+  Admin/Coordinador) reutilizan el trabajo en curso o ya completado.
+- Progreso: casos procesados sobre el total, actualizado por página.
+- Vencimiento: los archivos terminados se borran pasados
+  `EXPORT_TRABAJOS_TTL_SEGUNDOS` (se purgan en cada acceso).
+- ETag: SHA-256 del contenido, para descargas condicionales y `If-Range`.
+
+Estado compartido entre workers: cada trabajo tiene un manifiesto JSON
+(`<id>.json`) junto a su archivo, y un archivo `clave-<sha256>` con el id
+del trabajo de esa clave (creado con `os.link`, atómico). El trabajo corre
+en el worker que lo creó y cualquier worker responde su estado o la
+descarga. Con varios pods, `EXPORT_TRABAJOS_DIR` debe ser un volumen
+compartido.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import enrutador
+from app.models.usuario import Usuario
+from app.services.autorizacion_service import es_tutor
+from app.services.export_service import FORMATOS_COLUMNARES, MEDIA_TYPE_XLSX, ExportService
+
+
+PENDIENTE = "pendiente"
+EN_PROCESO = "en_proceso"
+COMPLETADO = "completado"
+ERROR = "error"
+
+# formato -> (media type, extensión)
+FORMATOS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "xlsx": (MEDIA_TYPE_XLSX, "xlsx"),
+    **FORMATOS_COLUMNARES,
+}
+
+
+@dataclass
+class TrabajoExportacion:
+    id_trabajo: str
+    clave: str
+    formato: str
+    filtros: dict
+    hojas: list[str]
+    alcance: Optional[int]
+    estado: str = PENDIENTE
+    procesados: int = 0
+    total: Optional[int] = None
+    creado: datetime = field(default_factory=datetime.utcnow)
+    finalizado: Optional[datetime] = None
+    ruta: Optional[str] = None
+    tamano: Optional[int] = None
+    etag: Optional[str] = None
+    error: Optional[str] = None
+    vence: Optional[float] = None  # epoch (time.time()), comparable entre procesos
+    actualizado: float = 0.0
+
+    @property
+    def progreso(self) -> float:
+        if self.estado == COMPLETADO:
+            return 1.0
+        if not self.total:
+            return 0.0
+        return min(self.procesados / self.total, 1.0)
+
+
+_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+_ID_TRABAJO = re.compile(r"[0-9a-f]{32}")
+
+
+def _obtener_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.EXPORT_TRABAJOS_WORKERS,
+                thread_name_prefix="exportacion",
+            )
+        return _executor
+
+
+def _directorio() -> str:
+    directorio = settings.EXPORT_TRABAJOS_DIR or os.path.join(tempfile.gettempdir(), "ithaka_exportaciones")
+    os.makedirs(directorio, exist_ok=True)
+    return directorio
+
+
+def alcance_de(current_user: Usuario) -> Optional[int]:
+    """Tutor: sus casos asignados (id); Admin y Coordinador: todos (None)."""
+    return current_user.id_usuario if es_tutor(current_user) else None
+
+
+def clave_trabajo(formato: str, filtros: dict, hojas: list[str], alcance: Optional[int]) -> str:
+    """Clave de deduplicación: mismo formato, filtros y alcance => mismo archivo."""
+    documento = {
+        "formato": formato,
+        "filtros": {k: v for k, v in filtros.items() if v is not None},
+        "hojas": sorted(set(hojas)) if formato == "xlsx" else [],
+        "alcance": alcance,
+    }
+    return hashlib.sha256(json.dumps(documento, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# ============================================================================
+# MANIFIESTOS EN DISCO (compartidos entre workers)
+# ============================================================================
+
+def _ruta_manifiesto(id_trabajo: str) -> str:
+    return os.path.join(_directorio(), f"{id_trabajo}.json")
+
+
+def _ruta_clave(clave: str) -> str:
+    return os.path.join(_directorio(), f"clave-{clave}")
+
+
+def _guardar(trabajo: TrabajoExportacion) -> None:
+    """Escribe el manifiesto del trabajo de forma atómica."""
+    trabajo.actualizado = time.time()
+    datos = asdict(trabajo)
+    datos["creado"] = trabajo.creado.isoformat()
+    datos["finalizado"] = trabajo.finalizado.isoformat() if trabajo.finalizado else None
+    ruta = _ruta_manifiesto(trabajo.id_trabajo)
+    temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo, default=str)
+    os.replace(temporal, ruta)
+
+
+def _leer(id_trabajo: str) -> Optional[TrabajoExportacion]:
+    """Trabajo guardado con ese id (None si no existe o el id no es válido)."""
+    if not _ID_TRABAJO.fullmatch(id_trabajo or ""):
+        return None
+    try:
+        with open(_ruta_manifiesto(id_trabajo), encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+    except (OSError, ValueError):
+        return None
+    datos["creado"] = datetime.fromisoformat(datos["creado"])
+    if datos["finalizado"]:
+        datos["finalizado"] = datetime.fromisoformat(datos["finalizado"])
+    return TrabajoExportacion(**datos)
+
+
+def _leer_texto(ruta: str) -> str:
+    try:
+        with open(ruta, encoding="utf-8") as archivo:
+            return archivo.read().strip()
+    except OSError:
+        return ""
+
+
+def _reservar_clave(trabajo: TrabajoExportacion) -> Optional[TrabajoExportacion]:
+    """
+    Asocia la clave de deduplicación al trabajo. Si otro pedido (de este u
+    otro worker) ya la tiene con un trabajo vigente, retorna ese trabajo.
+    """
+    ruta = _ruta_clave(trabajo.clave)
+    temporal = f"{ruta}.{trabajo.id_trabajo}.tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        archivo.write(trabajo.id_trabajo)
+    try:
+        # Atómico: falla si la clave ya existe
+        os.link(temporal, ruta)
+        return None
+    except FileExistsError:
+        existente = _leer(_leer_texto(ruta))
+        if existente is not None and existente.estado != ERROR:
+            return existente
+        # El trabajo anterior falló o ya no existe: se reemplaza
+        os.replace(temporal, ruta)
+        return None
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+def _eliminar(trabajo: TrabajoExportacion) -> None:
+    if _leer_texto(_ruta_clave(trabajo.clave)) == trabajo.id_trabajo:
+        _eliminar_archivo(_ruta_clave(trabajo.clave))
+    for ruta in (trabajo.ruta, _ruta_manifiesto(trabajo.id_trabajo)):
+        if ruta:
+            _eliminar_archivo(ruta)
+
+
+def _eliminar_archivo(ruta: str) -> None:
+    try:
+        os.remove(ruta)
+    except FileNotFoundError:
+        pass
+
+
+def _etag_archivo(ruta: str) -> str:
+    digest = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(1024 * 1024), b""):
+            digest.update(bloque)
+    return f'"{digest.hexdigest()}"'
+
+
+def purgar_vencidos() -> None:
+    """
+    Elimina los trabajos terminados cuyo TTL expiró (y sus archivos), y los
+    que quedaron sin terminar y sin avances durante un TTL (worker caído).
+    """
+    ahora = time.time()
+    for nombre in os.listdir(_directorio()):
+        if not nombre.endswith(".json"):
+            continue
+        trabajo = _leer(nombre[:-len(".json")])
+        if trabajo is None:
+            continue
+        if trabajo.vence is not None:
+            vencido = trabajo.vence <= ahora
+        else:
+            vencido = trabajo.actualizado + settings.EXPORT_TRABAJOS_TTL_SEGUNDOS <= ahora
+        if vencido:
+            _eliminar(trabajo)
+
+
+def crear_trabajo(
+    db: Session,
+    current_user: Usuario,
+    formato: str,
+    filtros: dict,
+    hojas: Optional[list[str]] = None,
+) -> TrabajoExportacion:
+    """
+    Registra y encola una exportación, o devuelve la equivalente que ya esté
+    pendiente, en proceso o completada (los trabajos con error se reintentan).
+    """
+    purgar_vencidos()
+    hojas = list(hojas or [])
+    alcance = alcance_de(current_user)
+    trabajo = TrabajoExportacion(
+        id_trabajo=uuid.uuid4().hex,
+        clave=clave_trabajo(formato, filtros, hojas, alcance),
+        formato=formato,
+        filtros=filtros,
+        hojas=hojas,
+        alcance=alcance,
+    )
+    # El manifiesto se escribe antes de publicar la clave: quien la lea lo encuentra
+    _guardar(trabajo)
+    existente = _reservar_clave(trabajo)
+    if existente is not None:
+        _eliminar_archivo(_ruta_manifiesto(trabajo.id_trabajo))
+        return existente
+
+    # Lectura larga: puede ir a una réplica (app/db/session.py)
+    _obtener_executor().submit(_ejecutar, trabajo, enrutador.bind_lectura(db), current_user.id_usuario)
+    return trabajo
+
+
+def obtener_trabajo(id_trabajo: str, current_user: Usuario) -> Optional[TrabajoExportacion]:
+    """Trabajo visible para el usuario (mismo alcance con el que se creó)."""
+    purgar_vencidos()
+    trabajo = _leer(id_trabajo)
+    if trabajo is None or trabajo.alcance != alcance_de(current_user):
+        return None
+    return trabajo
+
+
+def _ejecutar(trabajo: TrabajoExportacion, bind: Engine | Connection, id_usuario: int) -> None:
+    """Escribe el archivo del trabajo con una sesión propia del hilo."""
+    db = Session(bind=bind, autoflush=False)
+    try:
+        usuario = db.get(Usuario, id_usuario)
+        trabajo.estado = EN_PROCESO
+        trabajo.total = ExportService.construir_query_casos(
+            db=db, current_user=usuario, incluir_relaciones=False, **trabajo.filtros
+        ).count()
+        _guardar(trabajo)
+
+        def al_avanzar(procesados: int) -> None:
+            trabajo.procesados = procesados
+            _guardar(trabajo)
+
+        if trabajo.formato == "csv":
+            ruta = ExportService.exportar_casos_csv_archivo(
+                db=db, current_user=usuario, al_avanzar=al_avanzar, **trabajo.filtros
+            )
+        elif trabajo.formato == "xlsx":
+            ruta = ExportService.exportar_casos_xlsx(
+                db=db, current_user=usuario, hojas=trabajo.hojas, al_avanzar=al_avanzar, **trabajo.filtros
+            )
+        else:
+            ruta = ExportService.exportar_casos_columnar(
+                db=db, current_user=usuario, formato=trabajo.formato, al_avanzar=al_avanzar, **trabajo.filtros
+            )
+
+        destino = os.path.join(_directorio(), f"{trabajo.id_trabajo}.{FORMATOS[trabajo.formato][1]}")
+        shutil.move(ruta, destino)
+
+        trabajo.ruta = destino
+        trabajo.tamano = os.path.getsize(destino)
+        trabajo.etag = _etag_archivo(destino)
+        trabajo.finalizado = datetime.utcnow()
+        trabajo.estado = COMPLETADO
+    except Exception as exc:
+        trabajo.error = str(exc) or exc.__class__.__name__
+        trabajo.finalizado = datetime.utcnow()
+        trabajo.estado = ERROR
+    finally:
+        db.close()
+        trabajo.vence = time.time() + settings.EXPORT_TRABAJOS_TTL_SEGUNDOS
+        _guardar(trabajo)
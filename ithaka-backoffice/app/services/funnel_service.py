@@ -0,0 +1,411 @@
+"""Embudo de estados y tiempo en cada estado, derivados de la auditoría.
+
+Los cambios de estado solo quedan registrados como texto en `auditoria`:
+
+- "Estado actualizado": valor_anterior / valor_nuevo = nombre del estado
+  (PATCH /casos/{id}/estado y PATCH /casos/estado).
+- "Caso actualizado": dicts serializados con `id_estado` (PUT /casos/{id},
+  ver `auditoria_service.estados_en_actualizacion`).
+- "Caso creado": inicio del primer estado del caso.
+
+Los estados se identifican por `id_estado`: hay nombres repetidos entre
+tipos de caso ("en pausa" de postulación y de proyecto). Un nombre ambiguo
+se resuelve con el tipo del estado actual del caso, salvo justo después de
+una "Conversión automática a proyecto", que pasa a un estado de proyecto.
+Esa acción no se cuenta aparte: siempre va seguida del registro con el
+estado final.
+
+El estado inicial no figura en "Caso creado": se conoce con el primer
+cambio (su estado anterior) o, si el caso nunca cambió, es el `id_estado`
+actual del caso.
+
+`actualizar(db)` recorre la auditoría por `id_auditoria` en páginas de
+`FUNNEL_TAMANO_PAGINA`, a partir del último registro procesado
+(checkpoint), y acumula por (convocatoria, estado): entradas, salidas,
+transiciones a cada destino y duración de las estadías cerradas. Los
+pedidos a `/metricas/funnel` solo procesan lo nuevo desde el pedido
+anterior.
+
+Los registros más recientes que `FUNNEL_MARGEN_SEGUNDOS` se dejan para la
+próxima pasada: un INSERT de auditoría con id menor puede confirmarse
+después de uno con id mayor, y el checkpoint no debe saltearlo.
+
+Concurrencia: una sola pasada por proceso a la vez; un pedido que llega
+mientras otro actualiza no espera y responde con el estado vigente. Las
+consultas se hacen fuera del lock que protege el estado: solo se toma
+para aplicar cada página.
+
+Persistencia: cada `FUNNEL_SNAPSHOT_CADA` registros procesados el estado se
+guarda en `funnel_snapshot` (no desde réplicas). Cada worker, y cada
+proceso tras un reinicio, parte del snapshot más reciente y solo procesa
+la auditoría posterior. Al guardarlo se descartan los casos eliminados.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import exists
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.auditoria import Auditoria
+from app.models.caso import Caso
+from app.models.catalogo_estados import CatalogoEstados, normalizar_estado
+from app.models.funnel_snapshot import FunnelSnapshot
+from app.services.auditoria_service import estados_en_actualizacion
+
+CONVERSION = "Conversión automática a proyecto"
+CAMBIOS = ("Estado actualizado", "Caso actualizado")
+ACCIONES = ("Caso creado", CONVERSION) + CAMBIOS
+
+
+@dataclass
+class AgregadoEstado:
+    entradas: int = 0
+    salidas: int = 0
+    segundos: float = 0.0
+    estadias: int = 0
+    # id_estado destino -> cantidad
+    transiciones: Counter = field(default_factory=Counter)
+
+
+@dataclass
+class _Estado:
+    checkpoint: int = 0
+    # id_caso -> (id_estado actual o None si aún no se conoce, desde)
+    casos: dict[int, tuple[Optional[int], Optional[datetime]]] = field(default_factory=dict)
+    # Casos creados cuyo estado inicial todavía no se conoce
+    sin_estado: set[int] = field(default_factory=set)
+    # Casos con una conversión a proyecto pendiente de su registro de estado
+    convirtiendo: set[int] = field(default_factory=set)
+    convocatoria_de: dict[int, Optional[int]] = field(default_factory=dict)
+    agregados: dict[tuple[Optional[int], int], AgregadoEstado] = field(default_factory=dict)
+
+
+_estado = _Estado()
+# Protege `_estado` frente a `resumen`; `_actualizando`, una pasada a la vez
+_lock = threading.Lock()
+_actualizando = threading.Lock()
+# Checkpoint del último snapshot leído o guardado por este proceso
+_guardado = 0
+
+
+class _Catalogo:
+    """Estados por id y por nombre (un nombre puede estar en varios tipos)."""
+
+    def __init__(self, filas) -> None:
+        self.tipo: dict[int, str] = {}
+        self.por_nombre: dict[str, list[int]] = {}
+        for id_estado, nombre_estado, tipo_caso in sorted(filas):
+            self.tipo[id_estado] = tipo_caso
+            self.por_nombre.setdefault(nombre_estado, []).append(id_estado)
+
+    def resolver(self, nombre: Optional[str], tipo_preferido: Optional[str]) -> Optional[int]:
+        ids = self.por_nombre.get(normalizar_estado(nombre) or "")
+        if not ids:
+            return None
+        for id_estado in ids:
+            if self.tipo[id_estado] == tipo_preferido:
+                return id_estado
+        return ids[0]
+
+
+def _transicion(
+    fila, catalogo: _Catalogo, actual: Optional[int], convirtiendo: bool
+) -> Optional[tuple[Optional[int], int]]:
+    """(estado anterior, estado nuevo) de un registro de auditoría, o None."""
+    if fila.accion == "Estado actualizado":
+        tipo_anterior = catalogo.tipo.get(actual) if actual is not None else None
+        anterior = None
+        if fila.valor_anterior not in (None, "N/A"):
+            anterior = catalogo.resolver(fila.valor_anterior, tipo_anterior)
+        tipo_nuevo = "proyecto" if convirtiendo else catalogo.tipo.get(anterior, tipo_anterior)
+        nuevo = catalogo.resolver(fila.valor_nuevo, tipo_nuevo)
+        return (anterior, nuevo) if nuevo is not None else None
+    if fila.accion == "Caso actualizado":
+        return estados_en_actualizacion(fila.valor_anterior, fila.valor_nuevo)
+    return None
+
+
+def _agregado(estado: _Estado, id_caso: int, id_estado: int) -> AgregadoEstado:
+    clave = (estado.convocatoria_de.get(id_caso), id_estado)
+    return estado.agregados.setdefault(clave, AgregadoEstado())
+
+
+def _iniciar(estado: _Estado, id_caso: int, id_estado: int, desde: Optional[datetime]) -> None:
+    """Estado inicial de un caso creado: cuenta su entrada."""
+    _agregado(estado, id_caso, id_estado).entradas += 1
+    estado.casos[id_caso] = (id_estado, desde)
+    estado.sin_estado.discard(id_caso)
+
+
+def _olvidar(estado: _Estado, id_caso: int) -> None:
+    """Caso eliminado: deja de contarse entre los actuales y de consultarse."""
+    estado.casos.pop(id_caso, None)
+    estado.sin_estado.discard(id_caso)
+    estado.convirtiendo.discard(id_caso)
+    estado.convocatoria_de.pop(id_caso, None)
+
+
+def _a_dict(estado: _Estado) -> dict:
+    return {
+        "checkpoint": estado.checkpoint,
+        "casos": [
+            [id_caso, id_estado, desde.isoformat() if desde else None]
+            for id_caso, (id_estado, desde) in estado.casos.items()
+        ],
+        "sin_estado": sorted(estado.sin_estado),
+        "convirtiendo": sorted(estado.convirtiendo),
+        "convocatoria_de": list(estado.convocatoria_de.items()),
+        "agregados": [
+            [convocatoria, id_estado, a.entradas, a.salidas, a.segundos, a.estadias, list(a.transiciones.items())]
+            for (convocatoria, id_estado), a in estado.agregados.items()
+        ],
+    }
+
+
+def _desde_dict(datos: dict) -> _Estado:
+    return _Estado(
+        checkpoint=datos["checkpoint"],
+        casos={
+            id_caso: (id_estado, datetime.fromisoformat(desde) if desde else None)
+            for id_caso, id_estado, desde in datos["casos"]
+        },
+        sin_estado=set(datos["sin_estado"]),
+        convirtiendo=set(datos["convirtiendo"]),
+        convocatoria_de=dict(datos["convocatoria_de"]),
+        agregados={
+            (convocatoria, id_estado): AgregadoEstado(
+                entradas=entradas,
+                salidas=salidas,
+                segundos=segundos,
+                estadias=estadias,
+                transiciones=Counter(dict(transiciones)),
+            )
+            for convocatoria, id_estado, entradas, salidas, segundos, estadias, transiciones in datos["agregados"]
+        },
+    )
+
+
+def _procesar(estado: _Estado, fila, catalogo: _Catalogo) -> None:
+    if fila.id_caso is None:
+        return
+
+    if fila.accion == "Caso creado":
+        estado.casos[fila.id_caso] = (None, fila.timestamp)
+        estado.sin_estado.add(fila.id_caso)
+        return
+    if fila.accion == CONVERSION:
+        estado.convirtiendo.add(fila.id_caso)
+        return
+
+    actual, desde = estado.casos.get(fila.id_caso, (None, None))
+    cambio = _transicion(fila, catalogo, actual, fila.id_caso in estado.convirtiendo)
+    estado.convirtiendo.discard(fila.id_caso)
+    if cambio is None:
+        return
+    anterior, nuevo = cambio
+
+    if actual is None and fila.id_caso in estado.sin_estado and anterior is not None:
+        # Primer cambio tras la creación: su estado anterior es el inicial
+        _iniciar(estado, fila.id_caso, anterior, desde)
+        actual = anterior
+    origen = actual if actual is not None else anterior
+    if origen == nuevo:
+        return
+
+    if origen is not None:
+        agregado_origen = _agregado(estado, fila.id_caso, origen)
+        agregado_origen.salidas += 1
+        agregado_origen.transiciones[nuevo] += 1
+        if desde is not None and fila.timestamp is not None:
+            agregado_origen.segundos += (fila.timestamp - desde).total_seconds()
+            agregado_origen.estadias += 1
+
+    _agregado(estado, fila.id_caso, nuevo).entradas += 1
+    estado.casos[fila.id_caso] = (nuevo, fila.timestamp)
+    estado.sin_estado.discard(fila.id_caso)
+
+
+def _iniciar_sin_cambios(db: Session) -> None:
+    """
+    Casos creados que no cambiaron de estado: su estado inicial es el actual.
+    Se excluyen los que tienen cambios aún no procesados (dentro del margen);
+    se resuelven al procesarlos. Los que ya no existen se descartan. Una sola
+    consulta por tramo: el estado del caso y la ausencia de cambios se leen
+    juntos.
+    """
+    pendientes = sorted(_estado.sin_estado)
+    tamano = settings.FUNNEL_TAMANO_PAGINA
+    for inicio in range(0, len(pendientes), tamano):
+        tramo = pendientes[inicio:inicio + tamano]
+        cambios_pendientes = exists().where(
+            Auditoria.id_caso == Caso.id_caso,
+            Auditoria.id_auditoria > _estado.checkpoint,
+            Auditoria.accion.in_(CAMBIOS),
+        )
+        filas = db.query(Caso.id_caso, Caso.id_estado, cambios_pendientes.label("pendiente")).filter(
+            Caso.id_caso.in_(tramo)
+        ).all()
+        with _lock:
+            for id_caso in set(tramo) - {fila.id_caso for fila in filas}:
+                _olvidar(_estado, id_caso)
+            for fila in filas:
+                if fila.id_estado is not None and not fila.pendiente:
+                    _iniciar(_estado, fila.id_caso, fila.id_estado, _estado.casos[fila.id_caso][1])
+
+
+def _olvidar_eliminados(db: Session) -> None:
+    """Descarta los casos que ya no existen (por tramos)."""
+    conocidos = sorted(_estado.casos)
+    tamano = settings.FUNNEL_TAMANO_PAGINA
+    for inicio in range(0, len(conocidos), tamano):
+        tramo = conocidos[inicio:inicio + tamano]
+        existentes = {fila.id_caso for fila in db.query(Caso.id_caso).filter(Caso.id_caso.in_(tramo))}
+        eliminados = set(tramo) - existentes
+        if eliminados:
+            with _lock:
+                for id_caso in eliminados:
+                    _olvidar(_estado, id_caso)
+
+
+def _cargar_snapshot(db: Session) -> None:
+    """Adopta el estado guardado si está más avanzado que el de este proceso."""
+    global _estado, _guardado
+    checkpoint = db.query(FunnelSnapshot.checkpoint).filter(FunnelSnapshot.id == 1).scalar()
+    if checkpoint is None or checkpoint <= _estado.checkpoint:
+        return
+    datos = db.query(FunnelSnapshot.datos).filter(FunnelSnapshot.id == 1).scalar()
+    estado = _desde_dict(json.loads(datos))
+    with _lock:
+        _estado = estado
+    _guardado = estado.checkpoint
+
+
+def _guardar_snapshot(db: Session) -> None:
+    """Guarda el estado si avanzó `FUNNEL_SNAPSHOT_CADA` registros desde el último."""
+    global _guardado
+    if db.info.get("replica") or _estado.checkpoint - _guardado < settings.FUNNEL_SNAPSHOT_CADA:
+        return
+
+    _olvidar_eliminados(db)
+    with _lock:
+        checkpoint = _estado.checkpoint
+        datos = json.dumps(_a_dict(_estado))
+    valores = {"checkpoint": checkpoint, "datos": datos, "actualizado": datetime.utcnow()}
+    # Otro worker pudo guardar uno más avanzado: no se pisa
+    actualizadas = db.query(FunnelSnapshot).filter(
+        FunnelSnapshot.id == 1, FunnelSnapshot.checkpoint < checkpoint
+    ).update(valores, synchronize_session=False)
+    if not actualizadas and db.query(FunnelSnapshot.id).filter(FunnelSnapshot.id == 1).first() is None:
+        db.add(FunnelSnapshot(id=1, **valores))
+    try:
+        db.commit()
+    except IntegrityError:
+        # Otro worker creó la fila a la vez
+        db.rollback()
+    _guardado = checkpoint
+
+
+def actualizar(db: Session) -> int:
+    """
+    Procesa la auditoría nueva desde el checkpoint. Retorna el checkpoint.
+    Si este proceso ya está actualizando en otro request, retorna el
+    checkpoint vigente sin esperar.
+    """
+    if not _actualizando.acquire(blocking=False):
+        with _lock:
+            return _estado.checkpoint
+    try:
+        _cargar_snapshot(db)
+        limite = datetime.utcnow() - timedelta(seconds=settings.FUNNEL_MARGEN_SEGUNDOS)
+        catalogo = _Catalogo(db.query(
+            CatalogoEstados.id_estado, CatalogoEstados.nombre_estado, CatalogoEstados.tipo_caso
+        ))
+
+        while True:
+            filas = (
+                db.query(
+                    Auditoria.id_auditoria,
+                    Auditoria.id_caso,
+                    Auditoria.accion,
+                    Auditoria.valor_anterior,
+                    Auditoria.valor_nuevo,
+                    Auditoria.timestamp,
+                )
+                .filter(
+                    Auditoria.id_auditoria > _estado.checkpoint,
+                    Auditoria.accion.in_(ACCIONES),
+                    Auditoria.timestamp <= limite,
+                )
+                .order_by(Auditoria.id_auditoria)
+                .limit(settings.FUNNEL_TAMANO_PAGINA)
+                .all()
+            )
+            if not filas:
+                break
+
+            nuevos = {f.id_caso for f in filas if f.id_caso is not None} - _estado.convocatoria_de.keys()
+            convocatorias = {id_caso: None for id_caso in nuevos}
+            if nuevos:
+                convocatorias.update(
+                    db.query(Caso.id_caso, Caso.id_convocatoria).filter(Caso.id_caso.in_(nuevos))
+                )
+
+            with _lock:
+                _estado.convocatoria_de.update(convocatorias)
+                for fila in filas:
+                    _procesar(_estado, fila, catalogo)
+                _estado.checkpoint = filas[-1].id_auditoria
+
+        if _estado.sin_estado:
+            _iniciar_sin_cambios(db)
+        _guardar_snapshot(db)
+        return _estado.checkpoint
+    finally:
+        _actualizando.release()
+
+
+def resumen(id_convocatoria: Optional[int] = None) -> dict:
+    """Agregados por id_estado (sumando convocatorias si no se filtra)."""
+    with _lock:
+        por_estado: dict[int, AgregadoEstado] = {}
+        for (convocatoria, id_estado), agregado in _estado.agregados.items():
+            if id_convocatoria is not None and convocatoria != id_convocatoria:
+                continue
+            total = por_estado.setdefault(id_estado, AgregadoEstado())
+            total.entradas += agregado.entradas
+            total.salidas += agregado.salidas
+            total.segundos += agregado.segundos
+            total.estadias += agregado.estadias
+            total.transiciones.update(agregado.transiciones)
+
+        actuales = Counter(
+            id_estado
+            for id_caso, (id_estado, _) in _estado.casos.items()
+            if id_estado is not None
+            and (id_convocatoria is None or _estado.convocatoria_de.get(id_caso) == id_convocatoria)
+        )
+        return {
+            "checkpoint": _estado.checkpoint,
+            "estados": por_estado,
+            "actuales": actuales,
+        }
+
+
+def reiniciar() -> None:
+    """
+    Descarta los agregados de este proceso (se retoman desde el snapshot o
+    desde el inicio de la auditoría).
+    """
+    global _estado, _guardado
+    with _lock:
+        _estado = _Estado()
+    _guardado = 0
@@ -0,0 +1,114 @@
+"""Cache de métricas agregadas con invalidación por escritura.
+
+Cada resultado se guarda junto con la versión de las tablas de las que
+depende. Cualquier escritura confirmada sobre esas tablas incrementa su
+versión y el resultado se recalcula en el próximo pedido:
+
+- Cambios por el unit of work del ORM (`db.add`, `db.delete`, atributos
+  modificados) se detectan en `before_flush`.
+- UPDATE/INSERT/DELETE masivos ejecutados vía ORM (`query.update`,
+  `db.execute(insert(Modelo), filas)`) se detectan en `do_orm_execute`.
+- Las versiones se incrementan en `after_commit` (y se descartan en rollback).
+
+Un TTL (`METRICAS_CACHE_TTL_SEGUNDOS`) acota la desactualización entre
+workers o frente a SQL manual, igual que la cache de autorización.
+
+Uso:
+    valor = metricas_cache.obtener(("tutores", dias), (Asignacion, Nota), lambda: calcular(db))
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Hashable, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+_versiones: dict[str, int] = {}
+_cache: dict[Hashable, tuple[float, tuple[int, ...], Any]] = {}
+_lock = threading.Lock()
+
+
+def _tabla(modelo) -> str:
+    return modelo.__tablename__ if hasattr(modelo, "__tablename__") else str(modelo)
+
+
+def version(modelos: Iterable) -> tuple[int, ...]:
+    """Versión actual de cada tabla (en el orden pedido)."""
+    with _lock:
+        return tuple(_versiones.get(_tabla(modelo), 0) for modelo in modelos)
+
+
+def obtener(clave: Hashable, dependencias: Iterable, calcular: Callable[[], Any]) -> Any:
+    """Retorna el valor cacheado para `clave` o lo calcula si hubo escrituras en `dependencias`."""
+    dependencias = tuple(dependencias)
+    actual = version(dependencias)
+    ahora = time.monotonic()
+    with _lock:
+        entrada = _cache.get(clave)
+    if entrada is not None and entrada[0] > ahora and entrada[1] == actual:
+        return entrada[2]
+
+    valor = calcular()
+    with _lock:
+        _cache[clave] = (ahora + settings.METRICAS_CACHE_TTL_SEGUNDOS, actual, valor)
+    return valor
+
+
+def invalidar(tablas: Iterable[str]) -> None:
+    """Incrementa la versión de las tablas indicadas."""
+    with _lock:
+        for tabla in tablas:
+            _versiones[tabla] = _versiones.get(tabla, 0) + 1
+
+
+def invalidar_todo() -> None:
+    """Vacía la cache completa."""
+    with _lock:
+        _cache.clear()
+        _versiones.clear()
+
+
+# ============================================================================
+# INVALIDACIÓN AUTOMÁTICA (eventos del ORM)
+# ============================================================================
+
+def _marcar(session: Session, tablas: Iterable[str]) -> None:
+    session.info.setdefault("metricas_pendientes", set()).update(tablas)
+
+
+@event.listens_for(Session, "before_flush")
+def _detectar_cambios(session, flush_context, instances):
+    tablas = {
+        obj.__tablename__
+        for obj in (*session.new, *session.deleted, *session.dirty)
+        if hasattr(obj, "__tablename__")
+        and (obj not in session.dirty or session.is_modified(obj))
+    }
+    if tablas:
+        _marcar(session, tablas)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _detectar_masivos(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None:
+        _marcar(orm_execute_state.session, {mapper.local_table.name})
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_al_confirmar(session):
+    tablas = session.info.pop("metricas_pendientes", None)
+    if tablas:
+        invalidar(tablas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_pendientes(session):
+    session.info.pop("metricas_pendientes", None)
@@ -0,0 +1,215 @@
+"""Series temporales de casos nuevos, cambios de estado y notas.
+
+Cada serie cuenta eventos por período (día, semana ISO o mes) agrupando en
+SQL por la fecha truncada (`date_trunc` en PostgreSQL, `date`/`strftime`
+en SQLite):
+
+- casos_nuevos: `caso.fecha_creacion`
+- cambios_estado: `auditoria.timestamp` con acción "Estado actualizado"
+  (PATCH) más los "Caso actualizado" (PUT) que cambiaron `id_estado`
+- notas: `nota.fecha`
+
+Cache acumulativa: los períodos cerrados (anteriores al período en curso) se
+consideran inmutables y se guardan en memoria una vez calculados; en cada
+pedido solo se consulta el período en curso y, si hace falta, el tramo de
+historia que todavía no estaba cubierto. Así el costo de un gráfico de
+tendencia no crece con el largo de la historia.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.auditoria import Auditoria
+from app.models.caso import Caso
+from app.models.nota import Nota
+from app.services.auditoria_service import estados_en_actualizacion
+
+GRANULARIDADES = ("dia", "semana", "mes")
+SERIES = ("casos_nuevos", "cambios_estado", "notas")
+
+# Períodos por defecto cuando no se indica `desde`
+PERIODOS_POR_DEFECTO = {"dia": 30, "semana": 12, "mes": 12}
+
+
+def inicio_periodo(fecha: date, granularidad: str) -> date:
+    """Primer día del período que contiene `fecha`."""
+    if granularidad == "semana":
+        return fecha - timedelta(days=fecha.weekday())
+    if granularidad == "mes":
+        return fecha.replace(day=1)
+    return fecha
+
+
+def siguiente_periodo(inicio: date, granularidad: str) -> date:
+    if granularidad == "semana":
+        return inicio + timedelta(days=7)
+    if granularidad == "mes":
+        return date(inicio.year + inicio.month // 12, inicio.month % 12 + 1, 1)
+    return inicio + timedelta(days=1)
+
+
+def retroceder(inicio: date, granularidad: str, periodos: int) -> date:
+    """Inicio del período `periodos` antes de `inicio`."""
+    if granularidad == "semana":
+        return inicio - timedelta(days=7 * periodos)
+    if granularidad == "mes":
+        total = inicio.year * 12 + inicio.month - 1 - periodos
+        return date(total // 12, total % 12 + 1, 1)
+    return inicio - timedelta(days=periodos)
+
+
+def _truncar(columna, granularidad: str, dialecto: str):
+    if dialecto == "postgresql":
+        unidad = {"dia": "day", "semana": "week", "mes": "month"}[granularidad]
+        return func.date_trunc(unidad, columna)
+    if granularidad == "semana":
+        # SQLite: lunes de la semana (como date_trunc('week'))
+        return func.date(columna, "weekday 0", "-6 days")
+    if granularidad == "mes":
+        return func.strftime("%Y-%m-01", columna)
+    return func.date(columna)
+
+
+def _a_fecha(valor) -> date:
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return date.fromisoformat(str(valor)[:10])
+
+
+def _contar(
+    db: Session,
+    serie: str,
+    granularidad: str,
+    id_convocatoria: Optional[int],
+    desde: date,
+    hasta: Optional[date],
+) -> dict[date, int]:
+    """Un GROUP BY por período para la serie, en [desde, hasta)."""
+    if serie == "casos_nuevos":
+        columna, query_base = Caso.fecha_creacion, None
+    elif serie == "cambios_estado":
+        columna, query_base = Auditoria.timestamp, Auditoria
+    else:
+        columna, query_base = Nota.fecha, Nota
+
+    periodo = _truncar(columna, granularidad, db.get_bind().dialect.name).label("periodo")
+    query = db.query(periodo, func.count().label("cantidad"))
+    if query_base is None:
+        query = query.select_from(Caso)
+    else:
+        query = query.select_from(query_base)
+        if id_convocatoria is not None:
+            query = query.join(Caso, Caso.id_caso == query_base.id_caso)
+    if serie == "cambios_estado":
+        query = query.filter(Auditoria.accion == "Estado actualizado")
+    if id_convocatoria is not None:
+        query = query.filter(Caso.id_convocatoria == id_convocatoria)
+
+    query = query.filter(columna >= datetime.combine(desde, datetime.min.time()))
+    if hasta is not None:
+        query = query.filter(columna < datetime.combine(hasta, datetime.min.time()))
+
+    conteos = Counter({_a_fecha(fila.periodo): fila.cantidad for fila in query.group_by(periodo)})
+    if serie == "cambios_estado":
+        conteos.update(_cambios_en_put(db, granularidad, id_convocatoria, desde, hasta))
+    return dict(conteos)
+
+
+def _cambios_en_put(
+    db: Session,
+    granularidad: str,
+    id_convocatoria: Optional[int],
+    desde: date,
+    hasta: Optional[date],
+) -> Counter:
+    """
+    Cambios de estado hechos con PUT /casos/{id}: quedan dentro de "Caso
+    actualizado" (dicts serializados con `id_estado`). Se cuentan en Python:
+    hay que comparar el estado anterior con el nuevo.
+    """
+    query = db.query(Auditoria.timestamp, Auditoria.valor_anterior, Auditoria.valor_nuevo).filter(
+        Auditoria.accion == "Caso actualizado",
+        Auditoria.valor_nuevo.like("%'id_estado'%"),
+        Auditoria.timestamp >= datetime.combine(desde, datetime.min.time()),
+    )
+    if hasta is not None:
+        query = query.filter(Auditoria.timestamp < datetime.combine(hasta, datetime.min.time()))
+    if id_convocatoria is not None:
+        query = query.join(Caso, Caso.id_caso == Auditoria.id_caso).filter(
+            Caso.id_convocatoria == id_convocatoria
+        )
+
+    conteos: Counter = Counter()
+    for fila in query:
+        estados = estados_en_actualizacion(fila.valor_anterior, fila.valor_nuevo)
+        if estados is not None and estados[0] != estados[1]:
+            conteos[inicio_periodo(_a_fecha(fila.timestamp), granularidad)] += 1
+    return conteos
+
+
+@dataclass
+class _Cerrados:
+    """Conteos de períodos cerrados, contiguos en [desde, hasta)."""
+    desde: date
+    hasta: date
+    valores: dict[date, int] = field(default_factory=dict)
+
+
+_cache: dict[tuple, _Cerrados] = {}
+_lock = threading.Lock()
+
+
+def serie(
+    db: Session,
+    nombre: str,
+    granularidad: str,
+    id_convocatoria: Optional[int],
+    desde: date,
+    hoy: Optional[date] = None,
+) -> dict[date, int]:
+    """
+    Conteos por período desde `desde` (alineado al inicio de período) hasta el
+    período en curso inclusive.
+    """
+    hoy = hoy or datetime.utcnow().date()
+    actual = inicio_periodo(hoy, granularidad)
+    clave = (nombre, granularidad, id_convocatoria)
+
+    with _lock:
+        cerrados = _cache.get(clave)
+        if cerrados is not None:
+            cerrados = _Cerrados(cerrados.desde, cerrados.hasta, dict(cerrados.valores))
+
+    if cerrados is None or cerrados.hasta > actual:
+        cerrados = _Cerrados(desde=min(desde, actual), hasta=min(desde, actual))
+
+    # Historia aún no cubierta (antes del tramo cacheado y entre él y el período en curso)
+    if desde < cerrados.desde:
+        cerrados.valores.update(_contar(db, nombre, granularidad, id_convocatoria, desde, cerrados.desde))
+        cerrados.desde = desde
+    if cerrados.hasta < actual:
+        cerrados.valores.update(_contar(db, nombre, granularidad, id_convocatoria, cerrados.hasta, actual))
+        cerrados.hasta = actual
+
+    with _lock:
+        _cache[clave] = cerrados
+
+    resultado = {p: c for p, c in cerrados.valores.items() if p >= desde}
+    resultado.update(_contar(db, nombre, granularidad, id_convocatoria, actual, None))
+    return resultado
+
+
+def invalidar_todo() -> None:
+    """Vacía la cache de períodos cerrados (p. ej. tras cargas históricas)."""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,124 @@
+"""Proyeccion de columnas para listados (`?fields=`).
+
+Permite que un listado devuelva solo los atributos pedidos, compilando la
+seleccion a un SELECT de columnas (sin hidratar entidades ORM ni traer
+columnas pesadas como `descripcion` o `datos_chatbot`).
+
+Uso en un endpoint:
+
+    CAMPOS = columnas_de_modelo(Nota)
+    seleccion = parsear_fields(fields, CAMPOS)       # ValueError si hay campos invalidos
+    if seleccion:
+        return respuesta_proyectada(proyectar(query, CAMPOS, seleccion))
+
+El primer campo del mapa (la clave primaria) se incluye siempre.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, Mapping, NamedTuple, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Query
+
+from app.core.respuestas import ORJSONRespuesta
+
+
+class CampoProyectado(NamedTuple):
+    """Columna proyectable de un listado."""
+    expresion: Any
+    # Clave del join (ver `proyectar(..., joins=)`) que necesita la expresion
+    join: Optional[str] = None
+    # Valor a devolver cuando la columna es NULL
+    valor_si_nulo: Any = None
+
+
+def columnas_de_modelo(modelo, excluir: Iterable[str] = ()) -> dict[str, CampoProyectado]:
+    """Mapa campo → columna con todas las columnas del modelo (PK primero)."""
+    mapper = inspect(modelo)
+    excluidos = set(excluir)
+    pks = {col.key for col in mapper.primary_key}
+    atributos = sorted(mapper.column_attrs, key=lambda attr: attr.key not in pks)
+    return {
+        attr.key: CampoProyectado(getattr(modelo, attr.key))
+        for attr in atributos
+        if attr.key not in excluidos
+    }
+
+
+def parsear_fields(
+    fields: Optional[str],
+    campos: Mapping[str, CampoProyectado],
+) -> Optional[list[str]]:
+    """
+    Interpreta `fields=a,b,c`. Retorna None si no se pidio proyeccion.
+
+    Raises:
+        ValueError: si algun campo no existe en el listado.
+    """
+    if fields is None or not fields.strip():
+        return None
+
+    pedidos = [campo.strip() for campo in fields.split(",") if campo.strip()]
+    invalidos = [campo for campo in pedidos if campo not in campos]
+    if invalidos:
+        raise ValueError(
+            f"Campos inválidos: {', '.join(invalidos)}. "
+            f"Disponibles: {', '.join(campos)}"
+        )
+
+    clave_primaria = next(iter(campos))
+    seleccion = [clave_primaria]
+    for campo in pedidos:
+        if campo not in seleccion:
+            seleccion.append(campo)
+    return seleccion
+
+
+def proyectar(
+    query: Query,
+    campos: Mapping[str, CampoProyectado],
+    seleccion: list[str],
+    joins: Optional[Mapping[str, Callable[[Query], Query]]] = None,
+    skip: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> list[dict]:
+    """
+    Ejecuta `query` seleccionando solo las columnas pedidas.
+
+    Los filtros, joins y orden de `query` se conservan; los joins adicionales
+    que requieren las columnas proyectadas se aplican una vez. La paginacion
+    se recibe aparte porque SQLAlchemy no permite agregar joins despues de
+    LIMIT/OFFSET.
+    """
+    # Los joins se agregan antes de reemplazar las entidades, así su lado
+    # izquierdo es la entidad base del query.
+    joins_aplicados: set[str] = set()
+    for nombre in seleccion:
+        clave_join = campos[nombre].join
+        if clave_join and clave_join not in joins_aplicados:
+            query = joins[clave_join](query)
+            joins_aplicados.add(clave_join)
+
+    query = query.with_entities(
+        *(campos[nombre].expresion.label(nombre) for nombre in seleccion)
+    )
+
+    if skip is not None:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+
+    filas = []
+    for fila in query.all():
+        valores = dict(fila._mapping)
+        for nombre in seleccion:
+            if valores[nombre] is None and campos[nombre].valor_si_nulo is not None:
+                valores[nombre] = campos[nombre].valor_si_nulo
+        filas.append(valores)
+    return filas
+
+
+def respuesta_proyectada(filas: list[dict]) -> ORJSONRespuesta:
+    """Respuesta JSON para listados proyectados (no aplica response_model)."""
+    return ORJSONRespuesta(content=filas)
@@ -39,7 +39,8 @@ CREATE TABLE emprendedor (
     facultad_ucu VARCHAR(100),
     canal_llegada VARCHAR(100),
     motivacion TEXT,
-    fecha_registro TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    fecha_registro TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    version INTEGER NOT NULL DEFAULT 1
 );
 
 -- =========================
@@ -72,6 +73,7 @@ CREATE TABLE caso (
     id_emprendedor INTEGER NOT NULL,
     id_convocatoria INTEGER,
     id_estado INTEGER NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
 
     FOREIGN KEY (id_emprendedor)
         REFERENCES emprendedor(id_emprendedor)
@@ -174,6 +176,7 @@ CREATE TABLE nota (
     fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     id_usuario INTEGER NOT NULL,
     id_caso INTEGER NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
 
     FOREIGN KEY (id_usuario)
         REFERENCES usuario(id_usuario)
@@ -203,4 +206,82 @@ CREATE TABLE auditoria (
     FOREIGN KEY (id_caso)
         REFERENCES caso(id_caso)
         ON DELETE CASCADE
-);
\ No newline at end of file
+);
+
+-- =========================
+-- TABLA FUNNEL_SNAPSHOT
+-- =========================
+-- Estado persistido de /metricas/funnel (ver app/services/funnel_service.py)
+CREATE TABLE funnel_snapshot (
+    id INTEGER PRIMARY KEY,
+    checkpoint INTEGER NOT NULL,
+    datos TEXT NOT NULL,
+    actualizado TIMESTAMP
+);
+
+-- =========================
+-- BUSQUEDA FULL-TEXT
+-- =========================
+-- Ver app/db/busqueda.py (mismo DDL que aplica create_all en PostgreSQL)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE caso ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', coalesce(nombre_caso, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(descripcion, '')), 'B')
+    ) STORED;
+CREATE INDEX IF NOT EXISTS ix_caso_search_vector ON caso USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS ix_caso_nombre_caso_trgm ON caso USING GIN (nombre_caso gin_trgm_ops);
+
+ALTER TABLE emprendedor ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('simple', coalesce(nombre, '') || ' ' || coalesce(apellido, '') || ' ' ||
+                              coalesce(email, '') || ' ' || coalesce(documento_identidad, ''))
+    ) STORED;
+CREATE INDEX IF NOT EXISTS ix_emprendedor_search_vector ON emprendedor USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS ix_emprendedor_nombre_completo_trgm ON emprendedor USING GIN ((nombre || ' ' || apellido) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_emprendedor_email_trgm ON emprendedor USING GIN (email gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_emprendedor_documento_trgm ON emprendedor USING GIN (documento_identidad gin_trgm_ops);
+
+ALTER TABLE nota ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('spanish', coalesce(contenido, ''))) STORED;
+CREATE INDEX IF NOT EXISTS ix_nota_search_vector ON nota USING GIN (search_vector);
+
+-- =========================
+-- FILTROS SOBRE DATOS_CHATBOT
+-- =========================
+-- Contención (@>) indexada; ver app/services/chatbot_filtros.py
+CREATE INDEX IF NOT EXISTS ix_caso_datos_chatbot_gin ON caso USING GIN (datos_chatbot jsonb_path_ops);
+
+-- =========================
+-- ÍNDICES: FOREIGN KEYS Y FILTROS FRECUENTES
+-- =========================
+-- Mismo set que migrations/versions/0002_indices_fk_filtros.py.
+-- Con Alembic: `alembic stamp 0001_baseline && alembic upgrade head`.
+CREATE INDEX IF NOT EXISTS ix_caso_id_estado ON caso (id_estado);
+CREATE INDEX IF NOT EXISTS ix_caso_id_convocatoria ON caso (id_convocatoria);
+CREATE INDEX IF NOT EXISTS ix_caso_id_emprendedor ON caso (id_emprendedor);
+CREATE INDEX IF NOT EXISTS ix_asignacion_id_usuario_id_caso ON asignacion (id_usuario, id_caso);
+CREATE INDEX IF NOT EXISTS ix_asignacion_id_caso ON asignacion (id_caso);
+CREATE INDEX IF NOT EXISTS ix_nota_id_caso_fecha ON nota (id_caso, fecha);
+CREATE INDEX IF NOT EXISTS ix_nota_id_usuario ON nota (id_usuario);
+CREATE INDEX IF NOT EXISTS ix_apoyo_id_caso ON apoyo (id_caso);
+CREATE INDEX IF NOT EXISTS ix_apoyo_id_programa ON apoyo (id_programa);
+CREATE INDEX IF NOT EXISTS ix_apoyo_id_catalogo_apoyo ON apoyo (id_catalogo_apoyo);
+CREATE INDEX IF NOT EXISTS ix_apoyo_solicitado_id_caso ON apoyo_solicitado (id_caso);
+CREATE INDEX IF NOT EXISTS ix_apoyo_solicitado_id_catalogo_apoyo ON apoyo_solicitado (id_catalogo_apoyo);
+CREATE INDEX IF NOT EXISTS ix_auditoria_id_usuario_timestamp ON auditoria (id_usuario, timestamp);
+CREATE INDEX IF NOT EXISTS ix_auditoria_id_caso ON auditoria (id_caso);
+CREATE INDEX IF NOT EXISTS ix_usuario_id_rol ON usuario (id_rol);
+
+-- =========================
+-- ESTADOS NORMALIZADOS
+-- =========================
+-- Mismo esquema que migrations/versions/0003_estados_normalizados.py:
+-- nombre_estado / tipo_caso en minúsculas, únicos por tipo de caso.
+ALTER TABLE catalogo_estados DROP CONSTRAINT IF EXISTS check_tipo_caso;
+ALTER TABLE catalogo_estados ADD CONSTRAINT check_tipo_caso
+    CHECK (tipo_caso IN ('postulacion', 'proyecto'));
+ALTER TABLE catalogo_estados ADD CONSTRAINT check_nombre_estado_normalizado
+    CHECK (nombre_estado = lower(trim(nombre_estado)));
+CREATE UNIQUE INDEX IF NOT EXISTS ux_catalogo_estados_tipo_nombre ON catalogo_estados (tipo_caso, nombre_estado);
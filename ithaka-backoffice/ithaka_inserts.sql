@@ -43,25 +43,25 @@ INSERT INTO convocatoria (nombre, fecha_cierre) VALUES
 -- POSTULACIONES
 -- -------------------------
 INSERT INTO catalogo_estados (nombre_estado, tipo_caso) VALUES 
-('Postulado', 'Postulacion'),
-('En revisión', 'Postulacion'),
-('Evaluar', 'Postulacion'),
-('En pausa', 'Postulacion'),
-('Rechazado', 'Postulacion'),
-('Aprobado', 'Postulacion'),
-('En proyecto', 'Postulacion');
+('postulado', 'postulacion'),
+('en revisión', 'postulacion'),
+('evaluar', 'postulacion'),
+('en pausa', 'postulacion'),
+('rechazado', 'postulacion'),
+('aprobado', 'postulacion'),
+('en proyecto', 'postulacion');
 
 -- -------------------------
 -- PROYECTOS
 -- -------------------------
 INSERT INTO catalogo_estados (nombre_estado, tipo_caso) VALUES
-('En Pausa', 'Proyecto'),
-('VIN', 'Proyecto'),
-('Semilla ANDE', 'Proyecto'),
-('Semilla ANII', 'Proyecto'),
-('Realizado', 'Proyecto'),
-('Egresado', 'Proyecto'),
-('Cancelado', 'Proyecto');
+('en pausa', 'proyecto'),
+('vin', 'proyecto'),
+('semilla ande', 'proyecto'),
+('semilla anii', 'proyecto'),
+('realizado', 'proyecto'),
+('egresado', 'proyecto'),
+('cancelado', 'proyecto');
 
 
 
@@ -16,11 +16,37 @@ Documentación interactiva:
     http://localhost:8000/redoc   (ReDoc)
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-# Importar el router principal de la API v1
-from app.api.v1.api import api_router
+from app.core.compresion import CompresionMiddleware
+from app.core.config import settings
+from app.core.respuestas import ORJSONRespuesta
+from app.db.session import HEADER_ESCRITURA, MarcaEscrituraMiddleware
+
+# Registro de routers de la API v1 (se importan al primer uso)
+from app.api.v1.api import ROUTERS
+from app.core.routers_diferidos import cargar_todos, incluir_routers
+# Registran sus canales LISTEN al importarse (antes de iniciar el listener)
+from app.services import autorizacion_service, eventos_service  # noqa: F401
+
+
+# ============================================================================
+# CICLO DE VIDA
+# ============================================================================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Varios workers: los eventos de /casos/events y las invalidaciones de la
+    # cache de autorización llegan por LISTEN/NOTIFY
+    detener_listener = None
+    if settings.EVENTOS_LISTEN_NOTIFY:
+        detener_listener = eventos_service.iniciar_listener(settings.DATABASE_URL)
+    yield
+    if detener_listener is not None:
+        detener_listener.set()
+
 # ============================================================================
 # CREAR APLICACIÓN FASTAPI
 # ============================================================================
@@ -29,7 +55,9 @@ app = FastAPI(
     description="API para gestión de postulaciones y proyectos del Centro de Emprendimiento e Innovación - UCU",
     version="1.0.0",
     docs_url="/docs",      # Swagger UI
-    redoc_url="/redoc"     # ReDoc
+    redoc_url="/redoc",    # ReDoc
+    default_response_class=ORJSONRespuesta,  # JSON con orjson (ver app/core/respuestas.py)
+    lifespan=lifespan
 )
 
 # ============================================================================
@@ -42,6 +70,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],        # Permite GET, POST, PUT, DELETE, etc.
     allow_headers=["*"],        # Permite todos los headers
+    # ETag: para enviar If-Match (ver app/core/versionado.py); marca de
+    # escritura: para reenviarla en las lecturas (ver app/db/session.py)
+    expose_headers=["ETag", HEADER_ESCRITURA],
+)
+
+# ============================================================================
+# LECTURAS EN RÉPLICAS (read-your-writes entre workers)
+# ============================================================================
+app.add_middleware(MarcaEscrituraMiddleware)
+
+# ============================================================================
+# COMPRESIÓN DE RESPUESTAS
+# ============================================================================
+# gzip/brotli negociado por Accept-Encoding; también comprime StreamingResponse
+# bloque a bloque (ver app/core/compresion.py)
+app.add_middleware(
+    CompresionMiddleware,
+    tamano_minimo=settings.COMPRESION_TAMANO_MINIMO,
+    nivel_gzip=settings.COMPRESION_NIVEL_GZIP,
+    calidad_brotli=settings.COMPRESION_CALIDAD_BROTLI,
 )
 
 # ============================================================================
@@ -49,11 +97,24 @@ app.add_middleware(
 # ============================================================================
 # Todos los endpoints de la API estarán bajo /api/v1
 # Ejemplo: /api/v1/emprendedores, /api/v1/casos, etc.
-app.include_router(
-    api_router,
-    prefix="/api/v1"  # Prefijo para todos los endpoints
+incluir_routers(
+    app,
+    ROUTERS,
+    prefijo="/api/v1",  # Prefijo para todos los endpoints
+    diferido=settings.ROUTERS_DIFERIDOS,
 )
 
+# /docs y /openapi.json necesitan todas las rutas: cargar los routers pendientes
+_generar_openapi = app.openapi
+
+
+def _openapi_completo():
+    cargar_todos(app)
+    return _generar_openapi()
+
+
+app.openapi = _openapi_completo
+
 # ============================================================================
 # ENDPOINTS BÁSICOS (ROOT Y HEALTH CHECK)
 # ============================================================================
@@ -109,8 +170,7 @@ def health_check():
 # 
 # Para agregar endpoints de negocio:
 #   1. Crear archivo en app/api/v1/endpoints/
-#   2. Importar el router en app/api/v1/api.py
-#   3. Incluirlo con api_router.include_router()
+#   2. Registrarlo en ROUTERS de app/api/v1/api.py
 # 
 # Para más información, ver: GUIA_ENDPOINTS.md
 # ============================================================================
@@ -0,0 +1,77 @@
+"""
+Entorno de Alembic
+------------------
+Usa `Base.metadata` (todos los modelos de app/models) como esquema objetivo,
+con las reglas de comparación de app/db/migraciones.py,
+y la URL de `settings.DATABASE_URL`, salvo que se indique otra con
+`alembic -x url=...` o se pase una conexión en `config.attributes["connection"]`
+(así lo hacen los tests).
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+from sqlalchemy.engine import make_url
+
+from app.db.migraciones import opciones_autogenerate
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configurar_logging", True):
+    fileConfig(config.config_file_name)
+
+
+def _url() -> str:
+    url = context.get_x_argument(as_dictionary=True).get("url")
+    if url:
+        return url
+    if config.get_main_option("sqlalchemy.url"):
+        return config.get_main_option("sqlalchemy.url")
+    from app.core.config import settings
+    return settings.DATABASE_URL
+
+
+def run_migrations_offline() -> None:
+    """Genera el SQL sin conectarse (`alembic upgrade head --sql`)."""
+    url = _url()
+    context.configure(
+        url=url,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        **opciones_autogenerate(make_url(url).get_backend_name()),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _ejecutar(connection) -> None:
+    context.configure(
+        connection=connection,
+        render_as_batch=connection.dialect.name == "sqlite",
+        **opciones_autogenerate(connection.dialect.name),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Aplica las migraciones sobre una conexión real."""
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _ejecutar(connection)
+        return
+
+    connectable = engine_from_config(
+        {"sqlalchemy.url": _url()},
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as connection:
+        _ejecutar(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
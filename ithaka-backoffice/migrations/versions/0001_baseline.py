@@ -0,0 +1,274 @@
+"""Esquema base (ithaka_backoffice.sql)
+
+Crea las tablas tal como las define ithaka_backoffice.sql, más la búsqueda
+full-text (app/db/busqueda.py) y el índice GIN de datos_chatbot.
+
+Bases ya creadas con el script SQL: `alembic stamp 0001_baseline`.
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_baseline"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Copia congelada del DDL de app/db/busqueda.py al momento del baseline
+_BUSQUEDA_POSTGRES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE caso ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('spanish', coalesce(nombre_caso, '')), 'A') || "
+    "setweight(to_tsvector('spanish', coalesce(descripcion, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_caso_search_vector ON caso USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_caso_nombre_caso_trgm ON caso USING GIN (nombre_caso gin_trgm_ops)",
+    "ALTER TABLE emprendedor ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "to_tsvector('simple', coalesce(nombre, '') || ' ' || coalesce(apellido, '') || ' ' || "
+    "coalesce(email, '') || ' ' || coalesce(documento_identidad, ''))"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_emprendedor_search_vector ON emprendedor USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_emprendedor_nombre_completo_trgm ON emprendedor "
+    "USING GIN ((nombre || ' ' || apellido) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_emprendedor_email_trgm ON emprendedor USING GIN (email gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_emprendedor_documento_trgm ON emprendedor "
+    "USING GIN (documento_identidad gin_trgm_ops)",
+    "ALTER TABLE nota ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('spanish', coalesce(contenido, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_nota_search_vector ON nota USING GIN (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_caso_datos_chatbot_gin ON caso USING GIN (datos_chatbot jsonb_path_ops)",
+]
+
+_FTS_SQLITE = {
+    "caso": ("id_caso", ["nombre_caso", "descripcion"]),
+    "emprendedor": ("id_emprendedor", ["nombre", "apellido", "email", "documento_identidad"]),
+    "nota": ("id_nota", ["contenido"]),
+}
+
+
+def _busqueda_sqlite() -> list[str]:
+    """Tablas FTS5 + triggers (solo SQLite, usado en tests)."""
+    sentencias = []
+    for tabla, (pk, columnas) in _FTS_SQLITE.items():
+        fts = f"{tabla}_fts"
+        cols = ", ".join(columnas)
+        nuevos = ", ".join(f"new.{c}" for c in columnas)
+        viejos = ", ".join(f"old.{c}" for c in columnas)
+        sentencias += [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{cols}, content='{tabla}', content_rowid='{pk}', "
+            f"tokenize='unicode61 remove_diacritics 2')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {tabla} BEGIN "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk}, {nuevos}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {tabla} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {viejos}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {tabla} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{pk}, {viejos}); "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{pk}, {nuevos}); END",
+        ]
+    return sentencias
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "rol",
+        sa.Column("id_rol", sa.Integer(), primary_key=True),
+        sa.Column("nombre_rol", sa.String(50), nullable=False, unique=True),
+    )
+    op.create_table(
+        "usuario",
+        sa.Column("id_usuario", sa.Integer(), primary_key=True),
+        sa.Column("nombre", sa.String(150), nullable=False),
+        sa.Column("apellido", sa.String(150)),
+        sa.Column("email", sa.String(150), nullable=False, unique=True),
+        sa.Column("password_hash", sa.Text(), nullable=False),
+        sa.Column("activo", sa.Boolean(), server_default=sa.true()),
+        sa.Column(
+            "id_rol", sa.Integer(),
+            sa.ForeignKey("rol.id_rol", ondelete="RESTRICT"), nullable=False,
+        ),
+    )
+    op.create_table(
+        "emprendedor",
+        sa.Column("id_emprendedor", sa.Integer(), primary_key=True),
+        sa.Column("nombre", sa.String(150), nullable=False),
+        sa.Column("apellido", sa.String(150), nullable=False),
+        sa.Column("email", sa.String(150), nullable=False),
+        sa.Column("telefono", sa.String(50)),
+        sa.Column("documento_identidad", sa.String(50)),
+        sa.Column("pais_residencia", sa.String(100)),
+        sa.Column("ciudad_residencia", sa.String(100)),
+        sa.Column("campus_ucu", sa.String(100)),
+        sa.Column("relacion_ucu", sa.String(100)),
+        sa.Column("facultad_ucu", sa.String(100)),
+        sa.Column("canal_llegada", sa.String(100)),
+        sa.Column("motivacion", sa.Text()),
+        sa.Column("fecha_registro", sa.DateTime(), server_default=sa.func.current_timestamp()),
+    )
+    op.create_table(
+        "convocatoria",
+        sa.Column("id_convocatoria", sa.Integer(), primary_key=True),
+        sa.Column("nombre", sa.String(150), nullable=False),
+        sa.Column("fecha_cierre", sa.DateTime()),
+    )
+    op.create_table(
+        "catalogo_estados",
+        sa.Column("id_estado", sa.Integer(), primary_key=True),
+        sa.Column("nombre_estado", sa.String(100), nullable=False),
+        sa.Column("tipo_caso", sa.String(100), nullable=False),
+        sa.CheckConstraint("lower(tipo_caso) IN ('postulacion', 'proyecto')", name="check_tipo_caso"),
+    )
+    op.create_table(
+        "caso",
+        sa.Column("id_caso", sa.Integer(), primary_key=True),
+        sa.Column("fecha_creacion", sa.DateTime(), server_default=sa.func.current_timestamp()),
+        sa.Column("nombre_caso", sa.String(200), nullable=False),
+        sa.Column("descripcion", sa.Text()),
+        sa.Column("datos_chatbot", sa.JSON().with_variant(postgresql.JSONB(), "postgresql")),
+        sa.Column(
+            "id_emprendedor", sa.Integer(),
+            sa.ForeignKey("emprendedor.id_emprendedor", ondelete="RESTRICT"), nullable=False,
+        ),
+        sa.Column(
+            "id_convocatoria", sa.Integer(),
+            sa.ForeignKey("convocatoria.id_convocatoria", ondelete="SET NULL"),
+        ),
+        sa.Column(
+            "id_estado", sa.Integer(),
+            sa.ForeignKey("catalogo_estados.id_estado", ondelete="RESTRICT"), nullable=False,
+        ),
+    )
+    op.create_table(
+        "programa",
+        sa.Column("id_programa", sa.Integer(), primary_key=True),
+        sa.Column("nombre", sa.String(150), nullable=False),
+        sa.Column("activo", sa.Boolean(), server_default=sa.true()),
+    )
+    op.create_table(
+        "catalogo_apoyo",
+        sa.Column("id_catalogo_apoyo", sa.Integer(), primary_key=True),
+        sa.Column("nombre", sa.String(150), nullable=False, unique=True),
+        sa.Column("descripcion", sa.Text()),
+        sa.Column("activo", sa.Boolean(), server_default=sa.true()),
+    )
+    op.create_table(
+        "apoyo",
+        sa.Column("id_apoyo", sa.Integer(), primary_key=True),
+        sa.Column(
+            "id_catalogo_apoyo", sa.Integer(),
+            sa.ForeignKey("catalogo_apoyo.id_catalogo_apoyo", ondelete="RESTRICT"), nullable=False,
+        ),
+        sa.Column("fecha_inicio", sa.Date()),
+        sa.Column("fecha_fin", sa.Date()),
+        sa.Column(
+            "id_caso", sa.Integer(),
+            sa.ForeignKey("caso.id_caso", ondelete="CASCADE"), nullable=False,
+        ),
+        sa.Column(
+            "id_programa", sa.Integer(),
+            sa.ForeignKey("programa.id_programa", ondelete="RESTRICT"), nullable=False,
+        ),
+    )
+    op.create_table(
+        "apoyo_solicitado",
+        sa.Column("id_apoyo_solicitado", sa.Integer(), primary_key=True),
+        sa.Column(
+            "id_catalogo_apoyo", sa.Integer(),
+            sa.ForeignKey("catalogo_apoyo.id_catalogo_apoyo", ondelete="RESTRICT"), nullable=False,
+        ),
+        sa.Column(
+            "id_caso", sa.Integer(),
+            sa.ForeignKey("caso.id_caso", ondelete="CASCADE"), nullable=False,
+        ),
+    )
+    op.create_table(
+        "asignacion",
+        sa.Column("id_asignacion", sa.Integer(), primary_key=True),
+        sa.Column("fecha_asignacion", sa.DateTime(), server_default=sa.func.current_timestamp()),
+        sa.Column(
+            "id_usuario", sa.Integer(),
+            sa.ForeignKey("usuario.id_usuario", ondelete="RESTRICT"), nullable=False,
+        ),
+        sa.Column(
+            "id_caso", sa.Integer(),
+            sa.ForeignKey("caso.id_caso", ondelete="CASCADE"), nullable=False,
+        ),
+    )
+    op.create_table(
+        "nota",
+        sa.Column("id_nota", sa.Integer(), primary_key=True),
+        sa.Column("contenido", sa.Text(), nullable=False),
+        sa.Column("tipo_nota", sa.String(50), nullable=False),
+        sa.Column("fecha", sa.DateTime(), server_default=sa.func.current_timestamp()),
+        sa.Column(
+            "id_usuario", sa.Integer(),
+            sa.ForeignKey("usuario.id_usuario", ondelete="RESTRICT"), nullable=False,
+        ),
+        sa.Column(
+            "id_caso", sa.Integer(),
+            sa.ForeignKey("caso.id_caso", ondelete="CASCADE"), nullable=False,
+        ),
+    )
+    op.create_table(
+        "auditoria",
+        sa.Column("id_auditoria", sa.Integer(), primary_key=True),
+        sa.Column("timestamp", sa.DateTime(), server_default=sa.func.current_timestamp()),
+        sa.Column("accion", sa.String(150), nullable=False),
+        sa.Column("valor_anterior", sa.Text()),
+        sa.Column("valor_nuevo", sa.Text()),
+        sa.Column(
+            "id_usuario", sa.Integer(),
+            sa.ForeignKey("usuario.id_usuario", ondelete="RESTRICT"), nullable=False,
+        ),
+        sa.Column(
+            "id_caso", sa.Integer(),
+            sa.ForeignKey("caso.id_caso", ondelete="CASCADE"),
+        ),
+    )
+
+    dialecto = op.get_bind().dialect.name
+    if dialecto == "postgresql":
+        sentencias = _BUSQUEDA_POSTGRES
+    elif dialecto == "sqlite":
+        sentencias = _busqueda_sqlite()
+    else:
+        sentencias = []
+    for sentencia in sentencias:
+        op.execute(sentencia)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        for tabla in _FTS_SQLITE:
+            op.execute(f"DROP TABLE IF EXISTS {tabla}_fts")
+
+    for tabla in (
+        "auditoria",
+        "nota",
+        "asignacion",
+        "apoyo_solicitado",
+        "apoyo",
+        "catalogo_apoyo",
+        "programa",
+        "caso",
+        "catalogo_estados",
+        "convocatoria",
+        "emprendedor",
+        "usuario",
+        "rol",
+    ):
+        op.drop_table(tabla)
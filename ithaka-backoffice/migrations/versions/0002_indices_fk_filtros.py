@@ -0,0 +1,68 @@
+"""Índices para foreign keys y filtros frecuentes
+
+Listados filtrados (estado, convocatoria, emprendedor), alcance de Tutor
+(asignacion), notas por caso/fecha y auditoría por staff/fecha dejaban de
+hacer scan secuencial. En PostgreSQL se crean con CREATE INDEX CONCURRENTLY
+para no bloquear escrituras en producción.
+
+Revision ID: 0002_indices_fk_filtros
+Revises: 0001_baseline
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_indices_fk_filtros"
+down_revision: Union[str, Sequence[str], None] = "0001_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nombre, tabla, columnas)
+INDICES = [
+    ("ix_caso_id_estado", "caso", ["id_estado"]),
+    ("ix_caso_id_convocatoria", "caso", ["id_convocatoria"]),
+    ("ix_caso_id_emprendedor", "caso", ["id_emprendedor"]),
+    ("ix_asignacion_id_usuario_id_caso", "asignacion", ["id_usuario", "id_caso"]),
+    ("ix_asignacion_id_caso", "asignacion", ["id_caso"]),
+    ("ix_nota_id_caso_fecha", "nota", ["id_caso", "fecha"]),
+    ("ix_nota_id_usuario", "nota", ["id_usuario"]),
+    ("ix_apoyo_id_caso", "apoyo", ["id_caso"]),
+    ("ix_apoyo_id_programa", "apoyo", ["id_programa"]),
+    ("ix_apoyo_id_catalogo_apoyo", "apoyo", ["id_catalogo_apoyo"]),
+    ("ix_apoyo_solicitado_id_caso", "apoyo_solicitado", ["id_caso"]),
+    ("ix_apoyo_solicitado_id_catalogo_apoyo", "apoyo_solicitado", ["id_catalogo_apoyo"]),
+    ("ix_auditoria_id_usuario_timestamp", "auditoria", ["id_usuario", "timestamp"]),
+    ("ix_auditoria_id_caso", "auditoria", ["id_caso"]),
+    ("ix_usuario_id_rol", "usuario", ["id_rol"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY no puede correr dentro de una transacción
+    with op.get_context().autocommit_block():
+        for nombre, tabla, columnas in INDICES:
+            op.create_index(
+                nombre,
+                tabla,
+                columnas,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for nombre, tabla, _ in reversed(INDICES):
+            op.drop_index(
+                nombre,
+                table_name=tabla,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
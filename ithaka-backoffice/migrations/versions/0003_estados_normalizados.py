@@ -0,0 +1,87 @@
+"""Estados normalizados a nivel de base de datos
+
+`nombre_estado` y `tipo_caso` se guardan en minúsculas y sin espacios
+extremos (CHECK), con un índice único sobre (tipo_caso, nombre_estado).
+Los filtros comparan la columna directamente en lugar de usar lower(),
+de modo que pueden resolverse con índices.
+
+Antes de crear las restricciones se normalizan los datos existentes y se
+unifican estados duplicados (los casos pasan al estado de menor id).
+
+Revision ID: 0003_estados_normalizados
+Revises: 0002_indices_fk_filtros
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_estados_normalizados"
+down_revision: Union[str, Sequence[str], None] = "0002_indices_fk_filtros"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+CHECK_TIPO_CASO = "tipo_caso IN ('postulacion', 'proyecto')"
+CHECK_TIPO_CASO_ANTERIOR = "lower(tipo_caso) IN ('postulacion', 'proyecto')"
+CHECK_NOMBRE_NORMALIZADO = "nombre_estado = lower(trim(nombre_estado))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "UPDATE catalogo_estados SET "
+        "nombre_estado = lower(trim(nombre_estado)), tipo_caso = lower(trim(tipo_caso))"
+    )
+    op.execute(
+        "UPDATE caso SET id_estado = ("
+        " SELECT min(destino.id_estado) FROM catalogo_estados origen"
+        " JOIN catalogo_estados destino"
+        "   ON destino.tipo_caso = origen.tipo_caso AND destino.nombre_estado = origen.nombre_estado"
+        " WHERE origen.id_estado = caso.id_estado)"
+    )
+    op.execute(
+        "DELETE FROM catalogo_estados WHERE EXISTS ("
+        " SELECT 1 FROM catalogo_estados otro"
+        " WHERE otro.tipo_caso = catalogo_estados.tipo_caso"
+        "   AND otro.nombre_estado = catalogo_estados.nombre_estado"
+        "   AND otro.id_estado < catalogo_estados.id_estado)"
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        # Idempotente: bases creadas con la versión actual de ithaka_backoffice.sql
+        op.execute("ALTER TABLE catalogo_estados DROP CONSTRAINT IF EXISTS check_tipo_caso")
+        op.execute("ALTER TABLE catalogo_estados DROP CONSTRAINT IF EXISTS check_nombre_estado_normalizado")
+        op.create_check_constraint("check_tipo_caso", "catalogo_estados", CHECK_TIPO_CASO)
+        op.create_check_constraint("check_nombre_estado_normalizado", "catalogo_estados", CHECK_NOMBRE_NORMALIZADO)
+    else:
+        with op.batch_alter_table("catalogo_estados", recreate="always") as batch:
+            batch.drop_constraint("check_tipo_caso", type_="check")
+            batch.create_check_constraint("check_tipo_caso", CHECK_TIPO_CASO)
+            batch.create_check_constraint("check_nombre_estado_normalizado", CHECK_NOMBRE_NORMALIZADO)
+
+    op.create_index(
+        "ux_catalogo_estados_tipo_nombre",
+        "catalogo_estados",
+        ["tipo_caso", "nombre_estado"],
+        unique=True,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ux_catalogo_estados_tipo_nombre", table_name="catalogo_estados")
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_constraint("check_nombre_estado_normalizado", "catalogo_estados", type_="check")
+        op.drop_constraint("check_tipo_caso", "catalogo_estados", type_="check")
+        op.create_check_constraint("check_tipo_caso", "catalogo_estados", CHECK_TIPO_CASO_ANTERIOR)
+    else:
+        with op.batch_alter_table("catalogo_estados", recreate="always") as batch:
+            batch.drop_constraint("check_nombre_estado_normalizado", type_="check")
+            batch.drop_constraint("check_tipo_caso", type_="check")
+            batch.create_check_constraint("check_tipo_caso", CHECK_TIPO_CASO_ANTERIOR)
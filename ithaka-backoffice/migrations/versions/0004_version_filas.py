@@ -0,0 +1,38 @@
+"""Columna version en caso, nota y emprendedor
+
+Contador de versión por fila para concurrencia optimista (el ORM agrega
+`WHERE version = :v` a cada UPDATE) y ETags en la API. En PostgreSQL
+ADD COLUMN con default constante no reescribe la tabla.
+
+Revision ID: 0004_version_filas
+Revises: 0003_estados_normalizados
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_version_filas"
+down_revision: Union[str, Sequence[str], None] = "0003_estados_normalizados"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLAS = ("caso", "nota", "emprendedor")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for tabla in TABLAS:
+        op.add_column(tabla, sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for tabla in reversed(TABLAS):
+        with op.batch_alter_table(tabla) as batch:
+            batch.drop_column("version")
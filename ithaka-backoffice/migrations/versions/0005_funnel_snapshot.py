@@ -0,0 +1,39 @@
+"""Tabla funnel_snapshot
+
+Estado persistido del embudo de estados (/metricas/funnel): los workers y
+los reinicios retoman desde su checkpoint en lugar de reprocesar toda la
+auditoría.
+
+Revision ID: 0005_funnel_snapshot
+Revises: 0004_version_filas
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_funnel_snapshot"
+down_revision: Union[str, Sequence[str], None] = "0004_version_filas"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "funnel_snapshot",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("checkpoint", sa.Integer(), nullable=False),
+        sa.Column("datos", sa.Text(), nullable=False),
+        sa.Column("actualizado", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("funnel_snapshot")
@@ -0,0 +1,77 @@
+"""
+Benchmark de arranque (cold start)
+
+Importa `main` en procesos nuevos con `python -X importtime` y reporta:
+- tiempo de importación de `main` (mediana de N arranques) con los routers
+  importados al arrancar (ROUTERS_DIFERIDOS=False) y diferidos (True);
+- los módulos más costosos del arranque diferido, por tiempo acumulado
+  (incluye sus dependencias) y propio.
+
+No se conecta a la base de datos (el engine se crea sin conectar); usa la
+configuración del entorno / .env. Ejecutar con:
+    python -m scripts.benchmark_arranque [arranques] [modulos]
+"""
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# "import time:       123 |       4567 |   app.core.config"
+_LINEA = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _importar_main(diferido: bool) -> list[tuple[str, int, int, int]]:
+    """(módulo, propio µs, acumulado µs, profundidad) de un arranque en frío."""
+    entorno = {**os.environ, "ROUTERS_DIFERIDOS": "true" if diferido else "false"}
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=RAIZ, env=entorno, capture_output=True, text=True,
+    )
+    if proceso.returncode != 0:
+        sys.exit(f"Error importando main:\n{proceso.stderr[-2000:]}")
+    modulos = []
+    for linea in proceso.stderr.splitlines():
+        coincidencia = _LINEA.match(linea)
+        if coincidencia:
+            propio, acumulado, sangria, modulo = coincidencia.groups()
+            modulos.append((modulo, int(propio), int(acumulado), (len(sangria) - 1) // 2))
+    return modulos
+
+
+def _tiempo_main(modulos: list[tuple[str, int, int, int]]) -> float:
+    return next(acumulado for modulo, _, acumulado, _ in modulos if modulo == "main") / 1000
+
+
+def _medir(diferido: bool, arranques: int) -> tuple[float, list[tuple[str, int, int, int]]]:
+    muestras = [_importar_main(diferido) for _ in range(arranques)]
+    mediana = statistics.median(_tiempo_main(m) for m in muestras)
+    return mediana, muestras[-1]
+
+
+def main() -> None:
+    arranques = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    top = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+
+    inmediato, _ = _medir(False, arranques)
+    diferido, modulos = _medir(True, arranques)
+
+    print(f"Importación de main, mediana de {arranques} arranques")
+    print(f"  routers al arrancar: {inmediato:8.1f} ms")
+    print(f"  routers diferidos:   {diferido:8.1f} ms")
+    print(f"  reducción: {inmediato / diferido:.1f}x")
+
+    print(f"\nMódulos más costosos (arranque diferido), acumulado")
+    for modulo, _, acumulado, profundidad in sorted(modulos, key=lambda m: -m[2])[:top]:
+        print(f"  {acumulado / 1000:8.1f} ms  {'  ' * profundidad}{modulo}")
+
+    print(f"\nMódulos más costosos (arranque diferido), propio")
+    for modulo, propio, _, _ in sorted(modulos, key=lambda m: -m[1])[:top]:
+        print(f"  {propio / 1000:8.1f} ms  {modulo}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark de serialización de listados
+
+Compara, para una página de casos con datos_chatbot:
+- camino anterior: validar cada dict contra List[CasoResponse] (response_model)
+  y codificar con el json de la stdlib (JSONResponse);
+- camino rápido: dicts ya armados codificados con orjson (respuesta_lista).
+
+No necesita base de datos. Ejecutar con:
+    python -m scripts.benchmark_serializacion [filas] [repeticiones]
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import List
+
+# Agregar el directorio padre al path para que pueda importar app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.respuestas import respuesta_lista
+from app.schemas.caso import CasoResponse
+
+
+def _filas(cantidad: int) -> list[dict]:
+    return [
+        {
+            "id_caso": i + 1,
+            "nombre_caso": f"Emprendimiento {i}",
+            "descripcion": "Plataforma para conectar productores locales con compradores. " * 4,
+            "fecha_creacion": datetime(2026, 3, 1, 12, 30, i % 60),
+            "id_estado": 1,
+            "nombre_estado": "en revisión",
+            "tipo_caso": "postulacion",
+            "id_emprendedor": i + 1,
+            "id_convocatoria": 1,
+            "emprendedor": "Juan Pérez",
+            "convocatoria": "Convocatoria 2026",
+            "datos_chatbot": {
+                "sector": "Tecnología",
+                "modelo": "B2C",
+                "estado_producto": "MVP en desarrollo",
+                "equipo": {"integrantes": 3, "dedicacion": "parcial"},
+                "respuestas": [f"respuesta {j}" for j in range(10)],
+            },
+            "tutor_nombre": "Ana Gómez",
+            "id_tutor": 7,
+            "asignacion": i + 1,
+        }
+        for i in range(cantidad)
+    ]
+
+
+def _medir(funcion, repeticiones: int) -> float:
+    inicio = time.process_time()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.process_time() - inicio) / repeticiones * 1000
+
+
+def main() -> None:
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    filas = _filas(cantidad)
+    adaptador = TypeAdapter(List[CasoResponse])
+
+    def camino_anterior():
+        validadas = adaptador.validate_python(filas)
+        return json.dumps(jsonable_encoder(validadas), ensure_ascii=False).encode("utf-8")
+
+    def camino_rapido():
+        return respuesta_lista(filas).body
+
+    assert json.loads(camino_anterior()) == json.loads(camino_rapido())
+
+    anterior = _medir(camino_anterior, repeticiones)
+    rapido = _medir(camino_rapido, repeticiones)
+
+    print(f"{cantidad} casos por página, {repeticiones} repeticiones (CPU por respuesta)")
+    print(f"  response_model + json stdlib: {anterior:8.3f} ms")
+    print(f"  pre-serializado + orjson:     {rapido:8.3f} ms")
+    print(f"  reducción: {anterior / rapido:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,8 @@ os.environ["POSTGRES_USER"] = "test_user"
 os.environ["POSTGRES_PASSWORD"] = "test_password"
 os.environ["POSTGRES_DB"] = "test_db"
 os.environ["SECRET_KEY"] = "test_secret_key_for_testing_only_not_secure"
+# SQLite en memoria: sin listener de PostgreSQL
+os.environ["EVENTOS_LISTEN_NOTIFY"] = "false"
 
 from main import app
 from app.db.database import Base
@@ -25,6 +27,7 @@ from app.models.caso import Caso
 from app.models.catalogo_estados import CatalogoEstados
 from app.models.convocatoria import Convocatoria
 from app.models.programa import Programa
+from app.services import autorizacion_service, funnel_service, metricas_cache, metricas_series
 
 # Base de datos de prueba en memoria (SQLite)
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -46,6 +49,11 @@ def db():
     # Limpiar tablas existentes antes de crear
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # Los IDs se reutilizan entre tests: la cache de asignaciones no debe sobrevivir
+    autorizacion_service.invalidar_todo()
+    metricas_cache.invalidar_todo()
+    metricas_series.invalidar_todo()
+    funnel_service.reiniciar()
     
     db = TestingSessionLocal()
     
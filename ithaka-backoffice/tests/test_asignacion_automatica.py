@@ -0,0 +1,141 @@
+"""
+Tests de asignación automática de tutores (POST /asignaciones/automatica)
+"""
+import pytest
+
+from app.core.security import hash_password
+from app.models.apoyo_solicitado import ApoyoSolicitado
+from app.models.asignacion import Asignacion
+from app.models.auditoria import Auditoria
+from app.models.caso import Caso
+from app.models.catalogo_apoyo import CatalogoApoyo
+from app.models.usuario import Usuario
+from app.services.autorizacion_service import tutor_tiene_caso
+
+
+URL = "/api/v1/asignaciones/automatica"
+
+
+@pytest.fixture
+def segundo_tutor(db, rol_tutor):
+    usuario = Usuario(
+        nombre="Segunda",
+        apellido="Tutora",
+        email="tutora2@test.com",
+        password_hash=hash_password("tutor123"),
+        activo=True,
+        id_rol=rol_tutor.id_rol
+    )
+    db.add(usuario)
+    db.commit()
+    return usuario
+
+
+def _crear_casos(db, caso_test, cantidad):
+    casos = []
+    for i in range(cantidad):
+        caso = Caso(
+            nombre_caso=f"Postulación {i}",
+            id_emprendedor=caso_test.id_emprendedor,
+            id_estado=caso_test.id_estado,
+            id_convocatoria=caso_test.id_convocatoria
+        )
+        db.add(caso)
+        casos.append(caso)
+    db.commit()
+    return casos
+
+
+def test_reparte_segun_carga(client, db, headers_coordinador, caso_test, usuario_tutor, segundo_tutor):
+    # El primer tutor ya tiene un caso activo
+    db.add(Asignacion(id_caso=caso_test.id_caso, id_usuario=usuario_tutor.id_usuario))
+    db.commit()
+    casos = _crear_casos(db, caso_test, 3)
+
+    response = client.post(
+        URL,
+        json={"filtros": {"id_convocatoria": caso_test.id_convocatoria}},
+        headers=headers_coordinador
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["simulado"] is False
+    assert data["sin_asignar"] == []
+    # caso_test ya tenía tutor: solo se reparten los 3 nuevos
+    assert sorted(a["id_caso"] for a in data["asignaciones"]) == [c.id_caso for c in casos]
+    cargas = {t["id_usuario"]: t for t in data["tutores"]}
+    assert cargas[usuario_tutor.id_usuario]["carga_anterior"] == 1
+    assert cargas[usuario_tutor.id_usuario]["carga_final"] == 2
+    assert cargas[segundo_tutor.id_usuario]["carga_final"] == 2
+
+    assert db.query(Asignacion).count() == 4
+    assert db.query(Auditoria).filter(
+        Auditoria.accion == "Asignación automática de tutor"
+    ).count() == 3
+    # La cache de acceso del Tutor ve las nuevas asignaciones
+    nuevo = next(a for a in data["asignaciones"] if a["id_usuario"] == usuario_tutor.id_usuario)
+    assert tutor_tiene_caso(db, usuario_tutor.id_usuario, nuevo["id_caso"])
+
+
+def test_respeta_capacidad_y_peso_de_apoyos(client, db, headers_admin, caso_test, usuario_tutor):
+    catalogo = CatalogoApoyo(nombre="Mentoría")
+    db.add(catalogo)
+    db.flush()
+    casos = _crear_casos(db, caso_test, 2)
+    db.add_all([
+        ApoyoSolicitado(id_caso=casos[1].id_caso, id_catalogo_apoyo=catalogo.id_catalogo_apoyo),
+    ])
+    db.commit()
+
+    response = client.post(
+        URL,
+        json={"ids": [c.id_caso for c in casos], "capacidad": 2, "simular": True},
+        headers=headers_admin
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    # El caso con apoyos (peso 1.5) va primero; el otro (peso 1) ya no entra
+    assert data["asignaciones"] == [{
+        "id_caso": casos[1].id_caso,
+        "id_usuario": usuario_tutor.id_usuario,
+        "tutor_nombre": "Tutor Test",
+    }]
+    assert data["sin_asignar"] == [casos[0].id_caso]
+    # Simulación: no se guarda nada
+    assert db.query(Asignacion).count() == 0
+
+
+def test_sin_tutores_y_permisos(client, headers_admin, headers_tutor, caso_test):
+    payload = {"ids": [caso_test.id_caso]}
+    assert client.post(URL, json=payload, headers=headers_tutor).status_code == 403
+    # Ningún tutor activo entre los pedidos
+    sin_tutores = {**payload, "id_tutores": [99999]}
+    assert client.post(URL, json=sin_tutores, headers=headers_admin).status_code == 400
+    assert client.post(URL, json={}, headers=headers_admin).status_code == 422
+
+
+def test_peso_cuenta_apoyos_distintos_en_carga_y_reparto(client, db, headers_admin, caso_test, usuario_tutor):
+    catalogo = CatalogoApoyo(nombre="Mentoría")
+    db.add(catalogo)
+    db.flush()
+    nuevo = _crear_casos(db, caso_test, 1)[0]
+    # El mismo apoyo pedido dos veces pesa como uno, en ambos casos
+    for id_caso in (caso_test.id_caso, caso_test.id_caso, nuevo.id_caso, nuevo.id_caso):
+        db.add(ApoyoSolicitado(id_caso=id_caso, id_catalogo_apoyo=catalogo.id_catalogo_apoyo))
+    db.add(Asignacion(id_caso=caso_test.id_caso, id_usuario=usuario_tutor.id_usuario))
+    db.commit()
+
+    response = client.post(URL, json={"ids": [nuevo.id_caso], "simular": True}, headers=headers_admin)
+
+    tutor = response.json()["tutores"][0]
+    assert tutor["carga_anterior"] == 1.5
+    assert tutor["carga_final"] == 3
+
+
+def test_limite_de_ids_por_pedido(client, headers_admin):
+    from app.core.config import settings
+
+    ids = list(range(1, settings.ASIGNACION_AUTOMATICA_MAX_CASOS + 2))
+    assert client.post(URL, json={"ids": ids}, headers=headers_admin).status_code == 422
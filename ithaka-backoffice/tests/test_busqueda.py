@@ -0,0 +1,73 @@
+"""
+Tests de búsqueda full-text (FTS5 en SQLite)
+"""
+from app.models.asignacion import Asignacion
+from app.models.caso import Caso
+from app.models.nota import Nota
+
+
+def _buscar(client, headers, q, **params):
+    response = client.get("/api/v1/search", params={"q": q, **params}, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_busqueda_encuentra_caso_por_nombre(client, headers_admin, caso_test):
+    resultados = _buscar(client, headers_admin, "prueba")
+
+    casos = [r for r in resultados if r["tipo"] == "caso"]
+    assert [r["id"] for r in casos] == [caso_test.id_caso]
+    assert casos[0]["titulo"] == "Caso de prueba"
+
+
+def test_busqueda_emprendedor_por_email_y_sin_acentos(client, headers_admin, emprendedor_test):
+    por_email = _buscar(client, headers_admin, "juan.perez", tipos=["emprendedor"])
+    assert [r["id"] for r in por_email] == [emprendedor_test.id_emprendedor]
+
+    # "Perez" debe encontrar "Pérez"
+    por_apellido = _buscar(client, headers_admin, "Perez", tipos=["emprendedor"])
+    assert [r["id"] for r in por_apellido] == [emprendedor_test.id_emprendedor]
+
+
+def test_busqueda_nota_y_actualizacion_de_indice(client, db, headers_admin, caso_test, usuario_admin):
+    nota = Nota(
+        contenido="Reunión sobre financiamiento inicial",
+        tipo_nota="Seguimiento",
+        id_usuario=usuario_admin.id_usuario,
+        id_caso=caso_test.id_caso
+    )
+    db.add(nota)
+    db.commit()
+
+    resultados = _buscar(client, headers_admin, "financiamiento", tipos=["nota"])
+    assert [(r["id"], r["id_caso"]) for r in resultados] == [(nota.id_nota, caso_test.id_caso)]
+
+    nota.contenido = "Reunión sobre mentorías"
+    db.commit()
+
+    assert _buscar(client, headers_admin, "financiamiento", tipos=["nota"]) == []
+    assert len(_buscar(client, headers_admin, "mentorias", tipos=["nota"])) == 1
+
+
+def test_busqueda_tutor_solo_casos_asignados(client, db, headers_tutor, usuario_tutor, caso_test):
+    otro = Caso(
+        nombre_caso="Otro caso de prueba",
+        id_emprendedor=caso_test.id_emprendedor,
+        id_estado=caso_test.id_estado,
+        id_convocatoria=caso_test.id_convocatoria
+    )
+    db.add(otro)
+    db.add(Asignacion(id_caso=caso_test.id_caso, id_usuario=usuario_tutor.id_usuario))
+    db.commit()
+
+    resultados = _buscar(client, headers_tutor, "prueba", tipos=["caso"])
+    assert [r["id"] for r in resultados] == [caso_test.id_caso]
+
+
+def test_busqueda_tipo_invalido(client, headers_admin):
+    response = client.get(
+        "/api/v1/search",
+        params={"q": "algo", "tipos": ["usuario"]},
+        headers=headers_admin
+    )
+    assert response.status_code == 400
@@ -235,3 +235,654 @@ def test_crear_multiples_casos_mismo_emprendedor(client, db, headers_admin, empr
     assert response1.status_code == 201
     assert response2.status_code == 201
     assert response1.json()["id_caso"] != response2.json()["id_caso"]
+
+
+def _crear_casos_chatbot(db, caso_test):
+    """Crea casos con distintas respuestas del chatbot"""
+    from app.models.caso import Caso
+
+    datos = [
+        {"sector": "Tecnología", "etapa": "MVP", "equipo": {"integrantes": 3}, "canales": ["web", "app"]},
+        {"sector": "Tecnología", "etapa": "Idea", "equipo": {"integrantes": 1}, "canales": ["web"]},
+        {"sector": "Agro", "etapa": "MVP", "equipo": {"integrantes": 3}},
+    ]
+    casos = []
+    for i, dato in enumerate(datos):
+        caso = Caso(
+            nombre_caso=f"Caso chatbot {i}",
+            datos_chatbot=dato,
+            id_emprendedor=caso_test.id_emprendedor,
+            id_estado=caso_test.id_estado,
+            id_convocatoria=caso_test.id_convocatoria
+        )
+        db.add(caso)
+        casos.append(caso)
+    db.commit()
+    return casos
+
+
+def test_listar_casos_filtra_por_datos_chatbot(client, db, headers_admin, caso_test):
+    """Los filtros clave=valor y de contención se combinan (AND)"""
+    mvp_tec, idea_tec, mvp_agro = _crear_casos_chatbot(db, caso_test)
+
+    response = client.get(
+        "/api/v1/casos",
+        params={"chatbot": ["sector=Tecnología"]},
+        headers=headers_admin
+    )
+    assert response.status_code == 200
+    assert {c["id_caso"] for c in response.json()} == {mvp_tec.id_caso, idea_tec.id_caso}
+
+    response = client.get(
+        "/api/v1/casos",
+        params={"chatbot": ["etapa=MVP", "equipo.integrantes=3"]},
+        headers=headers_admin
+    )
+    assert {c["id_caso"] for c in response.json()} == {mvp_tec.id_caso, mvp_agro.id_caso}
+
+    response = client.get(
+        "/api/v1/casos",
+        params={"chatbot_contiene": '{"sector": "Tecnología", "canales": ["app"]}'},
+        headers=headers_admin
+    )
+    assert [c["id_caso"] for c in response.json()] == [mvp_tec.id_caso]
+
+
+def test_listar_casos_filtro_chatbot_invalido(client, headers_admin):
+    response = client.get(
+        "/api/v1/casos",
+        params={"chatbot_contiene": "[1, 2]"},
+        headers=headers_admin
+    )
+    assert response.status_code == 400
+
+    response = client.get(
+        "/api/v1/casos",
+        params={"chatbot": ["sin_separador"]},
+        headers=headers_admin
+    )
+    assert response.status_code == 400
+
+
+def test_filtro_chatbot_usa_contencion_jsonb_en_postgres():
+    """En PostgreSQL el filtro se compila a @> (indexable por GIN)"""
+    from sqlalchemy.dialects import postgresql
+    from app.services.chatbot_filtros import condicion_datos_chatbot, parsear_filtros_chatbot
+
+    filtro = parsear_filtros_chatbot(None, ["sector=Agro", "equipo.integrantes=3"])
+    assert filtro == {"sector": "Agro", "equipo": {"integrantes": 3}}
+
+    sql = str(condicion_datos_chatbot(filtro, "postgresql").compile(dialect=postgresql.dialect()))
+    assert "@>" in sql
+
+
+def test_listar_casos_con_fields_proyecta_columnas(client, db, headers_admin, caso_test, usuario_tutor):
+    """Vista tablero: solo id, nombre, estado y tutor"""
+    from app.models.asignacion import Asignacion
+
+    asignacion = Asignacion(id_caso=caso_test.id_caso, id_usuario=usuario_tutor.id_usuario)
+    db.add(asignacion)
+    db.commit()
+
+    response = client.get(
+        "/api/v1/casos",
+        params={"fields": "nombre_caso,nombre_estado,tutor_nombre,id_tutor"},
+        headers=headers_admin
+    )
+
+    assert response.status_code == 200
+    assert response.json() == [{
+        "id_caso": caso_test.id_caso,
+        "nombre_caso": "Caso de prueba",
+        "nombre_estado": "postulado",
+        "tutor_nombre": "Tutor Test",
+        "id_tutor": usuario_tutor.id_usuario,
+    }]
+
+
+def test_listar_casos_fields_sin_tutor_y_por_defecto_completo(client, headers_admin, caso_test):
+    response = client.get(
+        "/api/v1/casos",
+        params={"fields": "tutor_nombre,asignacion"},
+        headers=headers_admin
+    )
+    assert response.json() == [{
+        "id_caso": caso_test.id_caso,
+        "tutor_nombre": "Sin asignar",
+        "asignacion": "Sin Asignar",
+    }]
+
+    # Sin fields se mantiene la respuesta completa (incluye columnas diferidas)
+    completo = client.get("/api/v1/casos", headers=headers_admin).json()
+    assert completo[0]["descripcion"] == "Este es un caso de prueba"
+    assert completo[0]["emprendedor"] == "Juan Pérez"
+
+
+def test_listar_con_fields_invalido(client, headers_admin):
+    response = client.get("/api/v1/casos", params={"fields": "password"}, headers=headers_admin)
+    assert response.status_code == 400
+
+    response = client.get("/api/v1/notas", params={"fields": "no_existe"}, headers=headers_admin)
+    assert response.status_code == 400
+
+
+def test_listar_emprendedores_con_fields(client, headers_admin, emprendedor_test):
+    response = client.get(
+        "/api/v1/emprendedores",
+        params={"fields": "email"},
+        headers=headers_admin
+    )
+    assert response.status_code == 200
+    assert response.json() == [{
+        "id_emprendedor": emprendedor_test.id_emprendedor,
+        "email": "juan.perez@test.com",
+    }]
+
+
+def test_tutor_listar_casos_con_fields(client, db, headers_tutor, caso_test, usuario_tutor, emprendedor_test):
+    from app.models.asignacion import Asignacion
+    from app.models.caso import Caso
+
+    otro = Caso(
+        nombre_caso="No asignado",
+        id_emprendedor=emprendedor_test.id_emprendedor,
+        id_estado=caso_test.id_estado
+    )
+    db.add(otro)
+    db.add(Asignacion(id_caso=caso_test.id_caso, id_usuario=usuario_tutor.id_usuario))
+    db.commit()
+
+    response = client.get(
+        "/api/v1/casos",
+        params={"fields": "nombre_caso,tutor_nombre"},
+        headers=headers_tutor
+    )
+    assert response.status_code == 200
+    assert response.json() == [{
+        "id_caso": caso_test.id_caso,
+        "nombre_caso": "Caso de prueba",
+        "tutor_nombre": "Tutor Test",
+    }]
+
+
+def test_listar_casos_filtro_estado_sin_distinguir_mayusculas(client, headers_admin, caso_test):
+    response = client.get(
+        "/api/v1/casos",
+        params={"nombre_estado": " POSTULADO ", "tipo_caso": "Postulacion", "fields": "nombre_estado"},
+        headers=headers_admin
+    )
+    assert response.status_code == 200
+    assert response.json() == [{"id_caso": caso_test.id_caso, "nombre_estado": "postulado"}]
+
+
+def test_crear_estado_duplicado_normalizado(client, headers_admin, caso_test):
+    response = client.post(
+        "/api/v1/estados",
+        json={"nombre_estado": "POSTULADO", "tipo_caso": "postulacion"},
+        headers=headers_admin
+    )
+    assert response.status_code == 409
+
+
+# =============================================================================
+# DETALLE COMPLETO (GET /casos/{id}/full)
+# =============================================================================
+
+def _poblar_detalle(db, caso_test, usuario_tutor, usuario_admin):
+    from datetime import datetime, timedelta
+    from app.models import Apoyo, Programa
+    from app.models.apoyo_solicitado import ApoyoSolicitado
+    from app.models.asignacion import Asignacion
+    from app.models.auditoria import Auditoria
+    from app.models.catalogo_apoyo import CatalogoApoyo
+    from app.models.nota import Nota
+
+    catalogo = CatalogoApoyo(nombre="Mentoría")
+    programa = Programa(nombre="Incubación")
+    db.add_all([catalogo, programa])
+    db.flush()
+
+    db.add_all([
+        Asignacion(id_caso=caso_test.id_caso, id_usuario=usuario_tutor.id_usuario),
+        Apoyo(
+            id_caso=caso_test.id_caso,
+            id_catalogo_apoyo=catalogo.id_catalogo_apoyo,
+            id_programa=programa.id_programa
+        ),
+        ApoyoSolicitado(id_caso=caso_test.id_caso, id_catalogo_apoyo=catalogo.id_catalogo_apoyo),
+        Auditoria(accion="Creó el caso", id_usuario=usuario_admin.id_usuario, id_caso=caso_test.id_caso),
+    ])
+    inicio = datetime(2026, 1, 1)
+    for i in range(5):
+        db.add(Nota(
+            contenido=f"Nota {i}",
+            tipo_nota="seguimiento",
+            fecha=inicio + timedelta(days=i),
+            id_caso=caso_test.id_caso,
+            id_usuario=usuario_tutor.id_usuario
+        ))
+    db.commit()
+
+
+def test_caso_completo_incluye_todas_las_secciones(
+    client, db, headers_admin, caso_test, usuario_tutor, usuario_admin
+):
+    _poblar_detalle(db, caso_test, usuario_tutor, usuario_admin)
+
+    response = client.get(
+        f"/api/v1/casos/{caso_test.id_caso}/full",
+        params={"notas_limit": 2, "notas_skip": 1},
+        headers=headers_admin
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["caso"]["id_caso"] == caso_test.id_caso
+    assert data["caso"]["programa_apoyo"] == "Incubación"
+    assert data["emprendedor"]["id_emprendedor"] == caso_test.id_emprendedor
+    assert data["asignaciones"][0]["tutor_email"] == usuario_tutor.email
+    assert data["apoyos"][0]["apoyo"] == "Mentoría"
+    assert data["apoyos"][0]["programa"] == "Incubación"
+    assert data["apoyos_solicitados"][0]["apoyo"] == "Mentoría"
+
+    # Notas más recientes primero, paginadas
+    assert data["notas"]["total"] == 5
+    assert [nota["contenido"] for nota in data["notas"]["items"]] == ["Nota 3", "Nota 2"]
+    assert data["auditoria"]["total"] == 1
+    assert data["auditoria"]["items"][0]["accion"] == "Creó el caso"
+
+
+def test_caso_completo_tutor_sin_auditoria(
+    client, db, headers_tutor, caso_test, usuario_tutor, usuario_admin
+):
+    _poblar_detalle(db, caso_test, usuario_tutor, usuario_admin)
+
+    response = client.get(f"/api/v1/casos/{caso_test.id_caso}/full", headers=headers_tutor)
+
+    assert response.status_code == 200
+    assert response.json()["auditoria"] is None
+    assert response.json()["notas"]["total"] == 5
+
+
+def test_caso_completo_tutor_no_asignado_e_inexistente(client, headers_tutor, headers_admin, caso_test):
+    response = client.get(f"/api/v1/casos/{caso_test.id_caso}/full", headers=headers_tutor)
+    assert response.status_code == 403
+
+    response = client.get("/api/v1/casos/99999/full", headers=headers_admin)
+    assert response.status_code == 404
+
+
+# =============================================================================
+# CONSULTA EN LOTE (GET /casos/batch, /emprendedores/batch)
+# =============================================================================
+
+def test_obtener_casos_en_lote(client, db, headers_admin, headers_tutor, caso_test, usuario_tutor):
+    from app.models.asignacion import Asignacion
+    from app.models.caso import Caso
+
+    otro = Caso(
+        nombre_caso="Otro caso",
+        id_emprendedor=caso_test.id_emprendedor,
+        id_estado=caso_test.id_estado
+    )
+    db.add(otro)
+    db.flush()
+    db.add(Asignacion(id_caso=otro.id_caso, id_usuario=usuario_tutor.id_usuario))
+    db.commit()
+
+    ids = f"{caso_test.id_caso},{otro.id_caso},{otro.id_caso},99999"
+    response = client.get("/api/v1/casos/batch", params={"ids": ids}, headers=headers_admin)
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {str(caso_test.id_caso), str(otro.id_caso)}
+    assert data[str(otro.id_caso)]["tutor_nombre"] == f"{usuario_tutor.nombre} {usuario_tutor.apellido}"
+
+    # Tutor: solo los casos asignados
+    response = client.get("/api/v1/casos/batch", params={"ids": ids}, headers=headers_tutor)
+    assert set(response.json()) == {str(otro.id_caso)}
+
+
+def test_obtener_emprendedores_en_lote_alcance_tutor(client, headers_admin, headers_tutor, emprendedor_test):
+    params = {"ids": str(emprendedor_test.id_emprendedor)}
+
+    response = client.get("/api/v1/emprendedores/batch", params=params, headers=headers_admin)
+    assert response.status_code == 200
+    assert response.json()[str(emprendedor_test.id_emprendedor)]["email"] == emprendedor_test.email
+
+    response = client.get("/api/v1/emprendedores/batch", params=params, headers=headers_tutor)
+    assert response.json() == {}
+
+
+@pytest.mark.parametrize("ids", ["", "1,a", "0", "²", "١", "-1", "99999999999", ",".join(str(i) for i in range(1, 102))])
+def test_lote_ids_invalidos(client, headers_admin, ids):
+    response = client.get("/api/v1/casos/batch", params={"ids": ids}, headers=headers_admin)
+    assert response.status_code == 400
+
+
+# =============================================================================
+# CAMBIO DE ESTADO EN LOTE (PATCH /casos/estado)
+# =============================================================================
+
+def _casos_para_lote(db, caso_test, cantidad=3):
+    from app.models.caso import Caso
+    from app.models.catalogo_estados import CatalogoEstados
+
+    casos = [caso_test]
+    for i in range(cantidad - 1):
+        caso = Caso(
+            nombre_caso=f"Postulación {i}",
+            id_emprendedor=caso_test.id_emprendedor,
+            id_estado=caso_test.id_estado,
+            id_convocatoria=caso_test.id_convocatoria
+        )
+        db.add(caso)
+        casos.append(caso)
+    db.add_all([
+        CatalogoEstados(nombre_estado="Rechazado", tipo_caso="postulacion"),
+        CatalogoEstados(nombre_estado="En proyecto", tipo_caso="postulacion"),
+        CatalogoEstados(nombre_estado="En pausa", tipo_caso="proyecto"),
+    ])
+    db.commit()
+    return casos
+
+
+def test_cambiar_estado_lote_por_ids(client, db, headers_coordinador, caso_test):
+    from app.models.auditoria import Auditoria
+    from app.models.caso import Caso
+
+    casos = _casos_para_lote(db, caso_test)
+    estado_inicial = caso_test.id_estado
+    ids = [caso.id_caso for caso in casos[:2]] + [99999]
+
+    response = client.patch(
+        "/api/v1/casos/estado",
+        json={"nombre_estado": "RECHAZADO", "ids": ids},
+        headers=headers_coordinador
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["nombre_estado"] == "rechazado"
+    assert data["actualizados"] == 2
+    assert data["sin_cambios"] == 0
+    assert data["no_encontrados"] == [99999]
+
+    db.expire_all()
+    estados = {caso.id_caso: caso.id_estado for caso in db.query(Caso)}
+    assert estados[casos[0].id_caso] == data["id_estado"]
+    assert estados[casos[2].id_caso] == estado_inicial
+    registros = db.query(Auditoria).filter(Auditoria.accion == "Estado actualizado").all()
+    assert sorted(r.id_caso for r in registros) == sorted(ids[:2])
+    assert {(r.valor_anterior, r.valor_nuevo) for r in registros} == {("postulado", "rechazado")}
+
+    # Repetir: ya están en el estado destino
+    response = client.patch(
+        "/api/v1/casos/estado",
+        json={"nombre_estado": "rechazado", "ids": ids[:2]},
+        headers=headers_coordinador
+    )
+    assert response.json()["actualizados"] == 0
+    assert response.json()["sin_cambios"] == 2
+
+
+def test_cambiar_estado_lote_por_filtro_convierte_a_proyecto(client, db, headers_admin, caso_test):
+    from app.models.auditoria import Auditoria
+
+    _casos_para_lote(db, caso_test)
+
+    response = client.patch(
+        "/api/v1/casos/estado",
+        json={
+            "nombre_estado": "en proyecto",
+            "filtros": {"id_convocatoria": caso_test.id_convocatoria, "nombre_estado": "postulado"}
+        },
+        headers=headers_admin
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["nombre_estado"] == "en pausa"
+    assert data["actualizados"] == 3
+    assert data["convertidos_a_proyecto"] is True
+    assert db.query(Auditoria).filter(
+        Auditoria.accion == "Conversión automática a proyecto"
+    ).count() == 3
+
+
+@pytest.mark.parametrize("payload", [
+    {"nombre_estado": "rechazado"},
+    {"nombre_estado": "rechazado", "ids": [1], "filtros": {"id_estado": 1}},
+    {"nombre_estado": "rechazado", "filtros": {}},
+])
+def test_cambiar_estado_lote_payload_invalido(client, headers_admin, payload):
+    response = client.patch("/api/v1/casos/estado", json=payload, headers=headers_admin)
+    assert response.status_code == 422
+
+
+def test_cambiar_estado_lote_estado_inexistente_y_tutor(client, headers_admin, headers_tutor, caso_test):
+    payload = {"nombre_estado": "no existe", "ids": [caso_test.id_caso]}
+    assert client.patch("/api/v1/casos/estado", json=payload, headers=headers_admin).status_code == 404
+    assert client.patch("/api/v1/casos/estado", json=payload, headers=headers_tutor).status_code == 403
+
+
+def test_feed_de_cambios_por_cursor(client, db, headers_admin, caso_test, monkeypatch):
+    from app.core.config import settings
+    from app.models.caso import Caso
+
+    monkeypatch.setattr(settings, "CAMBIOS_MARGEN_SEGUNDOS", 0)
+    cursor = client.get("/api/v1/casos/changes", headers=headers_admin).json()["cursor"]
+
+    otro = Caso(nombre_caso="Otro", id_emprendedor=caso_test.id_emprendedor, id_estado=caso_test.id_estado)
+    db.add(otro)
+    db.commit()
+    for caso in (caso_test, otro):
+        client.put(f"/api/v1/casos/{caso.id_caso}", json={"nombre_caso": "Editado"}, headers=headers_admin)
+
+    # Paginado en orden de último cambio
+    data = client.get(
+        "/api/v1/casos/changes", params={"since": cursor, "limit": 1}, headers=headers_admin
+    ).json()
+    assert data["hay_mas"] is True
+    assert [c["id_caso"] for c in data["casos"]] == [caso_test.id_caso]
+    assert data["casos"][0]["nombre_caso"] == "Editado"
+
+    data = client.get(
+        "/api/v1/casos/changes", params={"since": data["cursor"]}, headers=headers_admin
+    ).json()
+    assert data["hay_mas"] is False
+    assert [c["id_caso"] for c in data["casos"]] == [otro.id_caso]
+
+    data = client.get(
+        "/api/v1/casos/changes", params={"since": data["cursor"]}, headers=headers_admin
+    ).json()
+    assert data["casos"] == [] and data["removidos"] == []
+
+
+def test_feed_de_cambios_tutor_fuera_de_alcance(client, headers_admin, headers_tutor, caso_test, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "CAMBIOS_MARGEN_SEGUNDOS", 0)
+    client.put(f"/api/v1/casos/{caso_test.id_caso}", json={"nombre_caso": "Editado"}, headers=headers_admin)
+
+    # Un caso que nunca tuvo asignado no se le informa
+    data = client.get("/api/v1/casos/changes", params={"since": 0}, headers=headers_tutor).json()
+    assert data["casos"] == []
+    assert data["removidos"] == []
+
+
+def test_feed_de_cambios_tutor_desasignado(
+    client, headers_admin, headers_tutor, usuario_tutor, caso_test, monkeypatch
+):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "CAMBIOS_MARGEN_SEGUNDOS", 0)
+    asignacion = client.post(
+        "/api/v1/asignaciones/",
+        json={"id_caso": caso_test.id_caso, "id_usuario": usuario_tutor.id_usuario},
+        headers=headers_admin
+    ).json()
+    data = client.get("/api/v1/casos/changes", params={"since": 0}, headers=headers_tutor).json()
+    assert [c["id_caso"] for c in data["casos"]] == [caso_test.id_caso]
+
+    client.delete(f"/api/v1/asignaciones/{asignacion['id_asignacion']}", headers=headers_admin)
+    data = client.get(
+        "/api/v1/casos/changes", params={"since": data["cursor"]}, headers=headers_tutor
+    ).json()
+    assert data["casos"] == []
+    assert data["removidos"] == [caso_test.id_caso]
+
+
+def test_feed_de_cambios_sin_avance_no_pide_repetir(client, db, headers_admin, caso_test):
+    from app.models.caso import Caso
+
+    otro = Caso(nombre_caso="Otro", id_emprendedor=caso_test.id_emprendedor, id_estado=caso_test.id_estado)
+    db.add(otro)
+    db.commit()
+    for caso in (caso_test, otro):
+        client.put(f"/api/v1/casos/{caso.id_caso}", json={"nombre_caso": "Editado"}, headers=headers_admin)
+
+    # Más casos que el límite, todos dentro del margen: el cursor no avanza
+    data = client.get(
+        "/api/v1/casos/changes", params={"since": 0, "limit": 1}, headers=headers_admin
+    ).json()
+    assert len(data["casos"]) == 1
+    assert data["cursor"] == 0
+    assert data["hay_mas"] is False
+
+
+def test_feed_de_cambios_no_avanza_sobre_cambios_recientes(client, headers_admin, caso_test):
+    client.put(f"/api/v1/casos/{caso_test.id_caso}", json={"nombre_caso": "Editado"}, headers=headers_admin)
+
+    # Dentro del margen: el caso se entrega pero el cursor no lo saltea
+    data = client.get("/api/v1/casos/changes", params={"since": 0}, headers=headers_admin).json()
+    assert [c["id_caso"] for c in data["casos"]] == [caso_test.id_caso]
+    assert data["cursor"] == 0
+
+
+def test_caso_etag_y_get_condicional(client, db, headers_admin, caso_test, usuario_tutor):
+    url = f"/api/v1/casos/{caso_test.id_caso}"
+    response = client.get(url, headers=headers_admin)
+    etag = response.headers["ETag"]
+    assert etag == f'"{response.json()["version"]}"'
+
+    response = client.get(url, headers={**headers_admin, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+    # Asignar tutor cambia la representación del caso: nuevo ETag
+    client.post(
+        "/api/v1/asignaciones/",
+        json={"id_caso": caso_test.id_caso, "id_usuario": usuario_tutor.id_usuario},
+        headers=headers_admin
+    )
+    response = client.get(url, headers={**headers_admin, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_caso_etag_cambia_con_apoyos_y_nombre_del_tutor(
+    client, db, headers_admin, caso_test, usuario_tutor
+):
+    from app.models.asignacion import Asignacion
+    from app.models.catalogo_apoyo import CatalogoApoyo
+    from app.models.programa import Programa
+
+    catalogo = CatalogoApoyo(nombre="Mentoría")
+    db.add_all([catalogo, Asignacion(id_caso=caso_test.id_caso, id_usuario=usuario_tutor.id_usuario)])
+    db.commit()
+    url = f"/api/v1/casos/{caso_test.id_caso}"
+
+    def sigue_vigente(etag):
+        return client.get(url, headers={**headers_admin, "If-None-Match": etag}).status_code == 304
+
+    etag = client.get(url, headers=headers_admin).headers["ETag"]
+    response = client.post("/api/v1/apoyos/", json={
+        "id_catalogo_apoyo": catalogo.id_catalogo_apoyo,
+        "id_caso": caso_test.id_caso,
+        "id_programa": db.query(Programa).first().id_programa,
+    }, headers=headers_admin)
+    assert response.status_code == 201
+    assert not sigue_vigente(etag)
+
+    etag = client.get(url, headers=headers_admin).headers["ETag"]
+    client.delete(f"/api/v1/apoyos/{response.json()['id_apoyo']}", headers=headers_admin)
+    assert not sigue_vigente(etag)
+
+    etag = client.get(url, headers=headers_admin).headers["ETag"]
+    client.put(f"/api/v1/usuarios/{usuario_tutor.id_usuario}", json={"nombre": "Renombrado"}, headers=headers_admin)
+    assert not sigue_vigente(etag)
+
+
+def test_actualizar_caso_con_if_match(client, headers_admin, headers_coordinador, caso_test):
+    url = f"/api/v1/casos/{caso_test.id_caso}"
+    etag = client.get(url, headers=headers_admin).headers["ETag"]
+
+    primera = client.put(url, json={"nombre_caso": "Admin"}, headers={**headers_admin, "If-Match": etag})
+    assert primera.status_code == 200
+    assert primera.headers["ETag"] != etag
+
+    # Segundo editor con la versión ya desactualizada
+    segunda = client.put(url, json={"nombre_caso": "Coordinador"}, headers={**headers_coordinador, "If-Match": etag})
+    assert segunda.status_code == 412
+    assert client.get(url, headers=headers_admin).json()["nombre_caso"] == "Admin"
+
+    response = client.patch(
+        f"{url}/estado", params={"nombre_estado": "postulado"}, headers={**headers_admin, "If-Match": etag}
+    )
+    assert response.status_code == 412
+
+
+def test_if_match_con_etag_de_get_comprimido(client, db, headers_admin, caso_test):
+    # Por encima de COMPRESION_TAMANO_MINIMO
+    caso_test.descripcion = "Descripción extensa del caso. " * 40
+    db.commit()
+    url = f"/api/v1/casos/{caso_test.id_caso}"
+    response = client.get(url, headers={**headers_admin, "Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["ETag"]
+
+    response = client.put(url, json={"nombre_caso": "Comprimido"}, headers={**headers_admin, "If-Match": etag})
+    assert response.status_code == 200
+
+    # Forma débil (agregada por un proxy) de la versión vigente
+    etag = response.headers["ETag"]
+    response = client.put(url, json={"nombre_caso": "Débil"}, headers={**headers_admin, "If-Match": f"W/{etag}"})
+    assert response.status_code == 200
+
+
+def test_actualizacion_concurrente_detectada_por_version(db, caso_test):
+    from sqlalchemy import update
+    from sqlalchemy.orm.exc import StaleDataError
+    from app.models.caso import Caso
+
+    caso_test.nombre_caso = "Local"
+    # Otra transacción modificó la fila después de leerla (la sesión no se entera)
+    db.execute(
+        update(Caso).where(Caso.id_caso == caso_test.id_caso).values(version=Caso.version + 1),
+        execution_options={"synchronize_session": False}
+    )
+
+    with pytest.raises(StaleDataError):
+        db.commit()
+    db.rollback()
+
+
+def test_emprendedor_etag_y_renombre_invalida_caso(client, headers_admin, caso_test, emprendedor_test):
+    url = f"/api/v1/emprendedores/{emprendedor_test.id_emprendedor}"
+    etag_emprendedor = client.get(url, headers=headers_admin).headers["ETag"]
+    etag_caso = client.get(f"/api/v1/casos/{caso_test.id_caso}", headers=headers_admin).headers["ETag"]
+
+    assert client.get(url, headers={**headers_admin, "If-None-Match": etag_emprendedor}).status_code == 304
+    assert client.put(
+        url, json={"nombre": "Otro"}, headers={**headers_admin, "If-Match": '"999"'}
+    ).status_code == 412
+
+    response = client.put(url, json={"nombre": "Otro"}, headers={**headers_admin, "If-Match": etag_emprendedor})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag_emprendedor
+
+    response = client.get(
+        f"/api/v1/casos/{caso_test.id_caso}", headers={**headers_admin, "If-None-Match": etag_caso}
+    )
+    assert response.status_code == 200
+    assert response.json()["emprendedor"].startswith("Otro")
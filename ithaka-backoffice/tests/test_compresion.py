@@ -0,0 +1,123 @@
+"""
+Tests del middleware de compresión de respuestas.
+"""
+import gzip
+import zlib
+
+import brotli
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compresion import CompresionMiddleware, metricas_compresion, negociar_codificacion
+from app.core.versionado import poner_etag
+
+
+def test_negociacion_accept_encoding():
+    assert negociar_codificacion("gzip, deflate, br") == "br"
+    assert negociar_codificacion("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert negociar_codificacion("br;q=0, gzip") == "gzip"
+    assert negociar_codificacion("*") == "br"
+    assert negociar_codificacion("identity") is None
+    assert negociar_codificacion("") is None
+
+
+def _app_de_prueba():
+    app = FastAPI()
+    app.add_middleware(CompresionMiddleware, tamano_minimo=100)
+
+    @app.get("/chico")
+    def chico():
+        return PlainTextResponse("hola")
+
+    @app.get("/stream")
+    def stream():
+        def bloques():
+            for i in range(50):
+                yield f"{i};fila de exportación con texto repetido\n".encode("utf-8")
+        return StreamingResponse(bloques(), media_type="text/csv")
+
+    @app.get("/contenido")
+    def contenido():
+        return PlainTextResponse("x" * 1000, headers={"ETag": '"abc"'})
+
+    @app.get("/version")
+    def version():
+        response = PlainTextResponse("x" * 1000)
+        poner_etag(response, 3)
+        return response
+
+    @app.get("/binario")
+    def binario():
+        return PlainTextResponse("x" * 1000, media_type="application/vnd.apache.parquet")
+
+    return app
+
+
+def test_streaming_se_comprime_por_bloques():
+    client = TestClient(_app_de_prueba())
+    esperado = "".join(f"{i};fila de exportación con texto repetido\n" for i in range(50)).encode("utf-8")
+
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert "Accept-Encoding" in response.headers["vary"]
+        crudo = b"".join(response.iter_raw())
+
+    assert gzip.decompress(crudo) == esperado
+    assert len(crudo) < len(esperado)
+
+    # Cada bloque se vacía (sync flush): el cliente puede descomprimir lo recibido
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        primer_bloque = next(response.iter_raw())
+    parcial = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(primer_bloque)
+    assert parcial.startswith(b"0;fila")
+
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "br"}) as response:
+        assert response.headers["content-encoding"] == "br"
+        assert brotli.decompress(b"".join(response.iter_raw())) == esperado
+
+
+def test_no_comprime_respuestas_chicas_ni_binarias():
+    client = TestClient(_app_de_prueba())
+
+    response = client.get("/chico", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+    response = client.get("/binario", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+    response = client.get("/stream", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+
+def test_etag_de_version_sigue_fuerte_al_comprimir():
+    client = TestClient(_app_de_prueba())
+
+    response = client.get("/contenido", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"abc"'
+
+    for encoding in ("gzip", "identity"):
+        response = client.get("/version", headers={"Accept-Encoding": encoding})
+        assert response.headers["etag"] == '"3"'
+        assert "x-etag-version" not in response.headers
+
+
+def test_listado_y_export_comprimidos_con_metricas(client, headers_admin, caso_test):
+    metricas_compresion.reiniciar()
+
+    response = client.get("/api/v1/casos/export", headers={**headers_admin, "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "ID Caso" in response.text
+
+    response = client.get("/api/v1/metricas/compresion", headers={**headers_admin, "Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    gzip_metricas = response.json()["codificaciones"]["gzip"]
+    assert gzip_metricas["respuestas"] >= 1
+    assert 0 < gzip_metricas["ratio"] < 1
+
+
+def test_metricas_compresion_solo_admin(client, headers_tutor):
+    assert client.get("/api/v1/metricas/compresion", headers=headers_tutor).status_code == 403
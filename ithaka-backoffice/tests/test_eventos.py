@@ -0,0 +1,123 @@
+"""
+Tests de eventos de casos (SSE en /casos/events)
+"""
+import asyncio
+
+from app.services import eventos_service
+from app.services.auditoria_service import registrar_auditoria_caso
+
+
+def _leer(flujo, cantidad):
+    """Primeros `cantidad` bloques del stream (sin el `retry:` inicial)."""
+    async def leer():
+        bloques = []
+        try:
+            await flujo.__anext__()
+            while len(bloques) < cantidad:
+                bloques.append(await asyncio.wait_for(flujo.__anext__(), 1))
+        finally:
+            await flujo.aclose()
+        return bloques
+    return asyncio.run(leer())
+
+
+def test_cambio_de_estado_en_lote_publica_evento_al_confirmar(client, db, headers_admin, caso_test):
+    from app.models.catalogo_estados import CatalogoEstados
+
+    ultimo = eventos_service.broker.ultimo_id
+    aprobado = CatalogoEstados(nombre_estado="Aprobado", tipo_caso="postulacion")
+    db.add(aprobado)
+    db.commit()
+
+    response = client.patch(
+        "/api/v1/casos/estado",
+        json={"nombre_estado": "aprobado", "ids": [caso_test.id_caso]},
+        headers=headers_admin
+    )
+    assert response.status_code == 200
+
+    eventos, hueco = eventos_service.broker.posteriores(ultimo)
+    assert not hueco
+    assert [(e["tipo"], e["id_caso"]) for e in eventos] == [("estado_cambiado", caso_test.id_caso)]
+
+
+def test_rollback_no_publica(db, caso_test, usuario_admin):
+    ultimo = eventos_service.broker.ultimo_id
+    registrar_auditoria_caso(
+        db, accion="nota_creada", id_usuario=usuario_admin.id_usuario, id_caso=caso_test.id_caso
+    )
+    db.rollback()
+    assert eventos_service.broker.ultimo_id == ultimo
+
+
+def test_flujo_reenvia_desde_last_event_id_y_filtra():
+    ultimo = eventos_service.broker.ultimo_id
+    eventos_service.broker.publicar({"tipo": "nota", "id_caso": 1})
+    eventos_service.broker.publicar({"tipo": "nota", "id_caso": 2})
+
+    async def solo_caso_2(evento):
+        return evento["id_caso"] == 2
+
+    [bloque] = _leer(eventos_service.flujo_sse(ultimo, solo_caso_2), 1)
+    assert bloque.startswith(f"id: {ultimo + 2}\nevent: nota\n")
+    assert '"id_caso": 2' in bloque
+
+
+def test_stream_de_tutor_solo_recibe_eventos_de_sus_casos(
+    client, db, headers_admin, caso_test, usuario_tutor, monkeypatch
+):
+    from app.api.v1.endpoints.caso import eventos_casos
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "EVENTOS_HEARTBEAT_SEGUNDOS", 0.2)
+
+    def actualizar_caso():
+        response = client.put(
+            f"/api/v1/casos/{caso_test.id_caso}", json={"descripcion": "Cambio"}, headers=headers_admin
+        )
+        assert response.status_code == 200
+
+    async def leer():
+        # Last-Event-ID inválido: se ignora (sin reenvío)
+        respuesta = await eventos_casos(last_event_id="²", db=db, current_user=usuario_tutor)
+        flujo = respuesta.body_iterator
+
+        def siguiente():
+            return asyncio.wait_for(flujo.__anext__(), 2)
+
+        try:
+            await siguiente()  # retry:
+            # Caso no asignado: el evento se filtra y solo llega el heartbeat
+            actualizar_caso()
+            assert await siguiente() == ": ping\n\n"
+
+            response = client.post(
+                "/api/v1/asignaciones/",
+                json={"id_caso": caso_test.id_caso, "id_usuario": usuario_tutor.id_usuario},
+                headers=headers_admin
+            )
+            assert response.status_code == 201
+            assert "event: asignacion\n" in await siguiente()
+
+            actualizar_caso()
+            assert "event: caso_actualizado\n" in await siguiente()
+        finally:
+            await flujo.aclose()
+
+    asyncio.run(leer())
+
+
+def test_flujo_pide_resync_si_faltan_eventos():
+    ultimo = eventos_service.broker.ultimo_id
+    [bloque] = _leer(eventos_service.flujo_sse(ultimo + 100), 1)
+    assert bloque.startswith("event: resync")
+
+
+def test_flujo_heartbeat_sin_eventos():
+    [bloque] = _leer(eventos_service.flujo_sse(None, heartbeat=0.01), 1)
+    assert bloque == ": ping\n\n"
+
+
+def test_eventos_requiere_autenticacion(client):
+    response = client.get("/api/v1/casos/events")
+    assert response.status_code in (401, 403)
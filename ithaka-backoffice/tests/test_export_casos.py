@@ -1,8 +1,10 @@
 """
-Tests para exportación de casos en CSV.
+Tests para exportación de casos en CSV y XLSX.
 """
 import csv
-from io import StringIO
+import zipfile
+from io import BytesIO, StringIO
+from xml.etree import ElementTree
 
 from app.models.asignacion import Asignacion
 from app.models.caso import Caso
@@ -156,3 +158,179 @@ def test_tutor_exporta_solo_casos_asignados(
 
     assert str(caso_test.id_caso) in ids_exportados
     assert str(caso_no_asignado.id_caso) not in ids_exportados
+
+
+def test_exportar_casos_filtra_por_datos_chatbot(client, db, headers_admin, caso_test):
+    caso_agro = Caso(
+        nombre_caso="Caso agro",
+        datos_chatbot={"sector": "Agro"},
+        id_emprendedor=caso_test.id_emprendedor,
+        id_estado=caso_test.id_estado,
+        id_convocatoria=caso_test.id_convocatoria
+    )
+    db.add(caso_agro)
+    db.commit()
+
+    response = client.get(
+        "/api/v1/casos/export",
+        params={"chatbot": ["sector=Agro"]},
+        headers=headers_admin
+    )
+
+    assert response.status_code == 200
+    filas = _leer_csv_response(response)
+    idx_id_caso = filas[0].index("ID Caso")
+    assert [fila[idx_id_caso] for fila in filas[1:]] == [str(caso_agro.id_caso)]
+
+
+def _leer_xlsx_response(response):
+    """Hojas del XLSX como {nombre: [filas]} (solo zipfile, sin dependencias extra)."""
+    ns = {"m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+    rel = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+    libro = zipfile.ZipFile(BytesIO(response.content))
+
+    compartidos = []
+    if "xl/sharedStrings.xml" in libro.namelist():
+        raiz = ElementTree.fromstring(libro.read("xl/sharedStrings.xml"))
+        compartidos = ["".join(t.text or "" for t in si.iter(f"{{{ns['m']}}}t")) for si in raiz]
+
+    rels = ElementTree.fromstring(libro.read("xl/_rels/workbook.xml.rels"))
+    destinos = {r.get("Id"): r.get("Target") for r in rels}
+
+    hojas = {}
+    for hoja in ElementTree.fromstring(libro.read("xl/workbook.xml")).find("m:sheets", ns):
+        xml = ElementTree.fromstring(libro.read(f"xl/{destinos[hoja.get(rel)]}"))
+        filas = []
+        for fila in xml.iter(f"{{{ns['m']}}}row"):
+            valores = []
+            for celda in fila.findall("m:c", ns):
+                if celda.get("t") == "inlineStr":
+                    valores.append("".join(t.text or "" for t in celda.iter(f"{{{ns['m']}}}t")))
+                elif celda.get("t") == "s":
+                    valores.append(compartidos[int(celda.find("m:v", ns).text)])
+                else:
+                    valores.append(celda.find("m:v", ns).text)
+            filas.append(valores)
+        hojas[hoja.get("name")] = filas
+    return hojas
+
+
+def test_exportar_casos_xlsx_con_hojas_adicionales(
+    client, db, headers_admin, usuario_tutor, caso_test, monkeypatch
+):
+    from app.core.config import settings
+    from app.models.nota import Nota
+
+    # Páginas de un caso para recorrer varias páginas con pocos datos
+    monkeypatch.setattr(settings, "EXPORT_TAMANO_PAGINA", 1)
+
+    otro_caso = Caso(
+        nombre_caso="Caso año ñandú",
+        datos_chatbot={"sector": "Tecnología"},
+        id_emprendedor=caso_test.id_emprendedor,
+        id_estado=caso_test.id_estado,
+        id_convocatoria=caso_test.id_convocatoria
+    )
+    db.add(otro_caso)
+    db.flush()
+    db.add_all([
+        Asignacion(id_usuario=usuario_tutor.id_usuario, id_caso=otro_caso.id_caso),
+        Nota(id_caso=caso_test.id_caso, id_usuario=usuario_tutor.id_usuario,
+             contenido="=SUM(A1:A2)", tipo_nota="seguimiento"),
+        Nota(id_caso=otro_caso.id_caso, id_usuario=usuario_tutor.id_usuario,
+             contenido="Reunión inicial", tipo_nota="seguimiento"),
+    ])
+    db.commit()
+
+    response = client.get(
+        "/api/v1/casos/export",
+        params={"format": "xlsx", "hojas": ["notas", "asignaciones"]},
+        headers=headers_admin
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    assert ".xlsx" in response.headers["content-disposition"]
+
+    hojas = _leer_xlsx_response(response)
+    assert list(hojas) == ["Casos", "Notas", "Asignaciones"]
+
+    casos = hojas["Casos"]
+    assert casos[0][0] == "ID Caso"
+    assert [fila[0] for fila in casos[1:]] == [str(caso_test.id_caso), str(otro_caso.id_caso)]
+    assert casos[2][1] == "Caso año ñandú"
+
+    notas = hojas["Notas"]
+    assert [fila[1] for fila in notas[1:]] == [str(caso_test.id_caso), str(otro_caso.id_caso)]
+    # El texto libre se guarda como texto, no como fórmula
+    assert "=SUM(A1:A2)" in notas[1]
+
+    asignaciones = hojas["Asignaciones"]
+    assert len(asignaciones) == 2
+    assert asignaciones[1][3] == usuario_tutor.email
+
+
+def test_exportar_casos_xlsx_hoja_invalida(client, headers_admin):
+    response = client.get(
+        "/api/v1/casos/export",
+        params={"format": "xlsx", "hojas": ["desconocida"]},
+        headers=headers_admin
+    )
+    assert response.status_code == 400
+
+
+def test_exportar_casos_parquet_tipado_y_chatbot_aplanado(
+    client, db, headers_admin, usuario_tutor, caso_test, monkeypatch
+):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "EXPORT_TAMANO_PAGINA", 1)
+
+    otro_caso = Caso(
+        nombre_caso="Caso con chatbot",
+        datos_chatbot={"sector": "Tecnología", "equipo": {"integrantes": 3}, "rut": True},
+        id_emprendedor=caso_test.id_emprendedor,
+        id_estado=caso_test.id_estado,
+        id_convocatoria=caso_test.id_convocatoria
+    )
+    db.add(otro_caso)
+    db.flush()
+    db.add(Asignacion(id_usuario=usuario_tutor.id_usuario, id_caso=otro_caso.id_caso))
+    db.commit()
+
+    response = client.get("/api/v1/casos/export", params={"format": "parquet"}, headers=headers_admin)
+
+    assert response.status_code == 200
+    assert ".parquet" in response.headers["content-disposition"]
+
+    tabla = pq.read_table(BytesIO(response.content))
+    assert tabla.num_rows == 2
+    assert tabla.schema.field("id_caso").type == pa.int64()
+    assert tabla.schema.field("fecha_creacion").type == pa.timestamp("us")
+    assert tabla.schema.field("chatbot.equipo.integrantes").type == pa.int64()
+    assert tabla.schema.field("chatbot.rut").type == pa.bool_()
+
+    filas = tabla.to_pylist()
+    assert [fila["id_caso"] for fila in filas] == [caso_test.id_caso, otro_caso.id_caso]
+    assert filas[0]["chatbot.sector"] is None
+    assert filas[1]["chatbot.sector"] == "Tecnología"
+    assert filas[1]["chatbot.equipo.integrantes"] == 3
+    assert filas[1]["id_tutor"] == usuario_tutor.id_usuario
+    assert filas[1]["tutor_email"] == usuario_tutor.email
+
+
+def test_exportar_casos_arrow_stream(client, headers_admin, caso_test):
+    import pyarrow as pa
+
+    response = client.get("/api/v1/casos/export", params={"format": "arrow"}, headers=headers_admin)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/vnd.apache.arrow.stream")
+
+    tabla = pa.ipc.open_stream(response.content).read_all()
+    assert tabla.column("id_caso").to_pylist() == [caso_test.id_caso]
@@ -0,0 +1,137 @@
+"""
+Tests para exportaciones en segundo plano (/exportaciones).
+"""
+import csv
+import os
+import time
+from io import StringIO
+
+import pytest
+
+from app.core.config import settings
+from app.services import exportacion_service
+
+
+@pytest.fixture(autouse=True)
+def registro_limpio(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_TRABAJOS_DIR", str(tmp_path))
+
+
+def _esperar(client, id_trabajo, headers, timeout=10):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        response = client.get(f"/api/v1/exportaciones/{id_trabajo}", headers=headers)
+        assert response.status_code == 200
+        datos = response.json()
+        if datos["estado"] in ("completado", "error"):
+            return datos
+        time.sleep(0.05)
+    pytest.fail("La exportación no terminó a tiempo")
+
+
+def test_exportacion_csv_completa_y_deduplicada(client, headers_admin, caso_test):
+    response = client.post("/api/v1/exportaciones", json={"formato": "csv"}, headers=headers_admin)
+    assert response.status_code == 202
+    id_trabajo = response.json()["id_trabajo"]
+
+    datos = _esperar(client, id_trabajo, headers_admin)
+    assert datos["estado"] == "completado"
+    assert datos["progreso"] == 1
+    assert datos["total"] == 1
+    assert datos["url_descarga"] == f"/api/v1/exportaciones/{id_trabajo}/descarga"
+
+    # Mismos filtros y alcance: se reutiliza el trabajo terminado
+    response = client.post("/api/v1/exportaciones", json={"formato": "csv"}, headers=headers_admin)
+    assert response.json()["id_trabajo"] == id_trabajo
+
+    response = client.get(datos["url_descarga"], headers=headers_admin)
+    assert response.status_code == 200
+    assert response.headers["accept-ranges"] == "bytes"
+    filas = list(csv.reader(StringIO(response.content.decode("utf-8"))))
+    assert filas[0][0] == "ID Caso"
+    assert [fila[0] for fila in filas[1:]] == [str(caso_test.id_caso)]
+
+
+def test_descarga_con_range_y_etag(client, headers_admin, caso_test):
+    id_trabajo = client.post(
+        "/api/v1/exportaciones", json={"formato": "xlsx", "hojas": ["notas"]}, headers=headers_admin
+    ).json()["id_trabajo"]
+    datos = _esperar(client, id_trabajo, headers_admin)
+    url = datos["url_descarga"]
+
+    completo = client.get(url, headers=headers_admin)
+    etag = completo.headers["etag"]
+    assert len(completo.content) == datos["tamano"]
+
+    parcial = client.get(url, headers={**headers_admin, "Range": "bytes=10-19"})
+    assert parcial.status_code == 206
+    assert parcial.headers["content-range"] == f"bytes 10-19/{datos['tamano']}"
+    assert parcial.content == completo.content[10:20]
+
+    # Reanudar desde un offset con If-Range vigente
+    resto = client.get(url, headers={**headers_admin, "Range": "bytes=100-", "If-Range": etag})
+    assert resto.status_code == 206
+    assert resto.content == completo.content[100:]
+
+    # If-Range con otro ETag: se envía el archivo completo
+    distinto = client.get(url, headers={**headers_admin, "Range": "bytes=0-9", "If-Range": '"otro"'})
+    assert distinto.status_code == 200
+
+    assert client.get(url, headers={**headers_admin, "If-None-Match": etag}).status_code == 304
+
+    fuera = client.get(url, headers={**headers_admin, "Range": f"bytes={datos['tamano']}-"})
+    assert fuera.status_code == 416
+
+
+def test_tutor_no_ve_trabajos_de_otro_alcance(client, headers_admin, headers_tutor, caso_test):
+    id_trabajo = client.post(
+        "/api/v1/exportaciones", json={"formato": "csv"}, headers=headers_admin
+    ).json()["id_trabajo"]
+    _esperar(client, id_trabajo, headers_admin)
+
+    assert client.get(f"/api/v1/exportaciones/{id_trabajo}", headers=headers_tutor).status_code == 404
+
+    # El Tutor obtiene su propio trabajo (alcance distinto) y no ve casos no asignados
+    id_tutor = client.post(
+        "/api/v1/exportaciones", json={"formato": "csv"}, headers=headers_tutor
+    ).json()["id_trabajo"]
+    assert id_tutor != id_trabajo
+    datos = _esperar(client, id_tutor, headers_tutor)
+    assert datos["total"] == 0
+
+
+def test_trabajo_vencido_se_purga(client, headers_admin, caso_test, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_TRABAJOS_TTL_SEGUNDOS", 0)
+
+    id_trabajo = client.post(
+        "/api/v1/exportaciones", json={"formato": "parquet"}, headers=headers_admin
+    ).json()["id_trabajo"]
+
+    limite = time.monotonic() + 10
+    while exportacion_service._leer(id_trabajo).vence is None and time.monotonic() < limite:
+        time.sleep(0.05)
+    ruta = exportacion_service._leer(id_trabajo).ruta
+    assert os.path.exists(ruta)
+
+    assert client.get(f"/api/v1/exportaciones/{id_trabajo}", headers=headers_admin).status_code == 404
+    assert not os.path.exists(ruta)
+
+
+def test_trabajo_visible_desde_otro_worker(client, headers_admin, caso_test, monkeypatch):
+    id_trabajo = client.post(
+        "/api/v1/exportaciones", json={"formato": "csv"}, headers=headers_admin
+    ).json()["id_trabajo"]
+    _esperar(client, id_trabajo, headers_admin)
+
+    # Otro worker no comparte memoria con este: solo ve el directorio
+    monkeypatch.setattr(exportacion_service, "_executor", None)
+    monkeypatch.setattr(exportacion_service, "_obtener_executor", lambda: pytest.fail("no debe re-exportar"))
+
+    response = client.post("/api/v1/exportaciones", json={"formato": "csv"}, headers=headers_admin)
+    assert response.json()["id_trabajo"] == id_trabajo
+    response = client.get(f"/api/v1/exportaciones/{id_trabajo}/descarga", headers=headers_admin)
+    assert response.status_code == 200
+
+
+def test_id_de_trabajo_invalido(client, headers_admin):
+    assert client.get("/api/v1/exportaciones/..%2F..%2Fetc", headers=headers_admin).status_code == 404
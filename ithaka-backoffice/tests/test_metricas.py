@@ -0,0 +1,441 @@
+"""
+Tests de endpoints de métricas
+"""
+from datetime import datetime, timedelta
+
+from app.models.asignacion import Asignacion
+from app.models.caso import Caso
+from app.models.catalogo_estados import CatalogoEstados
+from app.models.nota import Nota
+
+
+def _nota(db, caso, usuario, dias_atras):
+    db.add(Nota(
+        contenido="Seguimiento",
+        tipo_nota="seguimiento",
+        fecha=datetime.utcnow() - timedelta(days=dias_atras),
+        id_caso=caso.id_caso,
+        id_usuario=usuario.id_usuario
+    ))
+
+
+def test_metricas_tutores_cartera(client, db, headers_coordinador, caso_test, usuario_tutor):
+    rechazado = CatalogoEstados(nombre_estado="Rechazado", tipo_caso="postulacion")
+    db.add(rechazado)
+    db.flush()
+    cerrado = Caso(
+        nombre_caso="Caso cerrado",
+        id_emprendedor=caso_test.id_emprendedor,
+        id_estado=rechazado.id_estado
+    )
+    sin_notas = Caso(
+        nombre_caso="Sin notas",
+        id_emprendedor=caso_test.id_emprendedor,
+        id_estado=caso_test.id_estado
+    )
+    db.add_all([cerrado, sin_notas])
+    db.flush()
+    for caso in (caso_test, cerrado, sin_notas):
+        db.add(Asignacion(id_caso=caso.id_caso, id_usuario=usuario_tutor.id_usuario))
+    _nota(db, caso_test, usuario_tutor, dias_atras=3)
+    _nota(db, caso_test, usuario_tutor, dias_atras=40)
+    db.commit()
+
+    response = client.get("/api/v1/metricas/tutores", headers=headers_coordinador)
+
+    assert response.status_code == 200
+    [tutor] = response.json()["tutores"]
+    assert tutor["id_usuario"] == usuario_tutor.id_usuario
+    assert tutor["total_casos"] == 3
+    assert tutor["casos_activos"] == 2
+    assert tutor["notas_recientes"] == 1
+    assert {(e["nombre_estado"], e["cantidad"]) for e in tutor["por_estado"]} == {
+        ("postulado", 2), ("rechazado", 1)
+    }
+    # Solo casos activos; sin notas primero
+    assert [c["id_caso"] for c in tutor["casos"]] == [sin_notas.id_caso, caso_test.id_caso]
+    assert tutor["casos"][0]["dias_sin_nota"] is None
+    assert tutor["casos"][1]["dias_sin_nota"] == 3
+
+
+def test_metricas_tutores_cache_se_invalida_al_escribir(
+    client, db, headers_admin, caso_test, usuario_tutor
+):
+    response = client.get("/api/v1/metricas/tutores", headers=headers_admin)
+    assert response.json()["tutores"][0]["total_casos"] == 0
+
+    db.add(Asignacion(id_caso=caso_test.id_caso, id_usuario=usuario_tutor.id_usuario))
+    db.commit()
+
+    response = client.get("/api/v1/metricas/tutores", headers=headers_admin)
+    assert response.json()["tutores"][0]["total_casos"] == 1
+
+    # Escritura masiva (DELETE vía ORM, sin unit of work)
+    db.query(Asignacion).delete(synchronize_session=False)
+    db.commit()
+
+    response = client.get("/api/v1/metricas/tutores", headers=headers_admin)
+    assert response.json()["tutores"][0]["total_casos"] == 0
+
+
+def test_metricas_tutores_solo_admin_coordinador(client, headers_tutor):
+    response = client.get("/api/v1/metricas/tutores", headers=headers_tutor)
+    assert response.status_code == 403
+
+
+def test_metricas_series_por_semana(client, db, headers_admin, caso_test, usuario_tutor):
+    from app.models.auditoria import Auditoria
+
+    hace_dos_semanas = datetime.utcnow() - timedelta(days=14)
+    caso_test.fecha_creacion = hace_dos_semanas
+    _nota(db, caso_test, usuario_tutor, dias_atras=14)
+    _nota(db, caso_test, usuario_tutor, dias_atras=0)
+    db.add(Auditoria(
+        accion="Estado actualizado",
+        id_usuario=usuario_tutor.id_usuario,
+        id_caso=caso_test.id_caso
+    ))
+    db.commit()
+
+    response = client.get(
+        "/api/v1/metricas/series",
+        params={"granularidad": "semana", "id_convocatoria": caso_test.id_convocatoria},
+        headers=headers_admin
+    )
+
+    assert response.status_code == 200
+    puntos = response.json()["puntos"]
+    assert len(puntos) == 12
+    assert datetime.fromisoformat(puntos[-1]["periodo"]).weekday() == 0
+    assert puntos[-3]["casos_nuevos"] == 1
+    assert puntos[-3]["notas"] == 1
+    assert (puntos[-1]["notas"], puntos[-1]["cambios_estado"], puntos[-1]["casos_nuevos"]) == (1, 1, 0)
+    assert sum(p["casos_nuevos"] for p in puntos) == 1
+
+
+def test_metricas_series_cuenta_cambio_de_estado_por_put(client, db, headers_admin, caso_test, usuario_admin):
+    from app.models.auditoria import Auditoria
+
+    rechazado = CatalogoEstados(nombre_estado="Rechazado", tipo_caso="postulacion")
+    db.add(rechazado)
+    db.flush()
+    # El mismo estado reenviado no es un cambio
+    db.add(Auditoria(
+        accion="Caso actualizado",
+        valor_anterior=str({"id_estado": caso_test.id_estado}),
+        valor_nuevo=str({"id_estado": caso_test.id_estado, "descripcion": "x"}),
+        id_usuario=usuario_admin.id_usuario,
+        id_caso=caso_test.id_caso
+    ))
+    db.commit()
+
+    response = client.put(
+        f"/api/v1/casos/{caso_test.id_caso}",
+        json={"id_estado": rechazado.id_estado, "descripcion": "Actualizada"},
+        headers=headers_admin
+    )
+    assert response.status_code == 200
+    # El PUT sigue auditando el cambio dentro de "Caso actualizado"
+    registro = db.query(Auditoria).filter(Auditoria.accion == "Caso actualizado").order_by(
+        Auditoria.id_auditoria.desc()
+    ).first()
+    assert f"'id_estado': {rechazado.id_estado}" in registro.valor_nuevo
+    assert "'descripcion': 'Actualizada'" in registro.valor_nuevo
+    assert db.query(Auditoria).filter(Auditoria.accion == "Estado actualizado").count() == 0
+
+    puntos = client.get(
+        "/api/v1/metricas/series", params={"granularidad": "dia"}, headers=headers_admin
+    ).json()["puntos"]
+    assert puntos[-1]["cambios_estado"] == 1
+
+
+def test_metricas_series_solo_recalcula_periodo_actual(client, db, headers_admin, caso_test, usuario_tutor):
+    params = {"granularidad": "dia"}
+    client.get("/api/v1/metricas/series", params=params, headers=headers_admin)
+
+    # Períodos cerrados: inmutables (no se vuelven a consultar)
+    _nota(db, caso_test, usuario_tutor, dias_atras=5)
+    # Período en curso: siempre se recalcula
+    _nota(db, caso_test, usuario_tutor, dias_atras=0)
+    db.commit()
+
+    puntos = client.get("/api/v1/metricas/series", params=params, headers=headers_admin).json()["puntos"]
+    assert len(puntos) == 30
+    assert puntos[-1]["notas"] == 1
+    assert puntos[-6]["notas"] == 0
+
+
+def test_metricas_series_rango_excesivo(client, headers_admin):
+    response = client.get(
+        "/api/v1/metricas/series",
+        params={"granularidad": "dia", "desde": "2020-01-01"},
+        headers=headers_admin
+    )
+    assert response.status_code == 400
+
+
+def test_metricas_funnel_incremental(client, db, headers_admin, caso_test, usuario_admin, monkeypatch):
+    from app.core.config import settings
+    from app.models.auditoria import Auditoria
+
+    monkeypatch.setattr(settings, "FUNNEL_MARGEN_SEGUNDOS", 0)
+    inicio = datetime.utcnow() - timedelta(days=10)
+    rechazado = CatalogoEstados(nombre_estado="Rechazado", tipo_caso="postulacion")
+    aprobado = CatalogoEstados(nombre_estado="Aprobado", tipo_caso="postulacion")
+    db.add_all([rechazado, aprobado])
+    db.flush()
+
+    def registrar(accion, anterior, nuevo, dias):
+        db.add(Auditoria(
+            accion=accion,
+            valor_anterior=anterior,
+            valor_nuevo=nuevo,
+            id_usuario=usuario_admin.id_usuario,
+            id_caso=caso_test.id_caso,
+            timestamp=inicio + timedelta(days=dias)
+        ))
+        db.commit()
+
+    registrar("Caso creado", None, "Caso creado", 0)
+    registrar("Estado actualizado", "postulado", "rechazado", 4)
+
+    response = client.get("/api/v1/metricas/funnel", headers=headers_admin)
+    assert response.status_code == 200
+    estados = {e["nombre_estado"]: e for e in response.json()["estados"]}
+    assert estados["postulado"]["entradas"] == 1
+    assert estados["postulado"]["dias_promedio"] == 4
+    assert estados["postulado"]["transiciones"] == [
+        {
+            "id_estado": rechazado.id_estado,
+            "destino": "rechazado",
+            "tipo_caso": "postulacion",
+            "cantidad": 1,
+            "porcentaje": 100.0,
+        }
+    ]
+    assert estados["rechazado"]["casos_actuales"] == 1
+    checkpoint = response.json()["ultimo_id_auditoria"]
+
+    # Solo se procesa lo nuevo; el PUT registra el cambio como dicts con id_estado
+    registrar(
+        "Caso actualizado",
+        str({"id_estado": rechazado.id_estado}),
+        str({"id_estado": aprobado.id_estado}),
+        6,
+    )
+    registrar("nota_creada", None, "ignorada", 7)
+
+    response = client.get(
+        "/api/v1/metricas/funnel",
+        params={"id_convocatoria": caso_test.id_convocatoria},
+        headers=headers_admin
+    )
+    data = response.json()
+    assert data["ultimo_id_auditoria"] > checkpoint
+    estados = {e["nombre_estado"]: e for e in data["estados"]}
+    assert estados["rechazado"]["salidas"] == 1
+    assert estados["rechazado"]["dias_promedio"] == 2
+    assert estados["postulado"]["salidas"] == 1
+    assert estados["aprobado"]["casos_actuales"] == 1
+    assert estados["rechazado"]["casos_actuales"] == 0
+
+    response = client.get(
+        "/api/v1/metricas/funnel", params={"id_convocatoria": 99999}, headers=headers_admin
+    )
+    assert response.json()["estados"] == []
+
+
+def test_metricas_funnel_incluye_casos_que_no_cambiaron(
+    client, db, headers_admin, emprendedor_test, monkeypatch
+):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "FUNNEL_MARGEN_SEGUNDOS", 0)
+    rechazado = CatalogoEstados(nombre_estado="Rechazado", tipo_caso="postulacion")
+    db.add(rechazado)
+    db.commit()
+
+    ids = []
+    for nombre in ("Sigue postulado", "Se mueve"):
+        response = client.post(
+            "/api/v1/casos",
+            json={"nombre_caso": nombre, "id_emprendedor": emprendedor_test.id_emprendedor},
+            headers=headers_admin
+        )
+        assert response.status_code == 201
+        ids.append(response.json()["id_caso"])
+    client.patch(
+        f"/api/v1/casos/{ids[1]}/estado", params={"nombre_estado": "rechazado"}, headers=headers_admin
+    )
+
+    estados = {
+        e["nombre_estado"]: e
+        for e in client.get("/api/v1/metricas/funnel", headers=headers_admin).json()["estados"]
+    }
+    assert estados["postulado"]["entradas"] == 2
+    assert estados["postulado"]["salidas"] == 1
+    assert estados["postulado"]["casos_actuales"] == 1
+    assert estados["postulado"]["transiciones"][0]["porcentaje"] == 100.0
+    assert estados["rechazado"]["casos_actuales"] == 1
+
+
+def test_metricas_funnel_distingue_estados_con_el_mismo_nombre(
+    client, db, headers_admin, emprendedor_test, monkeypatch
+):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "FUNNEL_MARGEN_SEGUNDOS", 0)
+    pausa_postulacion = CatalogoEstados(nombre_estado="En pausa", tipo_caso="postulacion")
+    en_proyecto = CatalogoEstados(nombre_estado="En proyecto", tipo_caso="postulacion")
+    pausa_proyecto = CatalogoEstados(nombre_estado="En pausa", tipo_caso="proyecto")
+    activo = CatalogoEstados(nombre_estado="Proyecto activo", tipo_caso="proyecto")
+    db.add_all([pausa_postulacion, en_proyecto, pausa_proyecto, activo])
+    db.commit()
+
+    response = client.post(
+        "/api/v1/casos",
+        json={"nombre_caso": "Convertido", "id_emprendedor": emprendedor_test.id_emprendedor},
+        headers=headers_admin
+    )
+    id_caso = response.json()["id_caso"]
+    # "en proyecto" convierte a proyecto "en pausa"; luego el PUT lo activa
+    response = client.patch(
+        f"/api/v1/casos/{id_caso}/estado", params={"nombre_estado": "en proyecto"}, headers=headers_admin
+    )
+    assert response.json()["id_estado"] == pausa_proyecto.id_estado
+    response = client.put(
+        f"/api/v1/casos/{id_caso}", json={"id_estado": activo.id_estado}, headers=headers_admin
+    )
+    assert response.status_code == 200
+
+    estados = {
+        (e["tipo_caso"], e["nombre_estado"]): e
+        for e in client.get("/api/v1/metricas/funnel", headers=headers_admin).json()["estados"]
+    }
+    assert ("postulacion", "en pausa") not in estados
+    pausa = estados[("proyecto", "en pausa")]
+    assert (pausa["id_estado"], pausa["entradas"], pausa["salidas"]) == (pausa_proyecto.id_estado, 1, 1)
+    assert pausa["transiciones"][0]["id_estado"] == activo.id_estado
+    [transicion] = estados[("postulacion", "postulado")]["transiciones"]
+    assert (transicion["destino"], transicion["tipo_caso"]) == ("en pausa", "proyecto")
+    assert estados[("proyecto", "proyecto activo")]["casos_actuales"] == 1
+
+
+def test_metricas_funnel_retoma_desde_el_snapshot(client, db, headers_admin, caso_test, monkeypatch):
+    from app.core.config import settings
+    from app.models.auditoria import Auditoria
+    from app.models.funnel_snapshot import FunnelSnapshot
+    from app.services import funnel_service
+
+    monkeypatch.setattr(settings, "FUNNEL_MARGEN_SEGUNDOS", 0)
+    monkeypatch.setattr(settings, "FUNNEL_SNAPSHOT_CADA", 1)
+    rechazado = CatalogoEstados(nombre_estado="Rechazado", tipo_caso="postulacion")
+    db.add(rechazado)
+    db.commit()
+    client.patch(
+        f"/api/v1/casos/{caso_test.id_caso}/estado", params={"nombre_estado": "rechazado"}, headers=headers_admin
+    )
+    checkpoint = client.get("/api/v1/metricas/funnel", headers=headers_admin).json()["ultimo_id_auditoria"]
+    assert db.get(FunnelSnapshot, 1).checkpoint == checkpoint
+
+    # Otro worker (o un reinicio) no reprocesa la auditoría ya guardada
+    funnel_service.reiniciar()
+    db.query(Auditoria).delete()
+    db.commit()
+    estados = {
+        e["nombre_estado"]: e
+        for e in client.get("/api/v1/metricas/funnel", headers=headers_admin).json()["estados"]
+    }
+    assert estados["postulado"]["salidas"] == 1
+    assert estados["rechazado"]["casos_actuales"] == 1
+
+
+def test_metricas_funnel_descarta_casos_eliminados(client, db, headers_admin, caso_test, usuario_admin, monkeypatch):
+    from app.core.config import settings
+    from app.models.auditoria import Auditoria
+    from app.services import funnel_service
+
+    monkeypatch.setattr(settings, "FUNNEL_MARGEN_SEGUNDOS", 0)
+    db.add(Auditoria(
+        accion="Caso creado", valor_nuevo="Caso creado", id_usuario=usuario_admin.id_usuario, id_caso=caso_test.id_caso
+    ))
+    db.commit()
+    # Eliminado antes de procesar su creación: nunca se conoce su estado
+    db.query(Caso).filter(Caso.id_caso == caso_test.id_caso).delete()
+    db.commit()
+
+    assert client.get("/api/v1/metricas/funnel", headers=headers_admin).status_code == 200
+    assert funnel_service._estado.sin_estado == set()
+    assert caso_test.id_caso not in funnel_service._estado.casos
+
+
+def test_metricas_funnel_no_espera_otra_actualizacion(db, caso_test, usuario_admin):
+    from app.models.auditoria import Auditoria
+    from app.services import funnel_service
+
+    db.add(Auditoria(
+        accion="Caso creado", valor_nuevo="Caso creado", id_usuario=usuario_admin.id_usuario, id_caso=caso_test.id_caso
+    ))
+    db.commit()
+
+    # Otro request del proceso está actualizando: se responde con lo vigente
+    with funnel_service._actualizando:
+        assert funnel_service.actualizar(db) == 0
+
+
+def test_metricas_proyectos(client, db, headers_coordinador, caso_test):
+    from datetime import date
+    from app.models.apoyo import Apoyo
+    from app.models.catalogo_apoyo import CatalogoApoyo
+    from app.models.programa import Programa
+
+    en_pausa = CatalogoEstados(nombre_estado="En pausa", tipo_caso="proyecto")
+    catalogo = CatalogoApoyo(nombre="Mentoría")
+    db.add_all([en_pausa, catalogo])
+    db.flush()
+    caso_test.id_estado = en_pausa.id_estado
+    programa = db.query(Programa).first()
+    hoy = date.today()
+    db.add_all([
+        Apoyo(
+            id_caso=caso_test.id_caso,
+            id_catalogo_apoyo=catalogo.id_catalogo_apoyo,
+            id_programa=programa.id_programa,
+            fecha_inicio=hoy - timedelta(days=10),
+            fecha_fin=hoy + timedelta(days=20)
+        ),
+        Apoyo(
+            id_caso=caso_test.id_caso,
+            id_catalogo_apoyo=catalogo.id_catalogo_apoyo,
+            id_programa=programa.id_programa,
+            fecha_inicio=hoy - timedelta(days=100),
+            fecha_fin=hoy - timedelta(days=50)
+        ),
+    ])
+    db.commit()
+
+    response = client.get(
+        "/api/v1/metricas/proyectos",
+        params={"id_convocatoria": caso_test.id_convocatoria},
+        headers=headers_coordinador
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["totales"] == {
+        "proyectos": 1,
+        "proyectos_con_apoyo": 1,
+        "apoyos": 2,
+        "apoyos_activos": 1,
+        "apoyos_por_proyecto": 2.0,
+    }
+    assert data["por_estado"][0]["nombre_estado"] == "en pausa"
+    assert data["apoyos"] == [{"apoyo": "Mentoría", "cantidad": 2, "proyectos": 1, "activos": 1}]
+    [programa_resp] = data["programas"]
+    assert programa_resp["apoyos_activos"] == 1
+    assert programa_resp["inicio_activos"] == str(hoy - timedelta(days=10))
+    assert programa_resp["fin_activos"] == str(hoy + timedelta(days=20))
+
+    # Convocatoria sin proyectos
+    response = client.get("/api/v1/metricas/proyectos", params={"id_convocatoria": 99999}, headers=headers_coordinador)
+    assert response.json()["totales"]["proyectos"] == 0
@@ -0,0 +1,92 @@
+"""
+Tests de migraciones (Alembic)
+"""
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+
+from app.db.database import Base
+from app.db.migraciones import diferencias_con_modelos
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+@pytest.fixture
+def engine_migraciones(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migraciones.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _alembic(engine, comando, destino):
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configurar_logging"] = False
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        getattr(command, comando)(config, destino)
+
+
+def test_migraciones_coinciden_con_modelos(engine_migraciones):
+    _alembic(engine_migraciones, "upgrade", "head")
+
+    with engine_migraciones.connect() as connection:
+        assert diferencias_con_modelos(connection) == []
+
+
+def test_downgrade_y_upgrade_completos(engine_migraciones):
+    _alembic(engine_migraciones, "upgrade", "head")
+    _alembic(engine_migraciones, "downgrade", "base")
+
+    tablas = set(inspect(engine_migraciones).get_table_names())
+    assert tablas <= {"alembic_version"}
+
+    _alembic(engine_migraciones, "upgrade", "head")
+    with engine_migraciones.connect() as connection:
+        assert diferencias_con_modelos(connection) == []
+
+
+def test_foreign_keys_tienen_indice():
+    """Toda FK es la primera columna de algún índice (joins y filtros sin scan secuencial)."""
+    sin_indice = []
+    for tabla in Base.metadata.sorted_tables:
+        primeras = {indice.columns[0].name for indice in tabla.indexes}
+        for fk in tabla.foreign_keys:
+            if fk.parent.name not in primeras:
+                sin_indice.append(f"{tabla.name}.{fk.parent.name}")
+
+    assert sin_indice == []
+
+
+def test_estados_normalizados_y_unificados(engine_migraciones):
+    _alembic(engine_migraciones, "upgrade", "0002_indices_fk_filtros")
+    with engine_migraciones.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO catalogo_estados (id_estado, nombre_estado, tipo_caso) VALUES "
+            "(1, 'Postulado', 'Postulacion'), (2, ' postulado ', 'postulacion'), (3, 'En Pausa', 'Proyecto')"
+        ))
+        connection.execute(text(
+            "INSERT INTO emprendedor (id_emprendedor, nombre, apellido, email) VALUES (1, 'Ana', 'Gómez', 'ana@test.com')"
+        ))
+        connection.execute(text(
+            "INSERT INTO caso (id_caso, nombre_caso, id_emprendedor, id_estado) VALUES (1, 'Caso', 1, 2)"
+        ))
+
+    _alembic(engine_migraciones, "upgrade", "head")
+
+    with engine_migraciones.connect() as connection:
+        estados = connection.execute(text(
+            "SELECT id_estado, nombre_estado, tipo_caso FROM catalogo_estados ORDER BY id_estado"
+        )).all()
+        assert [tuple(e) for e in estados] == [(1, "postulado", "postulacion"), (3, "en pausa", "proyecto")]
+        assert connection.execute(text("SELECT id_estado FROM caso")).scalar() == 1
+
+    for valores in ("'Aprobado', 'postulacion'", "'postulado', 'postulacion'", "'x', 'otro'"):
+        with pytest.raises(IntegrityError):
+            with engine_migraciones.begin() as connection:
+                connection.execute(text(
+                    f"INSERT INTO catalogo_estados (nombre_estado, tipo_caso) VALUES ({valores})"
+                ))
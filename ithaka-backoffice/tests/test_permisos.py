@@ -285,3 +285,135 @@ class TestPermisosAuditoria:
             headers=headers_tutor
         )
         assert response.status_code == 403
+
+
+class TestAccesoTutorPorAsignacion:
+    """El acceso del Tutor sigue a las asignaciones (cache invalidada al asignar/desasignar)"""
+
+    def test_acceso_se_actualiza_al_asignar_y_desasignar(
+        self, client, headers_admin, headers_tutor, usuario_tutor, caso_test
+    ):
+        url_caso = f"/api/v1/casos/{caso_test.id_caso}"
+        url_emprendedor = f"/api/v1/emprendedores/{caso_test.id_emprendedor}"
+
+        assert client.get(url_caso, headers=headers_tutor).status_code == 403
+        assert client.get(url_emprendedor, headers=headers_tutor).status_code == 403
+
+        response = client.post(
+            "/api/v1/asignaciones",
+            json={"id_usuario": usuario_tutor.id_usuario, "id_caso": caso_test.id_caso},
+            headers=headers_admin
+        )
+        assert response.status_code == 201
+        id_asignacion = response.json()["id_asignacion"]
+
+        assert client.get(url_caso, headers=headers_tutor).status_code == 200
+        assert client.get(url_emprendedor, headers=headers_tutor).status_code == 200
+        response = client.get(f"/api/v1/apoyos-solicitados/caso/{caso_test.id_caso}", headers=headers_tutor)
+        assert response.status_code != 403
+
+        response = client.delete(f"/api/v1/asignaciones/{id_asignacion}", headers=headers_admin)
+        assert response.status_code in (200, 204)
+
+        assert client.get(url_caso, headers=headers_tutor).status_code == 403
+        assert client.get(url_emprendedor, headers=headers_tutor).status_code == 403
+
+    def test_asignacion_directa_en_db_invalida_cache(
+        self, client, db, headers_tutor, usuario_tutor, caso_test
+    ):
+        from app.models.asignacion import Asignacion
+
+        url_caso = f"/api/v1/casos/{caso_test.id_caso}"
+        assert client.get(url_caso, headers=headers_tutor).status_code == 403
+
+        db.add(Asignacion(id_usuario=usuario_tutor.id_usuario, id_caso=caso_test.id_caso))
+        db.commit()
+
+        assert client.get(url_caso, headers=headers_tutor).status_code == 200
+
+    def test_carga_concurrente_con_invalidacion_no_queda_en_cache(
+        self, db, usuario_tutor, caso_test, monkeypatch
+    ):
+        from app.models.asignacion import Asignacion
+        from app.services import autorizacion_service
+
+        cargar = autorizacion_service._cargar_acceso
+
+        def cargar_y_asignar(db, id_tutor):
+            # Otro request confirma una asignación mientras esta carga lee la anterior
+            acceso = cargar(db, id_tutor)
+            db.add(Asignacion(id_usuario=id_tutor, id_caso=caso_test.id_caso))
+            db.commit()
+            return acceso
+
+        monkeypatch.setattr(autorizacion_service, "_cargar_acceso", cargar_y_asignar)
+        assert not autorizacion_service.tutor_tiene_caso(db, usuario_tutor.id_usuario, caso_test.id_caso)
+        monkeypatch.setattr(autorizacion_service, "_cargar_acceso", cargar)
+
+        assert autorizacion_service.tutor_tiene_caso(db, usuario_tutor.id_usuario, caso_test.id_caso)
+
+    def test_invalidacion_notificada_por_otro_worker(self, db, usuario_tutor, caso_test):
+        import json
+
+        from app.models.asignacion import Asignacion
+        from app.services import autorizacion_service
+
+        id_tutor = usuario_tutor.id_usuario
+        assert not autorizacion_service.tutor_tiene_caso(db, id_tutor, caso_test.id_caso)
+
+        # Asignación hecha por otro worker: este proceso solo recibe el NOTIFY
+        autorizacion_service._invalidar_notificados(json.dumps({"tutores": [], "todos": False}))
+        db.execute(Asignacion.__table__.insert().values(id_usuario=id_tutor, id_caso=caso_test.id_caso))
+        db.commit()
+        assert not autorizacion_service.tutor_tiene_caso(db, id_tutor, caso_test.id_caso)
+
+        autorizacion_service._invalidar_notificados(json.dumps({"tutores": [id_tutor], "todos": False}))
+        assert autorizacion_service.tutor_tiene_caso(db, id_tutor, caso_test.id_caso)
+
+
+class TestAlcanceTutorEnListados:
+    """El alcance de Tutor (EXISTS) no duplica filas cuando hay varias asignaciones"""
+
+    @pytest.fixture
+    def caso_con_dos_tutores(self, db, usuario_tutor, usuario_coordinador, caso_test):
+        from app.models.asignacion import Asignacion
+        from app.models.caso import Caso
+        from app.models.nota import Nota
+
+        otro_caso = Caso(
+            nombre_caso="Segundo caso",
+            id_emprendedor=caso_test.id_emprendedor,
+            id_estado=caso_test.id_estado,
+            id_convocatoria=caso_test.id_convocatoria,
+        )
+        db.add(otro_caso)
+        db.flush()
+        db.add_all([
+            Asignacion(id_usuario=usuario_tutor.id_usuario, id_caso=caso_test.id_caso),
+            Asignacion(id_usuario=usuario_coordinador.id_usuario, id_caso=caso_test.id_caso),
+            Asignacion(id_usuario=usuario_tutor.id_usuario, id_caso=otro_caso.id_caso),
+            Nota(id_caso=caso_test.id_caso, id_usuario=usuario_tutor.id_usuario, contenido="Nota", tipo_nota="seguimiento"),
+        ])
+        db.commit()
+        return caso_test
+
+    def test_listados_de_tutor_sin_duplicados(self, client, headers_tutor, caso_con_dos_tutores):
+        casos = client.get("/api/v1/casos", headers=headers_tutor).json()
+        assert len(casos) == 2
+
+        notas = client.get("/api/v1/notas", headers=headers_tutor).json()
+        assert len(notas) == 1
+
+        emprendedores = client.get("/api/v1/emprendedores", headers=headers_tutor).json()
+        assert [e["id_emprendedor"] for e in emprendedores] == [caso_con_dos_tutores.id_emprendedor]
+
+    def test_filtro_id_tutor_combinado_con_alcance(
+        self, client, headers_admin, headers_tutor, usuario_coordinador, caso_con_dos_tutores
+    ):
+        params = {"id_tutor": usuario_coordinador.id_usuario}
+
+        casos = client.get("/api/v1/casos", params=params, headers=headers_admin).json()
+        assert [c["id_caso"] for c in casos] == [caso_con_dos_tutores.id_caso]
+
+        casos = client.get("/api/v1/casos", params=params, headers=headers_tutor).json()
+        assert [c["id_caso"] for c in casos] == [caso_con_dos_tutores.id_caso]
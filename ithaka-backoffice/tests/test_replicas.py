@@ -0,0 +1,117 @@
+"""
+Tests de enrutamiento primaria / réplicas (dos SQLite locales)
+"""
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import session as session_db
+from app.db.session import (
+    COOKIE_ESCRITURA,
+    HEADER_ESCRITURA,
+    EnrutadorSesiones,
+    MarcaEscrituraMiddleware,
+    get_db,
+)
+
+
+@pytest.fixture
+def enrutador(tmp_path):
+    engines = {}
+    fabricas = {}
+    for nombre in ("primaria", "replica"):
+        engines[nombre] = create_engine(f"sqlite:///{tmp_path / nombre}.db")
+        with engines[nombre].begin() as connection:
+            connection.execute(text("CREATE TABLE origen (nombre TEXT)"))
+            connection.execute(text("INSERT INTO origen VALUES (:nombre)"), {"nombre": nombre})
+        fabricas[nombre] = sessionmaker(bind=engines[nombre], autoflush=False)
+
+    yield EnrutadorSesiones(fabricas["primaria"], [fabricas["replica"]], sticky_segundos=60)
+
+    for engine in engines.values():
+        engine.dispose()
+
+
+def _origen(db):
+    try:
+        return db.execute(text("SELECT nombre FROM origen")).scalar()
+    finally:
+        db.close()
+
+
+def test_lecturas_a_replica_y_escrituras_a_primaria(enrutador):
+    assert _origen(enrutador.sesion("GET", "cliente")) == "replica"
+    assert _origen(enrutador.sesion("HEAD", None)) == "replica"
+    for metodo in ("POST", "PUT", "PATCH", "DELETE"):
+        assert _origen(enrutador.sesion(metodo, "cliente")) == "primaria"
+
+
+def test_lecturas_propias_van_a_primaria_tras_escribir(enrutador):
+    db = enrutador.sesion("POST", "autor")
+    db.execute(text("INSERT INTO origen VALUES ('nuevo')"))
+    db.commit()
+    db.close()
+
+    assert _origen(enrutador.sesion("GET", "autor")) == "primaria"
+    assert _origen(enrutador.sesion("GET", "otro")) == "replica"
+
+
+def test_sin_escrituras_no_hay_stickiness(enrutador):
+    db = enrutador.sesion("POST", "autor")
+    db.execute(select(text("1")))
+    db.commit()
+    db.close()
+
+    # Escritura revertida tampoco cuenta
+    db = enrutador.sesion("PUT", "autor")
+    db.execute(text("INSERT INTO origen VALUES ('descartado')"))
+    db.rollback()
+    db.close()
+
+    assert _origen(enrutador.sesion("GET", "autor")) == "replica"
+
+
+def test_sin_replicas_todo_a_primaria(enrutador):
+    primaria = enrutador._primaria
+    solo_primaria = EnrutadorSesiones(primaria)
+    assert _origen(solo_primaria.sesion("GET", "cliente")) == "primaria"
+
+
+def test_marca_de_escritura_del_cliente_va_a_primaria(enrutador):
+    # Otro proceso: no conoce la escritura, pero el cliente trae la marca
+    assert _origen(enrutador.sesion("GET", "autor", time.time() - 1)) == "primaria"
+    # Vencida o adulterada hacia el futuro: réplica
+    assert _origen(enrutador.sesion("GET", "autor", time.time() - 120)) == "replica"
+    assert _origen(enrutador.sesion("GET", "autor", time.time() + 3600)) == "replica"
+
+
+def test_marca_de_escritura_entre_workers(enrutador, monkeypatch):
+    monkeypatch.setattr(session_db, "enrutador", enrutador)
+    app = FastAPI()
+    app.add_middleware(MarcaEscrituraMiddleware)
+
+    @app.post("/origen")
+    def escribir(db: Session = Depends(get_db)):
+        db.execute(text("INSERT INTO origen VALUES ('nuevo')"))
+        db.commit()
+
+    @app.get("/origen")
+    def leer(db: Session = Depends(get_db)):
+        return db.execute(text("SELECT nombre FROM origen")).scalar()
+
+    client = TestClient(app)
+    response = client.post("/origen")
+    marca = response.headers[HEADER_ESCRITURA]
+    assert response.cookies[COOKIE_ESCRITURA] == marca
+    assert client.get("/origen").headers.get(HEADER_ESCRITURA) is None
+
+    # Otro worker (sin la marca en memoria) respeta la cookie o el header
+    otro_worker = EnrutadorSesiones(enrutador._primaria, enrutador._replicas, sticky_segundos=60)
+    monkeypatch.setattr(session_db, "enrutador", otro_worker)
+    assert client.get("/origen").json() == "primaria"
+    assert TestClient(app).get("/origen", headers={HEADER_ESCRITURA: marca}).json() == "primaria"
+    assert TestClient(app).get("/origen").json() == "replica"
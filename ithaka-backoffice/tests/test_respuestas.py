@@ -0,0 +1,43 @@
+"""
+Tests del camino rápido de listados (orjson sin re-validar response_model):
+la salida debe ser la misma que produciría la validación contra el schema.
+"""
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.models.asignacion import Asignacion
+from app.models.nota import Nota
+from app.schemas.auditoria import AuditoriaResponse
+from app.schemas.caso import CasoResponse
+from app.schemas.emprendedor import EmprendedorResponse
+from app.schemas.nota import NotaResponse
+
+
+def _igual_a_schema(response, schema):
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    datos = response.json()
+    assert datos
+    validados = TypeAdapter(List[schema]).validate_python(datos)
+    assert TypeAdapter(List[schema]).dump_python(validados, mode="json") == datos
+
+
+def test_listados_rapidos_respetan_el_schema(client, db, headers_admin, usuario_tutor, caso_test):
+    caso_test.datos_chatbot = {"sector": "Tecnología", "equipo": {"integrantes": 3}}
+    db.add(Asignacion(id_usuario=usuario_tutor.id_usuario, id_caso=caso_test.id_caso))
+    db.add(Nota(id_caso=caso_test.id_caso, id_usuario=usuario_tutor.id_usuario,
+                contenido="Seguimiento inicial", tipo_nota="seguimiento"))
+    db.commit()
+
+    # Genera auditoría por el endpoint
+    client.put(f"/api/v1/casos/{caso_test.id_caso}", json={"nombre_caso": "Renombrado"}, headers=headers_admin)
+
+    _igual_a_schema(client.get("/api/v1/casos", headers=headers_admin), CasoResponse)
+    _igual_a_schema(client.get("/api/v1/notas", headers=headers_admin), NotaResponse)
+    _igual_a_schema(client.get("/api/v1/emprendedores", headers=headers_admin), EmprendedorResponse)
+    _igual_a_schema(client.get("/api/v1/auditoria", headers=headers_admin), AuditoriaResponse)
+
+    casos = client.get("/api/v1/casos", headers=headers_admin).json()
+    assert casos[0]["datos_chatbot"] == {"sector": "Tecnología", "equipo": {"integrantes": 3}}
+    assert casos[0]["id_tutor"] == usuario_tutor.id_usuario
@@ -0,0 +1,80 @@
+"""
+Tests del registro de routers con importación diferida
+"""
+import sys
+import types
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.routers_diferidos import RouterRegistrado, RutaDiferida, incluir_routers
+
+
+def _endpoint(nombre, ruta):
+    def endpoint():
+        return {"modulo": nombre, "ruta": ruta}
+    return endpoint
+
+
+def _registrar_modulo(monkeypatch, nombre, *rutas):
+    router = APIRouter()
+    for ruta in rutas:
+        router.add_api_route(ruta, _endpoint(nombre, ruta), methods=["GET"])
+    modulo = types.ModuleType(nombre)
+    modulo.router = router
+    monkeypatch.setitem(sys.modules, nombre, modulo)
+
+
+def _app(monkeypatch):
+    _registrar_modulo(monkeypatch, "prueba_metricas", "/", "/{nombre}")
+    _registrar_modulo(monkeypatch, "prueba_proyectos", "/", "/detalle")
+    _registrar_modulo(monkeypatch, "prueba_casos", "/", "/{id_caso}")
+    app = FastAPI()
+    incluir_routers(app, [
+        RouterRegistrado("prueba_metricas", "/metricas", ("metricas",)),
+        RouterRegistrado("prueba_proyectos", "/metricas/proyectos", ("metricas",)),
+        RouterRegistrado("prueba_casos", "/casos", ("casos",)),
+    ], prefijo="/api/v1")
+    return app
+
+
+def _diferidas(app):
+    return {r.registro.modulo: r for r in app.router.routes if isinstance(r, RutaDiferida)}
+
+
+def test_router_se_carga_con_el_primer_pedido_a_su_prefijo(monkeypatch):
+    app = _app(monkeypatch)
+    client = TestClient(app)
+
+    assert set(_diferidas(app)) == {"prueba_metricas", "prueba_proyectos", "prueba_casos"}
+
+    response = client.get("/api/v1/casos/7")
+    assert response.json() == {"modulo": "prueba_casos", "ruta": "/{id_caso}"}
+    assert set(_diferidas(app)) == {"prueba_metricas", "prueba_proyectos"}
+
+    # Un prefijo solo corresponde en el límite de un segmento
+    assert client.get("/api/v1/casosx").status_code == 404
+    assert set(_diferidas(app)) == {"prueba_metricas", "prueba_proyectos"}
+
+
+def test_router_diferido_respeta_el_orden_del_registro(monkeypatch):
+    app = _app(monkeypatch)
+    client = TestClient(app)
+
+    # /metricas/{nombre} está registrado antes y captura "proyectos"
+    assert client.get("/api/v1/metricas/proyectos").json()["modulo"] == "prueba_metricas"
+    # Sin match en /metricas, sigue con /metricas/proyectos
+    assert client.get("/api/v1/metricas/proyectos/detalle").json() == {
+        "modulo": "prueba_proyectos", "ruta": "/detalle"
+    }
+    assert set(_diferidas(app)) == {"prueba_casos"}
+    assert client.get("/api/v1/metricas/").json()["modulo"] == "prueba_metricas"
+    assert client.get("/api/v1/metricas/proyectos/").json()["modulo"] == "prueba_proyectos"
+
+
+def test_openapi_incluye_routers_no_cargados(client):
+    paths = client.get("/openapi.json").json()["paths"]
+
+    assert any(p.startswith("/api/v1/exportaciones") for p in paths)
+    assert any(p.startswith("/api/v1/metricas/proyectos") for p in paths)
+    assert any(p.startswith("/api/v1/search") for p in paths)
@@ -251,3 +251,18 @@ def test_password_hasheado_correctamente(client, db, headers_admin):
     usuario = db.query(Usuario).filter(Usuario.id_usuario == usuario_id).first()
     assert usuario.password_hash != "plainpassword"
     assert usuario.password_hash.startswith("$2b$")  # bcrypt hash
+
+
+def test_obtener_usuarios_en_lote(client, headers_admin, headers_tutor, usuario_admin, usuario_tutor):
+    """Batch por IDs: indexado por ID, ignora inexistentes; Tutor solo se ve a sí mismo"""
+    ids = f"{usuario_admin.id_usuario},{usuario_tutor.id_usuario},99999"
+
+    response = client.get("/api/v1/usuarios/batch", params={"ids": ids}, headers=headers_admin)
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {str(usuario_admin.id_usuario), str(usuario_tutor.id_usuario)}
+    assert data[str(usuario_tutor.id_usuario)]["email"] == usuario_tutor.email
+    assert "password_hash" not in data[str(usuario_tutor.id_usuario)]
+
+    response = client.get("/api/v1/usuarios/batch", params={"ids": ids}, headers=headers_tutor)
+    assert set(response.json()) == {str(usuario_tutor.id_usuario)}